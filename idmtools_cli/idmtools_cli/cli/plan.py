@@ -0,0 +1,81 @@
+"""Define the plan cli command, estimating the size and creation cost of an experiment before running it."""
+import importlib
+import importlib.util
+import json
+import os
+import sys
+from logging import getLogger
+from typing import Any, Optional
+import click
+from idmtools_cli.cli.entrypoint import cli
+
+logger = getLogger(__name__)
+
+
+def load_target(target: str) -> Any:
+    """
+    Load the object a target points to.
+
+    Args:
+        target: script.py:name or package.module:name. Without name, the script must define an experiment named
+            experiment
+
+    Returns:
+        Object of the target. Callables are called without arguments
+    """
+    path, _, name = target.partition(':')
+    name = name or 'experiment'
+    if path.endswith('.py') or os.path.exists(path):
+        path = os.path.abspath(path)
+        # make the imports of the script relative to its directory work
+        sys.path.insert(0, os.path.dirname(path))
+        # not __main__, so the script does not run its experiment
+        spec = importlib.util.spec_from_file_location("idmtools_plan_target", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(path)
+    if not hasattr(module, name):
+        raise click.BadParameter(f"{path} does not define {name}", param_hint="TARGET")
+    obj = getattr(module, name)
+    return obj() if callable(obj) and not isinstance(obj, type) else obj
+
+
+@cli.command(help="Estimate the size and creation cost of an experiment before running it.")
+@click.argument('target')
+@click.option('--samples', default=20, type=int, help="Number of simulations to build for the estimates")
+@click.option('--block', default=None, type=str, help="Configuration block of the platform the experiment will run on")
+@click.option('--batch-size', default=None, type=int, help="Batch size of the creation. Defaults to the configuration")
+@click.option('--max-workers', default=None, type=int, help="Workers of the creation. Defaults to the configuration")
+@click.option('--json/--no-json', 'as_json', default=False, help="Print the plan as JSON")
+def plan(target: str, samples: int, block: Optional[str], batch_size: Optional[int], max_workers: Optional[int],
+         as_json: bool):
+    """
+    Plan an experiment.
+
+    TARGET is script.py:name or package.module:name, where name is an Experiment, TemplatedSimulations, or a function
+    returning one of them.
+
+    Args:
+        target: Experiment to plan
+        samples: Number of simulations to build
+        block: Configuration block of the platform
+        batch_size: Batch size of the creation
+        max_workers: Workers of the creation
+        as_json: Print the plan as JSON
+    """
+    from idmtools.core.platform_factory import Platform
+    from idmtools.entities.experiment import Experiment
+    from idmtools.entities.templated_simulation import TemplatedSimulations
+    platform = Platform(block) if block else None
+    obj = load_target(target)
+    if isinstance(obj, TemplatedSimulations):
+        obj = Experiment.from_template(obj)
+    if not isinstance(obj, Experiment):
+        raise click.BadParameter(f"{target} is a {type(obj).__name__}, not an Experiment or TemplatedSimulations",
+                                 param_hint="TARGET")
+    result = obj.plan(platform=platform, samples=samples, batch_size=batch_size, max_workers=max_workers)
+    if as_json:
+        click.echo(json.dumps(result.to_dict(), indent=2))
+    else:
+        click.echo(str(result))
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+import allure
+import pytest
+from click.testing import CliRunner
+os.environ['IDMTOOLS_LOGGING_USE_COLORED_LOGS'] = 'F'
+os.environ['IDMTOOLS_HIDE_DEV_WARNING'] = '1'
+from idmtools_cli.cli.plan import plan
+
+SCRIPT = """
+from idmtools.builders import SimulationBuilder
+from idmtools.entities import CommandLine
+from idmtools.entities.command_task import CommandTask
+from idmtools.entities.templated_simulation import TemplatedSimulations
+
+
+def set_value(simulation, value):
+    return dict(value=value)
+
+
+def build():
+    builder = SimulationBuilder()
+    builder.add_sweep_definition(set_value, range(500))
+    ts = TemplatedSimulations(base_task=CommandTask(command=CommandLine("python", "model.py")))
+    ts.add_builder(builder)
+    return ts
+
+
+if __name__ == "__main__":
+    raise RuntimeError("the plan must not run the script")
+"""
+
+
+@pytest.mark.smoke
+@allure.story("CLI")
+@allure.suite("idmtools_cli")
+class TestPlanCli(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.script = os.path.join(self.directory.name, "sweep.py")
+        with open(self.script, "w") as f:
+            f.write(SCRIPT)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_plan_json(self):
+        result = CliRunner().invoke(plan, [f"{self.script}:build", "--samples", "5", "--batch-size", "100", "--json"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        # the user logger also writes to the output
+        output = json.loads(result.output[result.output.index("{"):])
+        self.assertEqual(output["simulation_count"], 500)
+        self.assertEqual(output["sampled"], 5)
+        self.assertEqual(output["batches"], 5)
+
+    def test_plan_report(self):
+        result = CliRunner().invoke(plan, [f"{self.script}:build", "--samples", "2"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("500 (2 sampled)", result.output)
+
+    def test_missing_target(self):
+        result = CliRunner().invoke(plan, [f"{self.script}:missing"])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("does not define missing", result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,18 +5,23 @@ AnalyzerManager is the "driver" of analysis. Analysis is mostly a map reduce ope
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import os
+import shutil
 import sys
+import tempfile
 import time
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
 from logging import getLogger, DEBUG
 from typing import NoReturn, List, Dict, Tuple, Optional, TYPE_CHECKING
 from tqdm import tqdm
 from idmtools import IdmConfigParser
-from idmtools.analysis.map_worker_entry import map_item
+from idmtools.analysis.incremental import DEFAULT_STATE_DIRECTORY, IncrementalAnalyzerState
+from idmtools.analysis.map_worker_entry import fetch_item_files, map_item, map_item_files
+from idmtools.analysis.spill import SpilledMapResults, SpillWriter, reduce_map_results
 from idmtools.core import NoPlatformException
 from idmtools.core.enums import ItemType
 from idmtools.core.interfaces.ientity import IEntity
-from idmtools.core.logging import VERBOSE, SUCCESS
+from idmtools.core.logging import VERBOSE, SUCCESS, get_logging_queue, get_logging_queue_level, setup_worker_logging
 from idmtools.entities.ianalyzer import IAnalyzer
 from idmtools.utils.language import on_off, verbose_timedelta
 
@@ -27,7 +32,7 @@ logger = getLogger(__name__)
 user_logger = getLogger('user')
 
 
-def pool_worker_initializer(func, analyzers, platform: 'IPlatform') -> NoReturn:
+def pool_worker_initializer(func, analyzers, platform: 'IPlatform', logging_queue=None, logging_level=None) -> NoReturn:
     """
     Initialize the pool worker, which allows the process pool to associate the analyzers, cache, and path mapping to the function executed to retrieve data.
 
@@ -37,14 +42,54 @@ def pool_worker_initializer(func, analyzers, platform: 'IPlatform') -> NoReturn:
         func: The function that the pool will call.
         analyzers: The list of all analyzers to run.
         platform: The platform to communicate with to retrieve files from.
+        logging_queue: Queue of the main process to send log records to, when the queue logging mode is on.
+        logging_level: Level of the records sent to the queue, the level of the log file of the main process.
 
     Returns:
         None
     """
+    setup_worker_logging(logging_queue, logging_level)
     func.analyzers = analyzers
     func.platform = platform
 
 
+@dataclass
+class AnalysisPipelineStats:
+    """
+    Utilization of the stages of a prefetching analysis.
+    """
+    #: Number of items mapped
+    items: int = 0
+    #: Threads of the fetch stage
+    fetch_workers: int = 0
+    #: Workers of the parse and map stage
+    map_workers: int = 0
+    #: Seconds from the first fetch to the last map
+    wall_seconds: float = 0
+    #: Seconds the fetch workers spent getting files
+    fetch_seconds: float = 0
+    #: Seconds the map workers spent parsing and mapping
+    map_seconds: float = 0
+    #: Most items fetched or being fetched and not mapped yet
+    max_buffered: int = 0
+
+    @property
+    def fetch_utilization(self) -> float:
+        """Fraction of the time the fetch workers were busy."""
+        return self.fetch_seconds / (self.wall_seconds * self.fetch_workers) if self.wall_seconds and self.fetch_workers else 0
+
+    @property
+    def map_utilization(self) -> float:
+        """Fraction of the time the map workers were busy."""
+        return self.map_seconds / (self.wall_seconds * self.map_workers) if self.wall_seconds and self.map_workers else 0
+
+    def __str__(self):
+        """Summarize the utilization of the stages."""
+        return (f'{self.items} item(s) in {self.wall_seconds:.3f}s: fetch {self.fetch_workers} thread(s) '
+                f'{self.fetch_utilization:.0%} busy, map {self.map_workers} worker(s) {self.map_utilization:.0%} busy, '
+                f'up to {self.max_buffered} item(s) buffered')
+
+
 class AnalyzeManager:
     """
     Analyzer Manager Class. This is the main driver of analysis.
@@ -74,7 +119,9 @@ class AnalyzeManager:
                  partial_analyze_ok: bool = False, max_items: Optional[int] = None, verbose: bool = True,
                  force_manager_working_directory: bool = False,
                  exclude_ids: List[str] = None, analyze_failed_items: bool = False,
-                 max_workers: Optional[int] = None, executor_type: str = 'process'):
+                 max_workers: Optional[int] = None, executor_type: str = 'process',
+                 prefetch_workers: Optional[int] = None, prefetch_buffer: Optional[int] = None,
+                 spill_dir: Optional[str] = None):
         """
         Initialize the AnalyzeManager.
 
@@ -92,6 +139,9 @@ class AnalyzeManager:
             analyze_failed_items (bool, optional): Allows analyzing of failed items. Useful when you are trying to aggregate items that have failed. Defaults to False.
             max_workers (int, optional): Set the max workers. If not provided, falls back to the configuration item *max_threads*. If max_workers is not set in configuration, defaults to CPU count
             executor_type: (str): Whether to use process or thread pooling. Process pooling is more efficient but threading might be required in some environments
+            prefetch_workers (int, optional): Fetch the files of the items with this many threads of the main process, ahead of the workers which parse and map them. Useful when getting the files is slow, like with network or shared file systems, as fetching and mapping no longer share the max_workers. Falls back to the configuration item *prefetch_workers*. Defaults to None, where each worker gets the files of its item
+            prefetch_buffer (int, optional): Maximum items fetched ahead of the map, which bounds the file contents held in memory. Defaults to twice the map workers plus the prefetch workers
+            spill_dir (str, optional): Write the map results to files in this directory as they arrive, instead of keeping them in memory. The reduce of each analyzer then receives a read-only mapping loading the result of an item when it is accessed. See :mod:`idmtools.analysis.spill`. The files are removed after the analysis. Defaults to None
         """
         super().__init__()
         if working_dir is None:
@@ -121,6 +171,23 @@ class AnalyzeManager:
         if logger.isEnabledFor(DEBUG):
             logger.debug(f'AnalyzeManager set to {self.max_processes}')
 
+        if prefetch_workers is None:
+            prefetch_workers = IdmConfigParser().get_option('COMMON', 'prefetch_workers', None)
+            prefetch_workers = int(prefetch_workers) if prefetch_workers else None
+        if prefetch_workers is not None and prefetch_workers < 1:
+            raise ValueError("prefetch_workers must be greater or equal to one")
+        if prefetch_buffer is not None and prefetch_buffer < 1:
+            raise ValueError("prefetch_buffer must be greater or equal to one")
+        self.prefetch_workers = prefetch_workers
+        self.prefetch_buffer = prefetch_buffer
+        # utilization of the stages of the last prefetching analysis
+        self.pipeline_stats: Optional[AnalysisPipelineStats] = None
+        self.spill_dir = spill_dir
+        # spill file writer of each analyzer, by analyzer id, when spilling
+        self._spill_writers: Optional[Dict[str, SpillWriter]] = None
+        # spilled map results handed to the reduces, closed before removing the spill files
+        self._spilled_results: List[SpilledMapResults] = []
+
         # Should we continue analyzing even when we encounter an error?
         self.continue_on_error = False
 
@@ -164,6 +231,8 @@ class AnalyzeManager:
         logger.debug(f"Potential items to analyze: {len(self.potential_items)}")
 
         self._items = dict()  # filled in later by _get_items_to_analyze
+        # state of each analyzer, by analyzer id, in incremental analyses
+        self._incremental_states: Optional[Dict[str, IncrementalAnalyzerState]] = None
 
         self.analyzers = analyzers or list()
         self.verbose = verbose
@@ -302,6 +371,8 @@ class AnalyzeManager:
             if hasattr(analyzer, 'need_dir_map'):
                 user_logger.log(VERBOSE, f' | (Directory map: {on_off(analyzer.need_dir_map)}')
         user_logger.log(VERBOSE, f' | Pool of {n_processes} analyzing {self.executor_type}(es)')
+        if self.prefetch_workers:
+            user_logger.log(VERBOSE, f' | Prefetching files with {self.prefetch_workers} thread(s)')
 
     def _run_and_wait_for_mapping(self, executor) -> Tuple[Dict, bool]:
         """
@@ -337,11 +408,227 @@ class AnalyzeManager:
                     if not self.continue_on_error:
                         raise ex
                 else:
-                    results[futures[future]] = future.result()
+                    self._store_map_result(results, futures[future], future.result())
 
         logger.debug(f"Result fetching status: : {status}")
         return results, status
 
+    def _handle_mapping_exception(self, ex: Exception) -> NoReturn:
+        """
+        Report the failure of an item, raising it unless continue_on_error is on.
+
+        Args:
+            ex: Exception of the item
+
+        Returns:
+            None
+        """
+        user_logger.error(ex)
+        if not self.continue_on_error:
+            raise ex
+
+    def _run_and_wait_for_prefetch_mapping(self, executor, n_processes: int) -> Tuple[Dict, bool]:
+        """
+        Run the mapping of each item as a pipeline: threads fetch the files of the items, then the workers parse and map them.
+
+        Only prefetch_buffer items are fetched ahead of the map, so the file contents held in memory stay bounded.
+
+        Args:
+            executor: A pool of workers for the parse and map stage.
+            n_processes: Number of workers of the pool.
+
+        Returns:
+            Results by item and False if an exception occurred processing any item; otherwise True (succeeded).
+        """
+        n_items = len(self._items)
+        n_fetchers = min(self.prefetch_workers, max(n_items, 1))
+        buffer_size = self.prefetch_buffer or 2 * n_processes + n_fetchers
+        logger.debug(f"Mapping {n_items} items with {n_fetchers} fetch threads and a buffer of {buffer_size} items")
+        stats = AnalysisPipelineStats(fetch_workers=n_fetchers, map_workers=n_processes)
+        results = dict()
+        status = True
+        pending_items = iter(self._items.values())
+        fetches = dict()
+        maps = dict()
+        start = time.perf_counter()
+        if isinstance(executor, ProcessPoolExecutor):
+            # start the workers before the fetch threads: a process forked while a thread holds a lock, like the
+            # one of logging, would deadlock
+            executor.submit(os.getpid).result()
+        with ThreadPoolExecutor(max_workers=n_fetchers, thread_name_prefix="analysis-fetch") as fetcher, \
+                tqdm(total=n_items) as progress:
+            def fill_buffer():
+                while len(fetches) + len(maps) < buffer_size:
+                    item = next(pending_items, None)
+                    if item is None:
+                        break
+                    fetches[fetcher.submit(fetch_item_files, item, self.analyzers, self.platform)] = item
+                stats.max_buffered = max(stats.max_buffered, len(fetches) + len(maps))
+
+            fill_buffer()
+            while fetches or maps:
+                done, _ = wait(list(fetches.keys()) + list(maps.keys()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in fetches:
+                        item = fetches.pop(future)
+                        if future.exception():
+                            status = False
+                            progress.update()
+                            self._handle_mapping_exception(future.exception())
+                            continue
+                        analyzer_uids, file_data, seconds = future.result()
+                        stats.fetch_seconds += seconds
+                        maps[executor.submit(map_item_files, item, analyzer_uids, file_data)] = item
+                    else:
+                        item = maps.pop(future)
+                        progress.update()
+                        if future.exception():
+                            status = False
+                            self._handle_mapping_exception(future.exception())
+                            continue
+                        data, seconds = future.result()
+                        self._store_map_result(results, item, data)
+                        stats.map_seconds += seconds
+                        stats.items += 1
+                fill_buffer()
+        stats.wall_seconds = time.perf_counter() - start
+        self.pipeline_stats = stats
+        if self.verbose:
+            user_logger.log(VERBOSE, f' | Prefetch pipeline: {stats}')
+        logger.debug(f"Result fetching status: : {status}")
+        return results, status
+
+    def _store_map_result(self, results: Dict, item: IEntity, data: Dict) -> NoReturn:
+        """
+        Store the map results of an item, in the spill files of the analyzers when spilling.
+
+        Args:
+            results: Map results of each item
+            item: Item
+            data: Map results of the item, by analyzer id
+
+        Returns:
+            None
+        """
+        if self._spill_writers is None:
+            results[item] = data
+            return
+        for uid, analyzer_data in data.items():
+            self._spill_writers[uid].write(item, analyzer_data)
+        # only keep which analyzers have results
+        results[item] = dict.fromkeys(data)
+
+    def _start_spilling(self) -> NoReturn:
+        """
+        Create the spill files of the analyzers when spilling.
+
+        Returns:
+            None
+        """
+        self._spill_writers = None
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            directory = tempfile.mkdtemp(prefix="map_results_", dir=self.spill_dir)
+            self._spill_writers = {analyzer.uid: SpillWriter(os.path.join(directory, f"{index}.pkl"))
+                                   for index, analyzer in enumerate(self.analyzers)}
+
+    def _stop_spilling(self) -> NoReturn:
+        """
+        Remove the spill files, once all the mappings of the files are closed.
+
+        Returns:
+            None
+        """
+        for spilled in self._spilled_results:
+            spilled.close()
+        self._spilled_results = []
+        if self._spill_writers:
+            for writer in self._spill_writers.values():
+                writer.close()
+            directory = os.path.dirname(next(iter(self._spill_writers.values())).path)
+            try:
+                shutil.rmtree(directory)
+            except OSError as ex:
+                user_logger.warning(f"Could not remove the spill files in {directory}: {ex}")
+        self._spill_writers = None
+
+    def _gather_analyzer_data(self, analyzer: IAnalyzer, results: Dict) -> Dict:
+        """
+        Gather the map results of one analyzer.
+
+        Args:
+            analyzer: Analyzer
+            results: Map results of each item, by analyzer id
+
+        Returns:
+            Dictionary of item to the analyzer's map result for the item. A
+            :class:`~idmtools.analysis.spill.SpilledMapResults` when spilling
+        """
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"Gather data for {analyzer.uid}")
+        if self._spill_writers is not None:
+            item_data_for_analyzer = self._spill_writers[analyzer.uid].results().subset(results.keys())
+            self._spilled_results.append(item_data_for_analyzer)
+        else:
+            item_data_for_analyzer = {}
+            for item, data in results.items():
+                if analyzer.uid in data:
+                    item_data_for_analyzer[item] = data[analyzer.uid]
+        if item_data_for_analyzer.__len__() == 0:
+            user_logger.warning(f"Note: {analyzer.uid} has no simulation data to analyze. Please verify the filter or map function of the analyzer.")
+        return item_data_for_analyzer
+
+    def _load_incremental_states(self, state_dir: str) -> NoReturn:
+        """
+        Load the state of each analyzer for an incremental analysis.
+
+        Args:
+            state_dir: Directory of the states
+
+        Returns:
+            None
+        """
+        self._incremental_states = {analyzer.uid: IncrementalAnalyzerState.load(state_dir, analyzer)
+                                    for analyzer in self.analyzers}
+
+    def _get_new_items(self, items: Dict[str, IEntity]) -> Dict[str, IEntity]:
+        """
+        Get the items an incremental analysis still has to map.
+
+        Args:
+            items: Items ready for analysis
+
+        Returns:
+            Items that at least one analyzer has not mapped yet
+        """
+        states = list(self._incremental_states.values())
+        return {uid: item for uid, item in items.items() if any(str(uid) not in state.processed for state in states)}
+
+    def _get_reduce_data(self, analyzer: IAnalyzer, results: Dict) -> Dict:
+        """
+        Get the data to reduce for one analyzer.
+
+        In an incremental analysis, the partial result of the new items is saved in the state of the analyzer and the
+        data is the combination of the partial results of all the analyses.
+
+        Args:
+            analyzer: Analyzer
+            results: Map results of each item, by analyzer id
+
+        Returns:
+            Data for the reduce of the analyzer
+        """
+        if self._incremental_states is None:
+            return self._gather_analyzer_data(analyzer, results)
+        state = self._incremental_states[analyzer.uid]
+        new_results = {item: data for item, data in results.items() if str(item.uid) not in state.processed}
+        if new_results:
+            # the spill files are removed after the analysis
+            partial = reduce_map_results(analyzer.partial_reduce, self._gather_analyzer_data(analyzer, new_results))
+            state.append([str(item.uid) for item in new_results.keys()], partial)
+        items = {str(item.uid): item for item in self.potential_items}
+        return analyzer.combine(state.get_partials(items))
+
     def _run_and_wait_for_reducing(self, executor, results) -> dict:
         """
         Run and manage the reduce call on the combined item results (by analyzer).
@@ -362,17 +649,12 @@ class AnalyzeManager:
         with tqdm(total=len(self.analyzers), desc="Running Analyzer Reduces") as progress:
             # for each analyzer, queue our futures
             for analyzer in self.analyzers:
-                logger.debug(f"Gather data for {analyzer.uid}")
-                item_data_for_analyzer = {}
-                for item, data in results.items():
-                    if analyzer.uid in data:
-                        item_data_for_analyzer[item] = data[analyzer.uid]
-                if item_data_for_analyzer.__len__() == 0:
-                    user_logger.warning(f"Note: {analyzer.uid} has no simulation data to analyze. Please verify the filter or map function of the analyzer.")
-                future = executor.submit(analyzer.reduce, item_data_for_analyzer)
+                item_data_for_analyzer = self._get_reduce_data(analyzer, results)
+                future = executor.submit(reduce_map_results, analyzer.reduce, item_data_for_analyzer)
                 future.add_done_callback(lambda p: progress.update())
 
-                logger.debug(f"Queueing {analyzer.uid}")
+                if logger.isEnabledFor(DEBUG):
+                    logger.debug(f"Queueing {analyzer.uid}")
                 futures[future] = analyzer.uid
 
             # wait on our futures, catch exceptions, and aggregate results
@@ -392,12 +674,16 @@ class AnalyzeManager:
                 future.cancel()
         return finalize_results
 
-    def analyze(self) -> bool:
+    def analyze(self, incremental: bool = False, state_dir: Optional[str] = None) -> bool:
         """
         Process the provided items with the provided analyzers. This is the main driver method of :class:`AnalyzeManager`.
 
         Args:
-            kwargs: extra parameters
+            incremental: Only map the items that were not mapped by a previous incremental analysis with the same
+                state_dir, then reduce the map results of all the analyses. Useful with partial_analyze_ok to analyze
+                the simulations of a running experiment as they finish. See :mod:`idmtools.analysis.incremental`
+            state_dir: Directory of the state of the incremental analysis. Defaults to .idmtools_analysis in the
+                working directory
 
         Returns:
             True on success; False on failure/exception.
@@ -421,6 +707,15 @@ class AnalyzeManager:
             user_logger.error('No items are ready; cannot run analysis.')
             return False
 
+        if incremental:
+            self._load_incremental_states(state_dir or os.path.join(self.working_dir, DEFAULT_STATE_DIRECTORY))
+            n_ready = len(self._items)
+            self._items = self._get_new_items(self._items)
+            if self.verbose:
+                user_logger.info(f'Incremental analysis: {len(self._items)} new item(s) out of {n_ready} ready item(s)')
+        else:
+            self._incremental_states = None
+
         # initialize mapping results cache/storage
         n_items = len(self._items)
         n_processes = min(self.max_processes, max(n_items, 1))
@@ -455,14 +750,24 @@ class AnalyzeManager:
             opts = dict(max_workers=n_processes, initializer=pool_worker_initializer, initargs=(map_item, self.analyzers, self.platform))
             # determine type. Most cases we want a process, but sometimes(like in Jupyter notebooks, we want to use threads)
             if self.executor_type == 'process':
+                logging_queue = get_logging_queue()
+                if logging_queue is not None:
+                    # workers log through the queue of this process instead of opening the log file
+                    os.environ['NO_LOGGING_INIT'] = 'y'
+                    opts['initargs'] += (logging_queue, get_logging_queue_level())
                 executor = ProcessPoolExecutor(**opts)
             else:
                 executor = ThreadPoolExecutor(**opts)
 
-            map_results, status = self._run_and_wait_for_mapping(executor)
+            self._start_spilling()
+            if self.prefetch_workers:
+                map_results, status = self._run_and_wait_for_prefetch_mapping(executor, n_processes)
+            else:
+                map_results, status = self._run_and_wait_for_mapping(executor)
             finalize_results = self._run_and_wait_for_reducing(executor, map_results)
 
         finally:
+            self._stop_spilling()
             # because of debug mode, we have to leave executor and let python handle the shutdown through del
             # see https://youtrack.jetbrains.com/issue/PY-34432
             os.environ['NO_LOGGING_INIT'] = 'n'
@@ -486,5 +791,5 @@ class AnalyzeManager:
             total_time = time.time() - start_time
             time_str = verbose_timedelta(total_time)
             user_logger.log(SUCCESS, '\r | Analysis complete. Took {} '
-                                     '(~ {:.3f} per item)'.format(time_str, total_time / n_items))
+                                     '(~ {:.3f} per item)'.format(time_str, total_time / max(n_items, 1)))
         return True
@@ -0,0 +1,281 @@
+"""idmtools append-only analyzer output writer.
+
+Reference implementation of an incremental reduce. Instead of returning a DataFrame from map and concatenating every
+simulation's frame in reduce, map writes its frame (with an id column) to a part file as soon as it is computed and
+returns only the part path. Reduce then appends the part files to the final output one at a time, so memory use stays
+bounded by the largest single part regardless of the number of simulations.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import os
+import shutil
+from dataclasses import dataclass, field
+from logging import getLogger, DEBUG
+from typing import Any, Dict, List, Iterable, Optional, Tuple
+import pandas as pd
+from pandas.api.types import infer_dtype, union_categoricals
+
+logger = getLogger(__name__)
+
+SUPPORTED_FORMATS = ('csv', 'parquet')
+# Buffer size used when copying csv part files into the final output
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def check_parquet_support():
+    """
+    Ensure a parquet engine is installed.
+
+    Returns:
+        None
+
+    Raises:
+        ImportError - When neither pyarrow nor fastparquet is installed
+    """
+    for engine in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(engine)
+            return
+        except ImportError:
+            pass
+    raise ImportError("Writing parquet output requires pyarrow or fastparquet. Please run 'pip install pyarrow'")
+
+
+@dataclass
+class AppendOnlyWriter:
+    """
+    Write per item DataFrames to part files and append them to a single output in reduce.
+
+    For csv, the parts are merged into one csv file. Parts with the same header are copied byte for byte, parts with
+    different columns are re-aligned to the union of all columns. For parquet, the parts directory is the output: a
+    dataset partitioned by item with an id column, readable with `pd.read_parquet(<directory>)`. Parts with different
+    columns or dtypes are rewritten with the union of the columns and a common dtype per column, so the parts of the
+    dataset share one schema.
+    """
+    #: Directory holding the part files
+    parts_dir: str
+    #: Output format, csv or parquet
+    output_format: str = field(default='csv')
+    #: Name of the column identifying the item (simulation) a row belongs to. None to write the frames as they are
+    id_column: Optional[str] = field(default='SimId')
+
+    def __post_init__(self):
+        self.output_format = self.output_format.lower()
+        if self.output_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"{self.output_format} is not a supported output format. Choose one of {', '.join(SUPPORTED_FORMATS)}")
+        if self.output_format == 'parquet':
+            check_parquet_support()
+
+    @property
+    def extension(self) -> str:
+        """
+        Extension of the part files and the final output.
+
+        Returns:
+            Extension including the leading dot
+        """
+        return f'.{self.output_format}'
+
+    def reset(self) -> None:
+        """
+        Remove parts left from a previous run and create the parts directory.
+
+        Returns:
+            None
+        """
+        if os.path.exists(self.parts_dir):
+            shutil.rmtree(self.parts_dir)
+        os.makedirs(self.parts_dir, exist_ok=True)
+
+    def write(self, item_id: str, df: pd.DataFrame, index: bool = False) -> str:
+        """
+        Write the DataFrame of one item to its own part file.
+
+        Args:
+            item_id: Id of the item. Added as first column named *id_column* and used as the part file name
+            df: DataFrame to write
+            index: Write the DataFrame index as well
+
+        Returns:
+            Path of the part file
+        """
+        if index:
+            df = df.reset_index()
+        else:
+            df = df.reset_index(drop=True)
+        if self.id_column is not None:
+            if self.id_column in df.columns:
+                df = df.drop(columns=[self.id_column])
+            df.insert(0, self.id_column, str(item_id))
+        os.makedirs(self.parts_dir, exist_ok=True)
+        part_path = os.path.join(self.parts_dir, f'{item_id}{self.extension}')
+        if self.output_format == 'csv':
+            df.to_csv(part_path, index=False)
+        else:
+            df.to_parquet(part_path, index=False)
+        return part_path
+
+    def finalize(self, parts: Iterable[str], destination: str, header: bool = True) -> str:
+        """
+        Combine the part files into the final output.
+
+        Args:
+            parts: Part file paths in the order they should appear in the output
+            destination: Output path. For parquet output, this is a directory
+            header: Write the header line of the csv output
+
+        Returns:
+            The output path
+        """
+        parts = [p for p in parts if p]
+        os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+        if self.output_format == 'csv':
+            self._merge_csv(parts, destination, header=header)
+        else:
+            self._move_parquet(parts, destination)
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"Wrote {len(parts)} parts to {destination}")
+        return destination
+
+    @staticmethod
+    def _read_header(part: str) -> str:
+        """
+        Read the header line of a csv part.
+
+        Args:
+            part: Part file path
+
+        Returns:
+            Header line including the line ending
+        """
+        with open(part, 'r', newline='') as f:
+            return f.readline()
+
+    def _merge_csv(self, parts: List[str], destination: str, header: bool = True) -> None:
+        """
+        Append csv parts to a single csv file.
+
+        Args:
+            parts: Part file paths
+            destination: Output csv file
+            header: Write the header line
+
+        Returns:
+            None
+        """
+        headers = [self._read_header(p) for p in parts]
+        # Union of columns in order of first appearance, same as pd.concat
+        columns: List[str] = []
+        seen = set()
+        for part, part_header in zip(parts, headers):
+            if part_header in seen:
+                continue
+            seen.add(part_header)
+            for column in pd.read_csv(part, nrows=0).columns:
+                if column not in columns:
+                    columns.append(column)
+
+        header_line = pd.DataFrame(columns=columns).to_csv(index=False) if parts else ''
+        with open(destination, 'w', newline='') as out:
+            if header:
+                out.write(header_line)
+            for part, part_header in zip(parts, headers):
+                if part_header == header_line:
+                    # Same columns, copy the rows without parsing them
+                    with open(part, 'r', newline='') as f:
+                        f.readline()
+                        shutil.copyfileobj(f, out, COPY_BUFFER_SIZE)
+                else:
+                    pd.read_csv(part).reindex(columns=columns).to_csv(out, index=False, header=False)
+
+    @staticmethod
+    def _column_types(df: pd.DataFrame) -> Dict[str, Tuple[Any, str]]:
+        """
+        Describe the columns of a part.
+
+        Args:
+            df: Content of the part
+
+        Returns:
+            dtype and inferred type of the values of each column. The inferred type is 'empty' for columns without values
+        """
+        types = {}
+        for column in df.columns:
+            values = df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.cat.categories
+            types[column] = (df[column].dtype, infer_dtype(values, skipna=True))
+        return types
+
+    @staticmethod
+    def _common_dtypes(parts_types: List[Dict[str, Tuple[Any, str]]]) -> Dict[str, Any]:
+        """
+        Get the union of the columns of parts and a dtype all the parts can be cast to.
+
+        Parquet stores the type of a column in each file, so the dtype must also hold the missing values of the parts
+        where the column is missing or empty.
+
+        Args:
+            parts_types: Types of the columns of each part, see :meth:`_column_types`
+
+        Returns:
+            dtype of each column, in order of first appearance
+        """
+        columns: List[str] = []
+        for types in parts_types:
+            columns.extend(c for c in types if c not in columns)
+        dtypes = {}
+        for column in columns:
+            typed = [types[column] for types in parts_types if column in types and types[column][1] != 'empty']
+            kinds = {kind for _, kind in typed}
+            if not typed:
+                dtypes[column] = next(types[column][0] for types in parts_types if column in types)
+            elif len(typed) == len(parts_types) and all(dtype == typed[0][0] for dtype, _ in typed):
+                dtypes[column] = typed[0][0]
+            elif all(isinstance(dtype, pd.CategoricalDtype) for dtype, _ in typed) and len(kinds) == 1:
+                dtypes[column] = union_categoricals([pd.Categorical([], dtype=dtype) for dtype, _ in typed],
+                                                    ignore_order=True).dtype
+            elif kinds == {'boolean'}:
+                dtypes[column] = 'boolean'
+            elif kinds == {'integer'}:
+                dtypes[column] = 'Int64'
+            elif kinds <= {'integer', 'floating', 'mixed-integer-float'}:
+                dtypes[column] = 'float64'
+            elif kinds == {'string'}:
+                dtypes[column] = 'string'
+            else:
+                dtypes[column] = pd.concat([pd.Series([], dtype=dtype) for dtype, _ in typed]).dtype
+        return dtypes
+
+    def _move_parquet(self, parts: List[str], destination: str) -> None:
+        """
+        Move parquet parts into the output dataset directory, rewriting the parts not matching the common schema.
+
+        Args:
+            parts: Part file paths
+            destination: Output directory
+
+        Returns:
+            None
+        """
+        if os.path.exists(destination):
+            shutil.rmtree(destination)
+        os.makedirs(destination)
+        parts_types = [self._column_types(pd.read_parquet(part)) for part in parts]
+        dtypes = self._common_dtypes(parts_types)
+        for part, types in zip(parts, parts_types):
+            target = os.path.join(destination, os.path.basename(part))
+            if list(types) == list(dtypes) and all(types[c][0] == dtypes[c] for c in dtypes):
+                shutil.move(part, target)
+            else:
+                df = pd.read_parquet(part).reindex(columns=list(dtypes))
+                df.astype(dtypes).to_parquet(target, index=False)
+
+    def cleanup(self) -> None:
+        """
+        Remove the parts directory.
+
+        Returns:
+            None
+        """
+        shutil.rmtree(self.parts_dir, ignore_errors=True)
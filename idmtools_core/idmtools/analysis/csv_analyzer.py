@@ -5,8 +5,10 @@ Example of a csv analyzer to concatenate csv results into one csv from your expe
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import os
-from typing import Dict
+from typing import Dict, Union
+from uuid import uuid4
 import pandas as pd
+from idmtools.analysis.append_writer import AppendOnlyWriter
 from idmtools.entities import IAnalyzer
 from idmtools.entities.ianalyzer import ANALYSIS_ITEM_MAP_DATA_TYPE, ANALYZABLE_ITEM
 
@@ -29,17 +31,28 @@ class CSVAnalyzer(IAnalyzer):
             This example covers analyzing multiple CSVs
 
             .. literalinclude:: ../../examples/analyzers/example_analysis_MultiCSVAnalyzer.py
+
+    Notes:
+        With streaming=True, each simulation's data is written to a part file during map and reduce only appends the
+        parts to the output, so the combined DataFrame is never held in memory. See
+        :class:`~idmtools.analysis.append_writer.AppendOnlyWriter`.
+
+        Both modes write a *SimId* column followed by the union of the csv columns, without the row index of the
+        simulations' csv files. Numbers are formatted per simulation when streaming: an integer column missing from
+        some simulations is written as 1 where the default mode writes 1.0, which reads back to the same values.
     """
     # Arg option for analyzer init are uid, working_dir, parse (True to leverage the :class:`OutputParser`;
     # False to get the raw data in the :meth:`select_simulation_data`), and filenames
     # In this case, we want parse=True, and the filename(s) to analyze
-    def __init__(self, filenames, output_path="output_csv"):
+    def __init__(self, filenames, output_path="output_csv", streaming: bool = False, output_format: str = 'csv'):
         """
         Initialize our analyzer.
 
         Args:
             filenames: Filenames we want to pull
             output_path: Output path to write the csv
+            streaming: Write each simulation's data as it is mapped instead of combining everything in reduce
+            output_format: Output format when streaming, csv or parquet (requires pyarrow)
         """
         super().__init__(parse=True, filenames=filenames)
         # Raise exception early if files are not csv files
@@ -47,6 +60,8 @@ class CSVAnalyzer(IAnalyzer):
             raise Exception('Please ensure all filenames provided to CSVAnalyzer have a csv extension.')
 
         self.output_path = output_path
+        self.streaming = streaming
+        self.writer = AppendOnlyWriter(parts_dir='', output_format=output_format) if streaming else None
 
     def initialize(self):
         """
@@ -60,9 +75,12 @@ class CSVAnalyzer(IAnalyzer):
         # Create the output path
         if not os.path.exists(self.output_path):
             os.makedirs(self.output_path)
+        if self.streaming:
+            self.writer.parts_dir = os.path.join(self.output_path, f'.{self.__class__.__name__}_{uuid4().hex[:8]}_parts')
+            self.writer.reset()
 
     # Map is called to get for each simulation a data object (all the metadata of the simulations) and simulation object
-    def map(self, data: ANALYSIS_ITEM_MAP_DATA_TYPE, simulation: ANALYZABLE_ITEM) -> pd.DataFrame:
+    def map(self, data: ANALYSIS_ITEM_MAP_DATA_TYPE, simulation: ANALYZABLE_ITEM) -> Union[pd.DataFrame, str]:
         """
         Map each simulation/workitem data here.
 
@@ -73,23 +91,28 @@ class CSVAnalyzer(IAnalyzer):
             simulation: Simulation/Workitem we are mapping
 
         Returns:
-            Items joined together into a dataframe.
+            Items joined together into a dataframe. When streaming, the path of the part file written instead.
         """
         # If there are 1 to many csv files, concatenate csv data columns into one dataframe
         concatenated_df = pd.concat(list(data.values()), axis=0, ignore_index=True, sort=True)
+        if self.streaming:
+            return self.writer.write(str(simulation.uid), concatenated_df)
         return concatenated_df
 
     # In reduce, we are printing the simulation and result data filtered in map
-    def reduce(self, all_data: Dict[ANALYZABLE_ITEM, pd.DataFrame]):
+    def reduce(self, all_data: Dict[ANALYZABLE_ITEM, Union[pd.DataFrame, str]]):
         """
         Reduce(combine) all the data from our mapping.
 
         Args:
-            all_data: Mapping of our data in form Item(Simulation/Workitem) -> Mapped dataframe
+            all_data: Mapping of our data in form Item(Simulation/Workitem) -> Mapped dataframe (or part file path when streaming)
 
         Returns:
             None
         """
+        if self.streaming:
+            self._reduce_streaming(all_data)
+            return
         results = pd.concat(list(all_data.values()), axis=0,  # Combine a list of all the sims csv data column values
                             keys=[str(k.uid) for k in all_data.keys()],  # Add a hierarchical index with the keys option
                             names=['SimId'])  # Label the index keys you create with the names option
@@ -101,3 +124,19 @@ class CSVAnalyzer(IAnalyzer):
         output_folder = os.path.join(self.output_path, exp_id)
         os.makedirs(output_folder, exist_ok=True)
         results.to_csv(os.path.join(output_folder, self.__class__.__name__ + '.csv'))
+
+    def _reduce_streaming(self, all_data: Dict[ANALYZABLE_ITEM, str]):
+        """
+        Append the part files written during map to the output.
+
+        Args:
+            all_data: Mapping of Item(Simulation/Workitem) -> part file path
+
+        Returns:
+            None
+        """
+        first_sim = list(all_data.keys())[0]
+        output_folder = os.path.join(self.output_path, first_sim.experiment.id)
+        destination = os.path.join(output_folder, self.__class__.__name__ + self.writer.extension)
+        self.writer.finalize(all_data.values(), destination)
+        self.writer.cleanup()
@@ -5,7 +5,7 @@ Download Analyzer.
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import os
-from logging import getLogger
+from logging import getLogger, DEBUG
 from idmtools.entities.ianalyzer import IAnalyzer, ANALYSIS_REDUCE_DATA_TYPE, ANALYZABLE_ITEM, ANALYSIS_ITEM_MAP_DATA_TYPE
 
 logger = getLogger(__name__)
@@ -91,6 +91,7 @@ class DownloadAnalyzer(IAnalyzer):
         for filename in self.filenames:
             file_path = os.path.join(sim_folder, os.path.basename(filename))
 
-            logger.debug(f'Writing to path: {file_path}')
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f'Writing to path: {file_path}')
             with open(file_path, 'wb') as outfile:
                 outfile.write(data[filename])
@@ -0,0 +1,175 @@
+"""
+Incremental analysis support for AnalyzeManager.
+
+An incremental analysis keeps the state of each analyzer in a directory between runs: the ids of the items already
+mapped and the :meth:`IAnalyzer.partial_reduce <idmtools.entities.ianalyzer.IAnalyzer.partial_reduce>` result of each
+run. A new run only maps the items that became ready for analysis since the last run, then reduces the
+:meth:`IAnalyzer.combine <idmtools.entities.ianalyzer.IAnalyzer.combine>` of all the partial results. By default the
+partial results are the map results, so the reduce receives the same data as in a complete analysis; analyzers
+overriding partial_reduce and combine keep a running accumulator instead.
+
+Partial results keyed by items are saved keyed by item uid, so the state does not pickle the items with their parents
+and platform. The keys are turned back into the items of the current analysis before the combine.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import json
+import os
+import pickle
+import shutil
+from dataclasses import dataclass, field
+from logging import getLogger, DEBUG
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from idmtools.core.interfaces.iitem import IItem
+from idmtools.entities.ianalyzer import IAnalyzer
+
+logger = getLogger(__name__)
+user_logger = getLogger('user')
+
+#: Default directory of the states, in the working directory of the manager
+DEFAULT_STATE_DIRECTORY = ".idmtools_analysis"
+#: File of the partial results of each run
+PARTIALS_FILE = "partials.pkl"
+#: File describing the analyzer the state belongs to
+STATE_FILE = "state.json"
+
+
+def get_analyzer_fingerprint(analyzer: IAnalyzer) -> Dict[str, Any]:
+    """
+    Describe what the map results of an analyzer depend on.
+
+    Args:
+        analyzer: Analyzer
+
+    Returns:
+        Class, files and parsing of the analyzer
+    """
+    return dict(analyzer=f"{analyzer.__class__.__module__}.{analyzer.__class__.__qualname__}",
+                filenames=sorted(analyzer.filenames), parse=bool(analyzer.parse))
+
+
+@dataclass(repr=False)
+class IncrementalAnalyzerState:
+    """
+    State of an analyzer between incremental analyses.
+    """
+    #: Directory of the state
+    directory: str = field(default=None)
+    #: Ids of the items already mapped
+    processed: Set[str] = field(default_factory=set)
+    #: Partial result of each run. Results keyed by items are keyed by item uid, see :meth:`get_partials`
+    partials: List[Any] = field(default_factory=list)
+    #: Whether each partial result was keyed by items
+    keyed_by_item: List[bool] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, state_dir: str, analyzer: IAnalyzer) -> 'IncrementalAnalyzerState':
+        """
+        Load the state of an analyzer, starting over when the analyzer changed.
+
+        Args:
+            state_dir: Directory of the states of all analyzers
+            analyzer: Analyzer
+
+        Returns:
+            The state
+        """
+        state = cls(directory=os.path.join(state_dir, analyzer.uid))
+        fingerprint = get_analyzer_fingerprint(analyzer)
+        state_file = os.path.join(state.directory, STATE_FILE)
+        if os.path.exists(state_file):
+            with open(state_file, 'r') as f:
+                previous = json.load(f)
+            if previous != fingerprint:
+                user_logger.warning(f"Analyzer {analyzer.uid} changed since the last analysis: analyzing all items again")
+                state.reset()
+        os.makedirs(state.directory, exist_ok=True)
+        with open(state_file, 'w') as f:
+            json.dump(fingerprint, f)
+        state._read_partials()
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"Loaded {len(state.partials)} partial results of {len(state.processed)} items for "
+                         f"{analyzer.uid}")
+        return state
+
+    def _read_partials(self):
+        path = os.path.join(self.directory, PARTIALS_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r+b') as f:
+            end = 0
+            while True:
+                try:
+                    uids, partial, keyed_by_item = pickle.load(f)
+                except EOFError:
+                    # a run which stopped while saving leaves an incomplete record: its items are analyzed again
+                    if f.tell() != end:
+                        logger.warning(f"Dropping the incomplete partial result at the end of {path}")
+                    break
+                except pickle.UnpicklingError as ex:
+                    logger.warning(f"Dropping the incomplete partial result at the end of {path}: {ex}")
+                    break
+                end = f.tell()
+                self.processed.update(uids)
+                self.partials.append(partial)
+                self.keyed_by_item.append(keyed_by_item)
+            f.truncate(end)
+
+    @staticmethod
+    def _key_by_uid(partial: Any) -> Tuple[Any, bool]:
+        """
+        Replace the item keys of a partial result by the item uids.
+
+        Args:
+            partial: Partial result
+
+        Returns:
+            The partial result to save and whether it was keyed by items
+        """
+        if isinstance(partial, dict) and partial and all(isinstance(key, IItem) for key in partial):
+            return {str(item.uid): value for item, value in partial.items()}, True
+        return partial, False
+
+    def append(self, uids: Iterable[str], partial: Any) -> None:
+        """
+        Save the partial result of a run.
+
+        Args:
+            uids: Ids of the items mapped by the run
+            partial: Partial result of the items
+
+        Returns:
+            None
+        """
+        uids = list(uids)
+        partial, keyed_by_item = self._key_by_uid(partial)
+        with open(os.path.join(self.directory, PARTIALS_FILE), 'ab') as f:
+            pickle.dump((uids, partial, keyed_by_item), f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.processed.update(uids)
+        self.partials.append(partial)
+        self.keyed_by_item.append(keyed_by_item)
+
+    def get_partials(self, items: Dict[str, IItem]) -> List[Any]:
+        """
+        Get the partial results to combine, keyed by the items of the current analysis.
+
+        Args:
+            items: Items of the analysis, by uid. Uids missing from it are kept as keys
+
+        Returns:
+            Partial result of each run
+        """
+        return [{items.get(uid, uid): value for uid, value in partial.items()} if keyed_by_item else partial
+                for partial, keyed_by_item in zip(self.partials, self.keyed_by_item)]
+
+    def reset(self) -> None:
+        """
+        Forget the items already mapped.
+
+        Returns:
+            None
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.processed = set()
+        self.partials = []
+        self.keyed_by_item = []
@@ -6,10 +6,11 @@ Most of these function are used either to initialize a thread or to handle excep
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import itertools
+import time
 from logging import getLogger, DEBUG
 from idmtools.core.interfaces.ientity import IEntity
 from idmtools.utils.file_parser import FileParser
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Dict, List, Tuple
 from idmtools.core.interfaces.iitem import IItem
 from idmtools.entities.ianalyzer import TAnalyzerList
 from idmtools.utils.general import FilterSafeItem
@@ -39,6 +40,113 @@ def map_item(item: IItem) -> Dict[str, Dict]:
     return _get_mapped_data_for_item(item, analyzers, platform)
 
 
+def fetch_item_files(item: IEntity, analyzers: TAnalyzerList, platform: 'IPlatform') -> Tuple[List[str], Dict[str, bytes], float]:
+    """
+    Fetch the files of an item; the I/O stage of a prefetching analysis, run by threads of the main process.
+
+    Args:
+        item: The item to fetch the files of.
+        analyzers: The analyzers to run on the item.
+        platform: A platform object to get the files from.
+
+    Returns:
+        Ids of the analyzers to use on the item, contents of the files by filename, and seconds spent
+    """
+    start = time.perf_counter()
+    try:
+        analyzers_to_use, filenames = _get_analyzers_and_filenames(item, analyzers, platform)
+        file_data = platform.get_files(item, filenames) if len(filenames) > 0 else dict()
+    except Exception as e:
+        e.item = item
+        logger.error(e)
+        raise e
+    return [a.uid for a in analyzers_to_use], file_data, time.perf_counter() - start
+
+
+def map_item_files(item: IItem, analyzer_uids: List[str], file_data: Dict[str, bytes]) -> Tuple[Dict[str, Dict], float]:
+    """
+    Parse and map the fetched files of an item; a worker entry point of a prefetching analysis.
+
+    Args:
+        item: The item (often simulation) to process.
+        analyzer_uids: Ids of the analyzers to use on the item.
+        file_data: Contents of the files of the item by filename.
+
+    Returns:
+        Map results by analyzer id and seconds spent
+    """
+    start = time.perf_counter()
+    item.platform = map_item.platform
+    analyzers_to_use = [a for a in map_item.analyzers if a.uid in analyzer_uids]
+    try:
+        selected_data = _map_file_data(item, analyzers_to_use, file_data)
+    except Exception as e:
+        e.item = item
+        logger.error(e)
+        raise e
+    return selected_data, time.perf_counter() - start
+
+
+def _get_analyzers_and_filenames(item: IEntity, analyzers: TAnalyzerList, platform: 'IPlatform') -> Tuple[TAnalyzerList, List[str]]:
+    """
+    Get the analyzers applicable to an item and the files they need.
+
+    Args:
+        item: The item to analyze.
+        analyzers: The analyzers to filter.
+        platform: A platform object to query for information.
+
+    Returns:
+        Analyzers to use and filenames to get
+    """
+    # ensure item has a platform
+    item.platform = platform
+    analyzers_to_use = [a for a in analyzers if a.filter(FilterSafeItem(item))]
+    analyzer_uids = [a.uid for a in analyzers]
+
+    filenames = set(itertools.chain(*(a.filenames for a in analyzers_to_use)))
+    filenames = [f.replace("\\", '/') for f in filenames]
+
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"Analyzers to use on item: {str(analyzer_uids)}")
+        logger.debug(f"Filenames to analyze: {filenames}")
+    return analyzers_to_use, filenames
+
+
+def _map_file_data(item: IEntity, analyzers_to_use: TAnalyzerList, file_data: Dict[str, bytes]) -> Dict[str, Dict]:
+    """
+    Parse the files of an item and run the map of each analyzer.
+
+    Args:
+        item: The item to analyze.
+        analyzers_to_use: The analyzers applicable to the item.
+        file_data: Contents of the files of the item by filename.
+
+    Returns:
+        Map results by analyzer id
+    """
+    # Selected data will be a dict with analyzer.uid: data  entries
+    selected_data = {}
+    for analyzer in analyzers_to_use:
+        # If the analyzer needs the parsed data, parse
+        if analyzer.parse:
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f'Parsing content for {analyzer.uid}')
+            data = {filename: FileParser.parse(filename, content) for filename, content in file_data.items() if filename in analyzer.filenames}
+        else:
+            # If the analyzer doesnt wish to parse, give the raw data
+            data = {filename: content for filename, content in file_data.items() if filename in analyzer.filenames}
+
+        # run the mapping routine for this analyzer and item
+        logger.debug("Running map on selected data")
+        selected_data[analyzer.uid] = analyzer.map(data, item)
+
+    # Store all analyzer results for this item in the result cache
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"Setting result to cache on {item.id}")
+    return selected_data
+
+
 def _get_mapped_data_for_item(item: IEntity, analyzers: TAnalyzerList, platform: 'IPlatform') -> Dict[str, Dict]:
     """
     Get mapped data from an item.
@@ -56,17 +164,7 @@ def _get_mapped_data_for_item(item: IEntity, analyzers: TAnalyzerList, platform:
     """
     try:
         # determine which analyzers (and by extension, which filenames) are applicable to this item
-        # ensure item has a platform
-        item.platform = platform
-        analyzers_to_use = [a for a in analyzers if a.filter(FilterSafeItem(item))]
-        analyzer_uids = [a.uid for a in analyzers]
-
-        filenames = set(itertools.chain(*(a.filenames for a in analyzers_to_use)))
-        filenames = [f.replace("\\", '/') for f in filenames]
-
-        if logger.isEnabledFor(DEBUG):
-            logger.debug(f"Analyzers to use on item: {str(analyzer_uids)}")
-            logger.debug(f"Filenames to analyze: {filenames}")
+        analyzers_to_use, filenames = _get_analyzers_and_filenames(item, analyzers, platform)
 
         # The byte_arrays will associate filename with content
         if len(filenames) > 0:
@@ -74,25 +172,7 @@ def _get_mapped_data_for_item(item: IEntity, analyzers: TAnalyzerList, platform:
         else:
             file_data = dict()
 
-        # Selected data will be a dict with analyzer.uid: data  entries
-        selected_data = {}
-        for analyzer in analyzers_to_use:
-            # If the analyzer needs the parsed data, parse
-            if analyzer.parse:
-                logger.debug(f'Parsing content for {analyzer.uid}')
-                data = {filename: FileParser.parse(filename, content) for filename, content in file_data.items() if filename in analyzer.filenames}
-            else:
-                # If the analyzer doesnt wish to parse, give the raw data
-                data = {filename: content for filename, content in file_data.items() if filename in analyzer.filenames}
-
-            # run the mapping routine for this analyzer and item
-            logger.debug("Running map on selected data")
-            selected_data[analyzer.uid] = analyzer.map(data, item)
-
-        # Store all analyzer results for this item in the result cache
-        if logger.isEnabledFor(DEBUG):
-            logger.debug(f"Setting result to cache on {item.id}")
-        logger.debug(f"Wrote Setting result to cache on {item.id}")
+        selected_data = _map_file_data(item, analyzers_to_use, file_data)
     except Exception as e:
         e.item = item
         logger.error(e)
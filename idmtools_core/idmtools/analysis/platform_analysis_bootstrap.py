@@ -26,6 +26,9 @@ if __name__ == "__main__":
     parser.add_argument("--pre-run-func", default=None, help="List of function to run before starting analysis. Useful to load packages up in docker container before run")
     parser.add_argument("--analyzer-manager-args-file", default=None, help="Path to extra arguments for analyzer manager")
     parser.add_argument("--platform-args", default=None, help="Arguments used to create Platform")
+    parser.add_argument("--ids-file", default=None, help="Path to a file listing the items of a shard")
+    parser.add_argument("--shard-output", default=None, help="Save the partial results of a shard to this file instead of reducing")
+    parser.add_argument("--merge-work-item-ids", default=None, help="A comma separated list of shard work items to merge")
 
     args = parser.parse_args()
     if args.verbose:
@@ -37,6 +40,8 @@ if __name__ == "__main__":
     from idmtools.core import ItemType
     from idmtools.core.platform_factory import Platform
     from idmtools.analysis.analyze_manager import AnalyzeManager
+    from idmtools.analysis.sharding import ShardAnalyzeManager, load_shard_results, merge_shard_results, \
+        read_shard_ids
 
     logger = getLogger('SSMT Analysis')
 
@@ -66,6 +71,10 @@ if __name__ == "__main__":
             wi_tuple = (wi, ItemType.WORKFLOW_ITEM)
             item_ids.append(wi_tuple)
 
+    # Get the items of a shard
+    if args.ids_file:
+        item_ids.extend(read_shard_ids(args.ids_file))
+
     # load analyzer args pickle file
     analyzer_config = pickle.load(open(r"analyzer_args.pkl", 'rb'))
 
@@ -79,6 +88,7 @@ if __name__ == "__main__":
     if not all(analyzers):
         raise Exception("Not all analyzers could be found...\n{}".format(",".join(analyzers)))
 
+    extra_args = dict()
     if args.analyzer_manager_args_file is not None:
         logger.info(f"Loading extra AnalyzerManager args from {args.analyzer_manager_args_file}")
         with open(args.analyzer_manager_args_file, 'rb') as pin:
@@ -89,6 +99,19 @@ if __name__ == "__main__":
 
     # get platform
     platform = Platform(args.block, **platform_args)
-    logger.info(f"Analyzer Manager called with the following extra arguments: {extra_args}")
-    am = AnalyzeManager(platform=platform, ids=item_ids, analyzers=analyzers, **extra_args)
-    am.analyze()
+    if args.merge_work_item_ids:
+        # Merge step of a sharded analysis
+        shard_work_items = args.merge_work_item_ids.split(",")
+        logger.info(f"Merging the results of {len(shard_work_items)} shards")
+        merge_shard_results(analyzers, load_shard_results(platform, shard_work_items))
+    else:
+        logger.info(f"Analyzer Manager called with the following extra arguments: {extra_args}")
+        if args.shard_output:
+            am = ShardAnalyzeManager(platform=platform, ids=item_ids, analyzers=analyzers,
+                                     shard_output=args.shard_output, **extra_args)
+            # fail the shard when it has nothing to save so it can be retried
+            if not am.analyze():
+                sys.exit(1)
+        else:
+            am = AnalyzeManager(platform=platform, ids=item_ids, analyzers=analyzers, **extra_args)
+            am.analyze()
@@ -7,7 +7,7 @@ Platform Analysis tries to make the process of running remotely similar to local
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import re
-from typing import List, Callable, Union, Type, Dict, Any
+from typing import List, Callable, Union, Type, Dict, Any, Tuple
 import inspect
 import os
 import pickle
@@ -15,9 +15,11 @@ from logging import getLogger, DEBUG
 from idmtools.assets import Asset, AssetCollection
 from idmtools.assets.file_list import FileList
 from idmtools.config import IdmConfigParser
+from idmtools.core import ItemType
 from idmtools.entities import IAnalyzer
 from idmtools.entities.iplatform import IPlatform
 from idmtools.entities.iplatform_default import AnalyzerManagerPlatformDefault
+from idmtools.entities.iworkflow_item import IWorkflowItem
 from idmtools.utils.info import get_help_version_url
 
 logger = getLogger(__name__)
@@ -38,7 +40,8 @@ class PlatformAnalysis:
                  additional_files: Union[FileList, AssetCollection, List[str]] = None, asset_collection_id=None,
                  asset_files: Union[FileList, AssetCollection, List[str]] = None, wait_till_done: bool = True,
                  idmtools_config: str = None, pre_run_func: Callable = None, wrapper_shell_script: str = None,
-                 verbose: bool = False, extra_args: Dict[str, Any] = None):
+                 verbose: bool = False, extra_args: Dict[str, Any] = None, shards: int = 1, shard_retries: int = 0,
+                 allow_partial_results: bool = False):
         """
         Initialize our platform analysis.
 
@@ -60,6 +63,12 @@ class PlatformAnalysis:
             wrapper_shell_script: Optional path to a wrapper shell script. This script should redirect all arguments to command passed to it. Mostly useful for development purposes
             verbose: Enables verbose logging remotely
             extra_args: Optional extra arguments to pass to AnalyzerManager on the server side. See :meth:`~idmtools.analysis.analyze_manager.AnalyzeManager.__init__`
+            shards: Number of map work items to split the items into. When greater than one, each shard maps its items
+                and saves partial results, then a merge work item combines them and reduces (see
+                :meth:`~idmtools.entities.ianalyzer.IAnalyzer.combine`). The shards are always waited on
+            shard_retries: Number of times failed shards are run again
+            allow_partial_results: Merge the results of the successful shards when some shards still failed after the
+                retries. Otherwise, the analysis fails
 
         See Also:
             :meth:`idmtools.analysis.analyze_manager.AnalyzeManager.__init__`
@@ -91,6 +100,11 @@ class PlatformAnalysis:
         self.shell_script_binary = "/bin/bash"
         self.verbose = verbose
         self.extra_args = extra_args if extra_args else dict()
+        self.shards = shards
+        self.shard_retries = shard_retries
+        self.allow_partial_results = allow_partial_results
+        #: Map work items of a sharded analysis, in shard order
+        self.shard_work_items: List[IWorkflowItem] = []
 
         self.validate_args()
 
@@ -107,34 +121,162 @@ class PlatformAnalysis:
         Notes:
             TODO: check_status is not being used
         """
+        if self.shards > 1:
+            self._analyze_sharded()
+            return
         command = self._prep_analyze()
 
         logger.debug(f"Command: {command}")
-        from idmtools_platform_comps.ssmt_work_items.comps_workitems import SSMTWorkItem
+        self.wi = self._create_work_item(self.analysis_name, command, self.additional_files, self._get_assets(),
+                                         related_simulations=self.simulation_ids)
+
+        # Run the workitem
+        self._run_work_items([self.wi], wait=self.wait_till_done)
+        logger.debug(f"Status: {self.wi.status}")
+
+    def _analyze_sharded(self):
+        """
+        Analyze remotely with one map work item per shard and a merge work item.
+
+        Returns:
+            None
+
+        Raises:
+            RuntimeError - When shards failed and partial results are not allowed
+        """
+        from idmtools.analysis.sharding import partition_items, SHARD_OUTPUT_FILE
+        command = self._prep_analyze(sharded=True)
+        shards = partition_items(self._get_items_to_shard(), self.shards)
+        assets = self._get_assets()
+        user_logger.info(f"Analyzing in {len(shards)} shards")
+
+        self.shard_work_items = [None] * len(shards)
+        pending = list(range(len(shards)))
+        for attempt in range(self.shard_retries + 1):
+            if attempt:
+                user_logger.warning(f"Retrying {len(pending)} failed shard(s), attempt {attempt} of {self.shard_retries}")
+            work_items = {i: self._create_shard_work_item(i, shards, command, assets) for i in pending}
+            self._run_work_items(list(work_items.values()))
+            for i, wi in work_items.items():
+                self.shard_work_items[i] = wi
+            pending = [i for i, wi in work_items.items() if not wi.succeeded]
+            if not pending:
+                break
+
+        succeeded = [wi for i, wi in enumerate(self.shard_work_items) if i not in pending]
+        if pending:
+            message = f"{len(pending)} of {len(shards)} shards failed: " + \
+                      ", ".join(str(self.shard_work_items[i].uid) for i in pending)
+            if not self.allow_partial_results or not succeeded:
+                raise RuntimeError(message)
+            user_logger.warning(f"{message}. Merging the results of the other shards.")
+
+        shard_ids = [str(wi.uid) for wi in succeeded]
+        merge_command = f"{command} --merge-work-item-ids {','.join(shard_ids)}"
+        logger.debug(f"Merge command: {merge_command}, shard output: {SHARD_OUTPUT_FILE}")
+        self.wi = self._create_work_item(f"{self.analysis_name} merge", merge_command, self.additional_files, assets,
+                                         related_work_items=self.work_item_ids + shard_ids)
+        self._run_work_items([self.wi], wait=self.wait_till_done)
+        logger.debug(f"Status: {self.wi.status}")
+
+    def _get_items_to_shard(self) -> List[Tuple[str, ItemType]]:
+        """
+        List the leaf items (simulations and work items) to split into shards.
+
+        Returns:
+            Unique items in the order of the experiments, simulations, and work items
+        """
+        items = []
+        for experiment_id in self.experiment_ids:
+            experiment = self.platform.get_item(experiment_id, ItemType.EXPERIMENT, raw=True)
+            items.extend((str(sim.id), ItemType.SIMULATION) for sim in self.platform.flatten_item(experiment, raw=True))
+        items.extend((str(sim_id), ItemType.SIMULATION) for sim_id in self.simulation_ids)
+        items.extend((str(wi_id), ItemType.WORKFLOW_ITEM) for wi_id in self.work_item_ids)
+        return list(dict.fromkeys(items))
+
+    def _create_shard_work_item(self, index: int, shards: List[List[Tuple[str, ItemType]]], command: str,
+                                assets: AssetCollection) -> IWorkflowItem:
+        """
+        Create the map work item of a shard.
+
+        Args:
+            index: Shard index
+            shards: All the shards
+            command: Bootstrap command without items
+            assets: Assets of the work item
+
+        Returns:
+            Work item
+        """
+        from idmtools.analysis.sharding import write_shard_ids, SHARD_OUTPUT_FILE
+        transient_assets = AssetCollection(self.additional_files)
+        transient_assets.add_or_replace_asset(Asset(filename="shard_ids.json", content=write_shard_ids(shards[index])))
+        command = f"{command} --ids-file shard_ids.json --shard-output {SHARD_OUTPUT_FILE}"
+        return self._create_work_item(f"{self.analysis_name} shard {index + 1}/{len(shards)}", command,
+                                      transient_assets, assets)
+
+    def _get_assets(self) -> AssetCollection:
+        """
+        Get the assets of the analysis work items.
 
+        Returns:
+            Asset collection with the asset files, based on the asset collection id when set
+        """
         ac = AssetCollection.from_id(self.asset_collection_id,
                                      platform=self.platform) if self.asset_collection_id else AssetCollection()
         ac.add_assets(self.asset_files)
-        self.wi = SSMTWorkItem(name=self.analysis_name, command=command, tags=self.tags,
-                               transient_assets=self.additional_files, assets=ac,
-                               related_experiments=self.experiment_ids,
-                               related_simulations=self.simulation_ids,
-                               related_work_items=self.work_item_ids
-                               )
+        return ac
 
-        # Run the workitem
-        self.platform.run_items(self.wi)
-        if self.wait_till_done:
-            self.platform.wait_till_done(self.wi)
-        logger.debug(f"Status: {self.wi.status}")
+    def _create_work_item(self, name: str, command: str, transient_assets: AssetCollection, assets: AssetCollection,
+                          related_simulations: List[str] = None, related_work_items: List[str] = None) -> IWorkflowItem:
+        """
+        Create an analysis work item.
+
+        Args:
+            name: Work item name
+            command: Command to run
+            transient_assets: Transient assets
+            assets: Assets
+            related_simulations: Related simulations
+            related_work_items: Related work items. Defaults to the work items being analyzed
 
-    def _prep_analyze(self):
+        Returns:
+            Work item
         """
-        Prepare for analysis.
+        from idmtools_platform_comps.ssmt_work_items.comps_workitems import SSMTWorkItem
+        return SSMTWorkItem(name=name, command=command, tags=self.tags,
+                            transient_assets=transient_assets, assets=assets,
+                            related_experiments=self.experiment_ids,
+                            related_simulations=related_simulations or [],
+                            related_work_items=self.work_item_ids if related_work_items is None else related_work_items
+                            )
+
+    def _run_work_items(self, work_items: List[IWorkflowItem], wait: bool = True):
+        """
+        Run work items.
+
+        Args:
+            work_items: Work items
+            wait: Wait until all the work items are done
 
         Returns:
             None
         """
+        self.platform.run_items(work_items if len(work_items) > 1 else work_items[0])
+        if wait:
+            for wi in work_items:
+                self.platform.wait_till_done(wi)
+
+    def _prep_analyze(self, sharded: bool = False):
+        """
+        Prepare for analysis.
+
+        Args:
+            sharded: Build the command without the items to analyze, which are provided per shard
+
+        Returns:
+            The bootstrap command
+        """
         # Add the platform_analysis_bootstrap.py file to the collection
         dir_path = os.path.dirname(os.path.realpath(__file__))
         self.additional_files.add_or_replace_asset(os.path.join(dir_path, "platform_analysis_bootstrap.py"))
@@ -179,13 +321,13 @@ class PlatformAnalysis:
             command += f'{self.shell_script_binary} {os.path.basename(self.wrapper_shell_script)} '
         command += "python3 platform_analysis_bootstrap.py"
         # Add the experiments
-        if self.experiment_ids:
+        if self.experiment_ids and not sharded:
             command += f' --experiment-ids {",".join(self.experiment_ids)}'
         # Add the simulations
-        if self.simulation_ids:
+        if self.simulation_ids and not sharded:
             command += f' --simulation-ids {",".join(self.simulation_ids)}'
         # Add the work items
-        if self.work_item_ids:
+        if self.work_item_ids and not sharded:
             command += f' --work-item-ids {",".join(self.work_item_ids)}'
         # Add the analyzers
         command += " --analyzers {}".format(
@@ -0,0 +1,168 @@
+"""
+Sharded analysis support for PlatformAnalysis.
+
+A sharded analysis splits the items to analyze into shards. Each shard runs the map step of the analyzers on its items
+and saves a partial result per analyzer (see :meth:`IAnalyzer.partial_reduce
+<idmtools.entities.ianalyzer.IAnalyzer.partial_reduce>`). A merge step then combines the partial results of all the
+shards (see :meth:`IAnalyzer.combine <idmtools.entities.ianalyzer.IAnalyzer.combine>`) and runs the reduce of each
+analyzer once.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import json
+import os
+import pickle
+from logging import getLogger
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+from idmtools.analysis.analyze_manager import AnalyzeManager
+from idmtools.analysis.spill import reduce_map_results
+from idmtools.core.enums import ItemType
+from idmtools.entities.ianalyzer import IAnalyzer
+
+if TYPE_CHECKING:  # pragma: no cover
+    from idmtools.entities.iplatform import IPlatform
+
+logger = getLogger(__name__)
+
+#: Name of the file each shard writes its partial results to
+SHARD_OUTPUT_FILE = "shard_output.pkl"
+
+ItemId = Tuple[str, ItemType]
+
+
+def partition_items(items: List[ItemId], shard_count: int) -> List[List[ItemId]]:
+    """
+    Split items into contiguous shards of almost equal size, keeping their order.
+
+    Args:
+        items: Items to split
+        shard_count: Number of shards. Fewer shards are returned when there are fewer items
+
+    Returns:
+        List of shards
+    """
+    if shard_count < 1:
+        raise ValueError("The number of shards must be greater or equal to one")
+    shard_count = min(shard_count, len(items)) or 1
+    size, extra = divmod(len(items), shard_count)
+    shards, start = [], 0
+    for i in range(shard_count):
+        stop = start + size + (1 if i < extra else 0)
+        shards.append(items[start:stop])
+        start = stop
+    return shards
+
+
+def write_shard_ids(items: List[ItemId]) -> bytes:
+    """
+    Serialize the items of a shard.
+
+    Args:
+        items: Items of the shard
+
+    Returns:
+        Content of the ids file
+    """
+    return json.dumps([[item_id, item_type.name] for item_id, item_type in items]).encode()
+
+
+def read_shard_ids(path: str) -> List[ItemId]:
+    """
+    Read the items of a shard written by :func:`write_shard_ids`.
+
+    Args:
+        path: Path of the ids file
+
+    Returns:
+        Items of the shard
+    """
+    with open(path, 'r') as f:
+        return [(item_id, ItemType[item_type]) for item_id, item_type in json.load(f)]
+
+
+class ShardAnalyzeManager(AnalyzeManager):
+    """
+    AnalyzeManager running the map step for one shard.
+
+    Instead of calling reduce, it saves the :meth:`~idmtools.entities.ianalyzer.IAnalyzer.partial_reduce` result of
+    each analyzer, keyed by the analyzer position, to *shard_output*.
+    """
+
+    def __init__(self, *args, shard_output: str = SHARD_OUTPUT_FILE, **kwargs):
+        """
+        Initialize the manager.
+
+        Args:
+            args: AnalyzeManager arguments
+            shard_output: File the partial results are saved to
+            kwargs: AnalyzeManager keyword arguments
+        """
+        super().__init__(*args, **kwargs)
+        self.shard_output = shard_output
+
+    def _run_and_wait_for_reducing(self, executor, results) -> dict:
+        """
+        Save the partial results of the shard instead of reducing.
+
+        Args:
+            executor: Unused
+            results: Map results
+
+        Returns:
+            An analyzer ID keyed dictionary of None
+        """
+        # the spill files are removed after the analysis
+        partials = {index: reduce_map_results(analyzer.partial_reduce, self._gather_analyzer_data(analyzer, results))
+                    for index, analyzer in enumerate(self.analyzers)}
+        os.makedirs(os.path.dirname(os.path.abspath(self.shard_output)), exist_ok=True)
+        with open(self.shard_output, 'wb') as out:
+            pickle.dump(partials, out)
+        logger.debug(f"Saved partial results of {len(results)} items to {self.shard_output}")
+        return {analyzer.uid: None for analyzer in self.analyzers}
+
+
+def merge_shard_results(analyzers: List[IAnalyzer], shard_results: List[Dict[int, Any]], working_dir: str = None) \
+        -> List[Any]:
+    """
+    Combine the partial results of the shards and reduce each analyzer.
+
+    Args:
+        analyzers: Analyzers, in the same order as in the shards
+        shard_results: Partial results saved by each shard
+        working_dir: Working directory of the analyzers without one. Defaults to the current directory
+
+    Returns:
+        Reduce result of each analyzer, in analyzer order. Also set on each analyzer `results`
+    """
+    working_dir = working_dir or os.getcwd()
+    for analyzer in analyzers:
+        analyzer.working_dir = analyzer.working_dir or working_dir
+        analyzer.initialize()
+    results = []
+    for index, analyzer in enumerate(analyzers):
+        partials = [shard[index] for shard in shard_results if index in shard]
+        logger.debug(f"Combining {len(partials)} partial results for {analyzer.uid}")
+        analyzer.results = analyzer.reduce(analyzer.combine(partials))
+        results.append(analyzer.results)
+        analyzer.destroy()
+    return results
+
+
+def load_shard_results(platform: 'IPlatform', work_item_ids: List[str], output_file: str = SHARD_OUTPUT_FILE) \
+        -> List[Dict[int, Any]]:
+    """
+    Download the partial results saved by the shard work items.
+
+    Args:
+        platform: Platform
+        work_item_ids: Shard work items, in shard order
+        output_file: Name of the partial results file
+
+    Returns:
+        Partial results of each shard
+    """
+    shard_results = []
+    for work_item_id in work_item_ids:
+        files = platform.get_files_by_id(work_item_id, ItemType.WORKFLOW_ITEM, [output_file])
+        shard_results.append(pickle.loads(files[output_file]))
+    return shard_results
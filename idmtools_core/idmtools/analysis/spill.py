@@ -0,0 +1,192 @@
+"""
+Spill the map results of an analysis to disk.
+
+When the map results of all the items do not fit in memory, AnalyzeManager can write the result of each item to a file
+per analyzer as soon as it arrives, keeping only the offset of the result in memory. The reduce of the analyzer then
+receives a :class:`SpilledMapResults`, a read-only mapping of item to map result which loads a result from the
+memory mapped file when it is accessed. Pickling the mapping, to reduce in a worker process, only pickles the items
+and the offsets.
+
+The map results are pickled, so any data returned by map can be spilled. The spill files are removed after the
+analysis: :func:`reduce_map_results` releases the file of the mapping once reduced, and returns spilled results as a
+dictionary when the reduce returns them.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import mmap
+import os
+import pickle
+from collections.abc import Mapping
+from logging import getLogger, DEBUG
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+logger = getLogger(__name__)
+
+
+class SpilledMapResults(Mapping):
+    """
+    Read-only mapping of item to map result, loading the results from a spill file when they are accessed.
+    """
+
+    def __init__(self, path: str, index: Dict[Any, Tuple[int, int]]):
+        """
+        Initialize the mapping.
+
+        Args:
+            path: Spill file
+            index: Offset and size of the result of each item in the file
+        """
+        self.path = path
+        self.index = index
+        self._file = None
+        self._map = None
+
+    def __getitem__(self, item: Any) -> Any:
+        """
+        Load the map result of an item.
+
+        Args:
+            item: Item
+
+        Returns:
+            Map result of the item
+        """
+        offset, size = self.index[item]
+        if self._map is None:
+            self._file = open(self.path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return pickle.loads(self._map[offset:offset + size])
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the items, in the order their results arrived."""
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        """Number of items."""
+        return len(self.index)
+
+    def __contains__(self, item: Any) -> bool:
+        """Check if the mapping has a result for an item without loading it."""
+        return item in self.index
+
+    def __getstate__(self):
+        """Pickle the path and the offsets only."""
+        return dict(path=self.path, index=self.index)
+
+    def __setstate__(self, state):
+        """Restore the mapping, opening the file on first access."""
+        self.__init__(**state)
+
+    def subset(self, items) -> 'SpilledMapResults':
+        """
+        Get the mapping of some of the items.
+
+        Args:
+            items: Items to keep. Items without result are ignored
+
+        Returns:
+            Mapping of the items, backed by the same file
+        """
+        return SpilledMapResults(self.path, {item: self.index[item] for item in items if item in self.index})
+
+    def close(self) -> None:
+        """
+        Release the memory map of the file.
+
+        Returns:
+            None
+        """
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+
+class SpillWriter:
+    """
+    Append the map results of an analyzer to a spill file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Create the spill file.
+
+        Args:
+            path: Spill file
+        """
+        self.path = path
+        self.index: Dict[Any, Tuple[int, int]] = dict()
+        self._file = open(path, 'wb')
+
+    def close(self) -> None:
+        """
+        Close the spill file.
+
+        Returns:
+            None
+        """
+        if not self._file.closed:
+            self._file.close()
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f"Spilled {len(self.index)} results, {os.path.getsize(self.path)} bytes, to {self.path}")
+
+    def write(self, item: Any, data: Any) -> None:
+        """
+        Write the map result of an item.
+
+        Args:
+            item: Item
+            data: Map result of the item
+
+        Returns:
+            None
+        """
+        offset = self._file.tell()
+        pickle.dump(data, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.index[item] = (offset, self._file.tell() - offset)
+
+    def results(self) -> SpilledMapResults:
+        """
+        Close the spill file and get its results.
+
+        Returns:
+            Mapping of item to map result
+        """
+        self.close()
+        return SpilledMapResults(self.path, self.index)
+
+
+def materialize_map_results(results: Any) -> Any:
+    """
+    Load spilled map results in a dictionary, releasing their file.
+
+    Args:
+        results: Map results, or any other value which is returned as is
+
+    Returns:
+        Dictionary of item to map result for spilled map results, else the value
+    """
+    if not isinstance(results, SpilledMapResults):
+        return results
+    try:
+        return dict(results)
+    finally:
+        results.close()
+
+
+def reduce_map_results(reduce: Callable[[Any], Any], data: Any) -> Any:
+    """
+    Reduce map results, releasing the spill file they are loaded from.
+
+    Args:
+        reduce: Reduce, or partial reduce, of an analyzer
+        data: Map results of the analyzer
+
+    Returns:
+        Result of the reduce. Spilled map results returned by the reduce are loaded in a dictionary
+    """
+    try:
+        return materialize_map_results(reduce(data))
+    finally:
+        if isinstance(data, SpilledMapResults):
+            data.close()
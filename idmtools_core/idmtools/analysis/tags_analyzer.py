@@ -5,9 +5,11 @@ Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 # First, import some necessary system and idmtools packages.
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Union
+from uuid import uuid4
 
 import pandas as pd
+from idmtools.analysis.append_writer import AppendOnlyWriter
 from idmtools.entities import IAnalyzer
 
 # Create a class for the analyzer
@@ -20,12 +22,17 @@ class TagsAnalyzer(IAnalyzer):
 
     Examples:
         .. literalinclude:: ../../examples/analyzers/example_analysis_TagsAnalyzer.py
+
+    Notes:
+        With streaming=True, each simulation's tags are written to a part file during map and reduce only appends the
+        parts to the output. See :class:`~idmtools.analysis.append_writer.AppendOnlyWriter`.
     """
 
     # Arg option for analyzer init are uid, working_dir, parse (True to leverage the :class:`OutputParser`;
     # False to get the raw data in the :meth:`select_simulation_data`), and filenames
     # In this case, we want uid, working_dir, and parse=True
-    def __init__(self, uid=None, working_dir=None, parse=True, output_path="output_tag"):
+    def __init__(self, uid=None, working_dir=None, parse=True, output_path="output_tag", streaming: bool = False,
+                 output_format: str = 'csv'):
         """
         Initialize our Tags Analyzer.
 
@@ -34,6 +41,8 @@ class TagsAnalyzer(IAnalyzer):
             working_dir:
             parse:
             output_path:
+            streaming: Write each simulation's tags as they are mapped instead of combining everything in reduce
+            output_format: Output format when streaming, csv or parquet (requires pyarrow)
 
         See Also:
             :class:`~idmtools.entities.ianalyzer.IAnalyzer`.
@@ -41,6 +50,8 @@ class TagsAnalyzer(IAnalyzer):
         super().__init__(uid, working_dir, parse)
         self.exp_id = None
         self.output_path = output_path
+        self.streaming = streaming
+        self.writer = AppendOnlyWriter(parts_dir='', output_format=output_format) if streaming else None
 
     def initialize(self):
         """
@@ -54,6 +65,9 @@ class TagsAnalyzer(IAnalyzer):
         # Create the output path
         if not os.path.exists(self.output_path):
             os.makedirs(self.output_path)
+        if self.streaming:
+            self.writer.parts_dir = os.path.join(self.output_path, f'.{self.__class__.__name__}_{uuid4().hex[:8]}_parts')
+            self.writer.reset()
 
     # Map is called to get for each simulation a data object (all the metadata of the simulations) and simulation object
     def map(self, data: Dict[str, Any], simulation: ANALYZABLE_ITEM):
@@ -65,24 +79,33 @@ class TagsAnalyzer(IAnalyzer):
             simulation: Item to extract
 
         Returns:
-            Data frame with the tags built.
+            Data frame with the tags built. When streaming, the path of the part file written instead.
         """
+        if self.streaming:
+            return self.writer.write(str(simulation.uid), pd.DataFrame([simulation.tags]))
         df = pd.DataFrame(columns=list(simulation.tags.keys()))  # Create a dataframe with the simulation tag keys
         df.loc[str(simulation.uid)] = list(simulation.tags.values())  # Get a list of the sim tag values
         df.index.name = 'SimId'  # Label the index keys you create with the names option
         return df
 
     # In reduce, we are printing the simulation and result data filtered in map
-    def reduce(self, all_data: Dict[ANALYZABLE_ITEM, pd.DataFrame]):
+    def reduce(self, all_data: Dict[ANALYZABLE_ITEM, Union[pd.DataFrame, str]]):
         """
         Reduce the dictionary of items->Tags dataframe to a single dataframe and write to a csv file.
 
         Args:
-            all_data: Map of Item->Tags dataframe
+            all_data: Map of Item->Tags dataframe (or part file path when streaming)
 
         Returns:
             None
         """
+        if self.streaming:
+            first_sim = list(all_data.keys())[0]
+            output_folder = os.path.join(self.output_path, first_sim.experiment.id)
+            self.writer.finalize(all_data.values(), os.path.join(output_folder, self.__class__.__name__ + self.writer.extension))
+            self.writer.cleanup()
+            return
+
         results = pd.concat(list(all_data.values()), axis=0)  # Combine a list of all the sims tag values
 
         # Make a directory labeled the exp id to write the csv results to
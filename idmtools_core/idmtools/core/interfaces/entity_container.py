@@ -4,21 +4,45 @@ EntityContainer definition. EntityContainer provides an envelope for a Parent to
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import typing
+import weakref
+from collections import Counter
+from logging import getLogger
 
 
 if typing.TYPE_CHECKING:
     from idmtools.core.interfaces.ientity import IEntity
     from idmtools.core.enums import EntityStatus
-    from typing import List
+    from typing import List, Optional
+
+logger = getLogger(__name__)
 
 
 class EntityContainer(list):
     """
     EntityContainer is a wrapper classes used by Experiments and Suites to wrap their children.
 
-    It provides utilities to set status on entities
+    It provides utilities to set status on entities and keeps a count of children per status. Children notify the
+    containers they belong to when their status changes, so the counts are always up to date without scanning the
+    children. See :meth:`status_counts`.
     """
 
+    def __new__(cls, *args, **kwargs):
+        """
+        Create the container with empty counters. Done here so unpickling, which skips __init__, also has them.
+
+        Args:
+            args: Ignored
+            kwargs: Ignored
+
+        Returns:
+            EntityContainer
+        """
+        container = super().__new__(cls)
+        container._status_counts = Counter()
+        # Number of children whose status is derived (like Experiments) and cannot be counted
+        container._untracked = 0
+        return container
+
     def __init__(self, children: 'List[IEntity]' = None):
         """
         Initialize the EntityContainer.
@@ -29,6 +53,265 @@ class EntityContainer(list):
         super().__init__()
         self.extend(children or [])
 
+    # region Status counters
+    def _track(self, entity: 'IEntity'):
+        """
+        Start counting the status of a child.
+
+        Args:
+            entity: Child entity
+
+        Returns:
+            None
+        """
+        if not hasattr(entity, '_status_containers') or isinstance(getattr(type(entity), 'status', None), property):
+            self._untracked += 1
+            return
+        containers = entity.__dict__.get('_status_containers') or ()
+        object.__setattr__(entity, '_status_containers', containers + (weakref.ref(self),))
+        self._status_counts[entity.status] += 1
+
+    def _untrack(self, entity: 'IEntity'):
+        """
+        Stop counting the status of a child.
+
+        Args:
+            entity: Child entity
+
+        Returns:
+            None
+        """
+        containers = getattr(entity, '__dict__', {}).get('_status_containers') or ()
+        for i, ref in enumerate(containers):
+            if ref() is self:
+                object.__setattr__(entity, '_status_containers', containers[:i] + containers[i + 1:])
+                break
+        else:
+            self._untracked -= 1
+            return
+        self._status_counts[entity.status] -= 1
+        if self._status_counts[entity.status] <= 0:
+            del self._status_counts[entity.status]
+
+    def _recount(self):
+        """
+        Rebuild the counters from scratch. Used after bulk list operations.
+
+        Returns:
+            None
+        """
+        for entity in self:
+            self._untrack(entity)
+        self._status_counts = Counter()
+        self._untracked = 0
+        for entity in self:
+            self._track(entity)
+
+    def _on_child_status_changed(self, entity: 'IEntity', old_status: 'EntityStatus', new_status: 'EntityStatus'):
+        """
+        Update the counters when a child's status changed. Called by the child.
+
+        Args:
+            entity: Child whose status changed
+            old_status: Previous status
+            new_status: New status
+
+        Returns:
+            None
+        """
+        self._status_counts[old_status] -= 1
+        if self._status_counts[old_status] <= 0:
+            del self._status_counts[old_status]
+        self._status_counts[new_status] += 1
+
+    @property
+    def status_counts(self) -> 'Optional[Counter]':
+        """
+        Number of children per status.
+
+        Returns:
+            Counter of status to number of children, or None if some children have a derived status (like Experiments
+            in a Suite) that cannot be counted
+        """
+        if self._untracked:
+            return None
+        return self._status_counts
+
+    def validate_status_counts(self) -> bool:
+        """
+        Check the counters against a full scan of the children. Meant for tests and debugging.
+
+        Returns:
+            True if the counters match the status of the children
+        """
+        if self._untracked:
+            return True
+        expected = Counter(entity.status for entity in self)
+        if expected != self._status_counts:
+            logger.debug(f"Status counts {dict(self._status_counts)} do not match children status {dict(expected)}")
+            return False
+        return True
+    # endregion
+
+    # region list operations
+    def append(self, entity: 'IEntity'):
+        """
+        Append a child.
+
+        Args:
+            entity: Child to append
+
+        Returns:
+            None
+        """
+        super().append(entity)
+        self._track(entity)
+
+    def extend(self, entities: 'typing.Iterable[IEntity]'):
+        """
+        Append several children.
+
+        Args:
+            entities: Children to append
+
+        Returns:
+            None
+        """
+        for entity in entities:
+            self.append(entity)
+
+    def __iadd__(self, entities):
+        """
+        Append several children.
+
+        Args:
+            entities: Children to append
+
+        Returns:
+            self
+        """
+        self.extend(entities)
+        return self
+
+    def insert(self, index: int, entity: 'IEntity'):
+        """
+        Insert a child.
+
+        Args:
+            index: Position
+            entity: Child to insert
+
+        Returns:
+            None
+        """
+        super().insert(index, entity)
+        self._track(entity)
+
+    def remove(self, entity: 'IEntity'):
+        """
+        Remove a child.
+
+        Args:
+            entity: Child to remove
+
+        Returns:
+            None
+        """
+        del self[self.index(entity)]
+
+    def pop(self, index: int = -1) -> 'IEntity':
+        """
+        Remove and return a child.
+
+        Args:
+            index: Position
+
+        Returns:
+            Removed child
+        """
+        entity = super().pop(index)
+        self._untrack(entity)
+        return entity
+
+    def clear(self):
+        """
+        Remove all children.
+
+        Returns:
+            None
+        """
+        for entity in self:
+            self._untrack(entity)
+        super().clear()
+
+    def __setitem__(self, index, value):
+        """
+        Replace children.
+
+        Args:
+            index: Position or slice
+            value: New child or children
+
+        Returns:
+            None
+        """
+        if isinstance(index, slice):
+            value = list(value)
+            added = value
+            removed = self[index]
+        else:
+            added = [value]
+            removed = [self[index]]
+        for entity in removed:
+            self._untrack(entity)
+        super().__setitem__(index, value)
+        for entity in added:
+            self._track(entity)
+
+    def __delitem__(self, index):
+        """
+        Remove children.
+
+        Args:
+            index: Position or slice
+
+        Returns:
+            None
+        """
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        for entity in removed:
+            self._untrack(entity)
+        super().__delitem__(index)
+
+    def __imul__(self, n):
+        """
+        Repeat the children in place.
+
+        Args:
+            n: Number of repetitions
+
+        Returns:
+            self
+        """
+        super().__imul__(n)
+        self._recount()
+        return self
+
+    # endregion
+
+    def __reduce_ex__(self, protocol):
+        """
+        Pickle/copy support. The counters are not saved, they are rebuilt when the children are appended back.
+
+        Args:
+            protocol: Pickle protocol
+
+        Returns:
+            Reduce tuple
+        """
+        state = {k: v for k, v in self.__dict__.items() if k not in ('_status_counts', '_untracked')}
+        return self.__class__, (), state or None, iter(list(self))
+
     def set_status(self, status: 'EntityStatus'):
         """
         Set status on all the children.
@@ -41,6 +41,47 @@ class IEntity(IItem, metaclass=ABCMeta):
     item_type: ItemType = field(default=None, compare=False)
     #: Platform Representation of Entity
     _platform_object: Any = field(default=None, compare=False, metadata={"pickle_ignore": True})
+    #: Weak references to the containers(see EntityContainer) counting this entity's status
+    _status_containers: tuple = field(default=None, init=False, compare=False, repr=False,
+                                      metadata={"pickle_ignore": True})
+
+    def __setattr__(self, key, value):
+        """
+        Set an attribute. Status changes are reported to the containers counting the status of this entity.
+
+        Args:
+            key: Attribute name
+            value: Value
+
+        Returns:
+            None
+        """
+        if key == 'status' and self.__dict__.get('_status_containers'):
+            old_status = self.__dict__.get('status')
+            super().__setattr__(key, value)
+            if old_status != value:
+                for ref in self._status_containers:
+                    container = ref()
+                    if container is not None:
+                        container._on_child_status_changed(self, old_status, value)
+            return
+        super().__setattr__(key, value)
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Skip the status interception of entities with a computed status, like experiments.
+
+        Their status is never counted by a container, and the extra frame would hide the caller from the status setter.
+
+        Args:
+            kwargs: Subclass keyword arguments
+
+        Returns:
+            None
+        """
+        super().__init_subclass__(**kwargs)
+        if isinstance(getattr(cls, 'status', None), property) and cls.__setattr__ is IEntity.__setattr__:
+            cls.__setattr__ = object.__setattr__
 
     def update_tags(self, tags: dict = None) -> NoReturn:
         """
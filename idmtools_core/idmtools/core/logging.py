@@ -5,7 +5,9 @@ We configure our logging here, manage multi-process logging, alternate logging l
 
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
+import atexit
 import logging
+import multiprocessing
 import os
 import sys
 import time
@@ -13,7 +15,7 @@ import threading
 from contextlib import suppress
 from dataclasses import dataclass
 from logging import getLogger
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from typing import Union, Optional
 import coloredlogs as coloredlogs
 from idmtools.core import TRUTHY_VALUES
@@ -21,6 +23,9 @@ from idmtools.core import TRUTHY_VALUES
 LOGGING_STARTED = False
 LOGGING_FILE_STARTED = False
 LOGGING_FILE_HANDLER = None
+# Queue of the records logged by worker processes, and the thread writing them in the main process
+LOGGING_QUEUE = None
+LOGGING_QUEUE_LISTENER = None
 
 VERBOSE = 15
 NOTICE = 25
@@ -53,6 +58,8 @@ class IdmToolsLoggingConfig:
     user_output: bool = True
     #: Toggle enable file logging
     enable_file_logging: Union[str, bool] = True
+    #: Toggle sending the records of worker processes through a queue to a single writer thread of the main process
+    use_log_queue: Union[str, bool] = False
 
     def __post_init__(self):
         """
@@ -73,6 +80,9 @@ class IdmToolsLoggingConfig:
         if type(self.enable_file_logging) is str:
             self.enable_file_logging = self.enable_file_logging.lower() in TRUTHY_VALUES
 
+        if isinstance(self.use_log_queue, str):
+            self.use_log_queue = self.use_log_queue.lower() in TRUTHY_VALUES
+
         # ensure level is a logging level
         for attr in ['level', 'file_level']:
             if isinstance(getattr(self, attr), str):
@@ -218,6 +228,8 @@ def setup_logging(logging_config: IdmToolsLoggingConfig) -> None:
             LOGGING_FILE_HANDLER = setup_handlers(logging_config)
             if LOGGING_FILE_HANDLER:
                 LOGGING_FILE_STARTED = True
+                if logging_config.use_log_queue:
+                    start_queue_listener(LOGGING_FILE_HANDLER)
 
         # Show we enable user output. The only time we really should not do this is for specific CLI use cases
         # # such as json output
@@ -350,6 +362,96 @@ def create_file_handler(file_level, formatter: logging.Formatter, filename: str)
     return file_handler
 
 
+def start_queue_listener(file_handler: logging.Handler) -> None:
+    """
+    Start the thread writing the records sent by worker processes to the file handler.
+
+    Worker processes set up with :func:`setup_worker_logging` put their records on the queue instead of opening the
+    log file, so only the main process writes and rolls over the file.
+
+    Args:
+        file_handler: Handler of the log file
+
+    Returns:
+        None
+    """
+    global LOGGING_QUEUE, LOGGING_QUEUE_LISTENER
+    stop_queue_listener()
+    LOGGING_QUEUE = multiprocessing.Queue(-1)
+    LOGGING_QUEUE_LISTENER = QueueListener(LOGGING_QUEUE, file_handler, respect_handler_level=True)
+    LOGGING_QUEUE_LISTENER.start()
+
+
+@atexit.register
+def stop_queue_listener() -> None:
+    """
+    Write the records left on the queue and stop the listener thread.
+
+    Returns:
+        None
+    """
+    global LOGGING_QUEUE, LOGGING_QUEUE_LISTENER
+    listener, LOGGING_QUEUE_LISTENER = LOGGING_QUEUE_LISTENER, None
+    if listener is not None:
+        with suppress(Exception):
+            listener.stop()
+    LOGGING_QUEUE = None
+
+
+def get_logging_queue() -> Optional[multiprocessing.Queue]:
+    """
+    Get the queue worker processes should log to.
+
+    Returns:
+        The queue, None when the queue logging mode is off
+    """
+    return LOGGING_QUEUE
+
+
+def get_logging_queue_level() -> int:
+    """
+    Get the level of the records worker processes should send to the queue.
+
+    Returns:
+        Level of the log file of the main process, NOTSET when there is no log file
+    """
+    return LOGGING_FILE_HANDLER.level if LOGGING_FILE_HANDLER is not None else logging.NOTSET
+
+
+def setup_worker_logging(logging_queue: Optional[multiprocessing.Queue], level: Optional[Union[str, int]] = None) -> None:
+    """
+    Send the records of a worker process to the queue of the main process. Meant as a process pool initializer.
+
+    The handlers inherited from the main process are removed, and logging is marked as started so loading the
+    idmtools configuration in the worker does not open the log file again.
+
+    Args:
+        logging_queue: Queue from :func:`get_logging_queue`. Nothing is changed when None
+        level: Level of the records sent, from :func:`get_logging_queue_level`. Defaults to the level of the log file
+            inherited from the main process, which only forked workers have
+
+    Returns:
+        None
+    """
+    global LOGGING_STARTED, LOGGING_FILE_STARTED, LOGGING_FILE_HANDLER, LOGGING_QUEUE, LOGGING_QUEUE_LISTENER
+    if logging_queue is None:
+        return
+    if level is None:
+        level = get_logging_queue_level()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    handler = QueueHandler(logging_queue)
+    handler.setLevel(level)
+    root.addHandler(handler)
+    # a forked worker inherits the listener of the main process, which only runs there
+    LOGGING_QUEUE = logging_queue
+    LOGGING_QUEUE_LISTENER = None
+    LOGGING_FILE_HANDLER = None
+    LOGGING_FILE_STARTED = True
+    LOGGING_STARTED = True
+
+
 def reset_logging_handlers():
     """
     Reset all the logging handlers by removing the root handler.
@@ -364,6 +466,7 @@ def reset_logging_handlers():
         for handler in logging.root.handlers[:]:
             logging.root.removeHandler(handler)
     # Clean up file handler now
+    stop_queue_listener()
     LOGGING_FILE_STARTED = False
     LOGGING_STARTED = False
     LOGGING_FILE_HANDLER = None
@@ -8,7 +8,8 @@ TemplatedSimulations are useful for building large numbers of similar simulation
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import copy
-from dataclasses import dataclass, field, InitVar, fields
+from collections import Counter
+from dataclasses import dataclass, field, InitVar
 from logging import getLogger, DEBUG
 from types import GeneratorType
 from typing import NoReturn, Set, Union, Iterator, Type, Dict, Any, List, TYPE_CHECKING, Generator
@@ -24,23 +25,26 @@ from idmtools.core.interfaces.irunnable_entity import IRunnableEntity
 from idmtools.core.logging import SUCCESS, NOTICE
 from idmtools.entities.itask import ITask
 from idmtools.entities.platform_requirements import PlatformRequirements
+from idmtools.entities.simulation_table import SimulationTable
 from idmtools.entities.templated_simulation import TemplatedSimulations
 from idmtools.registry.experiment_specification import ExperimentPluginSpecification, get_model_impl, \
     get_model_type_impl
 from idmtools.registry.plugin_specification import get_description_impl
 from idmtools.utils.caller import get_caller
 from idmtools.utils.collections import ExperimentParentIterator
-from idmtools.utils.entities import get_default_tags
+from idmtools.utils.entities import get_default_tags, get_metadata_field_plan
 
 if TYPE_CHECKING:  # pragma: no cover
     from idmtools.entities.iplatform import IPlatform
     from idmtools.entities.simulation import Simulation  # noqa: F401
     from idmtools.entities.suite import Suite  # noqa: F401
+    from idmtools.entities.experiment_plan import ExperimentPlan  # noqa: F401
 
 logger = getLogger(__name__)
 user_logger = getLogger('user')
 SUPPORTED_SIM_TYPE = Union[
     EntityContainer,
+    SimulationTable,
     Generator['Simulation', None, None],
     TemplatedSimulations,
     Iterator['Simulation']
@@ -139,19 +143,20 @@ class Experiment(IAssetsEnabled, INamedEntity, IRunnableEntity):
             status = EntityStatus.CREATED if self._platform_object else None
             return status
 
-        sim_statuses = set([s.status for s in self.simulations.items])
-        any_succeeded_failed = any([s in [EntityStatus.FAILED, EntityStatus.SUCCEEDED] for s in sim_statuses])
-        if len(self.simulations.items) == 0 or all([s is None for s in sim_statuses]):
+        counts = self.simulation_status_counts
+        total = sum(counts.values())
+        any_succeeded_failed = counts[EntityStatus.FAILED] > 0 or counts[EntityStatus.SUCCEEDED] > 0
+        if total == 0 or counts[None] == total:
             status = None  # this will trigger experiment creation on a platform
-        elif any([s == EntityStatus.RUNNING for s in sim_statuses]):
+        elif counts[EntityStatus.RUNNING] > 0:
             status = EntityStatus.RUNNING
-        elif any([s == EntityStatus.CREATED for s in sim_statuses]) and any_succeeded_failed:
+        elif counts[EntityStatus.CREATED] > 0 and any_succeeded_failed:
             status = EntityStatus.RUNNING
-        elif any([s is None for s in sim_statuses]) and any_succeeded_failed:
+        elif counts[None] > 0 and any_succeeded_failed:
             status = EntityStatus.CREATED
-        elif any([s == EntityStatus.FAILED for s in sim_statuses]):
+        elif counts[EntityStatus.FAILED] > 0:
             status = EntityStatus.FAILED
-        elif all([s == EntityStatus.SUCCEEDED for s in sim_statuses]):
+        elif counts[EntityStatus.SUCCEEDED] == total:
             status = EntityStatus.SUCCEEDED
         else:
             status = EntityStatus.CREATED
@@ -320,7 +325,8 @@ class Experiment(IAssetsEnabled, INamedEntity, IRunnableEntity):
         Returns:
             True if all simulations have ran, False otherwise
         """
-        return all([s.done for s in self.simulations])
+        counts = self.simulation_status_counts
+        return counts[EntityStatus.SUCCEEDED] + counts[EntityStatus.FAILED] == sum(counts.values())
 
     @property
     def succeeded(self) -> bool:
@@ -330,7 +336,8 @@ class Experiment(IAssetsEnabled, INamedEntity, IRunnableEntity):
         Returns:
             True if all simulations have succeeded, False otherwise
         """
-        return all([s.succeeded for s in self.simulations])
+        counts = self.simulation_status_counts
+        return counts[EntityStatus.SUCCEEDED] == sum(counts.values())
 
     @property
     def any_failed(self) -> bool:
@@ -340,7 +347,35 @@ class Experiment(IAssetsEnabled, INamedEntity, IRunnableEntity):
         Returns:
             True if all simulations have succeeded, False otherwise
         """
-        return any([s.failed for s in self.simulations])
+        return self.simulation_status_counts[EntityStatus.FAILED] > 0
+
+    @property
+    def simulation_status_counts(self) -> Counter:
+        """
+        Number of simulations per status.
+
+        For simulations in an EntityContainer or a SimulationTable, the counts are maintained as simulation status
+        changes, so this is O(1). Other simulation collections are scanned.
+
+        Returns:
+            Counter of status to number of simulations
+        """
+        if isinstance(self.__simulations, (EntityContainer, SimulationTable)):
+            counts = self.__simulations.status_counts
+            if counts is not None:
+                return counts
+        return Counter(s.status for s in self.simulations)
+
+    def validate_status_counts(self) -> bool:
+        """
+        Check the simulation status counters against a full scan of the simulations. Meant for tests and debugging.
+
+        Returns:
+            True if the counters are consistent
+        """
+        if isinstance(self.__simulations, (EntityContainer, SimulationTable)):
+            return self.__simulations.validate_status_counts()
+        return True
 
     @property
     def simulations(self) -> ExperimentParentIterator:  # noqa: F811
@@ -381,6 +416,11 @@ class Experiment(IAssetsEnabled, INamedEntity, IRunnableEntity):
         if isinstance(simulations, (EntityContainer, TemplatedSimulations)):
             self.__simulations = simulations
             self.gather_common_assets_from_task = isinstance(simulations, EntityContainer)
+        elif isinstance(simulations, SimulationTable):
+            # read-mostly simulations of an existing experiment, materialized on access
+            simulations.parent = self
+            self.__simulations = simulations
+            self.gather_common_assets_from_task = False
         elif isinstance(simulations, (list, set)):
             self.gather_common_assets_from_task = True
             container = EntityContainer()
@@ -394,7 +434,7 @@ class Experiment(IAssetsEnabled, INamedEntity, IRunnableEntity):
             self.__simulations = container
         else:
             raise ValueError(
-                "Simulations must be an EntityContainer, Generator, TemplatedSimulations, or a List/Set of Simulations."
+                "Simulations must be an EntityContainer, SimulationTable, Generator, TemplatedSimulations, or a List/Set of Simulations."
             )
 
     @property
@@ -595,6 +635,27 @@ class Experiment(IAssetsEnabled, INamedEntity, IRunnableEntity):
                 _refresh_interval = p.refresh_interval
             self.wait(wait_on_done_progress=wait_on_done_progress, refresh_interval=_refresh_interval)
 
+    def plan(self, platform: 'IPlatform' = None, samples: int = 20, batch_size: int = None,
+             max_workers: int = None) -> 'ExperimentPlan':
+        """
+        Estimate the size and creation cost of the experiment before running it.
+
+        Only a sample of the simulations is built, so it is cheap for large sweeps.
+
+        Args:
+            platform: Platform the experiment will run on. If not specified, we first check object for platform object then the current context
+            samples: Number of simulations to build
+            batch_size: Batch size of the creation. Defaults to the configuration
+            max_workers: Number of workers of the creation. Defaults to the configuration
+
+        Returns:
+            ExperimentPlan with the projected totals and bottlenecks
+        """
+        from idmtools.core.context import get_current_platform
+        from idmtools.entities.experiment_plan import plan_experiment
+        platform = platform or self.platform or get_current_platform()
+        return plan_experiment(self, platform, samples=samples, batch_size=batch_size, max_workers=max_workers)
+
     def to_dict(self):
         """
         Convert experiment to dictionary.
@@ -602,15 +663,8 @@ class Experiment(IAssetsEnabled, INamedEntity, IRunnableEntity):
         Returns:
             Dictionary of experiment.
         """
-        result = dict()
-        for f in fields(self):
-            # Include:
-            # - public fields (not starting with '_')
-            # Exclude:
-            # - fields named 'parent'
-            if not f.name.startswith("_") and f.name not in ['parent']:
-                result[f.name] = getattr(self, f.name)
-
+        # public fields (not starting with '_'), except 'parent'
+        result = {f.name: getattr(self, f.name) for f in get_metadata_field_plan(self.__class__)}
         result['_uid'] = self.uid
         return result
 
@@ -726,6 +780,8 @@ class Experiment(IAssetsEnabled, INamedEntity, IRunnableEntity):
             return simulation_id in ids
         elif isinstance(self.simulations.items, TemplatedSimulations):
             return self.simulations.items.check_duplicate(simulation_id)
+        elif isinstance(self.simulations.items, SimulationTable):
+            return simulation_id in self.simulations.items
         else:
             return False
 
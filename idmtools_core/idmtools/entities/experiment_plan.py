@@ -0,0 +1,324 @@
+"""
+Here we implement the pre-flight plan of an experiment.
+
+A plan tells how big an experiment will be before it is created: how many simulations the builders expand to, the
+assets, files and directories the platform will store, and how long the creation should take with the current batch
+settings. Only a sample of the simulations is built, so planning a sweep of millions of simulations is cheap.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import copy
+import os
+import time
+from dataclasses import dataclass, field, asdict, replace
+from itertools import chain
+from logging import getLogger, DEBUG
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from idmtools.assets import Asset
+from idmtools.entities.templated_simulation import TemplatedSimulations
+
+if TYPE_CHECKING:  # pragma: no cover
+    from idmtools.entities.experiment import Experiment
+    from idmtools.entities.iplatform import IPlatform
+
+logger = getLogger(__name__)
+
+#: Number of files above which the plan warns about the load on the target file system
+FILES_WARNING_THRESHOLD = 1_000_000
+
+
+def _asset_size(asset: Asset) -> int:
+    if asset.absolute_path and asset._content is None:
+        try:
+            return os.path.getsize(asset.absolute_path)
+        except OSError:
+            return 0
+    content = asset.content
+    if content is None:
+        return 0
+    return len(content) if isinstance(content, (bytes, bytearray)) else len(asset.bytes)
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if size < 1024 or unit == "TiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _sample_indices(count: int, samples: int) -> List[int]:
+    samples = min(samples, count)
+    if samples <= 0:
+        return []
+    if samples == 1:
+        return [0]
+    # spread the samples over the sweep: the first and last simulations are the usual extremes
+    return sorted(set(round(i * (count - 1) / (samples - 1)) for i in range(samples)))
+
+
+@dataclass(repr=False)
+class ExperimentPlan:
+    """
+    Projected size and creation cost of an experiment.
+    """
+    #: Number of simulations of the experiment
+    simulation_count: int = field(default=0)
+    #: Number of simulations built to estimate the values per simulation
+    sampled: int = field(default=0)
+    #: Simulations per creation batch
+    batch_size: int = field(default=16)
+    #: Workers creating the batches
+    max_workers: int = field(default=16)
+    #: Executor of the workers, thread or process
+    executor: str = field(default="thread")
+    #: Number of common assets
+    common_asset_count: int = field(default=0)
+    #: Size of the common assets in bytes
+    common_asset_bytes: int = field(default=0)
+    #: Mean number of transient assets of a simulation
+    transient_files_per_simulation: float = field(default=0)
+    #: Mean size of the transient assets of a simulation in bytes
+    transient_bytes_per_simulation: float = field(default=0)
+    #: Largest size of the transient assets of a sampled simulation in bytes
+    max_transient_bytes: int = field(default=0)
+    #: Mean number of other files the platform writes for a simulation
+    platform_files_per_simulation: float = field(default=0)
+    #: Mean number of directories the platform creates for a simulation
+    platform_directories_per_simulation: float = field(default=0)
+    #: Mean size of the other files the platform writes for a simulation in bytes
+    platform_bytes_per_simulation: float = field(default=0)
+    #: Mean seconds to build a simulation from the template, in the main process
+    build_seconds_per_simulation: float = field(default=0)
+    #: Mean seconds to prepare a simulation for creation (pre_creation and assets), in the workers
+    prepare_seconds_per_simulation: float = field(default=0)
+    #: Transient assets identical in all sampled simulations
+    shared_transient_assets: List[str] = field(default_factory=list)
+
+    @property
+    def batches(self) -> int:
+        """Number of creation batches."""
+        return -(-self.simulation_count // max(self.batch_size, 1))
+
+    @property
+    def total_files(self) -> int:
+        """Projected number of files of the simulations, the common assets stored once."""
+        per_simulation = self.transient_files_per_simulation + self.platform_files_per_simulation
+        return round(self.simulation_count * per_simulation) + self.common_asset_count
+
+    @property
+    def total_directories(self) -> int:
+        """Projected number of directories of the simulations."""
+        return round(self.simulation_count * self.platform_directories_per_simulation)
+
+    @property
+    def total_bytes(self) -> int:
+        """Projected size of the experiment in bytes, the common assets stored once."""
+        per_simulation = self.transient_bytes_per_simulation + self.platform_bytes_per_simulation
+        return round(self.simulation_count * per_simulation) + self.common_asset_bytes
+
+    @property
+    def build_seconds(self) -> float:
+        """Projected seconds to build the simulations. The main process builds them one at a time."""
+        return self.simulation_count * self.build_seconds_per_simulation
+
+    @property
+    def prepare_seconds(self) -> float:
+        """
+        Projected seconds to prepare the simulations.
+
+        Preparing is CPU bound: only a process pool spreads it across the workers.
+        """
+        parallel = min(self.max_workers, self.batches) if self.executor == "process" else 1
+        return self.simulation_count * self.prepare_seconds_per_simulation / max(parallel, 1)
+
+    @property
+    def estimated_creation_seconds(self) -> float:
+        """Projected seconds of local work to create the experiment, before the platform stores anything."""
+        return self.build_seconds + self.prepare_seconds
+
+    @property
+    def bottlenecks(self) -> List[str]:
+        """What limits the creation of the experiment, the most important first."""
+        issues = []
+        if self.executor != "process" and self.prepare_seconds > 1 and self.max_workers > 1:
+            issues.append(f"Preparing simulations is CPU bound and takes {self.prepare_seconds:.1f}s in threads: "
+                          f"set default_pool_executor = process to use the {self.max_workers} workers")
+        if self.build_seconds > 1 and self.build_seconds > self.prepare_seconds:
+            issues.append(f"Building the simulations in the main process takes {self.build_seconds:.1f}s of the "
+                          f"{self.estimated_creation_seconds:.1f}s projected: keep the base task small, it is copied "
+                          f"for each simulation")
+        if self.simulation_count > self.batch_size and self.batches < self.max_workers:
+            issues.append(f"Only {self.batches} batches of {self.batch_size} simulations for {self.max_workers} "
+                          f"workers: lower batch_size")
+        if self.shared_transient_assets and self.simulation_count > 1:
+            issues.append(f"{', '.join(self.shared_transient_assets)} are identical in all sampled simulations: "
+                          f"make them common assets")
+        if self.total_files > FILES_WARNING_THRESHOLD:
+            issues.append(f"{self.total_files:,} files on the target file system: pack small files or store "
+                          f"shared content in the common assets")
+        return issues
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the plan to a dictionary, with the projected totals.
+
+        Returns:
+            Dictionary of the plan
+        """
+        result = asdict(self)
+        for name in ("batches", "total_files", "total_directories", "total_bytes", "build_seconds",
+                     "prepare_seconds", "estimated_creation_seconds", "bottlenecks"):
+            result[name] = getattr(self, name)
+        return result
+
+    def __str__(self):
+        """Report of the plan."""
+        lines = [
+            f"Simulations:          {self.simulation_count:,} ({self.sampled} sampled)",
+            f"Batches:              {self.batches:,} of {self.batch_size} for {self.max_workers} {self.executor} workers",
+            f"Common assets:        {self.common_asset_count:,} files, {_format_bytes(self.common_asset_bytes)}",
+            f"Transient assets:     {self.transient_files_per_simulation:.1f} files, "
+            f"{_format_bytes(self.transient_bytes_per_simulation)} per simulation "
+            f"(largest {_format_bytes(self.max_transient_bytes)})",
+            f"Files:                {self.total_files:,}",
+            f"Directories:          {self.total_directories:,}",
+            f"Storage:              {_format_bytes(self.total_bytes)}",
+            f"Creation (local):     {self.estimated_creation_seconds:.1f}s (build {self.build_seconds:.1f}s, "
+            f"prepare {self.prepare_seconds:.1f}s)",
+        ]
+        bottlenecks = self.bottlenecks
+        if bottlenecks:
+            lines.append("Bottlenecks:")
+            lines.extend(f"  - {issue}" for issue in bottlenecks)
+        return "\n".join(lines)
+
+    def __repr__(self):
+        """String version of the plan."""
+        return f"<ExperimentPlan simulations:{self.simulation_count} files:{self.total_files} bytes:{self.total_bytes}>"
+
+
+def _sample_templated_simulations(template: TemplatedSimulations, indices: List[int]):
+    """
+    Build the simulations of a template at some indices, without building the others.
+
+    Args:
+        template: Template of the simulations
+        indices: Sorted indices of the simulations
+
+    Returns:
+        Generator of the simulations and the seconds spent building each of them
+    """
+    # build detached simulations: attaching them to the experiment would assign its id
+    template = replace(template, parent=None)
+    builder_count = sum(len(b) for b in template.builders)
+    wanted = iter(i for i in indices if i < builder_count)
+    target = next(wanted, None)
+    for index, simulation_functions in enumerate(chain(*template.builders)):
+        if target is None:
+            break
+        if index != target:
+            continue
+        start = time.perf_counter()
+        simulation = template.new_simulation()
+        tags = {}
+        for func in simulation_functions:
+            new_tags = func(simulation=simulation)
+            if new_tags:
+                tags.update(new_tags)
+        simulation.tags.update(tags)
+        yield simulation, time.perf_counter() - start
+        target = next(wanted, None)
+    extra = [i - builder_count for i in indices if i >= builder_count]
+    yield from _sample_simulations(template.extra_simulations(), extra)
+
+
+def _sample_simulations(simulations, indices: List[int]):
+    wanted = set(indices)
+    for index, simulation in enumerate(simulations):
+        if index in wanted:
+            start = time.perf_counter()
+            # prepare a copy, the simulations of the experiment are created later
+            simulation = copy.deepcopy(simulation)
+            simulation._uid = None
+            yield simulation, time.perf_counter() - start
+
+
+def plan_experiment(experiment: 'Experiment', platform: Optional['IPlatform'] = None, samples: int = 20,
+                    batch_size: Optional[int] = None, max_workers: Optional[int] = None) -> ExperimentPlan:
+    """
+    Estimate the size and creation cost of an experiment, building only a sample of its simulations.
+
+    Args:
+        experiment: Experiment to plan
+        platform: Platform the experiment will run on. Without platform, the simulations are not prepared by their
+            task and the storage of the platform is not counted
+        samples: Number of simulations to build
+        batch_size: Batch size of the creation. Defaults to the configuration
+        max_workers: Number of workers of the creation. Defaults to the configuration
+
+    Returns:
+        ExperimentPlan
+    """
+    from idmtools.entities.iplatform_ops.utils import get_batch_settings
+    batch_size, max_workers, executor = get_batch_settings(batch_size, max_workers)
+    items = experiment.simulations.items
+    plan = ExperimentPlan(simulation_count=len(items), batch_size=batch_size, max_workers=max_workers,
+                          executor=executor)
+    indices = _sample_indices(plan.simulation_count, samples)
+
+    common_assets = experiment.assets.copy()
+    if isinstance(items, TemplatedSimulations):
+        # gathering changes the task: gather from a copy, the experiment is created later
+        common_assets.add_assets(copy.deepcopy(items.base_task).gather_common_assets(), fail_on_duplicate=False)
+        sampled = _sample_templated_simulations(items, indices)
+    else:
+        sampled = _sample_simulations(items, indices)
+
+    # the platform needs the experiment of a simulation: attach the samples to a copy, attaching them to the
+    # experiment would assign its id
+    parent = copy.copy(experiment)
+    transient = []
+    storage = []
+    build_seconds = []
+    prepare_seconds = []
+    first_checksums = None
+    for simulation, seconds in sampled:
+        simulation.parent = parent
+        build_seconds.append(seconds)
+        start = time.perf_counter()
+        if platform is not None:
+            simulation.pre_creation(platform)
+        else:
+            simulation.gather_assets()
+        prepare_seconds.append(time.perf_counter() - start)
+        if not isinstance(items, TemplatedSimulations):
+            common_assets.add_assets(simulation.task.common_assets, fail_on_duplicate=False)
+
+        assets = simulation.assets.assets
+        transient.append((len(assets), sum(_asset_size(asset) for asset in assets)))
+        checksums = {asset.short_remote_path(): asset.calculate_checksum() for asset in assets}
+        if first_checksums is None:
+            first_checksums = checksums
+        else:
+            first_checksums = {k: v for k, v in first_checksums.items() if checksums.get(k) == v}
+        if platform is not None:
+            storage.append(platform.plan_simulation_storage(simulation, common_assets))
+
+    plan.common_asset_count = len(common_assets)
+    plan.common_asset_bytes = sum(_asset_size(asset) for asset in common_assets)
+    plan.sampled = len(transient)
+    if transient:
+        plan.transient_files_per_simulation = sum(t[0] for t in transient) / len(transient)
+        plan.transient_bytes_per_simulation = sum(t[1] for t in transient) / len(transient)
+        plan.max_transient_bytes = max(t[1] for t in transient)
+        plan.build_seconds_per_simulation = sum(build_seconds) / len(build_seconds)
+        plan.prepare_seconds_per_simulation = sum(prepare_seconds) / len(prepare_seconds)
+        if len(transient) > 1:
+            plan.shared_transient_assets = sorted(first_checksums)
+    if storage:
+        plan.platform_files_per_simulation = sum(s["files"] for s in storage) / len(storage)
+        plan.platform_directories_per_simulation = sum(s["directories"] for s in storage) / len(storage)
+        plan.platform_bytes_per_simulation = sum(s["bytes"] for s in storage) / len(storage)
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"Planned {plan!r} from {plan.sampled} simulations")
+    return plan
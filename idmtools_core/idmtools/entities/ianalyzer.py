@@ -129,6 +129,38 @@ class IAnalyzer(metaclass=ABCMeta):
         """
         pass
 
+    def partial_reduce(self, all_data: ANALYSIS_REDUCE_DATA_TYPE) -> Any:
+        """
+        Reduce the :meth:`map` data of one shard of a sharded :class:`~idmtools.analysis.platform_anaylsis.PlatformAnalysis`.
+
+        The returned value is saved by the shard and passed to :meth:`combine` in the merge step. Incremental analyses
+        (see :mod:`idmtools.analysis.incremental`) also save it for the items each run maps. By default, the map
+        data is kept as is, so :meth:`reduce` receives the same data as in an analysis that is not sharded. Override
+        it with :meth:`combine` to pre-aggregate the data in each shard.
+
+        Args:
+            all_data: A dictionary with entries for the items of the shard and their selected data.
+
+        Returns:
+            Partial result of the shard. Must be picklable
+        """
+        return all_data
+
+    def combine(self, partial_results: List[Any]) -> Any:
+        """
+        Combine the :meth:`partial_reduce` results of all the shards into the data passed to :meth:`reduce`.
+
+        Args:
+            partial_results: Partial results, in shard order.
+
+        Returns:
+            Data for :meth:`reduce`. By default, the union of the shard dictionaries
+        """
+        combined = {}
+        for partial in partial_results:
+            combined.update(partial)
+        return combined
+
     def destroy(self) -> NoReturn:
         """
         Call after the analysis is done.
@@ -6,7 +6,6 @@ IPlatform is responsible for all the communication to our platform and translati
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import os
-import copy
 from abc import ABCMeta
 from dataclasses import dataclass
 from dataclasses import fields, field
@@ -42,6 +41,7 @@ from idmtools.assets.asset_collection import AssetCollection
 from idmtools.services.platforms import PlatformPersistService
 from idmtools.utils.caller import get_caller
 from idmtools.utils.entities import validate_user_inputs_against_dataclass
+from idmtools.utils.sim_directory import build_sim_directory_df, save_sim_directory_records
 
 logger = getLogger(__name__)
 user_logger = getLogger('user')
@@ -776,14 +776,16 @@ class IPlatform(IItem, CacheEnabled, metaclass=ABCMeta):
 
         # if we do have a progress bar, update it
         done = 0
-        # iterate over the children
-        for child in getattr(item, child_attribute):
-            # if the item is an experiment, use the status
-            if isinstance(item, Experiment) and child.status in done_states:
-                done += 1
-            # otherwise use the done attribute
-            elif isinstance(item, Suite) and child.done:
-                done += 1
+        if isinstance(item, Experiment):
+            # the experiment keeps count of its simulations per status
+            status_counts = item.simulation_status_counts
+            done = sum(status_counts[state] for state in done_states)
+        else:
+            # iterate over the children
+            for child in getattr(item, child_attribute):
+                # use the done attribute
+                if isinstance(item, Suite) and child.done:
+                    done += 1
         # check if we need to update the progress bar
         if hasattr(progress_bar, 'last_print_n') and done > progress_bar.last_print_n:
             progress_bar.update(done - progress_bar.last_print_n)
@@ -963,6 +965,22 @@ class IPlatform(IItem, CacheEnabled, metaclass=ABCMeta):
         else:
             return str(PurePath(*args))
 
+    def plan_simulation_storage(self, simulation: Simulation, common_assets: AssetCollection) -> Dict[str, int]:
+        """
+        Estimate what the platform stores for a simulation, besides its transient assets.
+
+        Used by :meth:`~idmtools.entities.experiment.Experiment.plan`. Platforms writing simulations to a file system
+        override it.
+
+        Args:
+            simulation: Simulation prepared for creation
+            common_assets: Common assets of the experiment
+
+        Returns:
+            Number of files, directories and bytes written for the simulation
+        """
+        return dict(files=0, directories=0, bytes=0)
+
     def id_from_file(self, filename: str):
         """
         Load just the id portion of an id file.
@@ -1016,36 +1034,21 @@ class IPlatform(IItem, CacheEnabled, metaclass=ABCMeta):
     def create_sim_directory_df(self, exp_id: str, include_tags: bool = True) -> pd.DataFrame:
         """
         Build simulation working directory mapping.
+
+        The ids, tags, and working directories are gathered in a single pass over the experiment and the frame is
+        built from column arrays. Repeated string tags are stored as categoricals.
+
         Args:
             exp_id: experiment id
             include_tags: True/False
         Returns:
-            DataFrame
+            DataFrame with the tag columns, simid, and outpath
         """
-        tag_df = None
-        if include_tags:
-            tags_list = []
-            sims = self.get_children(exp_id, ItemType.EXPERIMENT)
-            for sim in sims:
-                tags = copy.deepcopy(sim.tags)
-                tags["simid"] = sim.id
-                tags_list.append(tags)
-            tag_df = pd.DataFrame(tags_list)
-
-        dir_map = self.create_sim_directory_map(exp_id, ItemType.EXPERIMENT)
-
-        dir_list = [dict(simid=sim_id, outpath=str(path)) for sim_id, path in dir_map.items()]
-        dir_df = pd.DataFrame(dir_list)
-
-        if tag_df is not None and len(tag_df) > 0:
-            result_df = pd.merge(left=tag_df, right=dir_df, on='simid')
-        else:
-            result_df = dir_df
-
-        return result_df
+        return build_sim_directory_df(self._experiments.get_sim_directory_records(exp_id, include_tags=include_tags))
 
     def save_sim_directory_df_to_csv(self, exp_id: str, include_tags: bool = True,
-                                     output: str = os.getcwd(), save_header=False, file_name: str = None) -> None:
+                                     output: str = os.getcwd(), save_header=False, file_name: str = None,
+                                     output_format: str = 'csv', chunk_size: int = None) -> None:
         """
         Save simulation directory df to csv file.
         Args:
@@ -1054,51 +1057,61 @@ class IPlatform(IItem, CacheEnabled, metaclass=ABCMeta):
             output: output directory
             save_header: True/False
             file_name: user csv file name
+            output_format: csv or parquet. Parquet output requires pyarrow or fastparquet
+            chunk_size: When set, stream the simulations to the file *chunk_size* rows at a time instead of building
+                the whole DataFrame first. Parquet output is always streamed, to a dataset directory
         Returns:
             None
         """
-        df = self.create_sim_directory_df(exp_id, include_tags=include_tags)
-        try:
-            os.mkdir(output)
-        except OSError:
-            pass
-
+        os.makedirs(output, exist_ok=True)
         if file_name is None:
-            file_name = f'{exp_id}.csv'
-        df.to_csv(os.path.join(output, file_name), header=save_header, index=False)
+            file_name = f'{exp_id}.{output_format.lower()}'
+        destination = os.path.join(output, file_name)
+        if chunk_size or output_format.lower() != 'csv':
+            records = self._experiments.get_sim_directory_records(exp_id, include_tags=include_tags)
+            save_sim_directory_records(records, destination, output_format=output_format, header=save_header,
+                                       chunk_size=chunk_size or 10000)
+        else:
+            df = self.create_sim_directory_df(exp_id, include_tags=include_tags)
+            df.to_csv(destination, header=save_header, index=False)
 
     def filter_simulations_by_tags(self, item_id: str, item_type: ItemType, tags: Dict = None, status=None,
                                    entity_type=False, skip_sims=None, max_simulations=None, **kwargs):
         """
         Filter simulations associated with a given Experiment or Suite using tag-based conditions.
 
-        This method is a platform-level convenience wrapper that delegates filtering logic to the
-        `get_simulations_by_tags` method on the retrieved item. It supports:
+        This method is a platform-level convenience wrapper around `FilterItem.filter_item_by_id`. It supports:
         - Exact tag value matching
         - Callable filters for flexible conditions (e.g., lambda expressions)
+        - Range and membership predicates (`TagRange`, `TagIn` from `idmtools.utils.tag_index`)
         - Optionally limiting the number of returned simulations
         - Returning either simulation entities or just their IDs
 
+        The item is reloaded on every call, so tag and status changes are always seen. The tags of each experiment
+        are indexed once per call, whatever the number of tag filters.
+
         Args:
             item_id (str): The unique ID of the Experiment or Suite.
             item_type (ItemType): The type of the item (ItemType.EXPERIMENT or ItemType.SUITE).
             tags (Dict, optional): Dictionary of tag filters to apply. Values can be:
                 - Exact values (e.g., {"Coverage": 0.8})
                 - Callable functions (e.g., {"Run_Number": lambda v: 0 <= v <= 10})
-                - Ellipsis (...) or None to match presence of key only.
+                - Predicates (e.g., {"Run_Number": TagRange(0, 10)})
+                - Ellipsis (...) to match presence of key only.
             status (EntityStatus, optional): Filter by status. If provided, only simulations with the specified status will be returned.
             entity_type (bool, optional): If True, return full simulation entities; otherwise, return simulation IDs.
-            skip_sims (list, optional): A list of simulation IDs to exclude from the results.
+            skip_sims (list or set, optional): Simulation IDs to exclude from the results.
             max_simulations (int, optional): Maximum number of simulations to return.
-            **kwargs: Additional keyword arguments passed to the item's `get_simulations_by_tags` method.
+            **kwargs: Additional keyword arguments passed to `FilterItem.filter_item_by_id`.
 
         Returns:
             Union[List[str], List[Simulation], Dict[str, List[Simulation]]]:
                 - A list of simulation IDs (default),
                 - Or a list/dictionary of Simulation objects if `entity_type=True`.
         """
-        item = self.get_item(item_id, item_type, force=True)
-        return item.get_simulations_by_tags(tags=tags, status=status, entity_type=entity_type, skip_sims=skip_sims,
+        from idmtools.utils.filter_simulations import FilterItem
+        return FilterItem.filter_item_by_id(self, item_id, item_type, tags=tags, status=status,
+                                            entity_type=entity_type, skip_sims=skip_sims,
                                             max_simulations=max_simulations, **kwargs)
 
 
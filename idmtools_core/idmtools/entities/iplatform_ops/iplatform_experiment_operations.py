@@ -394,6 +394,30 @@ class IPlatformExperimentOperations(ABC):
         """
         return {}
 
+    def get_sim_directory_records(self, experiment_id: str, include_tags: bool = True) \
+            -> Iterator[Tuple[str, Dict[str, Any], str]]:
+        """
+        Gather the id, tags, and working directory of each simulation of an experiment.
+
+        The default implementation combines the experiment children with create_sim_directory_map. Platforms that can
+        read everything in a single pass should override it.
+
+        Args:
+            experiment_id: experiment id
+            include_tags: Include the simulation tags. When False, the tags of each record are empty
+
+        Returns:
+            Iterator of (simulation id, tags, working directory). Simulations without a working directory are skipped
+        """
+        dir_map = self.create_sim_directory_map(experiment_id)
+        if not include_tags:
+            for sim_id, path in dir_map.items():
+                yield sim_id, {}, str(path)
+            return
+        for sim in self.platform.get_children(experiment_id, ItemType.EXPERIMENT):
+            if sim.id in dir_map:
+                yield sim.id, sim.tags, str(dir_map[sim.id])
+
     def platform_delete(self, experiment_id: str) -> None:
         """
         Delete platform experiment.
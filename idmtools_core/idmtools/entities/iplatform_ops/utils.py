@@ -11,9 +11,10 @@ from concurrent.futures.thread import ThreadPoolExecutor
 from functools import partial
 from logging import getLogger, DEBUG
 from os import cpu_count
-from typing import List, Union, Generator, Iterable, Callable, Any
+from typing import List, Union, Generator, Iterable, Callable, Any, Optional, Tuple
 from more_itertools import chunked
 from idmtools.core import EntityContainer
+from idmtools.core.logging import get_logging_queue, get_logging_queue_level, setup_worker_logging
 from idmtools.entities.templated_simulation import TemplatedSimulations
 
 logger = getLogger(__name__)
@@ -63,6 +64,36 @@ def item_batch_worker_thread(create_func: Callable, items: Union[List], **kwargs
     return ret
 
 
+def get_batch_settings(batch_size: Optional[int] = None, max_workers: Optional[int] = None) -> Tuple[int, int, str]:
+    """
+    Get the settings batch_create_items uses to create items.
+
+    Args:
+        batch_size: Batch size overriding the configuration
+        max_workers: Number of workers overriding the configuration
+
+    Returns:
+        Batch size, number of workers and type of executor(thread or process)
+    """
+    from idmtools.config import IdmConfigParser
+    _batch_size = int(IdmConfigParser.get_option(None, "batch_size", fallback=16))
+    if batch_size is not None:
+        _batch_size = batch_size
+
+    _workers_per_cpu = IdmConfigParser.get_option(None, "workers_per_cpu", fallback=None)
+    if _workers_per_cpu:
+        _max_workers = int(_workers_per_cpu) * cpu_count()
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"workers set by cpu: {_workers_per_cpu} * {cpu_count()}")
+    else:
+        _max_workers = int(IdmConfigParser.get_option(None, "max_workers", fallback=16))
+    if max_workers is not None:
+        _max_workers = max_workers
+
+    default_pool_executor = IdmConfigParser.get_option(None, "default_pool_executor", fallback="thread").lower()
+    return _batch_size, _max_workers, default_pool_executor
+
+
 def batch_create_items(items: Union[Iterable, Generator], batch_worker_thread_func: Callable[[List], List] = None,
                        create_func: Callable[..., Any] = None, display_progress: bool = True,
                        progress_description: str = "Commissioning items", unit: str = None, **kwargs):
@@ -85,14 +116,9 @@ def batch_create_items(items: Union[Iterable, Generator], batch_worker_thread_fu
     from idmtools.config import IdmConfigParser
     from idmtools.utils.collections import ExperimentParentIterator
 
-    max_workers = kwargs.get('max_workers', None)
-
     # Consider values from the block that Platform uses
-    _batch_size = int(IdmConfigParser.get_option(None, "batch_size", fallback=16))
-
-    batch_size = kwargs.get('batch_size', None)
-    if batch_size is not None:
-        _batch_size = batch_size
+    _batch_size, _max_workers, default_pool_executor = get_batch_settings(kwargs.get('batch_size', None),
+                                                                          kwargs.get('max_workers', None))
 
     if display_progress and not IdmConfigParser.is_progress_bar_disabled():
         from tqdm import tqdm
@@ -102,21 +128,11 @@ def batch_create_items(items: Union[Iterable, Generator], batch_worker_thread_fu
         prog = None
 
     if EXECUTOR is None:
-        _workers_per_cpu = IdmConfigParser.get_option(None, "workers_per_cpu", fallback=None)
-        if _workers_per_cpu:
-            _max_workers = int(_workers_per_cpu) * cpu_count()
-            if logger.isEnabledFor(DEBUG):
-                logger.debug(f"workers set by cpu: {_workers_per_cpu} * {cpu_count()}")
-        else:
-            _max_workers = int(IdmConfigParser.get_option(None, "max_workers", fallback=16))
-
-        if max_workers is not None:
-            _max_workers = max_workers
-
         logger.info(f'Creating {_max_workers} Platform Workers')
-        default_pool_executor = IdmConfigParser.get_option(None, "default_pool_executor", fallback="thread").lower()
         if default_pool_executor == "process":
-            EXECUTOR = ProcessPoolExecutor(max_workers=_max_workers)
+            # workers log through the queue of this process when the queue logging mode is on
+            EXECUTOR = ProcessPoolExecutor(max_workers=_max_workers, initializer=setup_worker_logging,
+                                           initargs=(get_logging_queue(), get_logging_queue_level()))
         else:
             EXECUTOR = ThreadPoolExecutor(max_workers=_max_workers)
 
@@ -5,12 +5,14 @@ Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import copy
 from abc import ABCMeta, abstractmethod
+from functools import lru_cache
 from dataclasses import dataclass, field, fields
 from logging import getLogger
-from typing import Set, NoReturn, Union, Callable, List, TYPE_CHECKING, Dict
+from typing import Set, NoReturn, Union, Callable, List, TYPE_CHECKING, Dict, Optional
 from idmtools.assets import AssetCollection
 from idmtools.entities.command_line import CommandLine
 from idmtools.entities.platform_requirements import PlatformRequirements
+from idmtools.utils.entities import get_metadata_field_plan
 from idmtools.utils.hashing import ignore_fields_in_dataclass_on_pickle
 from inspect import signature
 
@@ -31,6 +33,16 @@ TTaskParent = Union['Simulation', 'IWorkflowItem']  # noqa: F821
 TTaskHook = Callable[[TTaskParent, 'IPlatform'], NoReturn]
 
 
+@lru_cache(maxsize=None)
+def _get_comps_platform_class() -> Optional[type]:
+    """Import the COMPS platform class once, None when it is not installed."""
+    try:
+        from idmtools_platform_comps.comps_platform import COMPSPlatform
+        return COMPSPlatform
+    except ImportError:
+        return None
+
+
 @dataclass
 class ITask(metaclass=ABCMeta):
     """
@@ -298,19 +310,13 @@ class ITask(metaclass=ABCMeta):
         from idmtools.core.context import get_current_platform
 
         result = dict()
-        metadata_fields = self.metadata_fields
-        platform = get_current_platform()
-        for f in fields(self):
-            if not f.name.startswith("_") and f.name not in ['parent']:
-                try:
-                    from idmtools_platform_comps.comps_platform import COMPSPlatform
-                    if isinstance(platform, COMPSPlatform):
-                        if f.name in metadata_fields:
-                            result[f.name] = getattr(self, f.name)
-                        else:
-                            result[f.name] = f.default
-                    else:
-                        result[f.name] = getattr(self, f.name)
-                except ImportError:
-                    result[f.name] = getattr(self, f.name)
+        comps_platform = _get_comps_platform_class()
+        on_comps = comps_platform is not None and isinstance(get_current_platform(), comps_platform)
+        # on COMPS, only the metadata fields keep their values
+        metadata_fields = self.metadata_fields if on_comps else ()
+        for f in get_metadata_field_plan(self.__class__):
+            if on_comps and f.name not in metadata_fields:
+                result[f.name] = f.default
+            else:
+                result[f.name] = getattr(self, f.name)
         return result
@@ -6,7 +6,7 @@ All simulations have a task. Optionally that have assets. All simulations should
 
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
-from dataclasses import dataclass, field, fields
+from dataclasses import dataclass, field
 from logging import getLogger, DEBUG
 from typing import List, Union, Mapping, Any, Type, TypeVar, Dict, TYPE_CHECKING
 from idmtools.assets import AssetCollection, Asset
@@ -16,6 +16,7 @@ from idmtools.core.interfaces.iassets_enabled import IAssetsEnabled
 from idmtools.core.interfaces.iitem import IItem
 from idmtools.core.interfaces.inamed_entity import INamedEntity
 from idmtools.entities.task_proxy import TaskProxy
+from idmtools.utils.entities import get_metadata_field_plan
 from idmtools.utils.language import get_qualified_class_name_from_obj
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -238,10 +239,7 @@ class Simulation(IAssetsEnabled, INamedEntity):
         Returns:
             Dict representing json of object
         """
-        result = dict()
-        for f in fields(self):
-            if not f.name.startswith("_") and f.name not in ['parent']:
-                result[f.name] = getattr(self, f.name)
+        result = {f.name: getattr(self, f.name) for f in get_metadata_field_plan(self.__class__)}
         result['_uid'] = self.uid
         result['task'] = self.task.to_dict() if self.task else None
         return result
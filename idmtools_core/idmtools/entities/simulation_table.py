@@ -0,0 +1,530 @@
+"""
+Compact, column based representation of a large collection of simulations.
+
+A SimulationTable keeps simulation ids, statuses, names, directories, and tags in pandas/numpy columns and only builds
+:class:`~idmtools.entities.simulation.Simulation` objects when they are accessed. It is meant for read-mostly workflows
+(status checks, analysis, tag queries) on experiments that are already created, where holding one full Simulation per
+row would use far more memory than the data itself.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import weakref
+from collections import Counter
+from logging import getLogger
+from typing import Iterable, List, Dict, Any, Optional, Callable, Union, Iterator, TYPE_CHECKING
+import numpy as np
+import pandas as pd
+from idmtools.core import EntityStatus
+
+if TYPE_CHECKING:  # pragma: no cover
+    from idmtools.entities.iplatform import IPlatform
+    from idmtools.entities.simulation import Simulation
+
+logger = getLogger(__name__)
+
+#: Status values indexed by their code in the status column
+STATUS_VALUES = (None,) + tuple(EntityStatus)
+#: Status to code in the status column
+STATUS_CODES = {status: code for code, status in enumerate(STATUS_VALUES)}
+#: Tag columns with at most this fraction of distinct values are stored as categoricals
+CATEGORY_RATIO = 0.5
+
+SimulationFactory = Callable[['SimulationTable', int], 'Simulation']
+
+
+def categorize_columns(frame: pd.DataFrame, columns: Iterable[str] = None) -> pd.DataFrame:
+    """
+    Convert low cardinality string columns of a DataFrame to categoricals, in place.
+
+    Args:
+        frame: DataFrame
+        columns: Columns to consider. Defaults to all columns
+
+    Returns:
+        The DataFrame
+    """
+    n = len(frame)
+    for column in (frame.columns if columns is None else columns):
+        values = frame[column]
+        if values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+            try:
+                if values.nunique(dropna=True) <= CATEGORY_RATIO * n:
+                    frame[column] = values.astype('category')
+            except TypeError:
+                # unhashable values like lists stay as objects
+                pass
+    return frame
+
+
+def _to_python(value: Any) -> Any:
+    """
+    Convert numpy scalars from a DataFrame row to python values.
+
+    Args:
+        value: Value
+
+    Returns:
+        Python value
+    """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _is_missing(value: Any) -> bool:
+    """
+    Whether a tag value is missing (the simulation does not have the tag).
+
+    Args:
+        value: Value
+
+    Returns:
+        True if missing
+    """
+    return value is None or value is pd.NA or (isinstance(value, float) and value != value)
+
+
+class SimulationTable:
+    """
+    Column based collection of simulations that materializes Simulation objects lazily.
+
+    Simulations are built on access by *factory* (by default a plain Simulation with id, name, status, tags and
+    platform) and cached only while referenced. Status changes on materialized simulations are written back to the
+    table, and the number of simulations per status is maintained so experiment status checks do not scan the rows.
+    """
+
+    def __init__(self, ids: Iterable[str], statuses: Iterable[Optional[EntityStatus]] = None,
+                 names: Iterable[str] = None, tags: Union[Iterable[Dict[str, Any]], pd.DataFrame] = None,
+                 directories: Iterable[str] = None, platform: 'IPlatform' = None,
+                 factory: SimulationFactory = None):
+        """
+        Initialize the table.
+
+        Args:
+            ids: Simulation ids
+            statuses: Simulation statuses. Defaults to None for all
+            names: Simulation names
+            tags: Simulation tags, as a list of dictionaries or a DataFrame with one row per simulation
+            directories: Simulation directories
+            platform: Platform set on materialized simulations
+            factory: Function building a Simulation from a row of the table. Defaults to a plain Simulation
+        """
+        self._ids = pd.Index([str(i) for i in ids], dtype=object)
+        n = len(self._ids)
+        if statuses is None:
+            self._status = np.zeros(n, dtype=np.int8)
+        else:
+            self._status = np.fromiter((STATUS_CODES[s] for s in statuses), dtype=np.int8, count=n)
+        self._names = self._column(names, n, 'names')
+        self._directories = self._column(directories, n, 'directories')
+        self._tags = self._tag_frame(tags, n)
+        self.platform = platform
+        self.factory = factory
+        self.parent = None
+        self._status_counts = Counter()
+        self._materialized = weakref.WeakValueDictionary()
+        self._recount()
+
+    @staticmethod
+    def _column(values: Optional[Iterable], n: int, name: str) -> Optional[pd.Categorical]:
+        """
+        Build an optional string column.
+
+        Args:
+            values: Column values
+            n: Number of rows
+            name: Column name used in errors
+
+        Returns:
+            Categorical column or None
+        """
+        if values is None:
+            return None
+        column = pd.Categorical([None if v is None else str(v) for v in values])
+        if len(column) != n:
+            raise ValueError(f"Expected {n} {name}, got {len(column)}")
+        return column
+
+    @staticmethod
+    def _tag_frame(tags: Optional[Union[Iterable[Dict[str, Any]], pd.DataFrame]], n: int) -> pd.DataFrame:
+        """
+        Build the tags DataFrame. Low cardinality columns (typical for sweeps) are stored as categoricals.
+
+        Args:
+            tags: Tags
+            n: Number of rows
+
+        Returns:
+            DataFrame with one row per simulation
+        """
+        if tags is None:
+            return pd.DataFrame(index=pd.RangeIndex(n))
+        if isinstance(tags, pd.DataFrame):
+            frame = tags.reset_index(drop=True)
+        else:
+            tags = list(tags)
+            frame = pd.DataFrame(tags) if tags else pd.DataFrame(index=pd.RangeIndex(0))
+        if len(frame) != n:
+            raise ValueError(f"Expected {n} rows of tags, got {len(frame)}")
+        return categorize_columns(frame)
+
+    @classmethod
+    def from_simulations(cls, simulations: Iterable['Simulation'], platform: 'IPlatform' = None,
+                         factory: SimulationFactory = None) -> 'SimulationTable':
+        """
+        Build a table from simulation objects.
+
+        Args:
+            simulations: Simulations
+            platform: Platform set on materialized simulations. Defaults to the platform of the first simulation
+            factory: Function building a Simulation from a row of the table
+
+        Returns:
+            SimulationTable
+        """
+        ids, statuses, names, tags = [], [], [], []
+        for sim in simulations:
+            ids.append(sim.uid)
+            statuses.append(sim.status)
+            names.append(getattr(sim, 'name', None))
+            tags.append(sim.tags)
+            if platform is None:
+                platform = sim._platform
+        return cls(ids, statuses=statuses, names=names, tags=tags, platform=platform, factory=factory)
+
+    # region columns
+    @property
+    def ids(self) -> List[str]:
+        """
+        Simulation ids.
+
+        Returns:
+            List of ids
+        """
+        return list(self._ids)
+
+    @property
+    def statuses(self) -> List[Optional[EntityStatus]]:
+        """
+        Simulation statuses.
+
+        Returns:
+            List of statuses
+        """
+        return [STATUS_VALUES[code] for code in self._status]
+
+    @property
+    def tags(self) -> pd.DataFrame:
+        """
+        Simulation tags, indexed by simulation id.
+
+        Returns:
+            DataFrame
+        """
+        return self._tags.set_axis(self._ids, axis=0)
+
+    def get_directory(self, index: int) -> Optional[str]:
+        """
+        Directory of a simulation.
+
+        Args:
+            index: Row
+
+        Returns:
+            Directory or None when directories are not stored
+        """
+        if self._directories is None:
+            return None
+        value = self._directories[index]
+        return None if _is_missing(value) else value
+
+    def get_tags(self, index: int) -> Dict[str, Any]:
+        """
+        Tags of a simulation.
+
+        Args:
+            index: Row
+
+        Returns:
+            Dictionary of tags
+        """
+        if len(self._tags.columns) == 0:
+            return {}
+        row = self._tags.iloc[index]
+        return {k: _to_python(v) for k, v in row.items() if not _is_missing(v)}
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Whole table as a DataFrame with id, status, name, directory, and the tag columns.
+
+        Returns:
+            DataFrame
+        """
+        df = pd.DataFrame(dict(id=self._ids, status=pd.Categorical.from_codes(
+            self._status, categories=['None'] + [s.name for s in EntityStatus])))
+        if self._names is not None:
+            df['name'] = self._names
+        if self._directories is not None:
+            df['directory'] = self._directories
+        return pd.concat([df, self._tags.reset_index(drop=True)], axis=1)
+    # endregion
+
+    # region status
+    def _recount(self):
+        """
+        Rebuild the status counters from the status column.
+
+        Returns:
+            None
+        """
+        counts = np.bincount(self._status, minlength=len(STATUS_VALUES))
+        self._status_counts = Counter({STATUS_VALUES[code]: int(c) for code, c in enumerate(counts) if c})
+
+    def index_of(self, sim_id: str) -> int:
+        """
+        Row of a simulation.
+
+        Args:
+            sim_id: Simulation id
+
+        Returns:
+            Row
+
+        Raises:
+            KeyError - When the simulation is not in the table
+        """
+        return self._ids.get_loc(str(sim_id))
+
+    def set_status(self, sim: Union[int, str], status: Optional[EntityStatus]):
+        """
+        Set the status of a simulation without materializing it.
+
+        Args:
+            sim: Row or simulation id
+            status: New status
+
+        Returns:
+            None
+        """
+        index = sim if isinstance(sim, (int, np.integer)) else self.index_of(sim)
+        code = STATUS_CODES[status]
+        old_code = self._status[index]
+        if old_code == code:
+            return
+        self._status[index] = code
+        self._status_counts[STATUS_VALUES[old_code]] -= 1
+        if self._status_counts[STATUS_VALUES[old_code]] <= 0:
+            del self._status_counts[STATUS_VALUES[old_code]]
+        self._status_counts[status] += 1
+        materialized = self._materialized.get(int(index))
+        if materialized is not None:
+            # keeps any other container counting this simulation up to date
+            materialized.status = status
+
+    def update_statuses(self, statuses: Dict[str, Optional[EntityStatus]]):
+        """
+        Set the status of several simulations.
+
+        Args:
+            statuses: Dictionary of simulation id to status
+
+        Returns:
+            None
+        """
+        for sim_id, status in statuses.items():
+            self.set_status(sim_id, status)
+
+    def _on_child_status_changed(self, entity: 'Simulation', old_status: EntityStatus, new_status: EntityStatus):
+        """
+        Write back the status of a materialized simulation. Called by the simulation.
+
+        Args:
+            entity: Simulation whose status changed
+            old_status: Previous status
+            new_status: New status
+
+        Returns:
+            None
+        """
+        try:
+            self.set_status(self.index_of(entity.uid), new_status)
+        except KeyError:
+            logger.debug(f"Simulation {entity.uid} is no longer in the table")
+
+    @property
+    def status_counts(self) -> Counter:
+        """
+        Number of simulations per status.
+
+        Returns:
+            Counter of status to number of simulations
+        """
+        return self._status_counts
+
+    def validate_status_counts(self) -> bool:
+        """
+        Check the counters against the status column. Meant for tests and debugging.
+
+        Returns:
+            True if the counters match
+        """
+        counts = self._status_counts
+        self._recount()
+        valid = counts == self._status_counts
+        self._status_counts = counts
+        return valid
+    # endregion
+
+    # region materialization
+    def _default_factory(self, index: int) -> 'Simulation':
+        """
+        Build a plain Simulation from a row.
+
+        Args:
+            index: Row
+
+        Returns:
+            Simulation
+        """
+        from idmtools.entities.simulation import Simulation
+        sim = Simulation(task=None)
+        sim.uid = self._ids[index]
+        if self._names is not None and not _is_missing(self._names[index]):
+            sim.name = self._names[index]
+        sim.tags = self.get_tags(index)
+        if self.platform is not None:
+            sim.platform = self.platform
+        return sim
+
+    def materialize(self, index: int) -> 'Simulation':
+        """
+        Get the Simulation object of a row, building it if it is not already in use.
+
+        Args:
+            index: Row
+
+        Returns:
+            Simulation
+        """
+        index = int(index)
+        sim = self._materialized.get(index)
+        if sim is None:
+            sim = self.factory(self, index) if self.factory else self._default_factory(index)
+            sim.status = STATUS_VALUES[self._status[index]]
+            if self.parent is not None:
+                sim._parent = self.parent
+                sim.parent_id = sim.experiment_id = self.parent.uid
+            containers = sim.__dict__.get('_status_containers') or ()
+            object.__setattr__(sim, '_status_containers', containers + (weakref.ref(self),))
+            self._materialized[index] = sim
+        return sim
+
+    def append(self, simulation: 'Simulation'):
+        """
+        Add a simulation. Each append copies the columns, so this is meant for occasional use.
+
+        Args:
+            simulation: Simulation to add
+
+        Returns:
+            None
+        """
+        other = SimulationTable.from_simulations([simulation], platform=self.platform)
+        n = len(self)
+        self._ids = self._ids.append(other._ids)
+        self._status = np.concatenate([self._status, other._status])
+        if self._names is not None:
+            self._names = pd.Categorical(list(self._names) + list(other._names))
+        if self._directories is not None:
+            self._directories = pd.Categorical(list(self._directories) + [None])
+        self._tags = pd.concat([self._tags, other._tags], ignore_index=True)
+        self._status_counts[simulation.status] += 1
+        containers = simulation.__dict__.get('_status_containers') or ()
+        object.__setattr__(simulation, '_status_containers', containers + (weakref.ref(self),))
+        self._materialized[n] = simulation
+    # endregion
+
+    # region sequence protocol
+    def __len__(self) -> int:
+        """
+        Number of simulations.
+
+        Returns:
+            Number of rows
+        """
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator['Simulation']:
+        """
+        Iterate over materialized simulations.
+
+        Returns:
+            Iterator of Simulation
+        """
+        for index in range(len(self)):
+            yield self.materialize(index)
+
+    def __getitem__(self, item: Union[int, slice, str]) -> Union['Simulation', List['Simulation']]:
+        """
+        Get simulations by row, slice of rows, or simulation id.
+
+        Args:
+            item: Row, slice, or id
+
+        Returns:
+            Simulation or list of Simulations
+        """
+        if isinstance(item, slice):
+            return [self.materialize(i) for i in range(*item.indices(len(self)))]
+        if isinstance(item, str):
+            return self.materialize(self.index_of(item))
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("SimulationTable index out of range")
+        return self.materialize(item)
+
+    def __contains__(self, sim_id: str) -> bool:
+        """
+        Whether a simulation id is in the table.
+
+        Args:
+            sim_id: Simulation id
+
+        Returns:
+            True if present
+        """
+        return str(sim_id) in self._ids
+    # endregion
+
+    def __getstate__(self):
+        """
+        Drop the materialized simulations and the factory when pickling.
+
+        Returns:
+            State
+        """
+        state = self.__dict__.copy()
+        state['_materialized'] = None
+        state['factory'] = None
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore the table from a pickle.
+
+        Args:
+            state: State
+
+        Returns:
+            None
+        """
+        self.__dict__.update(state)
+        self._materialized = weakref.WeakValueDictionary()
+
+    def __repr__(self):
+        """
+        Table representation.
+
+        Returns:
+            String
+        """
+        return f"<SimulationTable {len(self)} simulations, tags: {list(self._tags.columns)}>"
@@ -7,11 +7,12 @@ Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 from typing import NoReturn, Type, TYPE_CHECKING, Dict, List
 from abc import ABC
-from dataclasses import dataclass, field, fields
+from dataclasses import dataclass, field
 from idmtools.core.interfaces.iitem import IItem
 from idmtools.core.interfaces.inamed_entity import INamedEntity
 from idmtools.core import ItemType, EntityContainer
 from idmtools.core.interfaces.irunnable_entity import IRunnableEntity
+from idmtools.utils.entities import get_metadata_field_plan
 
 if TYPE_CHECKING:  # pragma: no cover
     from idmtools.entities.iplatform import IPlatform
@@ -130,10 +131,7 @@ class Suite(INamedEntity, ABC, IRunnableEntity):
         Returns:
             Dictionary of suite.
         """
-        result = dict()
-        for f in fields(self):
-            if not f.name.startswith("_") and f.name not in ['parent']:
-                result[f.name] = getattr(self, f.name)
+        result = {f.name: getattr(self, f.name) for f in get_metadata_field_plan(self.__class__)}
         result['_uid'] = self.uid
         return result
 
@@ -136,8 +136,9 @@ class ExperimentParentIterator(typing.Iterator['Simulation']):  # noqa F821
         # Set parent
         item.parent = self.parent
 
+        from idmtools.entities.simulation_table import SimulationTable
         # Add to collection
-        if isinstance(self.items, (list, set)):
+        if isinstance(self.items, (list, set, SimulationTable)):
             self.items.append(item)
             return
         elif isinstance(self.items, TemplatedSimulations):
@@ -159,7 +160,8 @@ class ExperimentParentIterator(typing.Iterator['Simulation']):  # noqa F821
             ValueError when the underlying data object doesn't support adding additional item
         """
         from idmtools.entities.templated_simulation import TemplatedSimulations
-        if isinstance(self.items, (list, set)):
+        from idmtools.entities.simulation_table import SimulationTable
+        if isinstance(self.items, (list, set, SimulationTable)):
             # if it is a template, try to preserve so we can use generators
             if isinstance(item, TemplatedSimulations):
                 self.extend(list(item))
@@ -7,6 +7,7 @@ import ast
 import os
 import dataclasses
 import typing
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
 
@@ -68,6 +69,24 @@ def as_dict(src, exclude: typing.List[str] = None, exclude_private_fields: bool
     return result
 
 
+@lru_cache(maxsize=None)
+def get_metadata_field_plan(cls: type, exclude: typing.Tuple[str, ...] = ('parent',)) -> \
+        typing.Tuple[dataclasses.Field, ...]:
+    """
+    Get the fields of a dataclass serialized by to_dict: the public fields, less the excluded ones.
+
+    The plan is computed once per class, instead of walking the dataclass fields for each item.
+
+    Args:
+        cls: Dataclass
+        exclude: Names of the fields to exclude
+
+    Returns:
+        Fields to serialize, in declaration order
+    """
+    return tuple(f for f in dataclasses.fields(cls) if not f.name.startswith('_') and f.name not in exclude)
+
+
 def validate_user_inputs_against_dataclass(field_type, field_value):
     """
     Validates user entered data against dataclass fields and types.
@@ -3,11 +3,12 @@ Filtering utility.
 
 Copyright 2025, Gates Foundation. All rights reserved.
 """
+from typing import Iterable, Optional, Set
 from idmtools.core import ItemType, EntityStatus
 from idmtools.core.interfaces.ientity import IEntity
 from idmtools.entities.experiment import Experiment
 from idmtools.entities.iplatform import IPlatform
-from idmtools.utils.general import parse_value_tags
+from idmtools.utils.tag_index import TagIndex
 
 
 class FilterItem:
@@ -23,6 +24,8 @@ class FilterItem:
 
         By default, this filters simulations that have a status of `EntityStatus.SUCCEEDED`.
         Additional filtering can be applied by specifying tag values or tag-based conditions.
+        Simulations are matched through a tag index (see :class:`~idmtools.utils.tag_index.TagIndex`) built from the
+        current tags of the experiment on each call, so the tags are parsed once per call whatever the filters.
 
         This method supports:
             - Skipping specific simulations by ID
@@ -33,6 +36,7 @@ class FilterItem:
             >>> filter_item(platform, experiment, status=EntityStatus.FAILED)
             >>> filter_item(platform, experiment, tags={"Run_Number": "2"})
             >>> filter_item(platform, experiment, tags={"Run_Number": lambda v: 2 <= v <= 10})
+            >>> filter_item(platform, experiment, tags={"Run_Number": TagRange(2, 10)})
             >>> filter_item(platform, experiment, tags={"Coverage": 0.8}, status=EntityStatus.SUCCEEDED)
             >>> filter_item(platform, experiment, tags={"Coverage": 0.8}, max_simulations=10)
 
@@ -43,9 +47,12 @@ class FilterItem:
                 * A fixed value (e.g., {"Run_Number": 2})
                 * A lambda or callable function for conditional logic
                 (e.g., {"Run_Number": lambda v: 2 <= v <= 10})
+                * A TagRange or TagIn predicate, which use the sorted/hashed values of the index
+                (e.g., {"Run_Number": TagRange(2, 10)})
+                * Ellipsis (...) to match the presence of the tag only
             status (EntityStatus, Optional): The experiment's status.
             entity_type (bool, optional): If True, return simulation entities instead of just their IDs.
-            skip_sims (list, optional): A list of simulation IDs (as strings) to exclude from the results.
+            skip_sims (list or set, optional): Simulation IDs (as strings) to exclude from the results.
             max_simulations (int, optional): Maximum number of simulations to return. Returns all if not set.
             **kwargs: Extra args.
 
@@ -58,66 +65,16 @@ class FilterItem:
             each value is a list of simulation IDs or simulation entities (depending on the `entity_type` flag).
 
         """
-        def match_tags(sim: IEntity, tags=None):
-            """
-            Check if simulation match tags.
-
-            Args:
-                sim: simulation
-                tags: search tags
-
-            Returns: bool True/False
-            """
-            # If no tags are provided, treat it as an empty filter (match all)
-            if tags is None:
-                return True
-            # Normalize simulation tag values and wrap them with TagValue for safe comparisons
-            # (e.g., allows "5" == 5 and supports operators like >, <, == in tag filters)
-            sim_tags = parse_value_tags(sim.tags, wrap_with_tagvalue=True)
-
-            # Iterate over each tag filter condition
-            for k, v in tags.items():
-                sim_val = sim_tags.get(k)
-                # If the simulation does not have the tag, skip it
-                if sim_val is None:
-                    return False
-                # If the filter value is a callable (e.g., lambda), evaluate the condition
-                if callable(v):
-                    if not v(sim_val):
-                        return False
-                # Otherwise, do a direct comparison between the simulation tag and expected value
-                elif sim_val != v:
-                    return False
-
-            return True
-
         if item.item_type not in [ItemType.EXPERIMENT, ItemType.SUITE]:
             raise ValueError("This method only supports Experiment and Suite types!")
 
-        if skip_sims is None:
-            skip_sims = []
+        skip_sims = FilterItem._skip_set(skip_sims)
         # ------------------------------------------------------------------ #
         # Base case  ─ Experiment
         # ------------------------------------------------------------------ #
         if isinstance(item, Experiment):
-            potential_sims = item.get_simulations()
-
-            # filter by status
-            sims_status_filtered = [sim for sim in potential_sims if sim.status == status] if status else potential_sims
-
-            # filter tags
-            sims_tags_filtered = [sim for sim in sims_status_filtered if match_tags(sim, tags)]
-
-            # filter sims
-            sims_id_filtered = [sim for sim in sims_tags_filtered if str(sim.uid) not in skip_sims]
-
-            # consider max_simulations for return
-            sims_final = sims_id_filtered[0:max_simulations if max_simulations else len(sims_id_filtered)]
-
-            if entity_type:
-                return sims_final
-            else:
-                return [s.id for s in sims_final]
+            return TagIndex(item).filter(tags=tags, status=status, entity_type=entity_type, skip_sims=skip_sims,
+                                         max_simulations=max_simulations)
 
         # Suite case:
         experiments = item.get_experiments()
@@ -154,7 +111,7 @@ class FilterItem:
             tags (dict, optional): A simulation's tags to filter by.
             status (EntityStatus, Optional): The experiment's status.
             entity_type (bool, optional): If True, return simulation entities instead of just their IDs.
-            skip_sims (List[str], optional): List of simulation IDs to skip during filtering. Defaults to an empty list.
+            skip_sims (list or set, optional): Simulation IDs to skip during filtering. Defaults to none.
             max_simulations (int, optional): Maximum number of simulations to return. Defaults to None (no limit).
             **kwargs: Additional keyword arguments passed to `filter_item()`.
 
@@ -169,8 +126,6 @@ class FilterItem:
         Raises:
             ValueError: If the provided `item_type` is not Experiment or Suite.
         """
-        if skip_sims is None:
-            skip_sims = []
         if item_type not in [ItemType.EXPERIMENT, ItemType.SUITE]:
             raise ValueError("This method only supports Experiment and Suite types!")
 
@@ -180,3 +135,18 @@ class FilterItem:
         # filter simulations
         return cls.filter_item(platform, item=item, tags=tags, status=status, entity_type=entity_type,
                                skip_sims=skip_sims, max_simulations=max_simulations, **kwargs)
+
+    @staticmethod
+    def _skip_set(skip_sims: Optional[Iterable[str]]) -> Set[str]:
+        """
+        Convert the simulation ids to skip to a set for constant time lookups.
+
+        Args:
+            skip_sims: Simulation ids
+
+        Returns:
+            Set of simulation ids as strings
+        """
+        if not skip_sims:
+            return set()
+        return {str(sim_id) for sim_id in skip_sims}
@@ -5,9 +5,11 @@ Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import json
 from enum import Enum
+from functools import lru_cache, partial
 from json import JSONEncoder
 from logging import getLogger
-from typing import List, Any, Dict, Union
+from operator import attrgetter, methodcaller
+from typing import List, Any, Dict, Union, Callable
 from uuid import UUID
 from idmtools.assets import AssetCollection, Asset
 from idmtools.core import EntityStatus
@@ -21,6 +23,50 @@ from datetime import datetime
 user_logger = getLogger('user')
 
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Use orjson to write JSON when it is installed
+USE_ORJSON = orjson is not None
+
+
+def _encode_task(o: ITask) -> Dict:
+    result = o.to_dict()
+    result["task_type"] = o.__class__.__name__
+    return result
+
+
+def _encode_unknown(o: Any) -> None:
+    return None
+
+
+# How IDMJSONEncoder encodes the types JSON does not know, checked in order
+_DEFAULT_ENCODERS = (
+    (Enum, attrgetter('value')),
+    (EntityStatus, attrgetter('value')),
+    (Experiment, methodcaller('to_dict')),
+    (Simulation, methodcaller('to_dict')),
+    (ITask, _encode_task),
+    (bytes, _encode_unknown),
+    ((CommandLine, UUID), str),
+    (Asset, partial(as_dict, exclude=['content'])),
+    (AssetCollection, attrgetter('assets')),
+    ((dict, int, list, str), lambda o: o),
+    (datetime, str),
+)
+
+
+@lru_cache(maxsize=None)
+def _get_default_encoder(cls: type) -> Callable[[Any], Any]:
+    """Find the encoder of a class once, instead of walking the isinstance chain for each object."""
+    for types, encoder in _DEFAULT_ENCODERS:
+        if issubclass(cls, types):
+            return encoder
+    return _encode_unknown
+
+
 class IDMJSONEncoder(JSONEncoder):
     """
     IDMJSONEncoder handles encoding IDM specific items.
@@ -37,30 +83,110 @@ class IDMJSONEncoder(JSONEncoder):
         Returns:
             JSON encoded object
         """
-        if isinstance(o, Enum):
-            return o.value
-        elif isinstance(o, EntityStatus):
-            return o.value
-        elif isinstance(o, Experiment):
-            return o.to_dict()
-        elif isinstance(o, Simulation):
-            return o.to_dict()
-        elif isinstance(o, ITask):
-            result = o.to_dict()
-            result["task_type"] = o.__class__.__name__
-            return result
-        elif isinstance(o, bytes):
-            return None
-        elif isinstance(o, (CommandLine, UUID)):
-            return str(o)
-        elif isinstance(o, Asset):
-            return as_dict(o, exclude=['content'])
-        elif isinstance(o, AssetCollection):
-            return o.assets
-        elif isinstance(o, (dict, int, list, str)):
-            return o
-        elif isinstance(o, datetime):
-            return str(o)
+        return _get_default_encoder(o.__class__)(o)
+
+
+_NATIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _json_key(key: Any) -> str:
+    """Convert a dictionary key the way json.dumps does."""
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        if key != key:
+            return 'NaN'
+        if key in (float('inf'), float('-inf')):
+            return 'Infinity' if key > 0 else '-Infinity'
+        return float.__repr__(key)
+    raise TypeError(f'keys must be str, int, float, bool or None, not {key.__class__.__name__}')
+
+
+def _convert_dict(o: Dict) -> Dict:
+    # plain values are kept inline, without looking their converter up
+    return {
+        k if k.__class__ is str else _json_key(k): v if v.__class__ in _NATIVE_TYPES else _get_converter(v.__class__)(v)
+        for k, v in o.items()
+    }
+
+
+def _convert_list(o: Union[list, tuple]) -> List:
+    return [v if v.__class__ in _NATIVE_TYPES else _get_converter(v.__class__)(v) for v in o]
+
+
+def _convert_default(o: Any) -> Any:
+    encoded = _get_default_encoder(o.__class__)(o)
+    return _get_converter(encoded.__class__)(encoded)
+
+
+@lru_cache(maxsize=None)
+def _get_converter(cls: type) -> Callable[[Any], Any]:
+    """Plan how objects of a class become JSON ready, in the order json.dumps checks the types."""
+    if cls in _NATIVE_TYPES:
+        return lambda o: o
+    if issubclass(cls, str):
+        return str.__str__
+    if issubclass(cls, int):
+        return int.__int__
+    if issubclass(cls, float):
+        return float.__float__
+    if issubclass(cls, (list, tuple)):
+        return _convert_list
+    if issubclass(cls, dict):
+        return _convert_dict
+    return _convert_default
+
+
+def to_json_ready(o: Any) -> Any:
+    """
+    Convert an object to plain dicts, lists and scalars in one pass.
+
+    The result is the same as json.loads(json.dumps(o, cls=IDMJSONEncoder)), without encoding and decoding the JSON
+    text. The way each class is converted is planned once per class.
+
+    Args:
+        o: Object to convert
+
+    Returns:
+        JSON ready object
+
+    Raises:
+        TypeError: if a dictionary has keys JSON does not support
+    """
+    return _get_converter(o.__class__)(o)
+
+
+def dumps_json(o: Any, indent: int = None, json_ready: bool = False) -> str:
+    """
+    Serialize an object to JSON, with orjson when it is installed.
+
+    orjson writes compact JSON without spaces, and NaN and infinite floats as null.
+
+    Args:
+        o: Object to serialize. IDM specific items are encoded like IDMJSONEncoder does
+        indent: indent level for pretty printing. None for compact JSON
+        json_ready: True when the object is already made of plain JSON types, see :func:`to_json_ready`
+
+    Returns:
+        JSON text
+    """
+    data = o if json_ready else to_json_ready(o)
+    # orjson only indents by 2 spaces
+    if USE_ORJSON and indent in (None, 2):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+        except (orjson.JSONEncodeError, TypeError):
+            # integers over 64 bits for example
+            pass
+    return json.dumps(data, indent=indent)
 
 
 def load_json_file(path: str) -> Union[Dict[Any, Any], List]:
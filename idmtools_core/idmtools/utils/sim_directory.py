@@ -0,0 +1,121 @@
+"""
+Build and save the simulation directory table (tags, simulation id, and output path of each simulation).
+
+Platforms provide the rows as (simulation id, tags, output path) records gathered in a single pass. The records are
+turned into column arrays, without copying the tags, and each tag column gets a proper dtype. Saving can stream the
+records in chunks so the whole table never has to be held in memory.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import os
+import tempfile
+from logging import getLogger
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import pandas as pd
+from idmtools.analysis.append_writer import AppendOnlyWriter
+from idmtools.entities.simulation_table import categorize_columns
+
+logger = getLogger(__name__)
+
+#: A simulation directory record: simulation id, tags, and output path
+SimDirectoryRecord = Tuple[str, Dict[str, Any], str]
+ID_COLUMN = 'simid'
+PATH_COLUMN = 'outpath'
+
+
+def _frame(ids: List[str], paths: List[str], tag_columns: Dict[str, List[Any]]) -> pd.DataFrame:
+    """
+    Build a DataFrame from column arrays.
+
+    Args:
+        ids: Simulation ids
+        paths: Output paths
+        tag_columns: Tag values per tag name, None where a simulation does not have the tag
+
+    Returns:
+        DataFrame with the tag columns followed by simid and outpath
+    """
+    frame = pd.DataFrame(tag_columns) if tag_columns else pd.DataFrame(index=pd.RangeIndex(len(ids)))
+    categorize_columns(frame)
+    frame[ID_COLUMN] = ids
+    frame[PATH_COLUMN] = paths
+    return frame
+
+
+def iter_sim_directory_frames(records: Iterable[SimDirectoryRecord], chunk_size: Optional[int] = None) \
+        -> Iterator[pd.DataFrame]:
+    """
+    Convert simulation directory records to DataFrames.
+
+    Args:
+        records: Records of (simulation id, tags, output path)
+        chunk_size: Maximum number of rows per DataFrame. None for a single DataFrame
+
+    Returns:
+        Iterator of DataFrames. At least one DataFrame is produced, even when there are no records
+    """
+    ids, paths, tag_columns = [], [], {}
+    produced = False
+    for sim_id, tags, path in records:
+        row = len(ids)
+        ids.append(sim_id)
+        paths.append(path)
+        for key, value in tags.items():
+            if key in (ID_COLUMN, PATH_COLUMN):
+                continue
+            column = tag_columns.get(key)
+            if column is None:
+                column = tag_columns[key] = [None] * row
+            column.append(value)
+        for column in tag_columns.values():
+            if len(column) == row:
+                column.append(None)
+        if chunk_size and len(ids) >= chunk_size:
+            yield _frame(ids, paths, tag_columns)
+            produced = True
+            ids, paths, tag_columns = [], [], {}
+    if ids or not produced:
+        yield _frame(ids, paths, tag_columns)
+
+
+def build_sim_directory_df(records: Iterable[SimDirectoryRecord]) -> pd.DataFrame:
+    """
+    Build the simulation directory DataFrame.
+
+    Args:
+        records: Records of (simulation id, tags, output path)
+
+    Returns:
+        DataFrame with one row per simulation. Repeated string tags are categoricals
+    """
+    return next(iter_sim_directory_frames(records))
+
+
+def save_sim_directory_records(records: Iterable[SimDirectoryRecord], destination: str, output_format: str = 'csv',
+                               header: bool = False, chunk_size: int = 10000) -> str:
+    """
+    Write simulation directory records to csv or parquet, *chunk_size* rows at a time.
+
+    Each chunk is written to a part file as soon as it is complete, then the parts are combined (see
+    :class:`~idmtools.analysis.append_writer.AppendOnlyWriter`). Columns are aligned when some chunks have tags that
+    others do not, and the parquet parts are rewritten with a common dtype per column when the chunks differ.
+
+    Args:
+        records: Records of (simulation id, tags, output path)
+        destination: Output file. For parquet, a dataset directory readable with `pd.read_parquet`
+        output_format: csv or parquet
+        header: Write the csv header line
+        chunk_size: Number of rows per chunk
+
+    Returns:
+        The destination
+    """
+    writer = AppendOnlyWriter('', output_format=output_format, id_column=None)
+    writer.parts_dir = tempfile.mkdtemp(prefix='.sim_directory_', dir=os.path.dirname(os.path.abspath(destination)))
+    try:
+        parts = [writer.write(f'{i:08d}', frame)
+                 for i, frame in enumerate(iter_sim_directory_frames(records, chunk_size=chunk_size))]
+        logger.debug(f"Writing {len(parts)} chunks of simulation directories to {destination}")
+        return writer.finalize(parts, destination, header=header)
+    finally:
+        writer.cleanup()
@@ -0,0 +1,342 @@
+"""
+Inverted tag index used to filter the simulations of an experiment by tags and status.
+
+The index is built once per experiment: every tag value is normalized the same way as
+:func:`~idmtools.utils.general.parse_value_tags` does, then stored in a hash table (value -> rows) for equality
+lookups and, for numeric values, in a sorted array for range lookups. An index is a snapshot of the tags: it is
+built for one filtering call and is not kept, so tags changed afterwards are never missed.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import json
+from dataclasses import dataclass
+from numbers import Number
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING, Union
+import numpy as np
+from idmtools.core import EntityStatus
+from idmtools.core.interfaces.entity_container import EntityContainer
+from idmtools.entities.simulation_table import SimulationTable, STATUS_CODES
+from idmtools.utils.general import CustomDecoder, SetEncoder, TagValue
+
+if TYPE_CHECKING:  # pragma: no cover
+    from idmtools.entities.experiment import Experiment
+    from idmtools.entities.simulation import Simulation
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def normalize_tag_value(value: Any) -> Any:
+    """
+    Normalize a tag value like parse_value_tags does ("5" -> 5, "true" -> True, sets -> lists, etc).
+
+    Args:
+        value: Raw tag value
+
+    Returns:
+        Normalized value
+    """
+    if isinstance(value, str):
+        return CustomDecoder.denormalize_tag_value(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, set):
+        value = list(value)
+    return json.loads(json.dumps({"v": value}, cls=SetEncoder), cls=CustomDecoder)["v"]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, Number) and not isinstance(value, complex) and value == value
+
+
+@dataclass(frozen=True)
+class TagRange:
+    """
+    Range predicate for a tag filter. Uses the sorted values of the tag index instead of calling a function per value.
+
+    Examples:
+        >>> experiment.get_simulations_by_tags(tags={"Run_Number": TagRange(2, 10)})
+        >>> experiment.get_simulations_by_tags(tags={"Coverage": TagRange(lower=0.5, include_lower=False)})
+
+    Args:
+        lower: Lower bound. None for no lower bound
+        upper: Upper bound. None for no upper bound
+        include_lower: Include the lower bound
+        include_upper: Include the upper bound
+    """
+    lower: Any = None
+    upper: Any = None
+    include_lower: bool = True
+    include_upper: bool = True
+
+    def __call__(self, value: Any) -> bool:
+        """
+        Check a value against the range. Values that cannot be compared to the bounds do not match.
+
+        Args:
+            value: Tag value or TagValue
+
+        Returns:
+            True if the value is within the range
+        """
+        value = normalize_tag_value(value.raw if isinstance(value, TagValue) else value)
+        lower, upper = normalize_tag_value(self.lower), normalize_tag_value(self.upper)
+        try:
+            if lower is not None and (value < lower or (not self.include_lower and value == lower)):
+                return False
+            if upper is not None and (value > upper or (not self.include_upper and value == upper)):
+                return False
+        except TypeError:
+            return False
+        return True
+
+    @property
+    def numeric(self) -> bool:
+        """
+        Whether the bounds are numbers, so the sorted numeric values of the index can be used.
+
+        Returns:
+            True if all the bounds are numbers
+        """
+        bounds = [normalize_tag_value(b) for b in (self.lower, self.upper) if b is not None]
+        return all(_is_number(b) for b in bounds)
+
+
+@dataclass(frozen=True, init=False)
+class TagIn:
+    """
+    Membership predicate for a tag filter.
+
+    Examples:
+        >>> experiment.get_simulations_by_tags(tags={"Scenario": TagIn("baseline", "campaign")})
+
+    Args:
+        values: Accepted values
+    """
+    values: Tuple[Any, ...]
+
+    def __init__(self, *values: Any):  # noqa D107
+        if len(values) == 1 and isinstance(values[0], (list, tuple, set, frozenset)):
+            values = tuple(values[0])
+        object.__setattr__(self, "values", values)
+
+    def __call__(self, value: Any) -> bool:
+        """
+        Check if a value is one of the accepted values.
+
+        Args:
+            value: Tag value or TagValue
+
+        Returns:
+            True if the value matches one of the values
+        """
+        value = value if isinstance(value, TagValue) else TagValue(value)
+        return any(value == v for v in self.values)
+
+
+class _TagColumn:
+    """
+    Rows of the experiment holding a tag, grouped by normalized value.
+    """
+
+    def __init__(self):  # noqa D107
+        self.rows_by_value: Dict[Any, Union[List[int], np.ndarray]] = {}
+        #: Rows whose value cannot be hashed (lists, dicts). They are compared one by one
+        self.unhashable: List[Tuple[int, Any]] = []
+        self._numbers: Optional[np.ndarray] = None
+        self._number_rows: Optional[List[np.ndarray]] = None
+
+    def add(self, row: int, value: Any):
+        try:
+            self.rows_by_value.setdefault(value, []).append(row)
+        except TypeError:
+            self.unhashable.append((row, value))
+
+    def freeze(self):
+        self.rows_by_value = {k: np.asarray(v, dtype=np.int64) for k, v in self.rows_by_value.items()}
+
+    def _sorted_numbers(self) -> Tuple[np.ndarray, List[np.ndarray]]:
+        if self._numbers is None:
+            numbers = sorted((k for k in self.rows_by_value if _is_number(k)), key=float)
+            self._numbers = np.asarray([float(k) for k in numbers], dtype=np.float64)
+            self._number_rows = [self.rows_by_value[k] for k in numbers]
+        return self._numbers, self._number_rows
+
+    def all_rows(self) -> np.ndarray:
+        parts = list(self.rows_by_value.values()) + [np.asarray([r for r, _ in self.unhashable], dtype=np.int64)]
+        return np.sort(np.concatenate(parts)) if parts else _EMPTY
+
+    def _where(self, predicate: Callable[[Any], bool], hashed: bool = True) -> np.ndarray:
+        parts = [rows for value, rows in self.rows_by_value.items() if predicate(value)] if hashed else []
+        others = [row for row, value in self.unhashable if predicate(value)]
+        if others:
+            parts.append(np.asarray(others, dtype=np.int64))
+        return np.sort(np.concatenate(parts)) if parts else _EMPTY
+
+    def _equal(self, value: Any) -> np.ndarray:
+        value = CustomDecoder.denormalize_tag_value(value)
+        try:
+            parts = [self.rows_by_value.get(value, _EMPTY)]
+        except TypeError:
+            return self._where(lambda v: v == value)
+        if self.unhashable:
+            parts.append(self._where(lambda v: v == value, hashed=False))
+        return np.sort(np.concatenate(parts)) if len(parts) > 1 else parts[0]
+
+    def _range(self, predicate: TagRange) -> np.ndarray:
+        if not predicate.numeric:
+            return self._where(predicate)
+        numbers, rows = self._sorted_numbers()
+        start, stop = 0, len(numbers)
+        if predicate.lower is not None:
+            lower = float(normalize_tag_value(predicate.lower))
+            start = np.searchsorted(numbers, lower, side="left" if predicate.include_lower else "right")
+        if predicate.upper is not None:
+            upper = float(normalize_tag_value(predicate.upper))
+            stop = np.searchsorted(numbers, upper, side="right" if predicate.include_upper else "left")
+        parts = rows[start:stop]
+        return np.sort(np.concatenate(parts)) if parts else _EMPTY
+
+    def match(self, value: Any) -> np.ndarray:
+        """
+        Rows matching a filter value.
+
+        Args:
+            value: Filter value. A fixed value, Ellipsis for presence only, a TagRange, TagIn, or a callable receiving
+                a TagValue
+
+        Returns:
+            Sorted array of rows
+        """
+        if value is Ellipsis:
+            return self.all_rows()
+        if isinstance(value, TagRange):
+            return self._range(value)
+        if isinstance(value, TagIn):
+            parts = [self._equal(v) for v in value.values]
+            return np.unique(np.concatenate(parts)) if parts else _EMPTY
+        if callable(value):
+            return self._where(lambda v: value(TagValue(v)))
+        return self._equal(value)
+
+
+class TagIndex:
+    """
+    Inverted tag index of the simulations of an experiment.
+
+    Filtering semantics are the ones of :meth:`FilterItem.filter_item
+    <idmtools.utils.filter_simulations.FilterItem.filter_item>`: a simulation without a filtered tag never matches,
+    values are compared after normalization, and results keep the order of the experiment's simulations. Statuses are
+    read from the simulations when a query runs, so refreshing the experiment status does not require a new index.
+
+    Args:
+        experiment: Experiment to index
+    """
+
+    def __init__(self, experiment: 'Experiment'):  # noqa D107
+        self.experiment = experiment
+        items = experiment.simulations.items
+        if isinstance(items, (EntityContainer, SimulationTable)):
+            self._simulations = items
+        else:
+            # Templated or generated simulations: keep the simulations produced while indexing
+            self._simulations = list(experiment.simulations)
+        self._columns: Dict[str, _TagColumn] = {}
+        if isinstance(self._simulations, SimulationTable):
+            self.ids = self._simulations.ids
+            self._index_table(self._simulations)
+        else:
+            self.ids = [sim.id for sim in self._simulations]
+            self._index_tags(sim.tags for sim in self._simulations)
+        for column in self._columns.values():
+            column.freeze()
+
+    def __len__(self) -> int:
+        """
+        Number of indexed simulations.
+
+        Returns:
+            Number of simulations
+        """
+        return len(self.ids)
+
+    def _column(self, key: str) -> _TagColumn:
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = _TagColumn()
+        return column
+
+    def _index_tags(self, all_tags: Iterable[Dict[str, Any]]):
+        for row, tags in enumerate(all_tags):
+            for key, value in (tags or {}).items():
+                self._column(key).add(row, normalize_tag_value(value))
+
+    def _index_table(self, table: SimulationTable):
+        for key in table.tags.columns:
+            column = self._column(key)
+            normalized = {}
+            for row, value in enumerate(table.tags[key].tolist()):
+                if value is None or (isinstance(value, float) and value != value):
+                    continue
+                try:
+                    value = normalized[value]
+                except KeyError:
+                    value = normalized[value] = normalize_tag_value(value)
+                except TypeError:
+                    value = normalize_tag_value(value)
+                column.add(row, value)
+
+    def _statuses_equal(self, rows: np.ndarray, status: EntityStatus) -> np.ndarray:
+        if isinstance(self._simulations, SimulationTable):
+            return self._simulations._status[rows] == STATUS_CODES[status]
+        return np.fromiter((self._simulations[row].status == status for row in rows), dtype=bool, count=len(rows))
+
+    def match(self, tags: Optional[Dict[str, Any]] = None, status: EntityStatus = None) -> np.ndarray:
+        """
+        Rows matching all the tag filters and the status.
+
+        Args:
+            tags: Tag filters
+            status: Status to match
+
+        Returns:
+            Sorted array of rows
+        """
+        rows = None
+        for key, value in (tags or {}).items():
+            column = self._columns.get(key)
+            matched = column.match(value) if column is not None else _EMPTY
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+            if len(rows) == 0:
+                return rows
+        if rows is None:
+            rows = np.arange(len(self.ids), dtype=np.int64)
+        if status:
+            rows = rows[self._statuses_equal(rows, status)]
+        return rows
+
+    def filter(self, tags: Optional[Dict[str, Any]] = None, status: EntityStatus = None, entity_type: bool = False,
+               skip_sims: Optional[Set[str]] = None, max_simulations: int = None) -> List[Union[str, 'Simulation']]:
+        """
+        Filter the simulations of the experiment.
+
+        Args:
+            tags: Tag filters. See :meth:`TagIndex.match`
+            status: Status to match
+            entity_type: If True, return simulations instead of ids
+            skip_sims: Ids of simulations to exclude
+            max_simulations: Maximum number of simulations to return
+
+        Returns:
+            List of simulation ids or simulations
+        """
+        rows = self.match(tags, status)
+        result = []
+        for row in rows.tolist():
+            if skip_sims and self.ids[row] in skip_sims:
+                continue
+            result.append(row)
+            if max_simulations and len(result) >= max_simulations:
+                break
+        if entity_type:
+            return [self._simulations[row] for row in result]
+        return [self.ids[row] for row in result]
@@ -0,0 +1,237 @@
+"""
+Here we implement a rendering service for jinja2 templates.
+
+Platforms render the same script templates for every experiment and simulation. The service loads and compiles each
+template once per process, keeping it until the file changes, and jinja2 stores the compiled code in the idmtools
+cache directory so later runs skip the compilation too.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from logging import getLogger, DEBUG
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from jinja2 import BaseLoader, Environment, FileSystemBytecodeCache, Template, TemplateNotFound
+
+logger = getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+
+class _PathLoader(BaseLoader):
+    """
+    Load templates by their path on disk, so the compiled code goes through the bytecode cache of the environment.
+    """
+
+    def get_source(self, environment: Environment, template: str) -> Tuple[str, str, None]:
+        try:
+            with open(template) as tin:
+                source = tin.read()
+        except OSError:
+            raise TemplateNotFound(template)
+        # The renderer checks the modification time itself
+        return source, template, None
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+@dataclass(repr=False)
+class TemplateRenderer:
+    """
+    Render jinja2 templates, compiling each template once.
+    """
+    #: Directory of the compiled templates. Defaults to the jinja2 directory of the idmtools cache directory
+    bytecode_cache_directory: Optional[str] = field(default=None)
+    #: Whether compiled templates are stored on disk to be reused by later runs
+    bytecode_cache: bool = field(default=True)
+    #: Number of templates built from strings kept in memory
+    string_cache_size: int = field(default=64)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._templates: Dict[str, Tuple[int, Template]] = dict()
+        self._strings: 'OrderedDict[str, Template]' = OrderedDict()
+        self._environment = None
+
+    @property
+    def environment(self) -> Environment:
+        """The jinja2 environment compiling the templates, created on first use."""
+        if self._environment is None:
+            # Same options as jinja2.Template, so the output does not change. Templates are cached by the renderer
+            self._environment = Environment(loader=_PathLoader(), cache_size=0,
+                                            bytecode_cache=self._get_bytecode_cache())
+        return self._environment
+
+    def _get_bytecode_cache(self) -> Optional[FileSystemBytecodeCache]:
+        if not self.bytecode_cache:
+            return None
+        if self.bytecode_cache_directory is None:
+            from idmtools import IdmConfigParser
+            from idmtools.core import IDMTOOLS_USER_HOME
+            self.bytecode_cache_directory = os.path.join(
+                str(IdmConfigParser.get_option(option="cache_directory",
+                                               fallback=IDMTOOLS_USER_HOME.joinpath("cache"))), 'jinja2')
+        try:
+            os.makedirs(self.bytecode_cache_directory, exist_ok=True)
+        except OSError as ex:
+            logger.debug(f"Cannot create the template cache directory {self.bytecode_cache_directory}: {ex}")
+            return None
+        return FileSystemBytecodeCache(self.bytecode_cache_directory)
+
+    def get_template(self, path: PathLike) -> Template:
+        """
+        Get the compiled template of a file.
+
+        Args:
+            path: Path of the template
+
+        Returns:
+            The template, compiled again only when the file changed since it was last loaded
+
+        Raises:
+            TemplateNotFound: if the file does not exist
+        """
+        path = os.path.abspath(path)
+        mtime = _mtime(path)
+        with self._lock:
+            cached = self._templates.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f"Compiling template {path}")
+            template = self.environment.get_template(path)
+            self._templates[path] = (mtime, template)
+            return template
+
+    def from_string(self, source: str) -> Template:
+        """
+        Get the compiled template of a string.
+
+        Args:
+            source: Source of the template
+
+        Returns:
+            The template, compiled once for the most recently used sources
+        """
+        with self._lock:
+            template = self._strings.get(source)
+            if template is not None:
+                self._strings.move_to_end(source)
+                return template
+            template = self.environment.from_string(source)
+            self._strings[source] = template
+            if len(self._strings) > self.string_cache_size:
+                self._strings.popitem(last=False)
+            return template
+
+    def render(self, path: PathLike, context: Dict[str, Any] = None, **kwargs) -> str:
+        """
+        Render a template file.
+
+        Args:
+            path: Path of the template
+            context: Variables of the template
+            kwargs: More variables of the template
+
+        Returns:
+            Rendered template
+        """
+        return self.get_template(path).render(context or dict(), **kwargs)
+
+    def render_many(self, path: PathLike, contexts: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Render a template file for many contexts, looking the template up once.
+
+        Args:
+            path: Path of the template
+            contexts: Variables of the template for each rendering
+
+        Returns:
+            Rendered templates, in the order of the contexts
+        """
+        template = self.get_template(path)
+        return [template.render(context) for context in contexts]
+
+    def render_to_file(self, path: PathLike, output: PathLike, context: Dict[str, Any] = None, **kwargs) -> None:
+        """
+        Render a template file and write the result.
+
+        Args:
+            path: Path of the template
+            output: Path of the rendered file
+            context: Variables of the template
+            kwargs: More variables of the template
+
+        Returns:
+            None
+        """
+        content = self.render(path, context, **kwargs)
+        with open(output, "w") as tout:
+            tout.write(content)
+
+    def clear(self):
+        """
+        Forget the templates compiled by this process. The bytecode cache on disk is kept.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._templates.clear()
+            self._strings.clear()
+
+
+_RENDERER: Optional[TemplateRenderer] = None
+_RENDERER_LOCK = threading.Lock()
+
+
+def get_renderer() -> TemplateRenderer:
+    """
+    Get the template renderer shared by the process.
+
+    Returns:
+        TemplateRenderer
+    """
+    global _RENDERER
+    if _RENDERER is None:
+        with _RENDERER_LOCK:
+            if _RENDERER is None:
+                _RENDERER = TemplateRenderer()
+    return _RENDERER
+
+
+def render_template(path: PathLike, context: Dict[str, Any] = None, **kwargs) -> str:
+    """
+    Render a template file with the shared renderer.
+
+    Args:
+        path: Path of the template
+        context: Variables of the template
+        kwargs: More variables of the template
+
+    Returns:
+        Rendered template
+    """
+    return get_renderer().render(path, context, **kwargs)
+
+
+def render_templates(path: PathLike, contexts: Iterable[Dict[str, Any]]) -> List[str]:
+    """
+    Render a template file for many contexts with the shared renderer.
+
+    Args:
+        path: Path of the template
+        contexts: Variables of the template for each rendering
+
+    Returns:
+        Rendered templates, in the order of the contexts
+    """
+    return get_renderer().render_many(path, contexts)
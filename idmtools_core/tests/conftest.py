@@ -1,2 +1,3 @@
 import os
-os.chdir(os.path.dirname(__file__))
\ No newline at end of file
+os.chdir(os.path.dirname(__file__))
+pytest_plugins = ["idmtools_test.utils.fixtures"]
@@ -0,0 +1,134 @@
+import threading
+import time
+import unittest
+from unittest import mock
+import allure
+import pytest
+from idmtools.analysis.analyze_manager import AnalyzeManager
+from idmtools.config import IdmConfigParser
+from idmtools.core import EntityStatus, ItemType
+from idmtools.core.platform_factory import Platform
+from idmtools.entities import IAnalyzer
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation import Simulation
+from idmtools_test.utils.test_task import TestTask
+
+
+class OutputAnalyzer(IAnalyzer):
+    """Read the value each simulation wrote to its output."""
+
+    def __init__(self, filter_odd=False):
+        super().__init__(filenames=["output/value.txt"], parse=False)
+        self.filter_odd = filter_odd
+
+    def filter(self, item):
+        return not self.filter_odd or item.tags["i"] % 2
+
+    def map(self, data, item):
+        return int(data["output/value.txt"])
+
+    def reduce(self, all_data):
+        return sorted(all_data.values())
+
+
+class FakeFiles:
+    """Serve the output of the simulations, recording the concurrency of the fetches."""
+
+    def __init__(self, delay=0.01, fail=None):
+        self.delay = delay
+        self.fail = fail
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, item, files, output=None, **kwargs):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.delay)
+            if item.tags["i"] == self.fail:
+                raise IOError(f"cannot read {files}")
+            return {f: str(item.tags["i"] * 10).encode() for f in files}
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+@pytest.mark.analysis
+@pytest.mark.smoke
+@pytest.mark.serial
+@allure.story("Analyzers")
+@allure.suite("idmtools_core")
+class TestAnalysisPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        IdmConfigParser.clear_instance()
+        self.platform = Platform("Test")
+        self.experiment = Experiment.from_task(TestTask())
+        self.experiment.simulations = [Simulation(task=TestTask(), tags=dict(i=i)) for i in range(12)]
+        self.experiment.run(platform=self.platform)
+        self.platform._simulations.set_simulation_status(self.experiment.uid, EntityStatus.SUCCEEDED)
+
+    def analyze(self, files, analyzers=None, executor_type='thread', **kwargs):
+        am = AnalyzeManager(self.platform, ids=[(self.experiment.uid, ItemType.EXPERIMENT)],
+                            analyzers=analyzers or [OutputAnalyzer(), OutputAnalyzer(filter_odd=True)],
+                            executor_type=executor_type, max_workers=2, verbose=False, **kwargs)
+        with mock.patch.object(type(self.platform), "get_files", files):
+            self.assertTrue(am.analyze())
+        return am
+
+    def test_same_results_as_worker_fetch(self):
+        expected = [list(range(0, 120, 10)), list(range(10, 120, 20))]
+        am = self.analyze(FakeFiles())
+        self.assertEqual([a.results for a in am.analyzers], expected)
+        self.assertIsNone(am.pipeline_stats)
+
+        files = FakeFiles()
+        am = self.analyze(files, prefetch_workers=3)
+        self.assertEqual([a.results for a in am.analyzers], expected)
+        stats = am.pipeline_stats
+        self.assertEqual((stats.items, stats.fetch_workers, stats.map_workers), (12, 3, 2))
+        self.assertLessEqual(files.max_running, 3)
+        self.assertGreater(stats.fetch_seconds, 0.1)
+        self.assertTrue(0 < stats.fetch_utilization <= 1)
+        self.assertTrue(0 < stats.map_utilization <= 1)
+        self.assertIn("12 item(s)", str(stats))
+
+    def test_buffer_is_bounded(self):
+        files = FakeFiles()
+        am = self.analyze(files, prefetch_workers=4, prefetch_buffer=2)
+        self.assertEqual(am.pipeline_stats.max_buffered, 2)
+        self.assertLessEqual(files.max_running, 2)
+        self.assertEqual(len(am.analyzers[0].results), 12)
+
+    def test_process_workers(self):
+        am = self.analyze(FakeFiles(delay=0), executor_type="process", prefetch_workers=2)
+        self.assertEqual(am.analyzers[0].results, list(range(0, 120, 10)))
+        self.assertEqual(am.pipeline_stats.items, 12)
+
+    def test_failed_fetch(self):
+        am = AnalyzeManager(self.platform, ids=[(self.experiment.uid, ItemType.EXPERIMENT)],
+                            analyzers=[OutputAnalyzer()], executor_type='thread', verbose=False, prefetch_workers=2)
+        with mock.patch.object(type(self.platform), "get_files", FakeFiles(fail=5)), self.assertRaises(IOError):
+            am.analyze()
+
+        am = AnalyzeManager(self.platform, ids=[(self.experiment.uid, ItemType.EXPERIMENT)],
+                            analyzers=[OutputAnalyzer()], executor_type='thread', verbose=False, prefetch_workers=2)
+        am.continue_on_error = True
+        with mock.patch.object(type(self.platform), "get_files", FakeFiles(fail=5)):
+            self.assertTrue(am.analyze())
+        self.assertEqual(am.analyzers[0].results, [i * 10 for i in range(12) if i != 5])
+
+    def test_prefetch_options(self):
+        with self.assertRaises(ValueError):
+            AnalyzeManager(self.platform, prefetch_workers=0)
+        with self.assertRaises(ValueError):
+            AnalyzeManager(self.platform, prefetch_workers=1, prefetch_buffer=0)
+        with mock.patch.object(IdmConfigParser, "get_option", side_effect=lambda section, option, default=None, **kwargs:
+                               "3" if option == "prefetch_workers" else default):
+            self.assertEqual(AnalyzeManager(self.platform).prefetch_workers, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import allure
+import pytest
+from idmtools.analysis.analyze_manager import AnalyzeManager
+from idmtools.analysis.sharding import ShardAnalyzeManager
+from idmtools.analysis.spill import SpilledMapResults, SpillWriter, reduce_map_results
+from idmtools.config import IdmConfigParser
+from idmtools.core import EntityStatus, ItemType
+from idmtools.core.platform_factory import Platform
+from idmtools.entities import IAnalyzer
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation import Simulation
+from idmtools_test.utils.test_task import TestTask
+
+
+class SeriesAnalyzer(IAnalyzer):
+    """Map each simulation to a series, reducing to the sums of the series."""
+
+    def __init__(self):
+        super().__init__(filenames=[])
+
+    def map(self, data, item):
+        return [item.tags["i"]] * 1000
+
+    def reduce(self, all_data):
+        return dict(spilled=isinstance(all_data, SpilledMapResults),
+                    sums=sorted(sum(series) for series in all_data.values()))
+
+
+class OddAnalyzer(IAnalyzer):
+    """Only analyze the odd simulations."""
+
+    def __init__(self):
+        super().__init__(filenames=[])
+
+    def filter(self, item):
+        return item.tags["i"] % 2
+
+    def map(self, data, item):
+        return item.tags["i"]
+
+    def reduce(self, all_data):
+        return sorted(all_data.values())
+
+
+class IdentityAnalyzer(IAnalyzer):
+    """Reduce to the map results themselves."""
+
+    def __init__(self):
+        super().__init__(filenames=[])
+
+    def map(self, data, item):
+        return item.tags["i"]
+
+    def reduce(self, all_data):
+        return all_data
+
+
+@pytest.mark.analysis
+@pytest.mark.smoke
+@pytest.mark.serial
+@allure.story("Analyzers")
+@allure.suite("idmtools_core")
+class TestAnalysisSpill(unittest.TestCase):
+
+    def setUp(self):
+        IdmConfigParser.clear_instance()
+        self.platform = Platform("Test")
+        self.experiment = Experiment.from_task(TestTask())
+        self.experiment.simulations = [Simulation(task=TestTask(), tags=dict(i=i)) for i in range(8)]
+        self.experiment.run(platform=self.platform)
+        self.platform._simulations.set_simulation_status(self.experiment.uid, EntityStatus.SUCCEEDED)
+        self.work_dir = tempfile.mkdtemp()
+        self.spill_dir = os.path.join(self.work_dir, "spill")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def analyze(self, manager=AnalyzeManager, executor_type='thread', **kwargs):
+        am = manager(self.platform, ids=[(self.experiment.uid, ItemType.EXPERIMENT)],
+                     analyzers=[SeriesAnalyzer(), OddAnalyzer()], executor_type=executor_type, max_workers=2,
+                     verbose=False, partial_analyze_ok=True, **kwargs)
+        self.assertTrue(am.analyze())
+        return am
+
+    def test_spill_file(self):
+        writer = SpillWriter(os.path.join(self.work_dir, "results.pkl"))
+        for key in "abc":
+            writer.write(key, dict(key=key, data=[key] * 10000))
+        results = writer.results()
+        self.assertEqual(list(results), ["a", "b", "c"])
+        self.assertEqual(results["b"], dict(key="b", data=["b"] * 10000))
+        self.assertIn("c", results)
+        self.assertNotIn("d", results)
+        self.assertEqual(dict(results.subset(["c", "d"])), {"c": dict(key="c", data=["c"] * 10000)})
+        # workers get the offsets, not the data
+        pickled = pickle.dumps(results)
+        self.assertLess(len(pickled), 1000)
+        self.assertEqual(pickle.loads(pickled)["a"]["key"], "a")
+        results.close()
+        self.assertEqual(results["a"]["key"], "a")
+        results.close()
+
+    def test_reduce_releases_spill_file(self):
+        writer = SpillWriter(os.path.join(self.work_dir, "results.pkl"))
+        for key in "ab":
+            writer.write(key, key * 2)
+        results = writer.results()
+        self.assertEqual(reduce_map_results(lambda data: sorted(data.values()), results), ["aa", "bb"])
+        self.assertIsNone(results._map)
+        # spilled results returned by a reduce are loaded before their file is removed
+        reduced = reduce_map_results(lambda data: data.subset(["b"]), results)
+        self.assertEqual((type(reduced), reduced), (dict, {"b": "bb"}))
+        self.assertIsNone(results._map)
+        with self.assertRaises(ZeroDivisionError):
+            reduce_map_results(lambda data: data["a"] and 1 / 0, results)
+        self.assertIsNone(results._map)
+
+    def test_reduce_spilled_results(self):
+        expected = [dict(spilled=False, sums=[i * 1000 for i in range(8)]), [1, 3, 5, 7]]
+        self.assertEqual([a.results for a in self.analyze().analyzers], expected)
+
+        expected[0]["spilled"] = True
+        for executor_type in ['thread', 'process']:
+            with self.subTest(executor_type=executor_type):
+                am = self.analyze(executor_type=executor_type, spill_dir=self.spill_dir)
+                self.assertEqual([a.results for a in am.analyzers], expected)
+                self.assertEqual(os.listdir(self.spill_dir), [])
+        am = self.analyze(spill_dir=self.spill_dir, prefetch_workers=2)
+        self.assertEqual([a.results for a in am.analyzers], expected)
+
+    def test_reduce_returning_spilled_results(self):
+        for executor_type in ['thread', 'process']:
+            with self.subTest(executor_type=executor_type):
+                am = AnalyzeManager(self.platform, ids=[(self.experiment.uid, ItemType.EXPERIMENT)],
+                                    analyzers=[IdentityAnalyzer()], executor_type=executor_type, max_workers=2,
+                                    verbose=False, spill_dir=self.spill_dir)
+                self.assertTrue(am.analyze())
+                results = am.analyzers[0].results
+                self.assertIs(type(results), dict)
+                self.assertEqual(sorted(results.values()), list(range(8)))
+                self.assertEqual(os.listdir(self.spill_dir), [])
+
+    def test_spill_with_partial_results(self):
+        am = AnalyzeManager(self.platform, ids=[(self.experiment.uid, ItemType.EXPERIMENT)],
+                            analyzers=[SeriesAnalyzer(), OddAnalyzer()], executor_type='thread', verbose=False,
+                            spill_dir=self.spill_dir)
+        state_dir = os.path.join(self.work_dir, "state")
+        self.assertTrue(am.analyze(incremental=True, state_dir=state_dir))
+        self.assertEqual(am.analyzers[1].results, [1, 3, 5, 7])
+        # the saved partial results do not depend on the removed spill files
+        self.assertTrue(am.analyze(incremental=True, state_dir=state_dir))
+        self.assertEqual(am.analyzers[0].results, dict(spilled=False, sums=[i * 1000 for i in range(8)]))
+
+        output = os.path.join(self.work_dir, "shard.pkl")
+        self.analyze(manager=ShardAnalyzeManager, spill_dir=self.spill_dir, shard_output=output)
+        with open(output, "rb") as f:
+            partials = pickle.load(f)
+        self.assertEqual(sorted(partials[1].values()), [1, 3, 5, 7])
+        self.assertIsInstance(partials[0], dict)
+
+
+if __name__ == '__main__':
+    unittest.main()
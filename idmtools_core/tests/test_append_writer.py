@@ -0,0 +1,122 @@
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+from types import SimpleNamespace
+import allure
+import pandas as pd
+import pytest
+from idmtools.analysis.append_writer import AppendOnlyWriter, check_parquet_support
+from idmtools.analysis.csv_analyzer import CSVAnalyzer
+from idmtools.analysis.tags_analyzer import TagsAnalyzer
+
+
+class FakeSimulation:
+    def __init__(self, experiment, tags):
+        self.uid = uuid.uuid4()
+        self.experiment = experiment
+        self.tags = tags
+
+
+try:
+    check_parquet_support()
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+
+@pytest.mark.analysis
+@allure.story("Analyzers")
+@allure.suite("idmtools_core")
+class TestAppendOnlyWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.working_dir = tempfile.mkdtemp()
+        experiment = SimpleNamespace(id=str(uuid.uuid4()))
+        self.sims = [FakeSimulation(experiment, dict(a=i, b=f"v{i}")) for i in range(5)]
+
+    def tearDown(self):
+        shutil.rmtree(self.working_dir)
+
+    def _run(self, analyzer, data_for_sim):
+        analyzer.working_dir = self.working_dir
+        analyzer.initialize()
+        analyzer.reduce({sim: analyzer.map(data_for_sim(sim), sim) for sim in self.sims})
+        return os.path.join(analyzer.output_path, self.sims[0].experiment.id)
+
+    def test_csv_analyzer_streaming_matches_default(self):
+        def data(sim):
+            return {"output.csv": pd.DataFrame(dict(x=range(3), y=[sim.tags["a"]] * 3))}
+
+        default_dir = self._run(CSVAnalyzer(filenames=["output.csv"], output_path="default"), data)
+        streaming = CSVAnalyzer(filenames=["output.csv"], output_path="streaming", streaming=True)
+        streaming_dir = self._run(streaming, data)
+
+        expected = pd.read_csv(os.path.join(default_dir, "CSVAnalyzer.csv"))
+        actual = pd.read_csv(os.path.join(streaming_dir, "CSVAnalyzer.csv"))
+        pd.testing.assert_frame_equal(expected, actual)
+        # part files are removed after reduce
+        self.assertEqual(os.listdir(streaming.output_path), [self.sims[0].experiment.id])
+
+    def test_csv_analyzer_streaming_with_different_columns(self):
+        def data(sim):
+            df = pd.DataFrame(dict(x=range(2), y=[sim.tags["a"] + 0.5] * 2))
+            if sim.tags["a"] == 1:
+                df["z"] = ["q", "r"]
+            if sim.tags["a"] == 2:
+                df = df.drop(columns="x")
+            return {"output.csv": df}
+
+        outputs = []
+        for streaming in (False, True):
+            analyzer = CSVAnalyzer(filenames=["output.csv"], output_path=f"streaming_{streaming}", streaming=streaming)
+            outputs.append(os.path.join(self._run(analyzer, data), "CSVAnalyzer.csv"))
+        headers = []
+        for output in outputs:
+            with open(output) as f:
+                headers.append(f.readline().strip())
+        # no row index column in either mode
+        self.assertEqual(headers, ["SimId,x,y,z"] * 2)
+        expected, actual = (pd.read_csv(output) for output in outputs)
+        pd.testing.assert_frame_equal(expected, actual)
+        self.assertEqual(list(actual["SimId"]), [str(s.uid) for s in self.sims for _ in range(2)])
+
+    def test_tags_analyzer_streaming(self):
+        analyzer = TagsAnalyzer(output_path="tags", streaming=True)
+        output_dir = self._run(analyzer, lambda sim: {})
+        df = pd.read_csv(os.path.join(output_dir, "TagsAnalyzer.csv"))
+        self.assertEqual(list(df.columns), ["SimId", "a", "b"])
+        self.assertEqual(list(df["SimId"]), [str(s.uid) for s in self.sims])
+        self.assertEqual(list(df["a"]), list(range(5)))
+
+    def test_merge_aligns_different_columns(self):
+        writer = AppendOnlyWriter(os.path.join(self.working_dir, "parts"))
+        writer.reset()
+        parts = [
+            writer.write("s1", pd.DataFrame(dict(a=[1, 2], b=[3, 4]))),
+            writer.write("s2", pd.DataFrame(dict(b=[5], c=[6]))),
+            writer.write("s3", pd.DataFrame(dict(a=[7], b=[8]))),
+        ]
+        destination = writer.finalize(parts, os.path.join(self.working_dir, "out", "merged.csv"))
+        df = pd.read_csv(destination)
+        self.assertEqual(list(df.columns), ["SimId", "a", "b", "c"])
+        self.assertEqual(list(df["SimId"]), ["s1", "s1", "s2", "s3"])
+        self.assertEqual(list(df["b"]), [3, 4, 5, 8])
+        self.assertTrue(pd.isna(df["a"][2]))
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            AppendOnlyWriter("parts", output_format="xlsx")
+
+    @unittest.skipUnless(HAS_PARQUET, "parquet engine is not installed")
+    def test_parquet_dataset(self):
+        analyzer = CSVAnalyzer(filenames=["output.csv"], output_path="parquet", streaming=True, output_format="parquet")
+        output_dir = self._run(analyzer, lambda sim: {"output.csv": pd.DataFrame(dict(x=range(2)))})
+        df = pd.read_parquet(os.path.join(output_dir, "CSVAnalyzer.parquet"))
+        self.assertEqual(len(df), 10)
+        self.assertEqual(set(df["SimId"]), {str(s.uid) for s in self.sims})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+from unittest import mock
+import allure
+import pytest
+from idmtools.assets import Asset, AssetCollection
+from idmtools.builders import SimulationBuilder
+from idmtools.entities import CommandLine
+from idmtools.entities.command_task import CommandTask
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.experiment_plan import ExperimentPlan, plan_experiment, _sample_indices
+from idmtools.entities.simulation import Simulation
+from idmtools.entities.templated_simulation import TemplatedSimulations
+
+
+def set_value(simulation, value):
+    simulation.task.transient_assets.add_or_replace_asset(Asset(filename="value.txt", content=str(value) * 10))
+    simulation.task.transient_assets.add_or_replace_asset(Asset(filename="same.txt", content="same"))
+    return dict(value=value)
+
+
+@pytest.mark.smoke
+@allure.story("Core")
+@allure.suite("idmtools_core")
+class TestExperimentPlan(unittest.TestCase):
+
+    def get_experiment(self, count: int) -> Experiment:
+        task = CommandTask(command=CommandLine("python", "model.py"))
+        task.common_assets.add_asset(Asset(filename="model.py", content="print(1)"))
+        builder = SimulationBuilder()
+        builder.add_sweep_definition(set_value, range(count))
+        ts = TemplatedSimulations(base_task=task)
+        ts.add_builder(builder)
+        return Experiment.from_template(ts, name="plan")
+
+    def test_sample_indices(self):
+        self.assertEqual(_sample_indices(0, 5), [])
+        self.assertEqual(_sample_indices(3, 5), [0, 1, 2])
+        self.assertEqual(_sample_indices(1000, 1), [0])
+        self.assertEqual(_sample_indices(101, 5), [0, 25, 50, 75, 100])
+
+    def test_plan_templated_experiment(self):
+        experiment = self.get_experiment(1000)
+        with mock.patch.object(TemplatedSimulations, "new_simulation", autospec=True,
+                               side_effect=TemplatedSimulations.new_simulation) as new_simulation:
+            plan = experiment.plan(samples=10, batch_size=100, max_workers=4)
+            # only the sampled simulations are built
+            self.assertEqual(new_simulation.call_count, 10)
+        self.assertEqual(plan.simulation_count, 1000)
+        self.assertEqual(plan.sampled, 10)
+        self.assertEqual(plan.batches, 10)
+        self.assertEqual(plan.common_asset_count, 1)
+        self.assertEqual(plan.common_asset_bytes, len("print(1)"))
+        self.assertEqual(plan.transient_files_per_simulation, 2)
+        self.assertEqual(plan.max_transient_bytes, len("999" * 10) + len("same"))
+        self.assertEqual(plan.total_files, 2001)
+        self.assertEqual(plan.shared_transient_assets, ["same.txt"])
+        self.assertTrue(any("same.txt" in issue for issue in plan.bottlenecks))
+        self.assertEqual(plan.to_dict()["total_files"], 2001)
+        self.assertIn("1,000 (10 sampled)", str(plan))
+        # planning does not create the simulations
+        self.assertEqual(len(experiment.simulations.items), 1000)
+        self.assertEqual(len(experiment.assets), 0)
+        self.assertIsNone(experiment._uid)
+
+    def test_plan_does_not_change_experiment(self):
+        experiment = self.get_experiment(10)
+        base_task = experiment.simulations.items.base_task
+        with mock.patch.object(CommandTask, "gather_common_assets", autospec=True,
+                               side_effect=CommandTask.gather_common_assets) as gather:
+            plan = plan_experiment(experiment, samples=3)
+        self.assertTrue(gather.called)
+        self.assertFalse(any(call.args[0] is base_task for call in gather.call_args_list))
+        self.assertEqual(plan.common_asset_count, 1)
+        self.assertIsNone(experiment._uid)
+
+    def test_plan_simulation_list(self):
+        simulations = []
+        for i in range(4):
+            task = CommandTask(command=CommandLine("python", "model.py"))
+            task.transient_assets.add_asset(Asset(filename="config.json", content="x" * (i + 1)))
+            simulations.append(Simulation(task=task))
+        experiment = Experiment(name="plan", simulations=simulations,
+                                assets=AssetCollection([Asset(filename="a.txt", content="abc")]))
+        plan = plan_experiment(experiment, samples=2)
+        self.assertEqual(plan.simulation_count, 4)
+        self.assertEqual(plan.sampled, 2)
+        self.assertEqual(plan.transient_bytes_per_simulation, 2.5)
+        self.assertEqual(plan.common_asset_bytes, 3)
+        self.assertEqual(plan.shared_transient_assets, [])
+        # the simulations of the experiment are not prepared
+        self.assertEqual(len(simulations[0].assets), 0)
+
+    def test_platform_storage(self):
+        platform = mock.MagicMock()
+        platform.plan_simulation_storage.return_value = dict(files=3, directories=1, bytes=100)
+        plan = plan_experiment(self.get_experiment(10), platform, samples=3)
+        self.assertEqual(platform.plan_simulation_storage.call_count, 3)
+        self.assertEqual(plan.total_directories, 10)
+        self.assertEqual(plan.total_files, 10 * 5 + 1)
+        self.assertEqual(plan.total_bytes, round(10 * (plan.transient_bytes_per_simulation + 100)) + 8)
+
+    def test_bottlenecks(self):
+        plan = ExperimentPlan(simulation_count=100, batch_size=50, max_workers=8, executor="thread",
+                              prepare_seconds_per_simulation=0.1, build_seconds_per_simulation=0.001)
+        issues = plan.bottlenecks
+        self.assertEqual(len(issues), 2)
+        self.assertIn("default_pool_executor = process", issues[0])
+        self.assertIn("lower batch_size", issues[1])
+        plan.executor = "process"
+        self.assertAlmostEqual(plan.prepare_seconds, 5)
+        plan = ExperimentPlan(simulation_count=2_000_000, batch_size=16, transient_files_per_simulation=1)
+        self.assertIn("2,000,000 files", plan.bottlenecks[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import allure
+import pytest
+from idmtools.analysis.analyze_manager import AnalyzeManager
+from idmtools.analysis.incremental import IncrementalAnalyzerState, PARTIALS_FILE
+from idmtools.config import IdmConfigParser
+from idmtools.core import EntityStatus, ItemType
+from idmtools.core.platform_factory import Platform
+from idmtools.entities import IAnalyzer
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation import Simulation
+from idmtools_test.utils.test_task import TestTask
+
+# ids of the items mapped by the analyzers of the tests
+MAPPED = []
+
+
+class TagValuesAnalyzer(IAnalyzer):
+    """Collect the sorted tag values. Uses the default partial_reduce and combine."""
+
+    def __init__(self):
+        super().__init__(filenames=[])
+
+    def map(self, data, item):
+        MAPPED.append(str(item.uid))
+        return item.tags["i"]
+
+    def reduce(self, all_data):
+        # the saved partials are keyed by uid: the keys must be the items again
+        self.tags = sorted(item.tags["i"] for item in all_data)
+        return sorted(all_data.values())
+
+
+class SumAnalyzer(IAnalyzer):
+    """Sum the tag values, keeping a running sum in the state."""
+
+    def __init__(self):
+        super().__init__(filenames=[])
+
+    def map(self, data, item):
+        return item.tags["i"]
+
+    def partial_reduce(self, all_data):
+        return sum(all_data.values())
+
+    def combine(self, partial_results):
+        return sum(partial_results)
+
+    def reduce(self, all_data):
+        return all_data
+
+
+@pytest.mark.analysis
+@pytest.mark.smoke
+@pytest.mark.serial
+@allure.story("Analyzers")
+@allure.suite("idmtools_core")
+class TestIncrementalAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        IdmConfigParser.clear_instance()
+        self.platform = Platform("Test")
+        self.experiment = Experiment.from_task(TestTask())
+        self.experiment.simulations = [Simulation(task=TestTask(), tags=dict(i=i)) for i in range(10)]
+        self.experiment.run(platform=self.platform)
+        self.platform._simulations.set_simulation_status(self.experiment.uid, EntityStatus.RUNNING)
+        self.state_dir = tempfile.mkdtemp()
+        MAPPED.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir)
+
+    def finish(self, number):
+        self.platform._simulations.set_simulation_num_status(self.experiment.uid, EntityStatus.SUCCEEDED, number)
+
+    def analyze(self, analyzers=None, **kwargs):
+        am = AnalyzeManager(self.platform, ids=[(self.experiment.uid, ItemType.EXPERIMENT)],
+                            analyzers=analyzers or [TagValuesAnalyzer(), SumAnalyzer()], partial_analyze_ok=True,
+                            executor_type='thread', max_workers=1, verbose=False)
+        self.assertTrue(am.analyze(**kwargs))
+        return [a.results for a in am.analyzers]
+
+    def test_only_new_items_are_mapped(self):
+        self.finish(4)
+        self.assertEqual(self.analyze(incremental=True, state_dir=self.state_dir), [[0, 1, 2, 3], 6])
+        self.assertEqual(len(MAPPED), 4)
+        first = set(MAPPED)
+
+        MAPPED.clear()
+        self.finish(7)
+        self.assertEqual(self.analyze(incremental=True, state_dir=self.state_dir), [list(range(7)), 21])
+        self.assertEqual(len(MAPPED), 3)
+        self.assertFalse(first & set(MAPPED))
+
+        # nothing new: reduce the saved state
+        MAPPED.clear()
+        self.assertEqual(self.analyze(incremental=True, state_dir=self.state_dir), [list(range(7)), 21])
+        self.assertEqual(MAPPED, [])
+
+        # same results as a complete analysis
+        self.finish(10)
+        self.assertEqual(self.analyze(incremental=True, state_dir=self.state_dir), [list(range(10)), 45])
+        self.assertEqual(self.analyze(analyzers=[TagValuesAnalyzer()]), [list(range(10))])
+
+    def test_new_analyzer_maps_all_items(self):
+        self.finish(5)
+        self.analyze(analyzers=[TagValuesAnalyzer()], incremental=True, state_dir=self.state_dir)
+        MAPPED.clear()
+        self.assertEqual(self.analyze(incremental=True, state_dir=self.state_dir), [list(range(5)), 10])
+        # the items are mapped again for the new analyzer, but the first one only reduces its saved partial
+        self.assertEqual(len(MAPPED), 5)
+        state = IncrementalAnalyzerState.load(self.state_dir, TagValuesAnalyzer())
+        self.assertEqual(len(state.partials), 1)
+
+    def test_partials_are_saved_by_uid(self):
+        self.finish(3)
+        self.analyze(incremental=True, state_dir=self.state_dir)
+        self.finish(5)
+        analyzer = TagValuesAnalyzer()
+        self.assertEqual(self.analyze(analyzers=[analyzer], incremental=True, state_dir=self.state_dir),
+                         [list(range(5))])
+        self.assertEqual(analyzer.tags, list(range(5)))
+        state = IncrementalAnalyzerState.load(self.state_dir, TagValuesAnalyzer())
+        self.assertEqual(state.keyed_by_item, [True, True])
+        self.assertEqual(sorted(v for partial in state.partials for v in partial.values()), list(range(5)))
+        self.assertTrue(all(isinstance(uid, str) for partial in state.partials for uid in partial))
+        ids = {str(sim.uid) for sim in self.experiment.simulations}
+        self.assertTrue(all(uid in ids for partial in state.partials for uid in partial))
+        # other partial results are saved as they are
+        self.assertEqual(IncrementalAnalyzerState.load(self.state_dir, SumAnalyzer()).keyed_by_item, [False])
+
+    def test_changed_analyzer_resets_state(self):
+        self.finish(3)
+        self.analyze(incremental=True, state_dir=self.state_dir)
+        analyzer = TagValuesAnalyzer()
+        analyzer.filenames = ["output.csv"]
+        state = IncrementalAnalyzerState.load(self.state_dir, analyzer)
+        self.assertEqual((state.processed, state.partials), (set(), []))
+
+    def test_incomplete_partial_is_dropped(self):
+        self.finish(2)
+        self.analyze(incremental=True, state_dir=self.state_dir)
+        path = os.path.join(self.state_dir, SumAnalyzer().uid, PARTIALS_FILE)
+        size = os.path.getsize(path)
+        with open(path, "ab") as f:
+            f.write(pickle.dumps((["id"], 100, False))[:-3])
+        state = IncrementalAnalyzerState.load(self.state_dir, SumAnalyzer())
+        self.assertEqual(state.partials, [1])
+        self.assertEqual(os.path.getsize(path), size)
+
+        self.finish(4)
+        self.assertEqual(self.analyze(incremental=True, state_dir=self.state_dir), [[0, 1, 2, 3], 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import json
+import math
+import unittest
+import uuid
+from datetime import datetime
+from enum import Enum, IntEnum
+from unittest import mock
+import allure
+import pytest
+from idmtools.assets import Asset, AssetCollection
+from idmtools.core import EntityStatus, ItemType
+from idmtools.entities import CommandLine
+from idmtools.entities.command_task import CommandTask
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation import Simulation
+from idmtools.entities.suite import Suite
+from idmtools.utils import json as idm_json
+from idmtools.utils.entities import get_metadata_field_plan
+from idmtools.utils.json import IDMJSONEncoder, dumps_json, to_json_ready
+
+
+class Color(Enum):
+    RED = "red"
+    NESTED = ItemType.SIMULATION
+
+
+class Size(IntEnum):
+    SMALL = 1
+
+
+def round_trip(o):
+    """Reference conversion: encode and decode the JSON text."""
+    return json.loads(json.dumps(o, cls=IDMJSONEncoder))
+
+
+@pytest.mark.smoke
+@allure.story("Core")
+@allure.suite("idmtools_core")
+class TestJsonSerialization(unittest.TestCase):
+
+    def setUp(self):
+        self.suite = Suite(name="suite", tags=dict(a=1))
+        self.experiment = Experiment(name="experiment", assets=AssetCollection([Asset(filename="a.txt", content="a")]))
+        self.experiment.suite = self.suite
+        for i in range(3):
+            task = CommandTask(command=CommandLine("python", "model.py", f"--i={i}"))
+            simulation = Simulation(name=f"sim{i}", task=task, tags=dict(i=i, size=Size.SMALL))
+            self.experiment.add_simulation(simulation)
+            simulation.experiment = self.experiment
+
+    def test_same_as_round_trip(self):
+        samples = [
+            self.suite.to_dict(),
+            self.experiment.to_dict(),
+            [s.to_dict() for s in self.experiment.simulations],
+            self.experiment.simulations[0].task,
+            {1: "int", 2.5: "float", True: "bool", None: "none", Size.SMALL: "enum key", "s": ("tuple", 1)},
+            dict(status=EntityStatus.FAILED, color=Color.RED, nested=Color.NESTED, size=Size.SMALL,
+                 id=uuid.UUID(int=1), when=datetime(2025, 1, 2, 3, 4, 5), data=b"bytes", unknown=object(),
+                 command=CommandLine("echo", "1"), infinity=float("inf")),
+        ]
+        for sample in samples:
+            with self.subTest(sample=type(sample).__name__):
+                self.assertEqual(to_json_ready(sample), round_trip(sample))
+
+        converted = to_json_ready(dict(size=Size.SMALL, item_type=ItemType.SIMULATION))
+        self.assertIs(type(converted["size"]), int)
+        self.assertIs(type(converted["item_type"]), str)
+        self.assertTrue(math.isnan(to_json_ready([float("nan")])[0]))
+
+        with self.assertRaises(TypeError):
+            to_json_ready({(1, 2): "tuple key"})
+
+    def test_to_dict_field_plan(self):
+        simulation = self.experiment.simulations[0]
+        self.assertIs(get_metadata_field_plan(Simulation), get_metadata_field_plan(Simulation))
+        self.assertNotIn("parent", [f.name for f in get_metadata_field_plan(Simulation)])
+        result = simulation.to_dict()
+        self.assertEqual(result["_uid"], simulation.uid)
+        self.assertEqual(result["task"], simulation.task.to_dict())
+        self.assertFalse([k for k in result if k.startswith("_") and k != "_uid"])
+        self.assertEqual(result["task"]["command"], simulation.task.command)
+
+    def test_dumps_json(self):
+        sample = dict(experiment=self.experiment.to_dict(), tags={1: Size.SMALL})
+        expected = round_trip(sample)
+        self.assertEqual(json.loads(dumps_json(sample)), expected)
+        self.assertEqual(json.loads(dumps_json(sample, indent=2)), expected)
+        self.assertEqual(json.loads(dumps_json(sample, indent=4)), expected)
+        # integers orjson does not support fall back to json
+        self.assertEqual(json.loads(dumps_json(dict(big=2 ** 70))), dict(big=2 ** 70))
+        with mock.patch.object(idm_json, "USE_ORJSON", False):
+            self.assertEqual(dumps_json(sample, indent=2), json.dumps(expected, indent=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
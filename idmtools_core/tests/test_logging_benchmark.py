@@ -6,12 +6,21 @@ import allure
 import os
 import sys
 import threading
+import logging
+import shutil
+import tempfile
+import time
 from concurrent.futures.process import ProcessPoolExecutor
 from concurrent.futures.thread import ThreadPoolExecutor
 from logging import DEBUG, getLogger
+from logging.handlers import QueueHandler
 from unittest import TestCase, skip
 
-from idmtools.core.logging import setup_logging, IdmToolsLoggingConfig
+import pytest
+
+from idmtools.config import IdmConfigParser
+from idmtools.core.logging import setup_logging, IdmToolsLoggingConfig, get_logging_queue, setup_worker_logging, \
+    stop_queue_listener, reset_logging_handlers, MultiProcessSafeRotatingFileHandler, get_logging_queue_level
 from idmtools_test.utils.decorators import run_test_in_n_seconds
 
 
@@ -22,6 +31,21 @@ def log_process_id():
     return True
 
 
+def log_from_worker(i):
+    logger = getLogger("test_queue_logging")
+    logger.setLevel(DEBUG)
+    logger.debug(f'Record {i} from process {os.getpid()}')
+    return os.getpid(), [type(h) for h in logging.root.handlers]
+
+
+def log_levels_from_worker(i):
+    logger = getLogger("test_queue_logging")
+    logger.setLevel(DEBUG)
+    logger.debug(f'Debug record {i}')
+    logger.info(f'Info record {i}')
+    return [h.level for h in logging.root.handlers]
+
+
 # Check if we have a debugger running. If we are, expect fifth of the performance, espcially the ProcessPoolExecutor
 # portions since that is quite slow in debugger
 LOG_TESTS_TO_RUN = 50000 if getattr(sys, 'gettrace', None) is None else 5000
@@ -72,3 +96,104 @@ class TestLoggingBenchmark(TestCase):
                     logger.info(f"{i}")
         finally:
             del logs
+
+
+@allure.story("Core")
+@allure.suite("idmtools_core")
+@pytest.mark.serial
+@pytest.mark.usefixtures("unittest_record_property")
+class TestQueueLogging(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.directory, "idmtools.log")
+
+    def tearDown(self) -> None:
+        # restore the logging of the tests
+        reset_logging_handlers()
+        IdmConfigParser._init_logging()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def read_log(self):
+        with open(self.log_file) as f:
+            return f.read()
+
+    def test_workers_log_through_queue(self):
+        setup_logging(IdmToolsLoggingConfig(filename=self.log_file, use_log_queue="true", user_output=False,
+                                            force=True))
+        logging_queue = get_logging_queue()
+        self.assertIsNotNone(logging_queue)
+
+        with ProcessPoolExecutor(max_workers=2, initializer=setup_worker_logging,
+                                 initargs=(logging_queue, get_logging_queue_level())) as p:
+            results = list(p.map(log_from_worker, range(20)))
+        # flush the records left on the queue
+        stop_queue_listener()
+        self.assertIsNone(get_logging_queue())
+
+        content = self.read_log()
+        for i, (pid, handlers) in enumerate(results):
+            self.assertNotEqual(pid, os.getpid())
+            # the workers do not write the file
+            self.assertEqual(handlers, [QueueHandler])
+            self.assertIn(f"Record {i} from process {pid}", content)
+
+    def test_workers_use_level_of_main_process(self):
+        setup_logging(IdmToolsLoggingConfig(filename=self.log_file, file_level="INFO", use_log_queue="true",
+                                            user_output=False, force=True))
+        self.assertEqual(get_logging_queue_level(), logging.INFO)
+        with ProcessPoolExecutor(max_workers=2, initializer=setup_worker_logging,
+                                 initargs=(get_logging_queue(), get_logging_queue_level())) as p:
+            results = list(p.map(log_levels_from_worker, range(4)))
+        stop_queue_listener()
+        self.assertEqual(results, [[logging.INFO]] * 4)
+        content = self.read_log()
+        self.assertIn("Info record 3", content)
+        self.assertNotIn("Debug record", content)
+
+    def test_queue_logging_off(self):
+        setup_logging(IdmToolsLoggingConfig(filename=self.log_file, user_output=False, force=True))
+        self.assertIsNone(get_logging_queue())
+        handlers = list(logging.root.handlers)
+        setup_worker_logging(None)
+        self.assertEqual(logging.root.handlers, handlers)
+
+    @pytest.mark.long
+    @pytest.mark.performance
+    def test_emission_cost(self):
+        n = 20000
+        logger = getLogger("test_emission_cost")
+        logger.propagate = False
+        logger.setLevel(DEBUG)
+        self.addCleanup(setattr, logger, "propagate", True)
+
+        def cost(handler):
+            logger.handlers = [handler]
+            start = time.perf_counter()
+            for i in range(n):
+                logger.debug("Record %d", i)
+            return (time.perf_counter() - start) / n
+
+        file_handler = MultiProcessSafeRotatingFileHandler(self.log_file, maxBytes=2 ** 20, backupCount=2)
+        file_handler.setFormatter(logging.Formatter(IdmToolsLoggingConfig().file_log_format_str))
+        file_cost = cost(file_handler)
+        file_handler.close()
+        setup_logging(IdmToolsLoggingConfig(filename=self.log_file, use_log_queue=True, user_output=False,
+                                            force=True))
+        queue_cost = cost(QueueHandler(get_logging_queue()))
+        logger.handlers = []
+
+        # a disabled debug call behind the isEnabledFor guard costs next to nothing
+        logger.setLevel(logging.INFO)
+        start = time.perf_counter()
+        for i in range(n):
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f"Record {i}")
+        guarded_cost = (time.perf_counter() - start) / n
+
+        self.record_property("file_record_seconds", file_cost)
+        self.record_property("queue_record_seconds", queue_cost)
+        self.record_property("disabled_record_seconds", guarded_cost)
+        # timings depend on the machine: only compare them
+        self.assertLess(guarded_cost * 10, queue_cost)
+        self.assertLess(guarded_cost * 10, file_cost)
@@ -0,0 +1,199 @@
+import os
+import pickle
+import shlex
+import shutil
+import tempfile
+import unittest
+import uuid
+from collections import defaultdict
+import allure
+import pytest
+from idmtools.analysis.analyze_manager import AnalyzeManager
+from idmtools.analysis.platform_anaylsis import PlatformAnalysis
+from idmtools.analysis.sharding import ShardAnalyzeManager, merge_shard_results, partition_items, read_shard_ids, \
+    write_shard_ids
+from idmtools.config import IdmConfigParser
+from idmtools.core import EntityStatus, ItemType
+from idmtools.core.platform_factory import Platform
+from idmtools.entities import IAnalyzer
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation import Simulation
+from idmtools_test.utils.test_task import TestTask
+
+
+class TagValuesAnalyzer(IAnalyzer):
+    """Collect the sorted tag values. Uses the default partial_reduce and combine."""
+
+    def __init__(self):
+        super().__init__(filenames=[])
+
+    def map(self, data, item):
+        return item.tags["i"]
+
+    def reduce(self, all_data):
+        return sorted(all_data.values())
+
+
+class CountAnalyzer(IAnalyzer):
+    """Count the items, reducing each shard to a number."""
+
+    def __init__(self):
+        super().__init__(filenames=[])
+
+    def map(self, data, item):
+        return 1
+
+    def partial_reduce(self, all_data):
+        return sum(all_data.values())
+
+    def combine(self, partial_results):
+        return dict(enumerate(partial_results))
+
+    def reduce(self, all_data):
+        return sum(all_data.values())
+
+
+class FakeWorkItem:
+    def __init__(self, name, command, transient_assets):
+        self.uid = uuid.uuid4()
+        self.name = name
+        self.command = command
+        self.transient_assets = transient_assets
+        self.status = None
+
+    @property
+    def succeeded(self):
+        return self.status == EntityStatus.SUCCEEDED
+
+
+class LocalPlatformAnalysis(PlatformAnalysis):
+    """Run the shard and merge work items in process."""
+
+    def __init__(self, *args, failures=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failures = failures or {}
+        self.attempts = defaultdict(int)
+        self.outputs = {}
+        self.work_dir = tempfile.mkdtemp()
+        self.merged = None
+
+    def _create_work_item(self, name, command, transient_assets, assets, related_simulations=None,
+                          related_work_items=None):
+        return FakeWorkItem(name, command, transient_assets)
+
+    def _run_work_items(self, work_items, wait=True):
+        for wi in work_items:
+            args = shlex.split(wi.command)
+            if "--merge-work-item-ids" in args:
+                ids = args[args.index("--merge-work-item-ids") + 1].split(",")
+                self.merged = merge_shard_results([a() for a in self.analyzers], [self.outputs[i] for i in ids],
+                                                  working_dir=self.work_dir)
+                wi.status = EntityStatus.SUCCEEDED
+                continue
+            self.attempts[wi.name] += 1
+            if self.attempts[wi.name] <= self.failures.get(wi.name, 0):
+                wi.status = EntityStatus.FAILED
+                continue
+            ids_file = os.path.join(self.work_dir, "shard_ids.json")
+            ids_asset = [a for a in wi.transient_assets if a.filename == "shard_ids.json"][0]
+            with open(ids_file, "wb") as f:
+                f.write(ids_asset.bytes)
+            output = os.path.join(self.work_dir, "shard_output.pkl")
+            am = ShardAnalyzeManager(self.platform, ids=read_shard_ids(ids_file),
+                                     analyzers=[a() for a in self.analyzers], shard_output=output,
+                                     executor_type='thread', max_workers=1, verbose=False)
+            assert am.analyze()
+            with open(output, "rb") as f:
+                self.outputs[str(wi.uid)] = pickle.load(f)
+            wi.status = EntityStatus.SUCCEEDED
+
+
+@pytest.mark.analysis
+@pytest.mark.smoke
+@pytest.mark.serial
+@allure.story("Analyzers")
+@allure.suite("idmtools_core")
+class TestShardedAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        IdmConfigParser.clear_instance()
+        self.platform = Platform("Test")
+        self.experiment = Experiment.from_task(TestTask())
+        self.experiment.simulations = [Simulation(task=TestTask(), tags=dict(i=i)) for i in range(11)]
+        self.experiment.run(platform=self.platform)
+        self.platform._simulations.set_simulation_status(self.experiment.uid, EntityStatus.SUCCEEDED)
+        self.ids = [(str(sim.id), ItemType.SIMULATION) for sim in self.experiment.simulations]
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_partition_items(self):
+        items = list(range(10))
+        shards = partition_items(items, 3)
+        self.assertEqual([len(s) for s in shards], [4, 3, 3])
+        self.assertEqual(sum(shards, []), items)
+        self.assertEqual(len(partition_items(items[:2], 5)), 2)
+        self.assertEqual(partition_items([], 3), [[]])
+        with self.assertRaises(ValueError):
+            partition_items(items, 0)
+
+    def test_shard_ids_round_trip(self):
+        ids = self.ids[:3] + [(str(uuid.uuid4()), ItemType.WORKFLOW_ITEM)]
+        path = os.path.join(self.work_dir, "ids.json")
+        with open(path, "wb") as f:
+            f.write(write_shard_ids(ids))
+        self.assertEqual(read_shard_ids(path), ids)
+
+    def test_merged_shards_match_single_run(self):
+        am = AnalyzeManager(self.platform, ids=self.ids, analyzers=[TagValuesAnalyzer(), CountAnalyzer()],
+                            executor_type='thread', max_workers=1, verbose=False)
+        self.assertTrue(am.analyze())
+        expected = [a.results for a in am.analyzers]
+        self.assertEqual(expected, [list(range(11)), 11])
+
+        shard_results = []
+        for index, shard in enumerate(partition_items(self.ids, 3)):
+            output = os.path.join(self.work_dir, f"shard{index}.pkl")
+            am = ShardAnalyzeManager(self.platform, ids=shard, analyzers=[TagValuesAnalyzer(), CountAnalyzer()],
+                                     shard_output=output, executor_type='thread', max_workers=1, verbose=False)
+            self.assertTrue(am.analyze())
+            with open(output, "rb") as f:
+                shard_results.append(pickle.load(f))
+        self.assertEqual([r[1] for r in shard_results], [4, 4, 3])
+        analyzers = [TagValuesAnalyzer(), CountAnalyzer()]
+        self.assertEqual(merge_shard_results(analyzers, shard_results, working_dir=self.work_dir), expected)
+        self.assertEqual(analyzers[1].results, 11)
+
+    def test_platform_analysis_retries_failed_shards(self):
+        analysis = LocalPlatformAnalysis(platform=self.platform, experiment_ids=[str(self.experiment.id)],
+                                         analyzers=[TagValuesAnalyzer, CountAnalyzer], shards=3, shard_retries=1,
+                                         analysis_name="Platform Analysis",
+                                         failures={"Platform Analysis shard 2/3": 1})
+        analysis.analyze()
+        self.assertEqual(analysis.merged, [list(range(11)), 11])
+        self.assertEqual(analysis.attempts["Platform Analysis shard 2/3"], 2)
+        self.assertEqual(analysis.attempts["Platform Analysis shard 1/3"], 1)
+        self.assertTrue(all(wi.succeeded for wi in analysis.shard_work_items))
+        self.assertNotIn("--experiment-ids", analysis.wi.command)
+        self.assertIn(",".join(str(wi.uid) for wi in analysis.shard_work_items), analysis.wi.command)
+
+    def test_platform_analysis_failed_shards(self):
+        failures = {"Platform Analysis shard 3/3": 5}
+        analysis = LocalPlatformAnalysis(platform=self.platform, experiment_ids=[str(self.experiment.id)],
+                                         analyzers=[TagValuesAnalyzer, CountAnalyzer], shards=3, shard_retries=1,
+                                         analysis_name="Platform Analysis", failures=failures)
+        with self.assertRaises(RuntimeError):
+            analysis.analyze()
+        self.assertIsNone(analysis.merged)
+
+        analysis = LocalPlatformAnalysis(platform=self.platform, experiment_ids=[str(self.experiment.id)],
+                                         analyzers=[TagValuesAnalyzer, CountAnalyzer], shards=3,
+                                         analysis_name="Platform Analysis", allow_partial_results=True, failures=failures)
+        analysis.analyze()
+        self.assertEqual(analysis.merged, [list(range(8)), 8])
+        self.assertNotIn(str(analysis.shard_work_items[2].uid), analysis.wi.command)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+import allure
+import pandas as pd
+import pytest
+from idmtools.analysis.append_writer import check_parquet_support
+from idmtools.utils.sim_directory import build_sim_directory_df, iter_sim_directory_frames, \
+    save_sim_directory_records
+
+
+def make_records(n=100):
+    for i in range(n):
+        tags = dict(a=i, scenario="baseline" if i % 2 else "campaign")
+        if i >= n // 2:
+            tags["late"] = i * 0.5
+        yield f"sim{i}", tags, f"/exp/sim{i}"
+
+
+try:
+    check_parquet_support()
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+
+@pytest.mark.smoke
+@allure.story("Entities")
+@allure.suite("idmtools_core")
+class TestSimDirectory(unittest.TestCase):
+
+    def setUp(self):
+        self.output = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output)
+
+    def test_build_frame(self):
+        df = build_sim_directory_df(make_records())
+        self.assertEqual(list(df.columns), ["a", "scenario", "late", "simid", "outpath"])
+        self.assertEqual(len(df), 100)
+        self.assertIsInstance(df["scenario"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["a"].dtype, "int64")
+        self.assertTrue(df["late"][:50].isna().all())
+        self.assertEqual(df["late"][99], 49.5)
+        self.assertEqual(df["outpath"][3], "/exp/sim3")
+
+    def test_empty(self):
+        df = build_sim_directory_df([])
+        self.assertEqual(list(df.columns), ["simid", "outpath"])
+        self.assertEqual(len(df), 0)
+
+    def test_chunks(self):
+        frames = list(iter_sim_directory_frames(make_records(), chunk_size=30))
+        self.assertEqual([len(f) for f in frames], [30, 30, 30, 10])
+        self.assertNotIn("late", frames[0].columns)
+
+    def test_streamed_csv_matches_frame(self):
+        expected = build_sim_directory_df(make_records())
+        for header in (True, False):
+            destination = os.path.join(self.output, f"{header}.csv")
+            save_sim_directory_records(make_records(), destination, header=header, chunk_size=30)
+            actual = pd.read_csv(destination, header=0 if header else None)
+            if header:
+                self.assertEqual(list(actual.columns), ["a", "scenario", "simid", "outpath", "late"])
+                actual = actual[expected.columns]
+            else:
+                actual.columns = ["a", "scenario", "simid", "outpath", "late"]
+            self.assertEqual(actual["simid"].tolist(), expected["simid"].tolist())
+            self.assertEqual(actual["late"].fillna(-1).tolist(), expected["late"].fillna(-1).tolist())
+        # part files are removed
+        self.assertEqual(sorted(os.listdir(self.output)), ["False.csv", "True.csv"])
+
+    @unittest.skipUnless(HAS_PARQUET, "parquet engine is not installed")
+    def test_streamed_parquet_chunks_share_schema(self):
+        def records():
+            yield from make_records()
+            # tags of a different type, and tags only some chunks have
+            for i in range(100, 130):
+                yield f"sim{i}", dict(a=i + 0.5, scenario="baseline", flag=bool(i % 2), label=None), f"/exp/sim{i}"
+
+        destination = save_sim_directory_records(records(), os.path.join(self.output, "sims.parquet"),
+                                                 output_format="parquet", chunk_size=30)
+        self.assertEqual(len(os.listdir(destination)), 5)
+        actual = pd.read_parquet(destination)
+        self.assertEqual(len(actual), 130)
+        self.assertEqual(set(actual.columns), {"a", "scenario", "late", "flag", "label", "simid", "outpath"})
+        self.assertEqual(actual["a"].dtype, "float64")
+        self.assertEqual(actual["a"].tolist(), list(range(100)) + [i + 0.5 for i in range(100, 130)])
+        self.assertEqual(actual["late"][99], 49.5)
+        self.assertTrue(actual["late"][:50].isna().all())
+        self.assertEqual(actual["flag"][:100].isna().sum(), 100)
+        self.assertEqual(actual["flag"][100:].tolist(), [bool(i % 2) for i in range(100, 130)])
+        self.assertTrue(actual["label"].isna().all())
+        self.assertEqual(actual["scenario"].value_counts()["baseline"], 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
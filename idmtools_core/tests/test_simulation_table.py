@@ -0,0 +1,106 @@
+import copy
+import gc
+import pickle
+import unittest
+import allure
+import pandas as pd
+import pytest
+from idmtools.core import EntityStatus
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation import Simulation
+from idmtools.entities.simulation_table import SimulationTable
+from idmtools_test.utils.test_task import TestTask
+
+
+@pytest.mark.smoke
+@allure.story("Entities")
+@allure.suite("idmtools_core")
+class TestSimulationTable(unittest.TestCase):
+
+    def setUp(self):
+        self.n = 100
+        self.table = SimulationTable(
+            ids=[f"sim{i}" for i in range(self.n)],
+            statuses=[EntityStatus.SUCCEEDED] * self.n,
+            names=[f"name{i}" for i in range(self.n)],
+            tags=[dict(a=i % 3, b="x" if i % 2 else "y", c=i) for i in range(self.n)],
+            directories=[f"/exp/sim{i}" for i in range(self.n)],
+        )
+        self.experiment = Experiment(name="table")
+        self.experiment.simulations = self.table
+
+    def test_columns_are_compact(self):
+        self.assertEqual(self.table._status.dtype.itemsize, 1)
+        # low cardinality tags are categoricals, unique ones are not
+        self.assertIsInstance(self.table.tags["b"].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(self.table.tags["c"].dtype, pd.CategoricalDtype)
+        self.assertEqual(self.table.get_directory(5), "/exp/sim5")
+        df = self.table.to_dataframe()
+        self.assertEqual(list(df.columns), ["id", "status", "name", "directory", "a", "b", "c"])
+        self.assertEqual(len(df), self.n)
+
+    def test_lazy_materialization(self):
+        self.assertEqual(len(self.table._materialized), 0)
+        sim = self.table[7]
+        self.assertIsInstance(sim, Simulation)
+        self.assertEqual(sim.id, "sim7")
+        self.assertEqual(sim.name, "name7")
+        self.assertEqual(sim.tags, dict(a=1, b="x", c=7))
+        self.assertEqual(sim.status, EntityStatus.SUCCEEDED)
+        self.assertIs(sim.parent, self.experiment)
+        # the same object is returned while it is referenced
+        self.assertIs(self.table["sim7"], sim)
+        del sim
+        gc.collect()
+        self.assertEqual(len(self.table._materialized), 0)
+
+    def test_experiment_iterates_table(self):
+        self.assertEqual(len(self.experiment.simulations), self.n)
+        ids = [s.id for s in self.experiment.simulations]
+        self.assertEqual(ids, self.table.ids)
+        self.assertTrue(self.experiment.succeeded)
+        self.assertEqual(self.experiment.status, EntityStatus.SUCCEEDED)
+        self.assertTrue(self.experiment.check_duplicate("sim3"))
+
+    def test_status_write_back(self):
+        sim = self.table[3]
+        sim.status = EntityStatus.FAILED
+        self.assertEqual(self.table.statuses[3], EntityStatus.FAILED)
+        self.assertTrue(self.experiment.any_failed)
+        self.assertEqual(self.experiment.status, EntityStatus.FAILED)
+
+        self.table.set_status("sim3", EntityStatus.RUNNING)
+        self.assertEqual(sim.status, EntityStatus.RUNNING)
+        self.table.update_statuses({"sim4": EntityStatus.RUNNING})
+        self.assertEqual(self.experiment.simulation_status_counts,
+                         {EntityStatus.SUCCEEDED: self.n - 2, EntityStatus.RUNNING: 2})
+        self.assertTrue(self.experiment.validate_status_counts())
+
+    def test_append(self):
+        new_sim = Simulation(task=TestTask())
+        new_sim.status = EntityStatus.CREATED
+        self.experiment.simulations.append(new_sim)
+        self.assertEqual(len(self.table), self.n + 1)
+        self.assertIs(self.table[-1], new_sim)
+        self.assertEqual(self.experiment.status, EntityStatus.RUNNING)
+        new_sim.status = EntityStatus.SUCCEEDED
+        self.assertTrue(self.experiment.succeeded)
+
+    def test_pickle_and_copy(self):
+        self.table[0].status = EntityStatus.FAILED
+        for copied in (pickle.loads(pickle.dumps(self.table)), copy.deepcopy(self.table)):
+            self.assertEqual(len(copied), self.n)
+            self.assertEqual(copied.status_counts[EntityStatus.FAILED], 1)
+            self.assertEqual(copied[1].tags, dict(a=1, b="x", c=1))
+            self.assertTrue(copied.validate_status_counts())
+
+    def test_from_simulations(self):
+        sims = [Simulation(task=TestTask(), tags=dict(i=i)) for i in range(5)]
+        table = SimulationTable.from_simulations(sims)
+        self.assertEqual(table.ids, [s.id for s in sims])
+        self.assertEqual(table[2].tags, dict(i=2))
+        self.assertEqual(table.status_counts, {None: 5})
+
+
+if __name__ == '__main__':
+    unittest.main()
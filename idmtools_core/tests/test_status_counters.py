@@ -0,0 +1,112 @@
+import copy
+import pickle
+import unittest
+import allure
+import pytest
+from idmtools.core import EntityStatus, EntityContainer
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation import Simulation
+from idmtools.entities.suite import Suite
+from idmtools_test.utils.test_task import TestTask
+
+
+@pytest.mark.smoke
+@allure.story("Entities")
+@allure.suite("idmtools_core")
+class TestStatusCounters(unittest.TestCase):
+
+    def setUp(self):
+        self.experiment = Experiment.from_task(TestTask())
+        self.experiment.simulations = [Simulation(task=TestTask()) for _ in range(10)]
+
+    def _set_status(self, status, sims=None):
+        for sim in (sims if sims is not None else self.experiment.simulations):
+            sim.status = status
+
+    def test_status_transitions(self):
+        self.assertIsNone(self.experiment.status)
+        self._set_status(EntityStatus.CREATED)
+        self.assertEqual(self.experiment.status, EntityStatus.CREATED)
+        self.assertFalse(self.experiment.done)
+
+        sims = list(self.experiment.simulations)
+        self._set_status(EntityStatus.RUNNING, sims[:3])
+        self.assertEqual(self.experiment.status, EntityStatus.RUNNING)
+        self._set_status(EntityStatus.SUCCEEDED, sims[:3])
+        # some created and some done is still running
+        self.assertEqual(self.experiment.status, EntityStatus.RUNNING)
+        self._set_status(EntityStatus.FAILED, sims[3:4])
+        self._set_status(EntityStatus.SUCCEEDED, sims[4:])
+        self.assertEqual(self.experiment.status, EntityStatus.FAILED)
+        self.assertTrue(self.experiment.done)
+        self.assertTrue(self.experiment.any_failed)
+        self.assertFalse(self.experiment.succeeded)
+        self.assertEqual(self.experiment.simulation_status_counts,
+                         {EntityStatus.SUCCEEDED: 9, EntityStatus.FAILED: 1})
+
+        self._set_status(EntityStatus.SUCCEEDED, sims[3:4])
+        self.assertEqual(self.experiment.status, EntityStatus.SUCCEEDED)
+        self.assertTrue(self.experiment.succeeded)
+        self.assertTrue(self.experiment.validate_status_counts())
+
+    def test_container_operations(self):
+        container = self.experiment.simulations.items
+        self._set_status(EntityStatus.CREATED)
+        extra = Simulation(task=TestTask())
+        extra.status = EntityStatus.RUNNING
+        container.append(extra)
+        self.assertEqual(self.experiment.status, EntityStatus.RUNNING)
+        container.remove(extra)
+        self.assertEqual(self.experiment.status, EntityStatus.CREATED)
+        # a removed simulation no longer updates the counters
+        extra.status = EntityStatus.FAILED
+        self.assertFalse(self.experiment.any_failed)
+
+        removed = container.pop(0)
+        container.insert(0, removed)
+        container[1] = extra
+        del container[2]
+        container[0:2] = [Simulation(task=TestTask())]
+        container += [Simulation(task=TestTask())]
+        self.assertTrue(container.validate_status_counts())
+        self.assertEqual(sum(container.status_counts.values()), len(container))
+        container.clear()
+        self.assertEqual(sum(container.status_counts.values()), 0)
+
+    def test_simulation_in_two_containers(self):
+        sims = list(self.experiment.simulations)
+        other = EntityContainer(sims[:5])
+        self._set_status(EntityStatus.SUCCEEDED, sims)
+        self.assertEqual(other.status_counts[EntityStatus.SUCCEEDED], 5)
+        self.assertTrue(self.experiment.succeeded)
+        self.assertTrue(other.validate_status_counts())
+
+    def test_copy_and_pickle(self):
+        self._set_status(EntityStatus.SUCCEEDED)
+        for copied in (copy.deepcopy(self.experiment), pickle.loads(pickle.dumps(self.experiment))):
+            self.assertTrue(copied.validate_status_counts())
+            self.assertTrue(copied.succeeded)
+            next(iter(copied.simulations)).status = EntityStatus.FAILED
+            self.assertTrue(copied.any_failed)
+            self.assertTrue(copied.validate_status_counts())
+        # the original is not affected by changes to the copies
+        self.assertFalse(self.experiment.any_failed)
+        self.assertTrue(self.experiment.validate_status_counts())
+
+    def test_suite_experiments_are_not_counted(self):
+        suite = Suite(name="suite")
+        suite.add_experiment(self.experiment)
+        self.assertIsNone(suite.experiments.status_counts)
+        self.assertTrue(suite.experiments.validate_status_counts())
+
+    def test_experiment_construction_does_not_warn(self):
+        with self.assertNoLogs("idmtools.entities.experiment", level="WARNING"):
+            experiment = Experiment(name="experiment")
+            copy.deepcopy(experiment)
+            pickle.loads(pickle.dumps(experiment))
+        with self.assertLogs("idmtools.entities.experiment", level="WARNING"):
+            experiment.status = EntityStatus.FAILED
+
+
+if __name__ == '__main__':
+    unittest.main()
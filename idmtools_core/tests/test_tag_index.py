@@ -0,0 +1,126 @@
+import unittest
+from unittest import mock
+import allure
+import pytest
+from idmtools.core import EntityStatus, ItemType
+from idmtools.core.platform_factory import Platform
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation import Simulation
+from idmtools.entities.simulation_table import SimulationTable
+from idmtools.utils.filter_simulations import FilterItem
+from idmtools.utils.general import parse_value_tags
+from idmtools.utils.tag_index import TagIn, TagIndex, TagRange
+from idmtools_test.utils.test_task import TestTask
+
+
+def legacy_filter(experiment, tags=None, status=None, skip_sims=(), max_simulations=None):
+    """Reference implementation: parse the tags of every simulation on every query."""
+    def match(sim):
+        sim_tags = parse_value_tags(sim.tags, wrap_with_tagvalue=True)
+        for k, v in (tags or {}).items():
+            sim_val = sim_tags.get(k)
+            if sim_val is None:
+                return False
+            if callable(v):
+                if not v(sim_val):
+                    return False
+            elif sim_val != v:
+                return False
+        return True
+    sims = [s for s in experiment.simulations if (not status or s.status == status) and match(s)]
+    sims = [s.id for s in sims if s.id not in skip_sims]
+    return sims[:max_simulations or len(sims)]
+
+
+@pytest.mark.smoke
+@allure.story("Filtering")
+@allure.suite("idmtools_core")
+class TestTagIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.experiment = Experiment(name="tag_index")
+        sims = []
+        for i in range(40):
+            tags = dict(Run_Number=str(i) if i % 2 else i, Coverage=[0.5, "0.8", 1][i % 3], flag="true" if i % 4 else False)
+            if i % 5:
+                tags["scenario"] = ["baseline", "campaign"][i % 2]
+            if i == 7:
+                tags["nested"] = dict(a="1")
+            sim = Simulation(task=TestTask(), tags=tags)
+            sim.status = EntityStatus.FAILED if i % 6 == 0 else EntityStatus.SUCCEEDED
+            sims.append(sim)
+        self.experiment.simulations = sims
+
+    def test_matches_legacy_filter(self):
+        queries = [
+            dict(),
+            dict(tags={"Run_Number": 5}),
+            dict(tags={"Run_Number": "6"}),
+            dict(tags={"Coverage": 0.8, "flag": True}),
+            dict(tags={"Coverage": 1, "flag": "false"}),
+            dict(tags={"scenario": "campaign"}, status=EntityStatus.SUCCEEDED),
+            dict(tags={"Run_Number": lambda v: 2 <= v <= 10}),
+            dict(tags={"Run_Number": TagRange(2, 10)}),
+            dict(tags={"Run_Number": TagRange(lower="2", upper=10, include_lower=False)}),
+            dict(tags={"Run_Number": TagRange(upper=30)}, max_simulations=4),
+            dict(tags={"Coverage": TagIn(0.5, "1")}, status=EntityStatus.FAILED),
+            dict(tags={"nested": dict(a=1)}),
+            dict(tags={"missing": 1}),
+            dict(tags={"scenario": "baseline"}, skip_sims=[s.id for s in self.experiment.simulations][:12]),
+        ]
+        index = TagIndex(self.experiment)
+        for query in queries:
+            with self.subTest(query=query):
+                expected = legacy_filter(self.experiment, **query)
+                query["skip_sims"] = set(query.get("skip_sims", ()))
+                self.assertEqual(index.filter(**query), expected)
+                self.assertEqual(self.experiment.get_simulations_by_tags(**query), expected)
+
+    def test_presence_and_entities(self):
+        sims = FilterItem.filter_item(None, self.experiment, tags={"scenario": ...}, entity_type=True)
+        self.assertEqual(len(sims), 32)
+        self.assertTrue(all("scenario" in s.tags for s in sims))
+        self.assertIs(sims[0], self.experiment.simulations.items[1])
+
+    def test_status_is_read_when_querying(self):
+        index = TagIndex(self.experiment)
+        self.assertEqual(len(index.filter(status=EntityStatus.FAILED)), 7)
+        for sim in self.experiment.simulations:
+            sim.status = EntityStatus.FAILED
+        self.assertEqual(len(index.filter(status=EntityStatus.FAILED)), 40)
+
+    def test_simulation_table(self):
+        table = SimulationTable.from_simulations(self.experiment.simulations)
+        experiment = Experiment(name="table")
+        experiment.simulations = table
+        for query in [dict(tags={"Run_Number": TagRange(2, 10)}), dict(tags={"Coverage": 0.8, "flag": True}),
+                      dict(tags={"scenario": "campaign"}, status=EntityStatus.FAILED)]:
+            with self.subTest(query=query):
+                self.assertEqual(TagIndex(experiment).filter(**query), legacy_filter(self.experiment, **query))
+
+    def test_tags_changed_in_place(self):
+        self.assertEqual(len(self.experiment.get_simulations_by_tags(tags={"Run_Number": TagRange(upper=4)})), 5)
+        for sim in self.experiment.simulations:
+            sim.tags["Run_Number"] = 100
+        self.assertEqual(self.experiment.get_simulations_by_tags(tags={"Run_Number": TagRange(upper=4)}), [])
+        self.assertEqual(len(self.experiment.get_simulations_by_tags(tags={"Run_Number": 100})), 40)
+
+    def test_platform_reloads_item(self):
+        platform = Platform("Test")
+        experiment = Experiment.from_task(TestTask())
+        experiment.simulations = [Simulation(task=TestTask(), tags=dict(i=i)) for i in range(10)]
+        experiment.run(platform=platform)
+        platform._simulations.set_simulation_status(experiment.uid, EntityStatus.SUCCEEDED)
+        ids = platform.filter_simulations_by_tags(experiment.id, ItemType.EXPERIMENT, tags={"i": TagRange(upper=4)})
+        self.assertEqual(len(ids), 5)
+        get_item = type(platform).get_item
+        with mock.patch.object(type(platform), "get_item", autospec=True, side_effect=get_item) as get_item:
+            ids = platform.filter_simulations_by_tags(experiment.id, ItemType.EXPERIMENT, tags={"i": 3},
+                                                      status=EntityStatus.SUCCEEDED, skip_sims={"unknown"})
+            self.assertEqual(len(ids), 1)
+            get_item.assert_called_once()
+            self.assertTrue(get_item.call_args.kwargs["force"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import allure
+import pytest
+from jinja2 import Environment, Template, TemplateNotFound
+from idmtools.utils.templates import TemplateRenderer, get_renderer, render_template, render_templates
+
+
+@pytest.mark.smoke
+@allure.story("Templates")
+@allure.suite("idmtools_core")
+class TestTemplates(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.bytecode_directory = os.path.join(self.directory, "bytecode")
+        self.renderer = TemplateRenderer(bytecode_cache_directory=self.bytecode_directory)
+        self.template = os.path.join(self.directory, "run.sh.jinja2")
+        self.write_template("#!/bin/bash\n{% for i in range(n) %}echo {{ name }} {{ i }}\n{% endfor %}\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write_template(self, content: str, mtime_ns: int = None):
+        with open(self.template, "w") as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(self.template, ns=(mtime_ns, mtime_ns))
+
+    def test_render_same_as_jinja_template(self):
+        with open(self.template) as f:
+            expected = Template(f.read()).render(name="sim", n=2)
+        self.assertEqual(self.renderer.render(self.template, dict(name="sim"), n=2), expected)
+        self.assertEqual(expected, "#!/bin/bash\necho sim 0\necho sim 1\n")
+
+        output = os.path.join(self.directory, "run.sh")
+        self.renderer.render_to_file(self.template, output, dict(name="sim", n=2))
+        with open(output) as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_compiled_once(self):
+        with mock.patch.object(Environment, "compile", autospec=True, side_effect=Environment.compile) as compile:
+            contexts = [dict(name=f"sim{i}", n=1) for i in range(5)]
+            self.assertEqual(self.renderer.render_many(self.template, contexts),
+                             [f"#!/bin/bash\necho sim{i} 0\n" for i in range(5)])
+            for context in contexts:
+                self.renderer.render(self.template, context)
+            self.assertEqual(compile.call_count, 1)
+        self.assertIs(self.renderer.get_template(self.template), self.renderer.get_template(self.template))
+
+    def test_reload_on_change(self):
+        self.write_template("first {{ name }}", mtime_ns=1_000_000_000)
+        self.assertEqual(self.renderer.render(self.template, name="a"), "first a")
+        self.write_template("second {{ name }}", mtime_ns=2_000_000_000)
+        self.assertEqual(self.renderer.render(self.template, name="a"), "second a")
+
+    def test_bytecode_cache_across_renderers(self):
+        self.renderer.render(self.template, name="sim", n=1)
+        self.assertEqual(len(os.listdir(self.bytecode_directory)), 1)
+        # a new process has a new renderer: it loads the compiled code instead of compiling the template
+        renderer = TemplateRenderer(bytecode_cache_directory=self.bytecode_directory)
+        with mock.patch.object(Environment, "compile", autospec=True, side_effect=Environment.compile) as compile:
+            self.assertEqual(renderer.render(self.template, name="sim", n=1), "#!/bin/bash\necho sim 0\n")
+            compile.assert_not_called()
+
+        renderer = TemplateRenderer(bytecode_cache=False)
+        self.assertIsNone(renderer.environment.bytecode_cache)
+
+    def test_from_string(self):
+        renderer = TemplateRenderer(bytecode_cache=False, string_cache_size=2)
+        first = renderer.from_string("a {{ x }}")
+        self.assertIs(renderer.from_string("a {{ x }}"), first)
+        self.assertEqual(first.render(x=1), "a 1")
+        renderer.from_string("b {{ x }}")
+        renderer.from_string("c {{ x }}")
+        # the least recently used template is dropped
+        self.assertIsNot(renderer.from_string("a {{ x }}"), first)
+
+    def test_missing_template(self):
+        with self.assertRaises(TemplateNotFound):
+            self.renderer.render(os.path.join(self.directory, "missing.jinja2"))
+
+    def test_shared_renderer(self):
+        renderer = TemplateRenderer(bytecode_cache_directory=self.bytecode_directory)
+        with mock.patch("idmtools.utils.templates._RENDERER", renderer):
+            self.assertIs(get_renderer(), renderer)
+            self.assertEqual(render_template(self.template, name="x", n=1), "#!/bin/bash\necho x 0\n")
+            self.assertEqual(render_templates(self.template, [dict(name="y", n=0)]), ["#!/bin/bash\n"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,14 +3,17 @@
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import json
+import os
 from dataclasses import dataclass, field, fields
 from functools import partial
 from logging import getLogger, DEBUG
 from typing import Union, Dict, Any, List, Optional, Type, TYPE_CHECKING
 from idmtools.assets import Asset, AssetCollection
+from idmtools.entities import CommandLine
 from idmtools.entities.itask import ITask
 from idmtools.entities.simulation import Simulation
 from idmtools.registry.task_specification import TaskSpecification
+from idmtools_models import merge_config
 if TYPE_CHECKING:  # pragma: no cover
     from idmtools.entities.iplatform import IPlatform
 
@@ -20,11 +23,36 @@ TJSONConfigValueType = Union[str, int, float, Dict[TJSONConfigKeyType, Any]]
 logger = getLogger(__name__)
 user_logger = getLogger('user')
 
+CONFIG_LAUNCHER_FILE_NAME = "merge_config.py"
+
+
+class _ConfigBase:
+    """
+    Config shared by the simulations of an experiment in delta mode.
+
+    Copies of a task share it, so sweeps do not copy the whole config for each simulation.
+    """
+
+    def __init__(self):
+        self.config: Optional[Dict[str, Any]] = None
+        self.content: Optional[str] = None
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __copy__(self):
+        return self
+
 
 @dataclass
 class JSONConfiguredTask(ITask):
     """
     Defines an extensible simple task that implements functionality through optional supplied use hooks.
+
+    Notes:
+        - With config_delta, the experiment stores the config of the base task of TemplatedSimulations once, as
+          config.base.json, and each simulation only stores the keys it changes in config.delta.json (a JSON merge
+          patch). The command runs through Assets/merge_config.py, which writes the merged config.json first
     """
 
     # Note: large amounts of parameters will increase size of metadata
@@ -39,6 +67,14 @@ class JSONConfiguredTask(ITask):
     # for example, if the argument is --config and the config file name is config.json we would run the command as
     # cmd --config config.json
     command_line_argument_no_filename: bool = field(default=False)
+    # Store the config shared by the simulations once, in the common assets, and only the keys each simulation changes
+    # as a JSON merge patch. A launcher merges both files before the command runs. Requires TemplatedSimulations
+    config_delta: bool = field(default=False, metadata={"md": True})
+    # Wrap the command with the launcher writing the merged config. Disable it when the model reads both files with
+    # idmtools_models.merge_config.load_config
+    config_delta_launcher: bool = field(default=True)
+    # Python running the launcher. Defaults to python_path of python tasks, else python
+    config_delta_python: Optional[str] = field(default=None)
 
     def __post_init__(self):
         """Constructor."""
@@ -56,8 +92,47 @@ class JSONConfiguredTask(ITask):
         """
         if self.is_config_common:
             self.__dump_config(self.common_assets)
+        self._gather_config_base()
         return self.common_assets
 
+    @property
+    def config_base_file_name(self) -> str:
+        """Name of the config shared by the simulations in delta mode."""
+        return self.__get_part_file_name(self.config_file_name, "base")
+
+    @property
+    def config_delta_file_name(self) -> str:
+        """Name of the merge patch of each simulation in delta mode."""
+        return self.__get_part_file_name(self.config_file_name, "delta")
+
+    def _get_config_base(self) -> _ConfigBase:
+        config_base = self.__dict__.get('_config_base')
+        if config_base is None:
+            config_base = self._config_base = _ConfigBase()
+        return config_base
+
+    def _gather_config_base(self) -> None:
+        """
+        Add the config shared by the simulations and the launcher to the common assets in delta mode.
+
+        The shared config is the config of the task the first time its common assets are gathered, which is the base
+        task for TemplatedSimulations.
+
+        Returns:
+            None
+        """
+        if not self.config_delta or self.is_config_common or self.config_file_name is None:
+            return
+        config_base = self._get_config_base()
+        if config_base.config is None:
+            params = {self.envelope: self.parameters} if self.envelope else self.parameters
+            config_base.config = json.loads(json.dumps(params))
+            config_base.content = json.dumps(config_base.config)
+        self.common_assets.add_or_replace_asset(Asset(filename=self.config_base_file_name, content=config_base.content))
+        if self.config_delta_launcher:
+            self.common_assets.add_or_replace_asset(Asset(absolute_path=os.path.abspath(merge_config.__file__),
+                                                          filename=CONFIG_LAUNCHER_FILE_NAME))
+
     def gather_transient_assets(self) -> AssetCollection:
         """
         Gather assets that are unique to this simulation/worktiem.
@@ -80,12 +155,41 @@ class JSONConfiguredTask(ITask):
         """
         if self.config_file_name is not None:
             params = {self.envelope: self.parameters} if self.envelope else self.parameters
+            if self.__dump_config_delta(assets, params):
+                return
             if logger.isEnabledFor(DEBUG):
                 logger.debug('Adding JSON Configured File %s', self.config_file_name)
                 logger.debug(f'Generating {self.config_file_name} as an asset from JSONConfiguredTask')
                 logger.debug('Writing Config %s', json.dumps(params))
             assets.add_or_replace_asset(Asset(filename=self.config_file_name, content=json.dumps(params)))
 
+    def __dump_config_delta(self, assets: AssetCollection, params: Dict[str, Any]) -> bool:
+        """
+        Writes the merge patch of the configuration in delta mode.
+
+        Args:
+            assets: Asset to add the patch too
+            params: Configuration
+
+        Returns:
+            True if the patch was written, False if the complete configuration has to be written
+        """
+        config_base = self.__dict__.get('_config_base')
+        if not self.config_delta or assets is self.common_assets or config_base is None or config_base.config is None:
+            return False
+        patch = merge_config.make_merge_patch(config_base.config, json.loads(json.dumps(params)))
+        if patch is None:
+            # A merge patch cannot set a value to null, the simulation keeps a complete config
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f'Writing the complete {self.config_file_name}: a merge patch cannot express it')
+            assets.remove(filename=self.config_delta_file_name)
+            return False
+        if logger.isEnabledFor(DEBUG):
+            logger.debug('Writing Config patch %s', json.dumps(patch))
+        assets.remove(filename=self.config_file_name)
+        assets.add_or_replace_asset(Asset(filename=self.config_delta_file_name, content=json.dumps(patch)))
+        return True
+
     def set_parameter(self, key: TJSONConfigKeyType, value: TJSONConfigValueType):
         """
         Update a parameter. The type hinting encourages JSON supported types.
@@ -181,18 +285,34 @@ class JSONConfiguredTask(ITask):
         if logger.isEnabledFor(DEBUG):
             logger.debug(f'Loading Config from {simulation.id}:{cfn}')
         config = dict()
+        # in delta mode, the simulation may only have the merge patch of its config
+        delta_name = self.__get_part_file_name(cfn, "delta") if simulation.tags.get('task_config_delta') else None
+        delta = None
         if simulation.assets and isinstance(simulation.assets, (AssetCollection, list)):
             for file in simulation.assets:
                 if file.filename == cfn:
                     config = file.content
                     if isinstance(config, bytes):
                         config = json.loads(config.decode('utf-8'))
+                elif delta_name and file.filename == delta_name:
+                    delta = file.content
             new_assets = []
             # filter our config from the simulation
             for _i, asset in enumerate(simulation.assets.assets):
-                if asset.filename != cfn:
+                if asset.filename not in (cfn, delta_name):
                     new_assets.append(asset)
             simulation.assets.assets = new_assets
+            if not config and delta is not None:
+                config = self.__merge_config_delta(simulation, cfn, delta)
+        elif delta_name:
+            # the launcher writes the merged config when the simulation runs
+            try:
+                config = simulation.platform.get_files(simulation, [cfn])[cfn]
+            except Exception:
+                delta = simulation.platform.get_files(simulation, [delta_name])[delta_name]
+                config = self.__merge_config_delta(simulation, cfn, delta)
+            if isinstance(config, bytes):
+                config = json.loads(config.decode('utf-8'))
         else:
             # try to load the config
             config = simulation.platform.get_files(simulation, [cfn])
@@ -204,13 +324,41 @@ class JSONConfiguredTask(ITask):
         if self.transient_assets:
             nw = AssetCollection()
             for asset in self.transient_assets:
-                if isinstance(asset, dict) and asset['filename'] != cfn:
-                    self.transient_assets.add_asset(Asset(**asset))
-                elif isinstance(asset, Asset) and asset.filename != cfn:
-                    self.transient_assets.add_asset(Asset(**asset))
+                if isinstance(asset, dict) and asset['filename'] not in (cfn, delta_name):
+                    nw.add_asset(Asset(**asset))
+                elif isinstance(asset, Asset) and asset.filename not in (cfn, delta_name):
+                    nw.add_asset(asset)
             self.transient_assets = nw
         return config
 
+    @staticmethod
+    def __get_part_file_name(config_file_name: str, part: str) -> str:
+        name, ext = os.path.splitext(config_file_name)
+        return f"{name}.{part}{ext}"
+
+    def __merge_config_delta(self, simulation: Simulation, config_file_name: str, delta: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        Rebuild the configuration of a simulation from its merge patch and the configuration shared by the experiment.
+
+        Args:
+            simulation: Simulation to load from
+            config_file_name: Config file name
+            delta: Content of the merge patch
+
+        Returns:
+            Config reloaded, the merge patch if the shared configuration cannot be found
+        """
+        base_name = self.__get_part_file_name(config_file_name, "base")
+        delta = json.loads(delta.decode('utf-8') if isinstance(delta, bytes) else delta)
+        experiment = simulation.parent
+        base = experiment.assets.get_one(filename=base_name) if experiment is not None and experiment.assets else None
+        if base is None:
+            user_logger.warning(f'Could not find {base_name} of simulation {simulation.id}, loading its patch only')
+            return delta
+        content = base.content
+        base = json.loads(content.decode('utf-8') if isinstance(content, bytes) else content)
+        return merge_config.apply_merge_patch(base, delta)
+
     def pre_creation(self, parent: Union['Simulation', 'WorkflowItem'], platform: 'IPlatform'):  # noqa: F821
         """
         Pre-creation. For JSONConfiguredTask, we finalize our configuration file and command line here.
@@ -242,6 +390,32 @@ class JSONConfiguredTask(ITask):
                     self.command.add_argument(self.configfile_argument)
                     self.command.add_argument(self.config_file_name)
 
+        config_base = self.__dict__.get('_config_base')
+        if self.config_delta and not self.is_config_common and config_base is not None and config_base.config is not None:
+            parent.tags['task_config_delta'] = True
+            if self.config_delta_launcher:
+                self.__add_config_launcher(platform)
+
+    def __add_config_launcher(self, platform: 'IPlatform') -> None:
+        """
+        Run the command through the launcher merging the configuration of the simulation.
+
+        Args:
+            platform: Platform task is being created on
+
+        Returns:
+            None
+        """
+        launcher = platform.join_path(platform.common_asset_path, CONFIG_LAUNCHER_FILE_NAME)
+        if launcher in str(self.command):
+            return
+        python = self.config_delta_python or getattr(self, 'python_path', None) or 'python'
+        base = platform.join_path(platform.common_asset_path, self.config_base_file_name)
+        command = CommandLine.from_string(f'{python} {launcher} {base} {self.config_delta_file_name} '
+                                          f'{self.config_file_name} {self.command}')
+        command.is_windows = self.command.is_windows
+        self.command = command
+
     def __repr__(self):
         """String version of task Prints config filename and parameters."""
         return f"<JSONConfiguredTask config:{self.config_file_name} parameters: {self.parameters}"
@@ -0,0 +1,189 @@
+"""
+Here we implement the merge of a base JSON config with a per simulation patch.
+
+JSONConfiguredTask can store the config shared by all simulations of an experiment once, as a common asset, and only
+the keys each simulation changes as a JSON merge patch (RFC 7386). This module is copied to the assets of the
+experiment: it runs before the model to write the merged config, then runs the model::
+
+    python Assets/merge_config.py Assets/config.base.json config.delta.json config.json python model.py
+
+Models can also read both files themselves with :func:`load_config`. The module only depends on the standard library
+so it runs with any python of the compute nodes.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+# Marks values a merge patch cannot express
+_NO_PATCH = object()
+
+
+def _same(a: Any, b: Any) -> bool:
+    # 1 == 1.0 == True in python but not in the config of a model, at any depth
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same(v, b[k]) for k, v in a.items())
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def _diff(base: Any, target: Any) -> Any:
+    if not isinstance(base, dict) or not isinstance(target, dict):
+        # a null value would delete the key, and a patch cannot set a key of an object to null
+        return _NO_PATCH if _has_null(target) else target
+    patch = dict()
+    for key, value in target.items():
+        if key not in base:
+            if _has_null(value):
+                return _NO_PATCH
+            patch[key] = value
+        elif not _same(base[key], value):
+            if isinstance(base[key], dict) and isinstance(value, dict):
+                value = _diff(base[key], value)
+            elif _has_null(value):
+                return _NO_PATCH
+            if value is _NO_PATCH:
+                return _NO_PATCH
+            patch[key] = value
+    for key in base:
+        if key not in target:
+            patch[key] = None
+    return patch
+
+
+def _has_null(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, dict):
+        return any(_has_null(v) for v in value.values())
+    return False
+
+
+def make_merge_patch(base: Dict[str, Any], target: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Get the merge patch turning a config into another.
+
+    Args:
+        base: Config shared by the simulations
+        target: Config of a simulation
+
+    Returns:
+        The patch, None if a patch cannot express the config, for example when it sets a key to null
+    """
+    patch = _diff(base, target)
+    return None if patch is _NO_PATCH else patch
+
+
+def apply_merge_patch(base: Any, patch: Any) -> Any:
+    """
+    Apply a merge patch to a config.
+
+    Args:
+        base: Config shared by the simulations. It is not modified
+        patch: Merge patch of a simulation
+
+    Returns:
+        The merged config
+    """
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(base) if isinstance(base, dict) else dict()
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def load_config(config: str, base: str = None, delta: str = None) -> Dict[str, Any]:
+    """
+    Load the config of a simulation.
+
+    Args:
+        config: Path of the config. It is used when the simulation has a complete config
+        base: Path of the config shared by the simulations
+        delta: Path of the merge patch of the simulation
+
+    Returns:
+        The config
+    """
+    if delta is None or base is None or not os.path.exists(delta):
+        with open(config) as f:
+            return json.load(f)
+    with open(base) as f:
+        base_config = json.load(f)
+    with open(delta) as f:
+        return apply_merge_patch(base_config, json.load(f))
+
+
+def merge_config_files(base: str, delta: str, output: str) -> bool:
+    """
+    Write the config of a simulation from the shared config and its merge patch.
+
+    Args:
+        base: Path of the config shared by the simulations
+        delta: Path of the merge patch of the simulation
+        output: Path of the config to write
+
+    Returns:
+        True if the config was written, False if the simulation has no patch, so its config is complete
+    """
+    if not os.path.exists(delta):
+        return False
+    config = load_config(output, base, delta)
+    tmp = f"{output}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(config, f)
+    os.replace(tmp, output)
+    return True
+
+
+def run(command: List[str]) -> int:
+    """
+    Run the command of the model, forwarding termination signals to it.
+
+    Args:
+        command: Command and arguments
+
+    Returns:
+        Return code of the command
+    """
+    process = subprocess.Popen(command)
+
+    def forward(signum, frame):
+        process.send_signal(signum)
+
+    for name in ("SIGTERM", "SIGINT"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), forward)
+    return process.wait()
+
+
+def main(args: List[str] = None) -> int:
+    """
+    Merge the config of a simulation, then run its command.
+
+    Args:
+        args: base config, patch and output paths, followed by the command of the model
+
+    Returns:
+        Return code of the command, 0 if there is no command
+    """
+    args = sys.argv[1:] if args is None else args
+    if len(args) < 3:
+        print("usage: merge_config.py <base> <delta> <output> [command ...]", file=sys.stderr)
+        return 2
+    merge_config_files(*args[:3])
+    return run(args[3:]) if args[3:] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
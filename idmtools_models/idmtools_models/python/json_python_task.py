@@ -41,7 +41,9 @@ class JSONConfiguredPythonTask(JSONConfiguredTask, PythonTask):
         Returns:
             Assets
         """
-        return PythonTask.gather_common_assets(self)
+        PythonTask.gather_common_assets(self)
+        self._gather_config_base()
+        return self.common_assets
 
     def gather_transient_assets(self) -> AssetCollection:
         """
@@ -48,7 +48,9 @@ class SingularityJSONConfiguredPythonTask(SingularityJSONConfiguredTask, PythonT
         Returns:
             Common AssetCollection
         """
-        return PythonTask.gather_common_assets(self)
+        PythonTask.gather_common_assets(self)
+        self._gather_config_base()
+        return self.common_assets
 
     def gather_transient_assets(self) -> AssetCollection:
         """
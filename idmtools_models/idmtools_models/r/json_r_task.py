@@ -40,7 +40,9 @@ class JSONConfiguredRTask(JSONConfiguredTask, RTask):
         Returns:
             Assets
         """
-        return RTask.gather_common_assets(self)
+        RTask.gather_common_assets(self)
+        self._gather_config_base()
+        return self.common_assets
 
     def gather_transient_assets(self) -> AssetCollection:
         """
@@ -10,13 +10,13 @@ from dataclasses import dataclass, field
 from functools import partial
 from logging import getLogger, DEBUG
 from typing import List, Callable, Type, Dict, Any, Union, TYPE_CHECKING
-from jinja2 import Environment
 from idmtools.assets import AssetCollection, Asset
 from idmtools.entities import CommandLine
 from idmtools.entities.itask import ITask
 from idmtools.entities.iworkflow_item import IWorkflowItem
 from idmtools.entities.simulation import Simulation
 from idmtools.registry.task_specification import TaskSpecification
+from idmtools.utils.templates import get_renderer
 if TYPE_CHECKING:  # pragma: no cover
     from idmtools.entities.iplatform import IPlatform
 
@@ -131,13 +131,12 @@ class TemplatedScriptTask(ITask):
         Returns:
             Asset Collection with template added
         """
-        # setup our jinja environment
-        env = Environment()
-        # try to load template from string or file
+        # try to load template from string or file. The renderer compiles each template once
+        renderer = get_renderer()
         if task.template:
-            template = env.from_string(task.template)
+            template = renderer.from_string(task.template)
         else:
-            template = env.get_template(task.template_file)
+            template = renderer.get_template(task.template_file)
         if logger.isEnabledFor(DEBUG):
             logger.debug(f"Rendering Script template: {template}")
         # render the template
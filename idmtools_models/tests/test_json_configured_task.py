@@ -1,12 +1,19 @@
 import allure
 import json
+import os
+import subprocess
+import sys
+import tempfile
 from dataclasses import dataclass, field
 from unittest import TestCase
 import pytest
 from idmtools.core.platform_factory import Platform
 from idmtools.core.task_factory import TaskFactory
 from idmtools.entities import CommandLine
+from idmtools.builders import SimulationBuilder
 from idmtools.entities.experiment import Experiment
+from idmtools.entities.templated_simulation import TemplatedSimulations
+from idmtools_models import merge_config
 from idmtools_models.json_configured_task import JSONConfiguredTask
 
 
@@ -96,3 +103,102 @@ class TestJSONConfiguredTask(TestCase):
             self.assertEqual(task.parameters, sim.task.parameters)
             self.assertEqual(task.command, sim.task.command)
 
+
+    def test_merge_patch(self):
+        base = dict(a=1, b=dict(c=2, d=[1, 2], e="x"), f=True, g=None)
+        samples = [
+            dict(base),
+            dict(a=2, b=dict(c=2, d=[1, 2], e="x"), f=True, g=None),
+            dict(a=1.0, b=dict(c=2, d=[2], e="x"), f=1, g=None, h=dict(i=1)),
+            dict(a=1, b=dict(d=[1, 2, None], e="y"), g=None),
+            dict(a=1, b=[], f=True, g=None),
+        ]
+        for target in samples:
+            with self.subTest(target=target):
+                patch = merge_config.make_merge_patch(base, target)
+                self.assertEqual(merge_config.apply_merge_patch(base, patch), target)
+                result = merge_config.apply_merge_patch(base, patch)
+                self.assertEqual([type(result[k]) for k in result], [type(target[k]) for k in target])
+        self.assertEqual(merge_config.make_merge_patch(base, dict(base)), {})
+        self.assertEqual(merge_config.make_merge_patch(base, dict(base, a=3)), dict(a=3))
+        self.assertEqual(merge_config.make_merge_patch(base, dict(base, b=dict(c=3, d=[1, 2], e="x"))), dict(b=dict(c=3)))
+        # type only changes are kept at any depth
+        nested = dict(b=dict(c=1, d=[1, 2]))
+        self.assertEqual(merge_config.make_merge_patch(nested, dict(b=dict(c=1.0, d=[1, 2]))), dict(b=dict(c=1.0)))
+        self.assertEqual(merge_config.make_merge_patch(nested, dict(b=dict(c=True, d=[1, 2]))), dict(b=dict(c=True)))
+        self.assertEqual(merge_config.make_merge_patch(nested, dict(b=dict(c=1, d=[1, 2.0]))),
+                         dict(b=dict(d=[1, 2.0])))
+        self.assertEqual(merge_config.make_merge_patch(dict(b=dict(c=dict(d=1))), dict(b=dict(c=dict(d=1.0)))),
+                         dict(b=dict(c=dict(d=1.0))))
+        # a merge patch cannot set a value to null
+        self.assertIsNone(merge_config.make_merge_patch(base, dict(base, a=None)))
+        self.assertIsNone(merge_config.make_merge_patch(base, dict(base, h=dict(i=None))))
+
+    def test_merge_config_launcher(self):
+        with tempfile.TemporaryDirectory() as directory:
+            base, delta, output = [os.path.join(directory, name) for name in ("base.json", "delta.json", "config.json")]
+            with open(base, "w") as f:
+                json.dump(dict(a=1, b=dict(c=2)), f)
+            with open(delta, "w") as f:
+                json.dump(dict(b=dict(c=3)), f)
+            launcher = os.path.abspath(merge_config.__file__)
+            command = [sys.executable, launcher, base, delta, output, sys.executable, "-c", "import sys; sys.exit(3)"]
+            self.assertEqual(subprocess.run(command).returncode, 3)
+            with open(output) as f:
+                self.assertEqual(json.load(f), dict(a=1, b=dict(c=3)))
+            self.assertEqual(merge_config.load_config(output, base, delta), dict(a=1, b=dict(c=3)))
+
+            # without a patch, the config is complete
+            os.remove(delta)
+            with open(output, "w") as f:
+                json.dump(dict(a=5), f)
+            self.assertEqual(merge_config.main([base, delta, output]), 0)
+            self.assertEqual(merge_config.load_config(output, base, delta), dict(a=5))
+
+    def test_config_delta_assets(self):
+        task = self.get_cat_command_task(dict(config_delta=True, envelope="parameters"))
+        task.update_parameters({f"key{i}": i for i in range(100)})
+        task.gather_common_assets()
+        base = task.common_assets.get_one(filename="config.base.json")
+        self.assertEqual(json.loads(base.content), dict(parameters={f"key{i}": i for i in range(100)}))
+        self.assertIsNotNone(task.common_assets.get_one(filename="merge_config.py"))
+
+        sim_task = TemplatedSimulations(base_task=task).new_simulation().task
+        sim_task.set_parameter("key3", "changed")
+        sim_task.gather_transient_assets()
+        self.assertEqual([a.filename for a in sim_task.transient_assets], ["config.delta.json"])
+        self.assertEqual(json.loads(sim_task.transient_assets.assets[0].content), dict(parameters=dict(key3="changed")))
+        # copies share the base config
+        self.assertIs(sim_task._config_base, task._config_base)
+
+        # a null value needs the complete config
+        sim_task.set_parameter("key4", None)
+        sim_task.gather_transient_assets()
+        self.assertEqual([a.filename for a in sim_task.transient_assets], ["config.json"])
+
+    @pytest.mark.timeout(60)
+    @pytest.mark.serial
+    def test_config_delta_sweep(self):
+        with Platform("TestExecute", type='TestExecute') as p:
+            task = ExampleExtendedJSONConfiguredTask(parameters=dict(a=1, b=2, c=3), config_delta=True,
+                                                     config_delta_python=sys.executable,
+                                                     command=CommandLine(sys.executable, "-m", "json.tool", "my_config.json"))
+            builder = SimulationBuilder()
+            builder.add_sweep_definition(JSONConfiguredTask.set_parameter_partial("a"), [10, 20])
+            ts = TemplatedSimulations(base_task=task)
+            ts.add_builder(builder)
+            experiment = Experiment.from_template(ts, name="Test config delta")
+            experiment.run(wait_until_done=True)
+            self.assertTrue(experiment.succeeded)
+            for simulation in experiment.simulations:
+                self.assertTrue(simulation.tags["task_config_delta"])
+                self.assertIn("merge_config.py", str(simulation.task.command))
+                path = os.path.join(p.execute_directory, str(experiment.id), str(simulation.id))
+                with open(os.path.join(path, "my_config.delta.json")) as f:
+                    self.assertEqual(json.load(f), dict(a=simulation.tags["a"]))
+                with open(os.path.join(path, "my_config.json")) as f:
+                    self.assertEqual(json.load(f), dict(a=simulation.tags["a"], b=2, c=3))
+
+            experiment2 = Experiment.from_id(experiment.id, load_task=True)
+            for simulation in experiment2.simulations:
+                self.assertEqual(simulation.task.parameters, dict(a=simulation.tags["a"], b=2, c=3))
@@ -8,15 +8,16 @@ import uuid
 from dataclasses import field, dataclass
 from functools import partial
 from logging import getLogger, DEBUG
-from typing import Type, Union, List, TYPE_CHECKING, Optional, Dict
+from typing import Type, Union, List, TYPE_CHECKING, Optional, Dict, Tuple
 from uuid import UUID
 import humanfriendly
 from COMPS.Data import AssetCollection as COMPSAssetCollection, QueryCriteria, AssetCollectionFile, SimulationFile, OutputFileMetadata, WorkItemFile
-from tqdm import tqdm
 from idmtools import IdmConfigParser
 from idmtools.assets import AssetCollection, Asset
 from idmtools.core import ItemType
 from idmtools.entities.iplatform_ops.iplatform_asset_collection_operations import IPlatformAssetCollectionOperations
+from idmtools_platform_comps.utils.asset_uploader import StreamingAssetUploader
+from idmtools_platform_comps.utils.checksum_cache import AssetChecksumCache
 from idmtools_platform_comps.utils.general import get_file_as_generator
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -33,6 +34,8 @@ class CompsPlatformAssetCollectionOperations(IPlatformAssetCollectionOperations)
     """
     platform: 'COMPSPlatform'  # noqa F821
     platform_type: Type = field(default=COMPSAssetCollection)
+    #: Hashes and uploads the files of new asset collections
+    uploader: StreamingAssetUploader = field(default_factory=StreamingAssetUploader, repr=False)
 
     def get(self, asset_collection_id: Optional[UUID], load_children: Optional[List[str]] = None, query_criteria: Optional[QueryCriteria] = None, **kwargs) -> COMPSAssetCollection:
         """
@@ -64,98 +67,143 @@ class CompsPlatformAssetCollectionOperations(IPlatformAssetCollectionOperations)
         Returns:
             COMPSAssetCollection
         """
-        ac = COMPSAssetCollection()
-        ac_files = set()
-        ac_map = dict()
-        for asset in asset_collection:
-            # using checksum is not accurate and not all systems will support de-duplication
-            if asset.checksum is None:
-                md5_checksum_str = asset.calculate_checksum()
-                ac_files.add(
-                    (
-                        asset.filename,
-                        asset.relative_path,
-                        uuid.UUID(md5_checksum_str)
-                    )
-                )
-                ac_map[asset] = uuid.UUID(md5_checksum_str)
-            else:  # We should already have this asset so we should have a md5sum
-                ac_files.add(
-                    (
-                        asset.filename,
-                        asset.relative_path,
-                        asset.checksum if isinstance(asset.checksum, uuid.UUID) else uuid.UUID(asset.checksum)
-                    )
-                )
-                ac_map[asset] = asset.checksum if isinstance(asset.checksum, uuid.UUID) else uuid.UUID(asset.checksum)
-
+        cache = getattr(self.platform, '_checksum_cache', None)
+        checksums = self.uploader.compute_checksums(asset_collection, cache=cache)
         # remove any duplicates
+        ac_files = list(dict.fromkeys((asset.filename, asset.relative_path, cksum) for asset, cksum in checksums.items()))
         if logger.isEnabledFor(DEBUG):
-            logger.debug(f"Building ac. Filtered out {len(asset_collection) - len(ac_files)} assets that exist on COMPS already")
+            logger.debug(f"Building ac. Filtered out {len(asset_collection) - len(ac_files)} duplicate assets")
 
-        for file in ac_files:
-            ac.add_asset(AssetCollectionFile(file_name=file[0], relative_path=file[1], md5_checksum=file[2]))
-        del ac_files
-        # Add tags
-        if asset_collection.tags:
-            ac.set_tags(asset_collection.tags)
+        lookup_key = None
+        if cache is not None and cache.enabled:
+            # the same files and tags were saved before, reuse that collection
+            lookup_key = cache.asset_collection_key(ac_files, asset_collection.tags)
+            ac = self._get_cached_asset_collection(cache, lookup_key)
+            if ac is not None:
+                self._set_platform_object(asset_collection, ac)
+                return ac
 
-        # check for missing files first
-        missing_files = ac.save(return_missing_files=True)
+        ac = self._build_comps_asset_collection(ac_files, asset_collection.tags)
+        if self._save_known_files(cache, ac, ac_files):
+            missing_files = None
+        else:
+            # check for missing files first
+            missing_files = ac.save(return_missing_files=True)
         if missing_files:
             if logger.isEnabledFor(DEBUG):
                 logger.debug(f"{len(missing_files)} missing files detected")
-            ac2 = COMPSAssetCollection()
-            if asset_collection.tags:
-                ac2.set_tags(ac.tags)
-            total_size = 0
-            for asset, cksum in ac_map.items():
-                if cksum in missing_files:
-                    if asset.absolute_path:
-                        total_size += os.path.getsize(asset.absolute_path)
-                        ac2.add_asset(
-                            AssetCollectionFile(
-                                file_name=asset.filename,
-                                relative_path=asset.relative_path
-                            ),
-                            file_path=asset.absolute_path
-                        )
-                    else:
-                        total_size += len(asset.bytes)
-                        ac2.add_asset(
-                            AssetCollectionFile(
-                                file_name=asset.filename,
-                                relative_path=asset.relative_path
-                            ),
-                            data=asset.bytes
-                        )
-                else:
-                    ac2.add_asset(AssetCollectionFile(
-                        file_name=asset.filename,
-                        relative_path=asset.relative_path,
-                        md5_checksum=cksum
-                    ))
+            missing_files = set(missing_files)
+            if cache is not None:
+                cache.invalidate_checksums(missing_files)
+            to_upload = dict()
+            for asset, cksum in checksums.items():
+                if cksum in missing_files and cksum not in to_upload:
+                    to_upload[cksum] = asset
             if IdmConfigParser.is_output_enabled():
-                user_logger.info(f"Uploading {len(missing_files)} files/{humanfriendly.format_size(total_size)}")
-            callback = None
-            prog = None
-            if not IdmConfigParser.is_progress_bar_disabled():
-                prog = tqdm(desc="Uploading files", unit='file', total=len(missing_files))
-
-                def update_progress(total_files_uploaded):
-                    prog.n = total_files_uploaded
-                    prog.display()
-
-                callback = update_progress
-            ac2.save(upload_files_callback=callback)
-            if callback:
-                callback(len(missing_files))
-                prog.close()
-            ac = ac2
+                total_size = sum(self.uploader.get_size(asset) for asset in to_upload.values())
+                user_logger.info(f"Uploading {len(to_upload)} files/{humanfriendly.format_size(total_size)}")
+            # Stream the missing files, then save the collection referencing all the files by checksum
+            report = self.uploader.upload(to_upload)
+            if IdmConfigParser.is_output_enabled():
+                user_logger.info(str(report))
+            ac = self._build_comps_asset_collection(ac_files, asset_collection.tags)
+            ac.save()
+        if cache is not None:
+            cache.record_asset_collection(ac.id, [cksum for _, _, cksum in ac_files], lookup_key=lookup_key)
+        self._set_platform_object(asset_collection, ac)
+        return ac
+
+    def _set_platform_object(self, asset_collection: AssetCollection, ac: COMPSAssetCollection):
+        """
+        Link an asset collection to the COMPS collection created for it.
+
+        Args:
+            asset_collection: Asset collection
+            ac: COMPS asset collection
+
+        Returns:
+            None
+        """
         asset_collection.uid = ac.id
         asset_collection._platform_object = ac
         asset_collection.platform = self.platform
         asset_collection.platform_id = self.platform.uid
+
+    def _get_cached_asset_collection(self, cache: AssetChecksumCache, lookup_key: str) -> Optional[COMPSAssetCollection]:
+        """
+        Get an asset collection previously created with the same files and tags.
+
+        Args:
+            cache: Checksum cache of the platform
+            lookup_key: Key of the files and tags
+
+        Returns:
+            COMPSAssetCollection or None when there is none or it no longer exists on COMPS
+        """
+        ac_id = cache.find_asset_collection(lookup_key)
+        if ac_id is None:
+            return None
+        try:
+            ac = self.get(ac_id, load_children=["tags"])
+        except Exception as e:
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f"Cached asset collection {ac_id} could not be loaded: {e}")
+            ac = None
+        if ac is None:
+            cache.invalidate_asset_collection(ac_id)
+        elif logger.isEnabledFor(DEBUG):
+            logger.debug(f"Reusing asset collection {ac_id} with the same files")
+        return ac
+
+    @staticmethod
+    def _save_known_files(cache: Optional[AssetChecksumCache], ac: COMPSAssetCollection,
+                          ac_files: List[Tuple[str, str, uuid.UUID]]) -> bool:
+        """
+        Save an asset collection without asking COMPS for the missing files, when all its files are known to be there.
+
+        Args:
+            cache: Checksum cache of the platform
+            ac: COMPS asset collection
+            ac_files: Filename, relative path, and checksum of each file
+
+        Returns:
+            True when the collection is saved, False when the missing files have to be negotiated
+        """
+        if cache is None or not cache.enabled:
+            return False
+        checksums = [cksum for _, _, cksum in ac_files]
+        if cache.unknown(checksums):
+            return False
+        try:
+            ac.save()
+        except RuntimeError as e:
+            # some files were removed from COMPS since they were cached
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f"Known files rejected by COMPS, checking the missing files: {e}")
+            cache.invalidate_checksums(checksums)
+            return False
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"Saved asset collection {ac.id} with {len(checksums)} known files")
+        return True
+
+    @staticmethod
+    def _build_comps_asset_collection(ac_files: List[Tuple[str, str, uuid.UUID]], tags: Dict = None) \
+            -> COMPSAssetCollection:
+        """
+        Build a COMPS asset collection referencing files by checksum.
+
+        Args:
+            ac_files: Filename, relative path, and checksum of each file
+            tags: Tags of the collection
+
+        Returns:
+            COMPSAssetCollection
+        """
+        ac = COMPSAssetCollection()
+        for filename, relative_path, checksum in ac_files:
+            ac.add_asset(AssetCollectionFile(file_name=filename, relative_path=relative_path, md5_checksum=checksum))
+        if tags:
+            ac.set_tags(tags)
         return ac
 
     def to_entity(self, asset_collection: Union[COMPSAssetCollection, SimulationFile, List[SimulationFile], OutputFileMetadata, List[WorkItemFile]], **kwargs) \
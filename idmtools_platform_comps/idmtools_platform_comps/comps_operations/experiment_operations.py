@@ -7,7 +7,7 @@ import os
 from dataclasses import dataclass, field
 from itertools import tee
 from logging import getLogger, DEBUG
-from typing import List, Dict, Type, Generator, NoReturn, Optional, TYPE_CHECKING
+from typing import List, Dict, Type, Generator, NoReturn, Optional, TYPE_CHECKING, Any, Iterator, Tuple
 from uuid import UUID
 from COMPS.Data import Experiment as COMPSExperiment, QueryCriteria, Configuration, Suite as COMPSSuite, \
     Simulation as COMPSSimulation
@@ -24,7 +24,7 @@ from idmtools.entities.templated_simulation import TemplatedSimulations
 from idmtools.utils.collections import ExperimentParentIterator
 from idmtools.utils.info import get_doc_base_url
 from idmtools.utils.time import timestamp
-from idmtools_platform_comps.utils.general import clean_experiment_name, convert_comps_status
+from idmtools_platform_comps.utils.general import clean_experiment_name
 
 if TYPE_CHECKING:  # pragma: no cover
     from idmtools_platform_comps.comps_platform import COMPSPlatform
@@ -374,6 +374,9 @@ class CompsPlatformExperimentOperations(IPlatformExperimentOperations):
         """
         Reload status for experiment(load simulations).
 
+        Only the id and state of the simulations are fetched, using paged queries. Experiments whose simulations are
+        all done are not queried again.
+
         Args:
             experiment: Experiment to load status for
             **kwargs:
@@ -381,10 +384,7 @@ class CompsPlatformExperimentOperations(IPlatformExperimentOperations):
         Returns:
             None
         """
-        simulations = self.get_children(experiment.get_platform_object(), force=True, columns=["id", "state"],
-                                        load_children=[])
-        for s in simulations:
-            experiment.simulations.set_status_for_item(s.id, convert_comps_status(s.state))
+        self.platform._status_refresher.refresh([experiment])
 
     def to_entity(self, experiment: COMPSExperiment, parent: Optional[COMPSSuite] = None, children: bool = True,
                   **kwargs) -> Experiment:
@@ -493,6 +493,30 @@ class CompsPlatformExperimentOperations(IPlatformExperimentOperations):
         clear_linux_mounts(self.platform)
         return sim_map
 
+    def get_sim_directory_records(self, experiment_id: str, include_tags: bool = True) \
+            -> Iterator[Tuple[str, Dict[str, Any], str]]:
+        """
+        Gather the id, tags, and working directory of each simulation with a single simulations query.
+
+        Args:
+            experiment_id: experiment id
+            include_tags: Include the simulation tags
+
+        Returns:
+            Iterator of (simulation id, tags, working directory). Simulations without hpc jobs are skipped
+        """
+        from idmtools_platform_comps.utils.linux_mounts import set_linux_mounts, clear_linux_mounts
+        children = ['tags', 'hpc_jobs'] if include_tags else ['hpc_jobs']
+        set_linux_mounts(self.platform)
+        try:
+            comps_exp = self.platform.get_item(experiment_id, ItemType.EXPERIMENT, raw=True, force=True)
+            comps_sims = comps_exp.get_simulations(QueryCriteria().select(['id', 'state']).select_children(children))
+            for sim in comps_sims:
+                if sim.hpc_jobs:
+                    yield str(sim.id), (sim.tags or {}) if include_tags else {}, sim.hpc_jobs[-1].working_directory
+        finally:
+            clear_linux_mounts(self.platform)
+
     def platform_delete(self, experiment_id: str) -> None:
         """
         Delete platform experiment.
@@ -25,9 +25,10 @@ from idmtools.entities.experiment import Experiment
 from idmtools.entities.iplatform_ops.iplatform_simulation_operations import IPlatformSimulationOperations
 from idmtools.entities.iplatform_ops.utils import batch_create_items
 from idmtools.entities.simulation import Simulation
-from idmtools.utils.json import IDMJSONEncoder
+from idmtools.utils.json import dumps_json
 from idmtools_platform_comps.utils.general import convert_comps_status, get_asset_for_comps_item, clean_experiment_name
 from idmtools_platform_comps.utils.scheduling import scheduled
+from idmtools_platform_comps.utils.transient_dedup import TransientAssetBatch
 
 if TYPE_CHECKING:  # pragma: no cover
     from idmtools_platform_comps.comps_platform import COMPSPlatform
@@ -65,17 +66,23 @@ def comps_batch_worker(simulations: List[Simulation], interface: 'CompsPlatformS
     created_simulations = []
 
     new_sims = 0
+    transient_batch = interface.start_transient_batch()
     for simulation in simulations:
         if simulation.status is None:
             interface.pre_create(simulation)
             new_sims += 1
             simulation.platform = interface.platform
             simulation._platform_object = interface.to_comps_sim(simulation, num_cores=num_cores, priority=priority,
-                                                                 asset_collection_id=asset_collection_id, **kwargs)
+                                                                 asset_collection_id=asset_collection_id,
+                                                                 transient_batch=transient_batch, **kwargs)
             created_simulations.append(simulation)
+    if transient_batch:
+        transient_batch.flush()
     if logger.isEnabledFor(DEBUG):
         logger.debug(f'Finished converting to COMPS. Starting saving of {len(simulations)}')
     COMPSSimulation.save_all(None, save_semaphore=COMPSSimulation.get_save_semaphore())
+    if transient_batch:
+        transient_batch.commit()
     if logger.isEnabledFor(DEBUG):
         logger.debug(f'Finished saving of {len(simulations)}. Starting post_create')
     for simulation in simulations:
@@ -285,6 +292,9 @@ class CompsPlatformSimulationOperations(IPlatformSimulationOperations):
             if logger.isEnabledFor(DEBUG):
                 logger.debug(f"COMMISSION Response: {ex.args}")
         COMPS_EXPERIMENT_BATCH_COMMISSION_TIMESTAMP = 0
+        dedup = getattr(self.platform, '_transient_dedup', None)
+        if dedup is not None and dedup.reports:
+            logger.info(f"Transient assets: {dedup.summary()}")
         # set commission here in comps objects to prevent commission in Experiment when batching
         for sim in results:
             sim.status = EntityStatus.RUNNING
@@ -308,8 +318,20 @@ class CompsPlatformSimulationOperations(IPlatformSimulationOperations):
         """For simulations, there is no running for COMPS."""
         pass
 
+    def start_transient_batch(self) -> Optional[TransientAssetBatch]:
+        """
+        Start a batch of simulations whose transient assets are de-duplicated.
+
+        Returns:
+            The batch, or None when the platform does not de-duplicate transient assets
+        """
+        if not getattr(self.platform, 'dedup_transient_assets', False):
+            return None
+        dedup = getattr(self.platform, '_transient_dedup', None)
+        return dedup.batch() if dedup is not None else None
+
     def send_assets(self, simulation: Simulation, comps_sim: Optional[COMPSSimulation] = None,
-                    add_metadata: bool = False, **kwargs):
+                    add_metadata: bool = False, transient_batch: Optional[TransientAssetBatch] = None, **kwargs):
         """
         Send assets to Simulation.
 
@@ -317,6 +339,7 @@ class CompsPlatformSimulationOperations(IPlatformSimulationOperations):
             simulation: Simulation to send asset for
             comps_sim: Optional COMPSSimulation object to prevent reloading it
             add_metadata: Add idmtools metadata object
+            transient_batch: Optional batch collecting the files, to upload the payloads repeated across the batch once
             **kwargs:
 
         Returns:
@@ -324,28 +347,36 @@ class CompsPlatformSimulationOperations(IPlatformSimulationOperations):
         """
         if comps_sim is None:
             comps_sim = simulation.get_platform_object()
+
+        def add_file(simulationfile: SimulationFile, data: bytes):
+            if transient_batch is not None:
+                transient_batch.add_file(comps_sim, simulationfile, data)
+            else:
+                comps_sim.add_file(simulationfile=simulationfile, data=data)
+
         for asset in simulation.assets:
             if asset.filename.lower() == 'workorder.json' and scheduled(simulation):
-                comps_sim.add_file(simulationfile=SimulationFile(asset.filename, 'WorkOrder'), data=asset.bytes)
+                add_file(SimulationFile(asset.filename, 'WorkOrder'), asset.bytes)
             else:
-                comps_sim.add_file(simulationfile=SimulationFile(asset.filename, 'input'), data=asset.bytes)
+                add_file(SimulationFile(asset.filename, 'input'), asset.bytes)
 
         # add metadata
         if add_metadata:
             if logger.isEnabledFor(DEBUG):
                 logger.debug("Creating idmtools metadata for simulation and task on COMPS")
             # later we should add some filtering for passwords and such here in case anything weird happens
-            metadata = json.dumps(simulation.task.to_dict(), cls=IDMJSONEncoder)
+            metadata = dumps_json(simulation.task.to_dict())
             from idmtools import __version__
-            comps_sim.add_file(
-                SimulationFile("idmtools_metadata.json", 'input', description=f'IDMTools {__version__}'),
-                data=metadata.encode()
-            )
+            add_file(SimulationFile("idmtools_metadata.json", 'input', description=f'IDMTools {__version__}'),
+                     metadata.encode())
 
     def refresh_status(self, simulation: Simulation, additional_columns: Optional[List[str]] = None, **kwargs):
         """
         Refresh status of a simulation.
 
+        The status is refreshed with the other simulations of its experiment in bulk, unless additional columns are
+        requested.
+
         Args:
             simulation: Simulation to refresh
             additional_columns: Optional additional columns to load from COMPS
@@ -354,6 +385,9 @@ class CompsPlatformSimulationOperations(IPlatformSimulationOperations):
         Returns:
             None
         """
+        if not additional_columns and (simulation.parent_id or simulation.experiment_id):
+            self.platform._status_refresher.refresh([simulation])
+            return
         cols = ['state']
         if additional_columns:
             cols.extend(additional_columns)
@@ -104,7 +104,7 @@ class CompsPlatformSuiteOperations(IPlatformSuiteOperations):
 
     def refresh_status(self, suite: Suite, **kwargs):
         """
-        Refresh the status of a suite. On comps, this is done by refreshing all experiments.
+        Refresh the status of a suite. On comps, this is done by refreshing all experiments in bulk.
 
         Args:
             suite: Suite to refresh status of
@@ -113,8 +113,7 @@ class CompsPlatformSuiteOperations(IPlatformSuiteOperations):
         Returns:
             None
         """
-        for experiment in suite.experiments:
-            self.platform.refresh_status(experiment)
+        self.platform._status_refresher.refresh([suite])
 
     def to_entity(self, suite: COMPSSuite, children: bool = True, **kwargs) -> Suite:
         """
@@ -43,6 +43,9 @@ from idmtools_platform_comps.comps_operations.simulation_operations import Comps
 from idmtools_platform_comps.comps_operations.suite_operations import CompsPlatformSuiteOperations
 from idmtools_platform_comps.comps_operations.workflow_item_operations import CompsPlatformWorkflowItemOperations
 from idmtools_platform_comps.cli.cli_functions import environment_list, validate_range
+from idmtools_platform_comps.utils.bulk_status import BulkStatusRefresher
+from idmtools_platform_comps.utils.checksum_cache import AssetChecksumCache, DEFAULT_CHECKSUM_CACHE_TTL
+from idmtools_platform_comps.utils.transient_dedup import TransientAssetDeduplicator
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +95,10 @@ class COMPSPlatform(IPlatform, CacheEnabled):
     exclusive: bool = field(default=False,
                             metadata=dict(help="Enable exclusive mode? (one simulation per node on the cluster)"))
     docker_image: str = field(default=None, metadata={"help": "Docker image to use for simulations"})
+    dedup_transient_assets: bool = field(default=False, metadata=dict(
+        help="Upload transient assets repeated across simulations once, in a shared asset collection (opt-in)"))
+    checksum_cache_ttl: int = field(default=DEFAULT_CHECKSUM_CACHE_TTL, metadata=dict(
+        help="Seconds the local cache of the asset checksums known to be on COMPS is trusted. 0 disables the cache"))
 
     _platform_supports: List[PlatformRequirements] = field(default_factory=lambda: copy.deepcopy(supported_types),
                                                            repr=False, init=False)
@@ -102,6 +109,9 @@ class COMPSPlatform(IPlatform, CacheEnabled):
     _suites: CompsPlatformSuiteOperations = field(**op_defaults, repr=False, init=False)
     _workflow_items: CompsPlatformWorkflowItemOperations = field(**op_defaults, repr=False, init=False)
     _assets: CompsPlatformAssetCollectionOperations = field(**op_defaults, repr=False, init=False)
+    _status_refresher: BulkStatusRefresher = field(**op_defaults, repr=False, init=False)
+    _transient_dedup: TransientAssetDeduplicator = field(**op_defaults, repr=False, init=False)
+    _checksum_cache: AssetChecksumCache = field(**op_defaults, repr=False, init=False)
     _skip_login: bool = field(default=False, repr=False)
 
     def __post_init__(self):
@@ -123,6 +133,9 @@ class COMPSPlatform(IPlatform, CacheEnabled):
         self._suites = CompsPlatformSuiteOperations(platform=self)
         self._workflow_items = CompsPlatformWorkflowItemOperations(platform=self)
         self._assets = CompsPlatformAssetCollectionOperations(platform=self)
+        self._status_refresher = BulkStatusRefresher()
+        self._checksum_cache = AssetChecksumCache(namespace=self.endpoint, ttl=self.checksum_cache_ttl)
+        self._transient_dedup = TransientAssetDeduplicator(checksum_cache=self._checksum_cache)
 
     def _login(self):
         # ensure logging is initialized
@@ -0,0 +1,265 @@
+"""idmtools comps streaming asset upload.
+
+Hashes the assets of a collection concurrently and uploads the files missing on COMPS with a bounded number of
+parallel streams. Files are read from disk in chunks, so the memory used does not depend on the size of the collection.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import io
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import partial
+from logging import getLogger, DEBUG
+from threading import Lock
+from typing import BinaryIO, Callable, Dict, Iterable, Optional, Tuple, TYPE_CHECKING
+import humanfriendly
+from COMPS.Data import AssetManager
+from tqdm import tqdm
+from idmtools import IdmConfigParser
+from idmtools.assets import Asset
+from idmtools.utils.hashing import calculate_md5
+
+if TYPE_CHECKING:  # pragma: no cover
+    from idmtools_platform_comps.utils.checksum_cache import AssetChecksumCache
+
+logger = getLogger(__name__)
+
+# Largest chunk read from a file at once
+MAX_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class _ChunkedReader(io.RawIOBase):
+    """Read-only file wrapper returning at most *max_chunk* bytes per read and counting the bytes read."""
+
+    def __init__(self, stream: BinaryIO, max_chunk: int, on_read: Callable[[int], None] = None):
+        super().__init__()
+        self._stream = stream
+        self._max_chunk = max_chunk
+        self._on_read = on_read
+        #: Number of bytes read
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._stream.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._stream.tell()
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > self._max_chunk:
+            size = self._max_chunk
+        data = self._stream.read(size)
+        self.bytes_read += len(data)
+        if self._on_read and data:
+            self._on_read(len(data))
+        return data
+
+    def close(self):
+        self._stream.close()
+        super().close()
+
+
+@dataclass
+class AssetUploadReport:
+    """Statistics of an upload."""
+    #: Number of files uploaded
+    files: int = 0
+    #: Number of bytes transferred, including the retried attempts
+    bytes: int = 0
+    #: Number of upload attempts that were retried
+    retries: int = 0
+    #: Duration of the upload in seconds
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes uploaded per second."""
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        """Summary of the upload."""
+        return f"Uploaded {self.files} files/{humanfriendly.format_size(self.bytes)} in {self.elapsed:.1f}s " \
+               f"({humanfriendly.format_size(self.throughput)}/s, {self.retries} retries)"
+
+
+@dataclass
+class StreamingAssetUploader:
+    """
+    Hash and upload assets with bounded memory.
+
+    Checksums are computed by *hash_workers* threads. Missing files are streamed from disk by *upload_workers*
+    threads, at most *max_chunk_size* bytes at a time, and each file is retried up to *max_retries* times. COMPS resumes
+    partially uploaded files.
+    """
+    #: Number of threads computing checksums
+    hash_workers: int = field(default=8)
+    #: Number of files uploaded in parallel
+    upload_workers: int = field(default=4)
+    #: Number of retries per file
+    max_retries: int = field(default=3)
+    #: Delay before the first retry, doubled at each retry
+    retry_delay: float = field(default=1.0)
+    #: Largest chunk read from a file at once
+    max_chunk_size: int = field(default=MAX_UPLOAD_CHUNK_SIZE)
+    #: Function uploading a stream for a checksum. Defaults to COMPS AssetManager.upload_large_asset. Replace to test
+    #: against a fake endpoint
+    upload_stream: Callable[[uuid.UUID, BinaryIO, Optional[Callable[[int], None]]], None] = field(default=None,
+                                                                                                  repr=False)
+
+    #: Report of the last upload
+    last_report: AssetUploadReport = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.upload_stream is None:
+            self.upload_stream = AssetManager.upload_large_asset
+
+    @staticmethod
+    def _checksum(asset: Asset, cache: 'AssetChecksumCache' = None) -> uuid.UUID:
+        """
+        Get the checksum of an asset, computing it when needed.
+
+        Args:
+            asset: Asset
+            cache: Cache of the checksums of local files
+
+        Returns:
+            md5 of the asset
+        """
+        if asset.checksum is None:
+            if asset.absolute_path:
+                checksum = cache.file_checksum(asset.absolute_path) if cache else None
+                if checksum is None:
+                    checksum = calculate_md5(asset.absolute_path, chunk_size=HASH_CHUNK_SIZE)
+                    if cache:
+                        cache.set_file_checksum(asset.absolute_path, checksum)
+                asset.checksum = checksum
+            else:
+                asset.calculate_checksum()
+        return asset.checksum if isinstance(asset.checksum, uuid.UUID) else uuid.UUID(str(asset.checksum))
+
+    def compute_checksums(self, assets: Iterable[Asset], cache: 'AssetChecksumCache' = None) -> Dict[Asset, uuid.UUID]:
+        """
+        Compute the checksums of assets concurrently.
+
+        Args:
+            assets: Assets
+            cache: Cache of the checksums of local files. Unchanged files are not hashed again
+
+        Returns:
+            Checksum of each asset, in the order of the assets
+        """
+        assets = list(assets)
+        with ThreadPoolExecutor(max_workers=self.hash_workers) as pool:
+            checksums = list(pool.map(partial(self._checksum, cache=cache), assets))
+        return dict(zip(assets, checksums))
+
+    @staticmethod
+    def get_size(asset: Asset) -> int:
+        """
+        Get the size of an asset without loading files.
+
+        Args:
+            asset: Asset
+
+        Returns:
+            Size in bytes
+        """
+        return os.path.getsize(asset.absolute_path) if asset.absolute_path else len(asset.bytes)
+
+    def _open(self, asset: Asset, on_read: Callable[[int], None] = None) -> _ChunkedReader:
+        """
+        Open an asset for upload.
+
+        Args:
+            asset: Asset
+            on_read: Called with the number of bytes of each read
+
+        Returns:
+            Stream reading at most max_chunk_size bytes at a time
+        """
+        raw = open(asset.absolute_path, 'rb') if asset.absolute_path else io.BytesIO(asset.bytes)
+        return _ChunkedReader(raw, self.max_chunk_size, on_read)
+
+    def _upload_file(self, checksum: uuid.UUID, asset: Asset, on_bytes: Callable[[int], None]) -> Tuple[int, int]:
+        """
+        Upload one file, retrying on errors.
+
+        Args:
+            checksum: md5 of the file
+            asset: Asset
+            on_bytes: Called with the number of bytes read for upload
+
+        Returns:
+            Number of retries and number of bytes transferred by the successful attempt
+
+        Raises:
+            Exception: the last upload error when all the retries failed
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                # COMPS skips the part of the file already on the server, so only the bytes read are transferred
+                with self._open(asset, on_bytes) as stream:
+                    self.upload_stream(checksum, stream, None)
+                    return attempt, stream.bytes_read
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.retry_delay * 2 ** attempt
+                logger.warning(f"Upload of {asset.short_remote_path()} failed ({e}). Retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def upload(self, files: Dict[uuid.UUID, Asset]) -> AssetUploadReport:
+        """
+        Upload files with at most upload_workers parallel streams.
+
+        Args:
+            files: Asset to upload for each checksum
+
+        Returns:
+            Report of the upload
+        """
+        report = AssetUploadReport()
+        sizes = {checksum: self.get_size(asset) for checksum, asset in files.items()}
+        lock = Lock()
+        prog = None
+        if not IdmConfigParser.is_progress_bar_disabled():
+            prog = tqdm(desc="Uploading files", unit='B', unit_scale=True, unit_divisor=1024,
+                        total=sum(sizes.values()))
+
+        def on_bytes(count: int):
+            with lock:
+                report.bytes += count
+                if prog is not None:
+                    prog.update(count)
+
+        start = time.time()
+        try:
+            with ThreadPoolExecutor(max_workers=self.upload_workers) as pool:
+                futures = {pool.submit(self._upload_file, checksum, asset, on_bytes): checksum
+                           for checksum, asset in files.items()}
+                for future in as_completed(futures):
+                    retries, transferred = future.result()
+                    with lock:
+                        report.files += 1
+                        report.retries += retries
+                        # the parts already on the server are not transferred again
+                        if prog is not None:
+                            prog.update(max(0, sizes[futures[future]] - transferred))
+        finally:
+            report.elapsed = time.time() - start
+            if prog is not None:
+                prog.close()
+        self.last_report = report
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(str(report))
+        return report
@@ -9,7 +9,7 @@ import sys
 from argparse import Namespace
 from logging import getLogger
 from COMPS.Data.WorkItem import RelationType
-from typing import List, Dict
+from typing import List, Dict, Iterable
 import os
 from COMPS.Data import AssetCollectionFile, WorkItem
 
@@ -31,27 +31,39 @@ class NoFileFound(Exception):
     doc_link: str = "platforms/comps/errors.html#errors"
 
 
-def create_asset_collection(file_list: SetOfAssets, ac_files: List[AssetCollectionFile], tags: Dict[str, str]):  # pragma: no cover
+def create_asset_collection(file_list: Iterable[AssetTuple], ac_files: List[AssetCollectionFile], tags: Dict[str, str]):  # pragma: no cover
     """
+    Create the asset collection of the files gathered.
 
     Args:
-        file_list:
+        file_list: Files gathered. Can be an iterator yielding the files as they are hashed
         ac_files: AC Files
         tags: Tags to add
 
     Returns:
+        Asset collection created
 
+    Raises:
+        NoFileFound - if no files were gathered
+        DuplicateAsset - if files have the same destination path
     """
     asset_collection = AssetCollection()
     asset_collection.set_tags(tags)
     # Maps checksum to AssetCollectionFile and the path on disk to file
     asset_collection_map: Dict[uuid.UUID, Tuple[AssetCollectionFile, str, int]] = dict()
+    files = []
+    # files are added while the rest are still being gathered
     for file in file_list:
+        files.append(file)
         fn = os.path.basename(file[1])
         acf = AssetCollectionFile(file_name=fn, relative_path=file[1].replace(fn, "").strip("/"), md5_checksum=file[2])
         asset_collection_map[file[2]] = (acf, file[0], file[3])
         asset_collection.add_asset(acf)
 
+    if len(files) == 0 and len(ac_files) == 0:
+        raise NoFileFound("No files found with patterns specified. Please verify your filters.")
+    ensure_no_duplicates(ac_files, files)
+
     # add files from acs
     for f in ac_files:
         asset_collection.add_asset(f)
@@ -125,14 +137,14 @@ if __name__ == "__main__":  # pragma: no cover
     # Load our workitem
     wi = WorkItem.get(os.environ['COMPS_WORKITEM_GUID'])
 
-    # Gather all our files in Experiments, Simulations, and Asset Collections
-    files, files_from_ac = filter_files_and_assets(args, entity_filter_func, wi, fn_format_func)
-    if len(files) == 0 and len(files_from_ac) == 0:
-        raise NoFileFound("No files found with patterns specified. Please verify your filters.")
-
-    ensure_no_duplicates(files_from_ac, files)
+    # Gather all our files in Experiments, Simulations, and Asset Collections. Outside of dry runs, the files are
+    # streamed to the asset collection as they are hashed
+    files, files_from_ac = filter_files_and_assets(args, entity_filter_func, wi, fn_format_func, stream=not args.dry_run)
 
     if args.dry_run:
+        if len(files) == 0 and len(files_from_ac) == 0:
+            raise NoFileFound("No files found with patterns specified. Please verify your filters.")
+        ensure_no_duplicates(files_from_ac, files)
         print_results(files_from_ac, files)
     else:
         ac = create_asset_collection(files, files_from_ac, tags=asset_tags)
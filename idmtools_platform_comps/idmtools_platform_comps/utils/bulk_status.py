@@ -0,0 +1,163 @@
+"""idmtools comps bulk status refresh.
+
+Refreshes simulation status for many experiments with paged `id,state` queries instead of one request per simulation.
+After the first refresh of an experiment, only the simulations modified since the previous refresh are fetched.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+from datetime import datetime
+from dataclasses import dataclass, field
+from logging import getLogger, DEBUG
+from typing import Callable, Dict, List, Iterable, Optional, Tuple, Union, TYPE_CHECKING
+import backoff
+from COMPS.Data import Simulation as COMPSSimulation, QueryCriteria
+from requests import Timeout, HTTPError
+from idmtools.core import EntityStatus
+from idmtools.entities.simulation import Simulation
+from idmtools.entities.suite import Suite
+from idmtools_platform_comps.utils.general import convert_comps_status, fatal_code
+
+if TYPE_CHECKING:  # pragma: no cover
+    from idmtools.entities.experiment import Experiment
+
+logger = getLogger(__name__)
+
+# COMPS limits query results to 1000 items
+STATUS_PAGE_SIZE = 1000
+
+
+@dataclass
+class BulkStatusRefresher:
+    """
+    Refresh simulation status of experiments/suites/simulations in bulk.
+
+    Each experiment that still has non-terminal simulations is queried in pages selecting only `id`, `state` and
+    `last_modified`. Later queries of the experiment only select the simulations modified since the latest
+    modification seen, so finished simulations are not fetched again. The results are kept in a snapshot and only
+    the simulations whose status changed are updated in place.
+    """
+    #: Maximum number of simulations requested per query
+    page_size: int = field(default=STATUS_PAGE_SIZE)
+    #: Function used to query simulations. Defaults to COMPS Simulation.get. Replace to test against a fake endpoint
+    query: Callable[..., List[COMPSSimulation]] = field(default=None, repr=False)
+
+    #: Number of queries issued by the last refresh
+    last_query_count: int = field(default=0, init=False)
+    _snapshot: Dict[str, EntityStatus] = field(default_factory=dict, init=False, repr=False)
+    #: Latest modification of the simulations of each experiment in the snapshot
+    _modified: Dict[str, datetime] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.query is None:
+            self.query = COMPSSimulation.get
+
+    @backoff.on_exception(backoff.constant, (Timeout, ConnectionError, HTTPError), interval=1.5, max_tries=5,
+                          giveup=fatal_code)
+    def _query_page(self, experiment_id: str, offset: int, since: Optional[datetime] = None) -> List[COMPSSimulation]:
+        """
+        Query one page of simulation states for an experiment.
+
+        Args:
+            experiment_id: Experiment id
+            offset: Offset in the result-set
+            since: Only query the simulations modified at or after this time
+
+        Returns:
+            Simulations with id, state and last_modified filled
+        """
+        filters = [f'experiment_id={experiment_id}']
+        if since is not None:
+            filters.append(f"last_modified>={since.strftime('%Y-%m-%d %T')}")
+        qc = QueryCriteria().select(['id', 'state', 'last_modified']).where(filters)
+        qc.orderby('date_created').count(self.page_size)
+        if offset:
+            qc.offset(offset)
+        self.last_query_count += 1
+        return self.query(query_criteria=qc)
+
+    def fetch_states(self, experiment_id: str, since: Optional[datetime] = None) -> Dict[str, EntityStatus]:
+        """
+        Fetch the status of the simulations of an experiment using paged queries.
+
+        Args:
+            experiment_id: Experiment id
+            since: Only fetch the simulations modified at or after this time. None to fetch all of them
+
+        Returns:
+            Dictionary of simulation id to status
+        """
+        states = dict()
+        offset = 0
+        latest = self._modified.get(experiment_id) if since is not None else None
+        while True:
+            page = self._query_page(experiment_id, offset, since)
+            for s in page:
+                states[str(s.id)] = convert_comps_status(s.state)
+                modified = getattr(s, 'last_modified', None)
+                if modified is not None and (latest is None or modified > latest):
+                    latest = modified
+            if len(page) < self.page_size:
+                break
+            offset += len(page)
+        if latest is not None:
+            self._modified[experiment_id] = latest
+        return states
+
+    def refresh(self, items: Iterable[Union['Experiment', Suite, Simulation]], force: bool = False) \
+            -> Dict[str, EntityStatus]:
+        """
+        Refresh simulation status in place for experiments, suites and simulations.
+
+        Args:
+            items: Experiments, Suites and/or Simulations to refresh. Simulations are refreshed with their experiment
+            force: Query all the simulations, even the ones already done or not modified since the last refresh
+
+        Returns:
+            Dictionary of simulation id to new status for the simulations that changed since the previous refresh
+        """
+        self.last_query_count = 0
+        changed = dict()
+        for experiment_id, simulations, done in self._experiments(items):
+            if not force and simulations and done:
+                continue
+            since = None if force else self._modified.get(experiment_id)
+            self._snapshot.update(self.fetch_states(experiment_id, since))
+            for sim_id, sim in simulations.items():
+                status = self._snapshot.get(sim_id)
+                if status is None:
+                    if logger.isEnabledFor(DEBUG):
+                        logger.debug(f"Simulation {sim_id} is not found in experiment {experiment_id}. Skipping")
+                    continue
+                if sim.status != status:
+                    sim.status = status
+                    changed[sim_id] = status
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"Bulk status refresh: {len(changed)} changed using {self.last_query_count} queries")
+        return changed
+
+    @staticmethod
+    def _experiments(items: Iterable[Union['Experiment', Suite, Simulation]]) \
+            -> List[Tuple[str, Dict[str, Simulation], bool]]:
+        """
+        Group the simulations to refresh by experiment, expanding suites into their experiments.
+
+        Args:
+            items: Experiments, Suites and/or Simulations
+
+        Returns:
+            Id, simulations to refresh by id, and whether the simulations are all done, for each experiment
+        """
+        experiments = dict()
+        for item in items:
+            if isinstance(item, Suite):
+                for experiment in item.experiments:
+                    experiments[str(experiment.uid)] = ({str(s.uid): s for s in experiment.simulations.items},
+                                                        experiment.done)
+            elif isinstance(item, Simulation):
+                experiment_id = str(item.parent_id or item.experiment_id)
+                simulations, done = experiments.get(experiment_id, (dict(), True))
+                simulations[str(item.uid)] = item
+                experiments[experiment_id] = (simulations, done and item.done)
+            else:
+                experiments[str(item.uid)] = ({str(s.uid): s for s in item.simulations.items}, item.done)
+        return [(experiment_id, simulations, done) for experiment_id, (simulations, done) in experiments.items()]
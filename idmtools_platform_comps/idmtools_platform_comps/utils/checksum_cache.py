@@ -0,0 +1,274 @@
+"""idmtools comps asset checksum cache.
+
+Persistent local cache of what a COMPS server already has: the md5 of files known to be on the server, and the
+checksums of the asset collections created from this machine. Unchanged inputs skip both hashing and the negotiation
+of missing files with the server, and transient simulation files known to be on the server are sent by checksum.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import hashlib
+import json
+import os
+import uuid
+from dataclasses import dataclass, field
+from logging import getLogger, DEBUG
+from typing import Any, Dict, Iterable, Optional, Set, Union
+import diskcache
+from idmtools.core import IDMTOOLS_USER_HOME
+
+logger = getLogger(__name__)
+
+# Server knowledge older than this is checked again
+DEFAULT_CHECKSUM_CACHE_TTL = 7 * 24 * 3600
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Digest of json serializable values.
+
+    Args:
+        *parts: Values
+
+    Returns:
+        md5 of the values
+    """
+    return hashlib.md5(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+@dataclass
+class AssetChecksumCache:
+    """
+    Cache of the asset checksums known to be on a COMPS server.
+
+    Entries describing the server expire after *ttl* seconds. Checksums of local files are keyed by path, size, and
+    modification time, so they stay valid until the file changes.
+    """
+    #: Server the entries describe, usually the endpoint of the platform
+    namespace: str = field(default="default")
+    #: Seconds before the entries describing the server expire. 0 disables the cache
+    ttl: Optional[float] = field(default=DEFAULT_CHECKSUM_CACHE_TTL)
+    #: Directory of the cache. Defaults to the idmtools cache directory
+    directory: Optional[str] = field(default=None)
+    _cache: Optional[diskcache.Cache] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is used."""
+        return self.ttl is None or self.ttl > 0
+
+    @property
+    def cache(self) -> diskcache.Cache:
+        """Open the cache on first use."""
+        if self._cache is None:
+            if self.directory is None:
+                from idmtools import IdmConfigParser
+                self.directory = os.path.join(
+                    str(IdmConfigParser.get_option(option="cache_directory",
+                                                   fallback=IDMTOOLS_USER_HOME.joinpath("cache"))),
+                    'disk_cache', 'comps_checksums')
+            os.makedirs(self.directory, exist_ok=True)
+            self._cache = diskcache.Cache(self.directory, timeout=2)
+        return self._cache
+
+    def __getstate__(self):
+        """Drop the open cache when pickled."""
+        state = self.__dict__.copy()
+        state['_cache'] = None
+        return state
+
+    def _key(self, kind: str, value: Any) -> str:
+        return f"{self.namespace}:{kind}:{value}"
+
+    def _set(self, key: str, value: Any):
+        self.cache.set(key, value, expire=self.ttl, retry=True)
+
+    @staticmethod
+    def _uuid(checksum: Union[str, uuid.UUID]) -> uuid.UUID:
+        return checksum if isinstance(checksum, uuid.UUID) else uuid.UUID(str(checksum))
+
+    def file_checksum(self, path: str) -> Optional[uuid.UUID]:
+        """
+        Get the cached md5 of a local file.
+
+        Args:
+            path: Path of the file
+
+        Returns:
+            md5 of the file, or None when the file changed since it was hashed or was never hashed
+        """
+        if not self.enabled:
+            return None
+        stat = os.stat(path)
+        return self.cache.get(f"file:{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}", retry=True)
+
+    def set_file_checksum(self, path: str, checksum: Union[str, uuid.UUID]):
+        """
+        Record the md5 of a local file.
+
+        Args:
+            path: Path of the file
+            checksum: md5 of the file
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+        stat = os.stat(path)
+        self.cache.set(f"file:{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}", self._uuid(checksum),
+                       retry=True)
+
+    def get_local(self, key: str) -> Any:
+        """
+        Get a value derived from local files only, such as the checksum of a build context.
+
+        Args:
+            key: Key, which must change when the files change
+
+        Returns:
+            Cached value or None
+        """
+        if not self.enabled:
+            return None
+        return self.cache.get(f"local:{key}", retry=True)
+
+    def set_local(self, key: str, value: Any):
+        """
+        Cache a value derived from local files only. These values do not expire.
+
+        Args:
+            key: Key, which must change when the files change
+            value: Value
+
+        Returns:
+            None
+        """
+        if self.enabled:
+            self.cache.set(f"local:{key}", value, retry=True)
+
+    def unknown(self, checksums: Iterable[Union[str, uuid.UUID]]) -> Set[uuid.UUID]:
+        """
+        Filter the checksums not known to be on the server.
+
+        Args:
+            checksums: md5 of files
+
+        Returns:
+            The checksums that may be missing on the server
+        """
+        checksums = {self._uuid(c) for c in checksums}
+        if not self.enabled:
+            return checksums
+        return {c for c in checksums if self.cache.get(self._key("known", c), retry=True) is None}
+
+    def add_known(self, checksums: Iterable[Union[str, uuid.UUID]]):
+        """
+        Record checksums known to be on the server.
+
+        Args:
+            checksums: md5 of files
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+        for checksum in checksums:
+            self._set(self._key("known", self._uuid(checksum)), True)
+
+    def invalidate_checksums(self, checksums: Iterable[Union[str, uuid.UUID]]):
+        """
+        Forget checksums, for example when the server reports them missing.
+
+        Args:
+            checksums: md5 of files
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+        for checksum in checksums:
+            self.cache.delete(self._key("known", self._uuid(checksum)), retry=True)
+
+    def record_asset_collection(self, ac_id: Union[str, uuid.UUID], checksums: Iterable[Union[str, uuid.UUID]],
+                                lookup_key: str = None):
+        """
+        Record an asset collection and the checksums of its files, which are then known to be on the server.
+
+        Args:
+            ac_id: Id of the asset collection
+            checksums: md5 of the files of the collection
+            lookup_key: Key to find the collection with :meth:`find_asset_collection`
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+        checksums = sorted({self._uuid(c) for c in checksums}, key=str)
+        entry = self.cache.get(self._key("ac", str(ac_id)), default=dict(checksums=[], keys=[]), retry=True)
+        entry['checksums'] = checksums
+        if lookup_key is not None:
+            if lookup_key not in entry['keys']:
+                entry['keys'].append(lookup_key)
+            self._set(self._key("lookup", lookup_key), str(ac_id))
+        self._set(self._key("ac", str(ac_id)), entry)
+        self.add_known(checksums)
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"Cached asset collection {ac_id} with {len(checksums)} files")
+
+    def find_asset_collection(self, lookup_key: str) -> Optional[str]:
+        """
+        Find a cached asset collection.
+
+        Args:
+            lookup_key: Key given to :meth:`record_asset_collection`
+
+        Returns:
+            Id of the asset collection, or None
+        """
+        if not self.enabled:
+            return None
+        return self.cache.get(self._key("lookup", lookup_key), retry=True)
+
+    def invalidate_asset_collection(self, ac_id: Union[str, uuid.UUID]):
+        """
+        Forget an asset collection, its lookup keys, and the checksums of its files.
+
+        Args:
+            ac_id: Id of the asset collection
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+        entry = self.cache.pop(self._key("ac", str(ac_id)), retry=True)
+        if entry:
+            for key in entry['keys']:
+                self.cache.delete(self._key("lookup", key), retry=True)
+            self.invalidate_checksums(entry['checksums'])
+
+    def clear(self):
+        """
+        Remove all the entries of the cache.
+
+        Returns:
+            None
+        """
+        self.cache.clear(retry=True)
+
+    @staticmethod
+    def asset_collection_key(files: Iterable[Any], tags: Dict = None) -> str:
+        """
+        Key of an asset collection built from files and tags.
+
+        Args:
+            files: Filename, relative path, and checksum of each file
+            tags: Tags of the collection
+
+        Returns:
+            Lookup key
+        """
+        return "files:" + fingerprint(sorted([str(part) for part in f] for f in files), tags or {})
@@ -142,10 +142,16 @@ class RequirementsToAssetCollection:
         # Late validation
         self.init_platform()
 
-        # Check if ac with md5 exists
+        # Check the local cache, then COMPS, for an ac with the md5
+        if not rerun:
+            ac_id = self.retrieve_ac_id_from_cache()
+            if ac_id:
+                return ac_id
+
         ac = self.retrieve_ac_by_tag()
 
         if ac and not rerun:
+            self.save_ac_to_cache(ac)
             return ac.id
 
         # Create Experiment to install custom requirements
@@ -172,6 +178,7 @@ class RequirementsToAssetCollection:
         ac = self.retrieve_ac_from_wi(wi)
 
         if ac:
+            self.save_ac_to_cache(ac)
             return ac.id
 
     def save_updated_requirements(self):
@@ -213,6 +220,43 @@ class RequirementsToAssetCollection:
             user_logger.info(f"Found existing requirements assets at {ac_list[0].id}")
             return ac_list[0]
 
+    @property
+    def cache_key(self):
+        """
+        Key of the asset collection of our requirements + target in the platform checksum cache.
+
+        Returns:
+            The cache key.
+        """
+        self.init_platform()
+        return f"requirements:{self._os_target}:{self.checksum}"
+
+    def retrieve_ac_id_from_cache(self):
+        """
+        Retrieve the id of the asset collection previously found or created for our requirements.
+
+        Returns: asset collection id or None when there is none or it no longer exists on COMPS
+        """
+        cache = getattr(self.platform, '_checksum_cache', None)
+        if cache is None:
+            return None
+        ac = self.platform._assets._get_cached_asset_collection(cache, self.cache_key)
+        if ac is not None:
+            user_logger.info(f"Found existing requirements assets at {ac.id}")
+            return ac.id
+
+    def save_ac_to_cache(self, ac):
+        """
+        Save the asset collection of our requirements in the platform checksum cache.
+
+        Args:
+            ac: COMPS asset collection
+        Returns: None
+        """
+        cache = getattr(self.platform, '_checksum_cache', None)
+        if cache is not None:
+            cache.record_asset_collection(ac.id, [a.md5_checksum for a in ac.assets or []], lookup_key=self.cache_key)
+
     def retrieve_ac_from_wi(self, wi):
         """
         Retrieve ac id from file ac_info.txt saved by WI.
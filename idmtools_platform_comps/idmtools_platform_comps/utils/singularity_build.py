@@ -29,6 +29,7 @@ from idmtools.entities.command_task import CommandTask
 from idmtools.entities.relation_type import RelationType
 from idmtools.utils.hashing import calculate_md5_stream
 from idmtools_platform_comps.ssmt_work_items.comps_workitems import InputDataWorkItem
+from idmtools_platform_comps.utils.checksum_cache import fingerprint
 from idmtools_platform_comps.utils.general import save_sif_asset_md5_from_ac_id
 from idmtools_platform_comps.utils.package_version import get_docker_manifest
 from idmtools_platform_comps.utils.package_version_new import get_ghcr_manifest, get_digest_from_docker_hub
@@ -159,7 +160,16 @@ class SingularityBuildWorkItem(InputDataWorkItem):
         file_hash = hashlib.sha256()
         # ensure our template is set
         self.__add_common_assets()
-        for asset in sorted(self.assets + self.transient_assets, key=lambda a: a.short_remote_path()):
+        assets = sorted(self.assets + self.transient_assets, key=lambda a: a.short_remote_path())
+        # unchanged inputs are not hashed again
+        cache = getattr(self.platform, '_checksum_cache', None)
+        context_key = None
+        if cache is not None:
+            context_key = "singularity_context:" + fingerprint(self.__context_inputs(assets), self.environment_variables)
+            context = cache.get_local(context_key)
+            if context is not None:
+                return context
+        for asset in assets:
             if asset.absolute_path:
                 with open(asset.absolute_path, mode='rb') as ain:
                     calculate_md5_stream(ain, file_hash=file_hash)
@@ -172,7 +182,34 @@ class SingularityBuildWorkItem(InputDataWorkItem):
 
         if logger.isEnabledFor(DEBUG):
             logger.debug(f'Context: sha256:{file_hash.hexdigest()}')
-        return f'sha256:{file_hash.hexdigest()}'
+        context = f'sha256:{file_hash.hexdigest()}'
+        if cache is not None:
+            cache.set_local(context_key, context)
+        return context
+
+    @staticmethod
+    def __context_inputs(assets: List[Asset]) -> List[List[str]]:
+        """
+        Describe the inputs of the context checksum without reading files.
+
+        Files are described by their path, size, and modification time, so the description changes with the files.
+
+        Args:
+            assets: Assets of the build
+
+        Returns:
+            Description of each asset
+        """
+        inputs = []
+        for asset in assets:
+            if asset.absolute_path:
+                stat = os.stat(asset.absolute_path)
+                inputs.append([asset.short_remote_path(), os.path.abspath(asset.absolute_path), stat.st_size, stat.st_mtime_ns])
+            elif asset.persisted:
+                inputs.append([asset.short_remote_path(), str(asset.checksum)])
+            else:
+                inputs.append([asset.short_remote_path(), hashlib.md5(asset.bytes).hexdigest()])
+        return inputs
 
     def __add_file_to_context(self, contents: Union[str, bytes], file_hash):
         """
@@ -237,14 +274,19 @@ class SingularityBuildWorkItem(InputDataWorkItem):
         ac = None
         if not sbi.force:  # don't search if it is going to be forced
             qc = QueryCriteria().where_tag(['type=singularity']).select_children(['assets', 'tags']).orderby('date_created desc')
-            if sbi.__digest:
-                qc.where_tag([f'digest={sbi.__digest}'])
-            elif sbi.definition_file or sbi.definition_content:
-                qc.where_tag([f'build_context={sbi.context_checksum()}'])
+            build_tag = sbi.__build_tag()
+            if build_tag:
+                qc.where_tag([build_tag])
             if len(qc.tag_filters) > 1:
-                if logger.isEnabledFor(DEBUG):
-                    logger.debug("Searching for existing containers")
-                ac = platform._assets.get(None, query_criteria=qc)
+                cache = getattr(platform, '_checksum_cache', None)
+                ac = SingularityBuildWorkItem.__get_cached_container(platform, cache, build_tag)
+                if ac is None:
+                    if logger.isEnabledFor(DEBUG):
+                        logger.debug("Searching for existing containers")
+                    ac = platform._assets.get(None, query_criteria=qc)
+                if ac:
+                    if cache is not None:
+                        cache.record_asset_collection(ac[0].id, [a.md5_checksum for a in ac[0].assets or []], lookup_key=f"singularity:{build_tag}")
             if ac:
                 if logger.isEnabledFor(DEBUG):
                     logger.debug(f"Found: {len(ac)} previous builds")
@@ -256,6 +298,43 @@ class SingularityBuildWorkItem(InputDataWorkItem):
 
         return ac
 
+    @staticmethod
+    def __get_cached_container(platform: 'IPlatform', cache, build_tag: str) -> Optional[list]:
+        """
+        Load the container previously found or built for the same tag, skipping the search on COMPS.
+
+        Args:
+            platform: Platform
+            cache: Checksum cache of the platform
+            build_tag: digest or build_context tag of the build
+
+        Returns:
+            List with the COMPS asset collection, or None
+        """
+        ac_id = cache.find_asset_collection(f"singularity:{build_tag}") if cache is not None else None
+        if ac_id is None:
+            return None
+        try:
+            return [platform._assets.get(ac_id)]
+        except Exception as e:
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f"Cached container {ac_id} could not be loaded: {e}")
+            cache.invalidate_asset_collection(ac_id)
+            return None
+
+    def __build_tag(self) -> Optional[str]:
+        """
+        Get the tag identifying the image built.
+
+        Returns:
+            digest tag for images pulled, build_context tag for images built from a definition, or None
+        """
+        if self.__digest:
+            return f'digest={self.__digest}'
+        elif self.definition_file or self.definition_content:
+            return f'build_context={self.context_checksum()}'
+        return None
+
     def __add_tags(self):
         """
         Add default tags to the asset collection to be created.
@@ -403,6 +482,10 @@ class SingularityBuildWorkItem(InputDataWorkItem):
         if ac is None or self.force:
             super().run(**opts)
             ac = self.asset_collection
+            cache = getattr(p, '_checksum_cache', None)
+            build_tag = self.__build_tag()
+            if ac is not None and cache is not None and build_tag:
+                cache.record_asset_collection(ac.id, [a.checksum for a in ac.assets if a.checksum], lookup_key=f"singularity:{build_tag}")
 
         else:
             if IdmConfigParser.is_output_enabled():
@@ -11,8 +11,10 @@ from collections import defaultdict
 from concurrent.futures._base import as_completed, Future
 from concurrent.futures.thread import ThreadPoolExecutor
 from logging import DEBUG, getLogger
+import re
 from pathlib import PurePath
-from typing import List, Tuple, Set, Callable
+from threading import Lock
+from typing import List, Tuple, Set, Callable, Iterable, Iterator, Union
 import humanfriendly
 from COMPS.Data import WorkItem, Experiment, Simulation, AssetCollectionFile, AssetCollection, QueryCriteria, CommissionableEntity
 from COMPS.Data.Simulation import SimulationState
@@ -61,10 +63,303 @@ def get_common_parser(app_description):
     return parser
 
 
+def _translate_segment(segment: str) -> str:
+    """
+    Translate one path segment of a shell pattern to a regular expression that does not cross separators.
+
+    Args:
+        segment: Pattern segment
+
+    Returns:
+        Regular expression
+    """
+    i, n, res = 0, len(segment), []
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == '*':
+            res.append('[^/]*')
+        elif c == '?':
+            res.append('[^/]')
+        elif c == '[':
+            j = i
+            if j < n and segment[j] == '!':
+                j += 1
+            if j < n and segment[j] == ']':
+                j += 1
+            while j < n and segment[j] != ']':
+                j += 1
+            if j >= n:
+                res.append('\\[')
+            else:
+                stuff = segment[i:j].replace('\\', '\\\\')
+                i = j + 1
+                if stuff[0] == '!':
+                    stuff = '^/' + stuff[1:]
+                elif stuff[0] in ('^', '['):
+                    stuff = '\\' + stuff
+                res.append(f'[{stuff}]')
+        else:
+            res.append(re.escape(c))
+    return ''.join(res)
+
+
+def _has_magic(segment: str) -> bool:
+    return any(c in segment for c in '*?[')
+
+
+class FileMatcher:
+    """
+    All the include and exclude patterns of a filter compiled into two regular expressions.
+
+    Include patterns follow the rules of recursive glob relative to the directory searched: wildcards do not match
+    hidden names and a ``**`` segment matches any number of directories. Exclude patterns follow the rules of
+    :func:`is_file_excluded`.
+    """
+
+    def __init__(self, file_patterns: List[str], exclude_patterns: List[str] = None):
+        """
+        Compile the patterns.
+
+        Args:
+            file_patterns: List of file patterns
+            exclude_patterns: List of patterns to exclude
+        """
+        includes = []
+        #: Patterns the matcher cannot express, which are searched with glob
+        self.glob_patterns = []
+        #: Directories, relative to the searched directory, containing all the files the patterns can match
+        self.roots = set()
+        for pattern in file_patterns:
+            segments = pattern.replace(os.sep, '/').split('/') if os.sep != '/' else pattern.split('/')
+            if os.path.isabs(pattern) or '..' in segments or '.' in segments:
+                self.glob_patterns.append(pattern)
+                continue
+            includes.append(self._translate_include(segments))
+            root = []
+            for segment in segments[:-1]:
+                if _has_magic(segment):
+                    break
+                root.append(segment)
+            self.roots.add('/'.join(root))
+        # searching a directory also searches its sub-directories
+        self.roots = {r for r in self.roots if not any(r != o and (o == '' or r.startswith(o + '/')) for o in self.roots)}
+        flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+        self._include = re.compile('|'.join(f'(?:{i})' for i in includes), flags) if includes else None
+        excludes = [self._translate_exclude(p) for p in exclude_patterns or [] if p]
+        self._exclude = re.compile('|'.join(f'(?:{e})' for e in excludes), re.IGNORECASE) if excludes else None
+
+    @staticmethod
+    def _translate_include(segments: List[str]) -> str:
+        res = []
+        for i, segment in enumerate(segments):
+            last = i == len(segments) - 1
+            if segment == '**':
+                # recursive wildcard, which does not descend into hidden directories
+                res.append('(?:(?!\\.)[^/]+/)*' + ('(?!\\.)[^/]+' if last else ''))
+                continue
+            if _has_magic(segment):
+                res.append(('' if segment.startswith('.') else '(?!\\.)') + _translate_segment(segment))
+            else:
+                res.append(re.escape(segment))
+            if not last:
+                res.append('/')
+        return ''.join(res) + '\\Z'
+
+    @staticmethod
+    def _translate_exclude(pattern: str) -> str:
+        pattern = pattern.replace(os.sep, '/') if os.sep != '/' else pattern
+        absolute = pattern.startswith('/')
+        segments = [s for s in pattern.split('/') if s and s != '.']
+        return ('^/' if absolute else '(?:^|/)') + '/'.join(_translate_segment(s) for s in segments) + '\\Z'
+
+    def is_included(self, relative_path: str) -> bool:
+        """
+        Does a file match one of the include patterns.
+
+        Args:
+            relative_path: Path of the file relative to the searched directory, with / separators
+
+        Returns:
+            True if the file matches
+        """
+        return self._include is not None and self._include.match(relative_path) is not None
+
+    def is_excluded(self, filename: str) -> bool:
+        """
+        Does a file match one of the exclude patterns.
+
+        Args:
+            filename: Path of the file
+
+        Returns:
+            True if the file is excluded
+        """
+        if self._exclude is None:
+            return False
+        if os.sep != '/':
+            filename = filename.replace(os.sep, '/')
+        return self._exclude.search(filename) is not None
+
+
+class ChecksumCache:
+    """
+    Thread safe cache of file checksums.
+
+    Files are keyed by real path, size, and modification time, so files reached through several simulations, like the
+    files of a shared Assets directory, are hashed once.
+    """
+
+    def __init__(self):
+        """Create an empty cache."""
+        self._checksums = dict()
+        self._lock = Lock()
+
+    def checksum(self, filename: str) -> Tuple[uuid.UUID, int]:
+        """
+        Get the checksum and size of a file, hashing it only when needed.
+
+        Args:
+            filename: File
+
+        Returns:
+            md5 and size of the file
+        """
+        from idmtools.utils.hashing import calculate_md5
+        stat = os.stat(filename)
+        key = (os.path.realpath(filename), stat.st_size, stat.st_mtime_ns)
+        # the first thread asking for a file hashes it, the others wait for its result
+        with self._lock:
+            checksum = self._checksums.get(key)
+            owner = checksum is None
+            if owner:
+                checksum = self._checksums[key] = Future()
+        if owner:
+            try:
+                checksum.set_result(uuid.UUID(calculate_md5(filename, chunk_size=HASH_CHUNK_SIZE)))
+            except Exception as e:
+                with self._lock:
+                    del self._checksums[key]
+                checksum.set_exception(e)
+        return checksum.result(), stat.st_size
+
+
+# Checksums of the files gathered by this process
+CHECKSUM_CACHE = ChecksumCache()
+HASH_CHUNK_SIZE = 1024 * 1024
+# Source filename and destination filename of a file found, before hashing
+FoundFile = Tuple[str, str]
+
+
+def find_files(directory: str, file_patterns: List[str], exclude_patterns: List[str] = None, assets: bool = False, prefix: str = None, filename_format_func: FilenameFormatFunction = None) -> List[FoundFile]:
+    """
+    Find the files matching patterns with a single walk of the directory, without hashing them.
+
+    Args:
+        directory: Directory to gather from
+        file_patterns: List of file patterns
+        exclude_patterns: List of patterns to exclude
+        assets: Should assets be included
+        prefix: Prefix for file_list
+        filename_format_func: Function that can format the filename
+
+    Returns:
+        Source and destination filenames of the files that match patterns.
+    """
+    matcher = FileMatcher(file_patterns, exclude_patterns)
+    found = dict()
+
+    def add_file(file: str, short_name: str):
+        # Process assets separately than regular files
+        if short_name.startswith("Assets") and not assets:
+            return
+        if file in found or matcher.is_excluded(file):
+            return
+        # Setup destination name which is just joining prefix if it exists
+        dest_name = os.path.join(prefix if prefix else '', short_name)
+        if filename_format_func:
+            dest_name = filename_format_func(dest_name)
+        found[file] = dest_name
+
+    for root in sorted(matcher.roots):
+        top = os.path.join(directory, root) if root else directory
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f'Looking for files in {top}')
+        visited = set()
+        for dirpath, dirnames, filenames in os.walk(top, followlinks=True):
+            # do not loop through symbolic links to parent directories
+            real = os.path.realpath(dirpath)
+            if real in visited:
+                dirnames.clear()
+                continue
+            visited.add(real)
+            rel_dir = os.path.relpath(dirpath, directory)
+            rel_dir = '' if rel_dir == os.curdir else rel_dir.replace(os.sep, '/') + '/'
+            if not assets and rel_dir == '':
+                # everything in Assets directories is skipped
+                dirnames[:] = [d for d in dirnames if not d.startswith("Assets")]
+            for filename in filenames:
+                if matcher.is_included(rel_dir + filename):
+                    file = os.path.join(dirpath, filename)
+                    if os.path.isfile(file):
+                        # Create our shortname. This will remove the base directory from the file. Eg
+                        # If are scanning C:\ABC\, the file C:\ABC\DEF\123.txt will be DEF\123.txt
+                        add_file(file, file.replace(directory + os.path.sep, ""))
+
+    for pattern in matcher.glob_patterns:
+        for file in glob.iglob(os.path.join(directory, pattern), recursive=True):
+            if os.path.isfile(file):
+                add_file(file, file.replace(directory + os.path.sep, ""))
+
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"Found {len(found)} files in {directory}")
+    return list(found.items())
+
+
+def hash_file(file: FoundFile, checksum_cache: ChecksumCache = None) -> AssetTuple:
+    """
+    Hash a file found.
+
+    Args:
+        file: Source and destination filenames
+        checksum_cache: Checksum cache. Defaults to the cache of the process
+
+    Returns:
+        Asset tuple of the file
+    """
+    checksum, filesize = (checksum_cache or CHECKSUM_CACHE).checksum(file[0])
+    return file[0], file[1], checksum, filesize
+
+
+def hash_files(files: Iterable[FoundFile], pool: ThreadPoolExecutor = None, checksum_cache: ChecksumCache = None) -> Iterator[AssetTuple]:
+    """
+    Hash files in a thread pool, yielding each file as soon as it is hashed.
+
+    Args:
+        files: Source and destination filenames
+        pool: Pool to hash with. A pool is created when not provided
+        checksum_cache: Checksum cache. Defaults to the cache of the process
+
+    Returns:
+        Asset tuples, in the order the hashes complete
+    """
+    own_pool = pool is None
+    pool = pool or ThreadPoolExecutor()
+    try:
+        futures = [pool.submit(hash_file, file, checksum_cache) for file in files]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+
 def gather_files(directory: str, file_patterns: List[str], exclude_patterns: List[str] = None, assets: bool = False, prefix: str = None, filename_format_func: FilenameFormatFunction = None) -> SetOfAssets:
     """
     Gather file_list.
 
+    The directory is walked once for all the patterns, and only the files left after excluding are hashed.
+
     Args:
         directory: Directory to gather from
         file_patterns: List of file patterns
@@ -76,45 +371,7 @@ def gather_files(directory: str, file_patterns: List[str], exclude_patterns: Lis
     Returns:
         Return files that match patterns.
     """
-    from idmtools.utils.hashing import calculate_md5
-    file_list = set()
-    # Loop through our patterns
-    for pattern in file_patterns:
-        # User glob to search each directory using the pattern. We also do full recursion here
-
-        sd = os.path.join(directory, pattern)
-        if logger.isEnabledFor(DEBUG):
-            logger.debug(f'Looking for files with pattern {sd}')
-        for file in glob.iglob(sd, recursive=True):
-            # Ensure it is a file and not a directory
-            if logger.isEnabledFor(DEBUG):
-                logger.debug(f'{file.encode("ascii", "ignore").decode("utf-8")} matching pattern. Is Dir: {os.path.isdir(file)}. Is Link: {os.path.islink(file)}')
-            if os.path.isfile(file):
-                if logger.isEnabledFor(DEBUG):
-                    logger.debug(f'Found file {file.encode("ascii", "ignore").decode("utf-8")}')
-                # Create our shortname. This will remove the base directory from the file. Eg
-                # If are scanning C:\ABC\, the file C:\ABC\DEF\123.txt will be DEF\123.txt
-                short_name = file.replace(directory + os.path.sep, "")
-                # Setup destination name which is just joining prefix if it exists
-                dest_name = os.path.join(prefix if prefix else '', short_name)
-                filesize = os.stat(file).st_size
-                if filename_format_func:
-                    dest_name = filename_format_func(dest_name)
-                # Process assets separately than regular files
-                if short_name.startswith("Assets"):
-                    if assets:
-                        file_list.add((file, dest_name, uuid.UUID(calculate_md5(file)), filesize))
-                else:
-                    file_list.add((file, dest_name, uuid.UUID(calculate_md5(file)), filesize))
-
-    # Now strip file that match exclude patterns. We do this after since the regular expressions here are a bit more expensive, so a we are at the
-    # minimum possible files we must scan as this point. We did possible calculate extra md5s here
-    if logger.isEnabledFor(DEBUG):
-        logger.debug(f"File count before excluding: {len(file_list)} in {directory}")
-    result = set([f for f in file_list if not is_file_excluded(f[0], exclude_patterns)])
-    if logger.isEnabledFor(DEBUG):
-        logger.debug(f"File count after excluding: {len(file_list)} in {directory}")
-    return result
+    return set(hash_files(find_files(directory, file_patterns, exclude_patterns, assets, prefix, filename_format_func)))
 
 
 def is_file_excluded(filename: str, exclude_patterns: List[str]) -> bool:
@@ -152,10 +409,34 @@ def gather_files_from_related(work_item: WorkItem, file_patterns: List[str], exc
     Returns:
         Set of File Tuples in format Filename, Destination Name, and Checksum
     """
-    file_list = set()
+    return set(iter_files_from_related(work_item, file_patterns, exclude_patterns, assets, simulation_prefix_format_str, work_item_prefix_format_str, entity_filter_func, filename_format_func))
+
+
+def iter_files_from_related(work_item: WorkItem, file_patterns: List[str], exclude_patterns: List[str], assets: bool, simulation_prefix_format_str: str, work_item_prefix_format_str: str, entity_filter_func: EntityFilterFunc,
+                            filename_format_func: FilenameFormatFunction) -> Iterator[AssetTuple]:  # pragma: no cover
+    """
+    Gather files from different related entities, yielding each file as soon as it is hashed.
+
+    Directories are searched in parallel. The files found are hashed in a second pool while the search continues, and
+    files found through several entities are hashed once.
+
+    Args:
+        work_item: Work item to gather from
+        file_patterns: List of File Patterns
+        exclude_patterns: List of Exclude patterns
+        assets: Should items be gathered from Assets Directory
+        simulation_prefix_format_str: Format string for prefix of Simulations
+        work_item_prefix_format_str: Format string for prefix of WorkItem
+        entity_filter_func: Function to filter entities
+        filename_format_func: Filename filter function
+
+    Returns:
+        File Tuples in format Filename, Destination Name, Checksum, and Filesize
+    """
     # Setup threading work using a future list and a ThreadPoolExecutor
     futures = []
     pool = ThreadPoolExecutor()
+    hash_pool = ThreadPoolExecutor()
     if logger.isEnabledFor(DEBUG):
         logger.debug("Filtering experiments")
     filter_experiments(assets, entity_filter_func, exclude_patterns, file_patterns, futures, pool, simulation_prefix_format_str, work_item, filename_format_func=filename_format_func)
@@ -168,13 +449,22 @@ def gather_files_from_related(work_item: WorkItem, file_patterns: List[str], exc
 
     if logger.isEnabledFor(DEBUG):
         logger.debug("Waiting on filtering to complete")
-    # Now wait until scanning items has completed
-    for future in tqdm(as_completed(futures), total=len(futures), desc="Filtering relations for files"):
-        file_list.update(future.result())
-
-    if logger.isEnabledFor(DEBUG):
-        logger.debug(f"Total Files found: {len(file_list)}")
-    return file_list
+    seen = set()
+    hash_futures = []
+    try:
+        # Queue the files for hashing as soon as each directory is searched
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Filtering relations for files"):
+            for file in future.result():
+                if file not in seen:
+                    seen.add(file)
+                    hash_futures.append(hash_pool.submit(hash_file, file))
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"Total Files found: {len(seen)}")
+        for future in as_completed(hash_futures):
+            yield future.result()
+    finally:
+        pool.shutdown()
+        hash_pool.shutdown(cancel_futures=True)
 
 
 def filter_experiments(assets: bool, entity_filter_func: EntityFilterFunc, exclude_patterns_compiles: List, file_patterns: List[str], futures: List[Future], pool: ThreadPoolExecutor, simulation_prefix_format_str: str, work_item: WorkItem,
@@ -267,7 +557,7 @@ def filter_experiment_assets(
                 logger.debug(f'Loading assets for {experiment.name} from simulation {simulation.id}')
             # create prefix from the format var
             prefix = get_simulation_prefix(work_item, simulation, simulation_prefix_format_str, experiment)
-            futures.append(pool.submit(gather_files, directory=simulation.hpc_jobs[0].working_directory, file_patterns=file_patterns, exclude_patterns=exclude_patterns_compiles, assets=assets, prefix=prefix, filename_format_func=filename_format_func))
+            futures.append(pool.submit(find_files, directory=simulation.hpc_jobs[0].working_directory, file_patterns=file_patterns, exclude_patterns=exclude_patterns_compiles, assets=assets, prefix=prefix, filename_format_func=filename_format_func))
 
 
 def filter_simulations_files(assets: bool, entity_filter_func: EntityFilterFunc, exclude_patterns_compiles: List, file_patterns: List[str], futures: List[Future], pool: ThreadPoolExecutor, simulation_prefix_format_str: str, work_item: WorkItem,
@@ -322,7 +612,7 @@ def filter_simulation_list(assets: bool, entity_filter_func: EntityFilterFunc, e
             prefix = get_simulation_prefix(parent_work_item=work_item, experiment=experiment, simulation=simulation, simulation_prefix_format_str=simulation_prefix_format_str)
             if simulation.hpc_jobs is None:
                 simulation = simulation.get(simulation.id, HPC_JOBS_QUERY)
-            futures.append(pool.submit(gather_files, directory=simulation.hpc_jobs[0].working_directory, file_patterns=file_patterns, exclude_patterns=exclude_patterns_compiles, assets=assets, prefix=prefix, filename_format_func=filename_format_func))
+            futures.append(pool.submit(find_files, directory=simulation.hpc_jobs[0].working_directory, file_patterns=file_patterns, exclude_patterns=exclude_patterns_compiles, assets=assets, prefix=prefix, filename_format_func=filename_format_func))
 
 
 def filter_work_items_files(assets: bool, entity_filter_func: EntityFilterFunc, exclude_patterns_compiles: List, file_patterns: List[str], futures: List[Future], pool: ThreadPoolExecutor, work_item: WorkItem, work_item_prefix_format_str: str,
@@ -351,7 +641,7 @@ def filter_work_items_files(assets: bool, entity_filter_func: EntityFilterFunc,
             if logger.isEnabledFor(DEBUG):
                 logger.debug(f'Loading outputs from WorkItem {related_work_item.name} - {related_work_item.id}')
             prefix = work_item_prefix_format_str.format(work_item=related_work_item, parent_work_item=work_item) if work_item_prefix_format_str else None
-            futures.append(pool.submit(gather_files, directory=related_work_item.working_directory, file_patterns=file_patterns, exclude_patterns=exclude_patterns_compiles, assets=assets, prefix=prefix, filename_format_func=filename_format_func))
+            futures.append(pool.submit(find_files, directory=related_work_item.working_directory, file_patterns=file_patterns, exclude_patterns=exclude_patterns_compiles, assets=assets, prefix=prefix, filename_format_func=filename_format_func))
 
 
 def filter_ac_files(wi: WorkItem, patterns, exclude_patterns) -> List[AssetCollectionFile]:  # pragma: no cover
@@ -545,7 +835,7 @@ def parse_filter_args_common(args: argparse.Namespace):
     return entity_filter_func, fn_format_func
 
 
-def filter_files_and_assets(args: argparse.Namespace, entity_filter_func: EntityFilterFunc, wi: WorkItem, filename_format_func: FilenameFormatFunction) -> Tuple[SetOfAssets, List[AssetCollectionFile]]:
+def filter_files_and_assets(args: argparse.Namespace, entity_filter_func: EntityFilterFunc, wi: WorkItem, filename_format_func: FilenameFormatFunction, stream: bool = False) -> Tuple[Union[SetOfAssets, Iterator[AssetTuple]], List[AssetCollectionFile]]:
     """
     Filter files and assets using provided parameters.
 
@@ -554,11 +844,12 @@ def filter_files_and_assets(args: argparse.Namespace, entity_filter_func: Entity
         entity_filter_func: Optional filter function for entities. This function is ran on every item. If it returns true, we return the item
         wi: WorkItem we are running in
         filename_format_func: Filename format function allows use to customize how we filter filenames for output.
+        stream: Return the files as an iterator yielding each file as soon as it is hashed, instead of a set
 
     Returns:
         Files that matches the filter and the assets that matches the filter as well.
     """
-    files = gather_files_from_related(
+    files = (iter_files_from_related if stream else gather_files_from_related)(
         wi, file_patterns=args.file_pattern, exclude_patterns=args.exclude_pattern if args.exclude_pattern else [], assets=args.assets,
         work_item_prefix_format_str=args.work_item_prefix_format_str,
         simulation_prefix_format_str=args.simulation_prefix_format_str if not args.no_simulation_prefix else None,
@@ -0,0 +1,247 @@
+"""idmtools comps transient asset de-duplication.
+
+Transient assets (config.json, idmtools_metadata.json, ...) are often identical across the simulations of a batch.
+Instead of uploading the same payload with every simulation, repeated payloads are uploaded once in a shared asset
+collection and the simulations reference them by checksum.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import hashlib
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from logging import getLogger, DEBUG
+from threading import Lock
+from typing import Callable, List, Optional, Set, Tuple, TYPE_CHECKING
+from COMPS.Data import AssetCollection as COMPSAssetCollection, AssetCollectionFile, SimulationFile
+from COMPS.Data import Simulation as COMPSSimulation
+import humanfriendly
+
+if TYPE_CHECKING:  # pragma: no cover
+    from idmtools_platform_comps.utils.checksum_cache import AssetChecksumCache
+
+logger = getLogger(__name__)
+
+# Payloads smaller than this are always sent with the simulation
+DEDUP_MIN_SIZE = 1024
+
+
+@dataclass
+class TransientAssetDedupReport:
+    """Transient asset de-duplication statistics of a batch of simulations."""
+    #: Number of simulations in the batch
+    simulations: int = 0
+    #: Number of transient files of the simulations
+    files: int = 0
+    #: Number of distinct payloads
+    unique_payloads: int = 0
+    #: Number of payloads uploaded to the shared asset collection
+    promoted: int = 0
+    #: Number of files sent as a checksum reference instead of their content
+    references: int = 0
+    #: Size of all the transient files
+    bytes_total: int = 0
+    #: Size of the content actually uploaded
+    bytes_uploaded: int = 0
+    #: Id of the shared asset collection created for the batch, if any
+    asset_collection_id: Optional[str] = None
+
+    @property
+    def bytes_saved(self) -> int:
+        """Size of the content that did not have to be uploaded."""
+        return self.bytes_total - self.bytes_uploaded
+
+    def __add__(self, other: 'TransientAssetDedupReport') -> 'TransientAssetDedupReport':
+        """Combine the statistics of two batches."""
+        return TransientAssetDedupReport(
+            simulations=self.simulations + other.simulations, files=self.files + other.files,
+            unique_payloads=self.unique_payloads + other.unique_payloads, promoted=self.promoted + other.promoted,
+            references=self.references + other.references, bytes_total=self.bytes_total + other.bytes_total,
+            bytes_uploaded=self.bytes_uploaded + other.bytes_uploaded
+        )
+
+    def __str__(self):
+        """Summary of the report."""
+        return f"{self.files} transient files in {self.simulations} simulations: {self.unique_payloads} unique " \
+               f"payloads, {self.promoted} promoted to a shared asset collection, {self.references} sent by " \
+               f"checksum. Uploaded {humanfriendly.format_size(self.bytes_uploaded)} of " \
+               f"{humanfriendly.format_size(self.bytes_total)}"
+
+
+@dataclass
+class TransientAssetBatch:
+    """Transient files of a batch of simulations, held until the whole batch is known."""
+    deduplicator: 'TransientAssetDeduplicator'
+    #: COMPS simulation, file metadata, content, and md5 of each file
+    pending: List[Tuple[COMPSSimulation, SimulationFile, bytes, str]] = field(default_factory=list)
+    simulations: Set[int] = field(default_factory=set)
+    #: Checksums of the payloads uploaded with the simulations of the batch
+    uploaded: Set[str] = field(default_factory=set)
+
+    def add_file(self, comps_sim: COMPSSimulation, simulationfile: SimulationFile, data: bytes):
+        """
+        Add a transient file of a simulation.
+
+        Args:
+            comps_sim: COMPS simulation
+            simulationfile: File metadata
+            data: File content
+
+        Returns:
+            None
+        """
+        self.simulations.add(id(comps_sim))
+        self.pending.append((comps_sim, simulationfile, data, hashlib.md5(data).hexdigest()))
+
+    def flush(self) -> TransientAssetDedupReport:
+        """
+        Add the files to the COMPS simulations, uploading repeated payloads only once.
+
+        Returns:
+            Report of the batch
+        """
+        return self.deduplicator.flush(self)
+
+    def commit(self):
+        """
+        Record the payloads uploaded with the simulations once the simulations are saved.
+
+        Later batches reference them instead of uploading them again.
+
+        Returns:
+            None
+        """
+        self.deduplicator.add_known_checksums(self.uploaded)
+
+
+@dataclass
+class TransientAssetDeduplicator:
+    """
+    De-duplicate the transient assets of simulations across batches.
+
+    A payload repeated at least *min_repeats* times in a batch is uploaded once in a shared asset collection and the
+    simulations reference it by checksum. Payloads already uploaded, by a previous batch or asset collection, are
+    always referenced by checksum. With a *checksum_cache*, the payloads known to be on COMPS are shared with the
+    asset collections and with later sessions.
+    """
+    #: Number of occurrences in a batch for a payload to be promoted to the shared asset collection
+    min_repeats: int = field(default=2)
+    #: Payloads smaller than this are always sent with the simulation
+    min_size: int = field(default=DEDUP_MIN_SIZE)
+    #: Function used to save the shared asset collections. Defaults to COMPS AssetCollection.save. Replace to test
+    #: against a fake client
+    save_asset_collection: Callable[[COMPSAssetCollection], None] = field(default=None, repr=False)
+    #: Persistent cache of the checksums known to be on COMPS
+    checksum_cache: Optional['AssetChecksumCache'] = field(default=None, repr=False)
+
+    #: md5 of the payloads known to be on COMPS
+    known_checksums: Set[str] = field(default_factory=set, init=False, repr=False)
+    #: Report of each batch
+    reports: List[TransientAssetDedupReport] = field(default_factory=list, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.save_asset_collection is None:
+            self.save_asset_collection = COMPSAssetCollection.save
+
+    def batch(self) -> TransientAssetBatch:
+        """
+        Start a batch.
+
+        Returns:
+            An empty batch
+        """
+        return TransientAssetBatch(deduplicator=self)
+
+    def add_known_checksums(self, checksums: Set[str]):
+        """
+        Record payloads known to be on COMPS.
+
+        Args:
+            checksums: md5 of the payloads
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.known_checksums.update(checksums)
+        if self.checksum_cache is not None:
+            self.checksum_cache.add_known(checksums)
+
+    def _promote(self, payloads: dict) -> str:
+        """
+        Upload payloads in a shared asset collection.
+
+        Args:
+            payloads: Content by md5
+
+        Returns:
+            Id of the asset collection
+        """
+        ac = COMPSAssetCollection()
+        ac.set_tags(dict(idmtools_transient_assets=str(len(payloads))))
+        for md5, data in payloads.items():
+            ac.add_asset(AssetCollectionFile(file_name=md5, relative_path="transient"), data=data)
+        self.save_asset_collection(ac)
+        return str(ac.id)
+
+    def flush(self, batch: TransientAssetBatch) -> TransientAssetDedupReport:
+        """
+        Add the files of a batch to their COMPS simulations.
+
+        Args:
+            batch: Batch
+
+        Returns:
+            Report of the batch
+        """
+        counts = Counter(md5 for _, _, _, md5 in batch.pending)
+        report = TransientAssetDedupReport(simulations=len(batch.simulations), files=len(batch.pending),
+                                           unique_payloads=len(counts))
+        with self._lock:
+            known = set(self.known_checksums)
+        if self.checksum_cache is not None:
+            candidates = {md5 for _, _, data, md5 in batch.pending if len(data) >= self.min_size} - known
+            if candidates:
+                known.update(candidates - {c.hex for c in self.checksum_cache.unknown(candidates)})
+        to_promote = dict()
+        for _, _, data, md5 in batch.pending:
+            if counts[md5] >= self.min_repeats and len(data) >= self.min_size and md5 not in known:
+                to_promote[md5] = data
+        if to_promote:
+            report.asset_collection_id = self._promote(to_promote)
+            report.promoted = len(to_promote)
+            report.bytes_uploaded += sum(len(data) for data in to_promote.values())
+            self.add_known_checksums(set(to_promote))
+            known.update(to_promote)
+
+        for comps_sim, simulationfile, data, md5 in batch.pending:
+            report.bytes_total += len(data)
+            if md5 in known and len(data) >= self.min_size:
+                reference = SimulationFile(simulationfile.file_name, simulationfile.file_type,
+                                           simulationfile.description, md5_checksum=uuid.UUID(md5))
+                comps_sim.add_file(simulationfile=reference)
+                report.references += 1
+            else:
+                comps_sim.add_file(simulationfile=simulationfile, data=data)
+                report.bytes_uploaded += len(data)
+                if len(data) >= self.min_size:
+                    batch.uploaded.add(md5)
+        batch.pending.clear()
+
+        with self._lock:
+            self.reports.append(report)
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"Transient assets: {report}")
+        return report
+
+    def summary(self) -> TransientAssetDedupReport:
+        """
+        Combine the reports of all batches.
+
+        Returns:
+            Report of all batches
+        """
+        with self._lock:
+            reports = list(self.reports)
+        return sum(reports, TransientAssetDedupReport())
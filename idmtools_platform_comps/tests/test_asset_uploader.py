@@ -0,0 +1,167 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+import allure
+from idmtools.assets import Asset, AssetCollection
+from idmtools_platform_comps.comps_operations import asset_collection_operations
+from idmtools_platform_comps.comps_operations.asset_collection_operations import CompsPlatformAssetCollectionOperations
+from idmtools_platform_comps.utils.asset_uploader import StreamingAssetUploader
+
+
+class FakeUploadEndpoint:
+    """Local stand-in for the COMPS large asset upload, reading streams the way AssetManager does."""
+
+    def __init__(self, fail_once=None, delay=0.0):
+        self.fail_once = set(fail_once or [])
+        self.delay = delay
+        self.received = dict()
+        self.max_read = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, checksum, stream, status_callback=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            data = b''
+            chunk_size = 1024
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                self.max_read = max(self.max_read, len(chunk))
+                data += chunk
+                chunk_size *= 2
+                if checksum in self.fail_once:
+                    self.fail_once.remove(checksum)
+                    raise ConnectionError("connection reset")
+            time.sleep(self.delay)
+            self.received[checksum] = data
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class FakeCOMPSAssetCollection:
+    """Asset collection recording the files it references. The server knows the checksums in *known*."""
+    known = set()
+    saved = []
+
+    def __init__(self):
+        self.files = []
+        self.tags = None
+        self.id = None
+
+    def add_asset(self, af, file_path=None, data=None):
+        assert file_path is None and data is None, "the collection must reference the files by checksum"
+        self.files.append(af)
+
+    def set_tags(self, tags):
+        self.tags = tags
+
+    def save(self, return_missing_files=False):
+        missing = [af.md5_checksum for af in self.files if af.md5_checksum not in self.known]
+        if return_missing_files and missing:
+            return missing
+        assert not missing
+        self.id = uuid.uuid4()
+        self.saved.append(self)
+
+
+@allure.story("COMPS")
+@allure.suite("idmtools_platform_comps")
+class TestStreamingAssetUploader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.assets = []
+        for i in range(6):
+            path = os.path.join(self.tmp, f"file{i}.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(50000 + i * 1000))
+            self.assets.append(Asset(absolute_path=path))
+        self.assets.append(Asset(filename="config.json", content=b'{"a": 1}'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def md5(self, asset):
+        return uuid.UUID(hashlib.md5(asset.bytes).hexdigest())
+
+    def test_compute_checksums(self):
+        checksums = StreamingAssetUploader(hash_workers=3).compute_checksums(self.assets)
+        self.assertEqual(list(checksums), self.assets)
+        for asset, checksum in checksums.items():
+            self.assertEqual(checksum, self.md5(asset))
+
+    def test_upload_bounded_streams(self):
+        endpoint = FakeUploadEndpoint(delay=0.05)
+        uploader = StreamingAssetUploader(upload_workers=2, max_chunk_size=4096, upload_stream=endpoint)
+        files = uploader.compute_checksums(self.assets)
+        files = {checksum: asset for asset, checksum in files.items()}
+        with mock.patch('idmtools.IdmConfigParser.is_progress_bar_disabled', return_value=True):
+            report = uploader.upload(files)
+        self.assertEqual(endpoint.received, {checksum: asset.bytes for checksum, asset in files.items()})
+        self.assertLessEqual(endpoint.max_read, 4096)
+        self.assertEqual(endpoint.max_active, 2)
+        self.assertEqual(report.files, len(self.assets))
+        self.assertEqual(report.retries, 0)
+        self.assertEqual(report.bytes, sum(len(asset.bytes) for asset in self.assets))
+        self.assertGreater(report.throughput, 0)
+        self.assertIs(uploader.last_report, report)
+        self.assertIn(f"Uploaded {len(self.assets)} files", str(report))
+
+    def test_upload_retries(self):
+        checksum = self.md5(self.assets[0])
+        endpoint = FakeUploadEndpoint(fail_once=[checksum])
+        uploader = StreamingAssetUploader(retry_delay=0, max_chunk_size=4096, upload_stream=endpoint)
+        with mock.patch('idmtools.IdmConfigParser.is_progress_bar_disabled', return_value=True):
+            report = uploader.upload({checksum: self.assets[0]})
+        self.assertEqual(endpoint.received[checksum], self.assets[0].bytes)
+        self.assertEqual(report.retries, 1)
+        self.assertGreater(report.bytes, len(self.assets[0].bytes))
+
+        endpoint = FakeUploadEndpoint(fail_once=[checksum])
+        uploader = StreamingAssetUploader(max_retries=0, upload_stream=endpoint)
+        with mock.patch('idmtools.IdmConfigParser.is_progress_bar_disabled', return_value=True):
+            with self.assertRaises(ConnectionError):
+                uploader.upload({checksum: self.assets[0]})
+
+    def test_platform_create_uploads_missing_files(self):
+        endpoint = FakeUploadEndpoint()
+        FakeCOMPSAssetCollection.known = {self.md5(self.assets[0])}
+        FakeCOMPSAssetCollection.saved = []
+        ac = AssetCollection(self.assets)
+        ac.tags = dict(a="b")
+
+        def upload_stream(checksum, stream, status_callback=None):
+            endpoint(checksum, stream, status_callback)
+            FakeCOMPSAssetCollection.known.add(checksum)
+
+        ops = CompsPlatformAssetCollectionOperations(platform=SimpleNamespace(uid="comps"))
+        ops.uploader = StreamingAssetUploader(upload_stream=upload_stream)
+        with mock.patch.object(asset_collection_operations, 'COMPSAssetCollection', FakeCOMPSAssetCollection), \
+                mock.patch('idmtools.IdmConfigParser.is_progress_bar_disabled', return_value=True), \
+                mock.patch('idmtools.IdmConfigParser.is_output_enabled', return_value=False):
+            comps_ac = ops.platform_create(ac)
+        self.assertEqual(len(FakeCOMPSAssetCollection.saved), 1)
+        self.assertIs(comps_ac, FakeCOMPSAssetCollection.saved[0])
+        self.assertEqual(ac.uid, comps_ac.id)
+        self.assertEqual(comps_ac.tags, dict(a="b"))
+        self.assertEqual(len(comps_ac.files), len(self.assets))
+        # the file already on the server is not uploaded again
+        self.assertEqual(set(endpoint.received), {self.md5(asset) for asset in self.assets[1:]})
+        self.assertEqual(ops.uploader.last_report.files, len(self.assets) - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
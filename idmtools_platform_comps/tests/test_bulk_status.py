@@ -0,0 +1,146 @@
+import unittest
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import allure
+from COMPS.Data.Simulation import SimulationState
+from idmtools.core import EntityStatus
+from idmtools.entities import Suite
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation import Simulation
+from idmtools_platform_comps.comps_operations.simulation_operations import CompsPlatformSimulationOperations
+from idmtools_platform_comps.utils.bulk_status import BulkStatusRefresher
+
+
+class FakeSimulationQueryEndpoint:
+    """Local stand-in for the COMPS simulation query endpoint that honors filters, paging, and select."""
+
+    def __init__(self):
+        self.states = dict()
+        self.modified = dict()
+        self.clock = datetime(2025, 1, 1)
+        self.calls = []
+        self.returned = 0
+
+    def add_experiment(self, experiment: Experiment, state=SimulationState.Running):
+        self.states[str(experiment.uid)] = dict()
+        for s in experiment.simulations:
+            self.set_state(experiment, str(s.uid), state)
+
+    def set_state(self, experiment: Experiment, sim_id: str, state):
+        self.clock += timedelta(minutes=1)
+        self.states[str(experiment.uid)][sim_id] = state
+        self.modified[sim_id] = self.clock
+
+    def __call__(self, query_criteria):
+        self.calls.append(query_criteria)
+        exp_id = next(f.split("=", 1)[1] for f in query_criteria._filters if f.startswith("experiment_id="))
+        since = next((datetime.strptime(f.split(">=", 1)[1], '%Y-%m-%d %H:%M:%S') for f in query_criteria._filters
+                      if f.startswith("last_modified>=")), None)
+        offset = query_criteria._offset or 0
+        count = query_criteria._count or 1000
+        items = [(sim_id, state) for sim_id, state in self.states.get(exp_id, {}).items()
+                 if since is None or self.modified[sim_id] >= since][offset:offset + count]
+        self.returned += len(items)
+        return [SimpleNamespace(id=uuid.UUID(sim_id), state=state, last_modified=self.modified[sim_id])
+                for sim_id, state in items]
+
+
+@allure.story("COMPS")
+@allure.suite("idmtools_platform_comps")
+class TestBulkStatusRefresher(unittest.TestCase):
+
+    def setUp(self):
+        self.endpoint = FakeSimulationQueryEndpoint()
+        self.suite = Suite(name="suite")
+        for _ in range(3):
+            exp = Experiment(name="exp", simulations=[Simulation(name="sim") for _ in range(25)])
+            for sim in exp.simulations:
+                sim.uid = uuid.uuid4()
+                sim.status = EntityStatus.CREATED
+            self.suite.add_experiment(exp)
+            self.endpoint.add_experiment(exp)
+        self.refresher = BulkStatusRefresher(page_size=10, query=self.endpoint)
+
+    def test_paged_query_selects_only_id_and_state(self):
+        changed = self.refresher.refresh([self.suite])
+        self.assertEqual(len(changed), 75)
+        # 25 simulations in pages of 10 => 3 queries per experiment
+        self.assertEqual(self.refresher.last_query_count, 9)
+        self.assertTrue(all(qc._fields == ['id', 'state', 'last_modified'] for qc in self.endpoint.calls))
+        self.assertTrue(all(qc._children == [] for qc in self.endpoint.calls))
+        for exp in self.suite.experiments:
+            self.assertTrue(all(s.status == EntityStatus.RUNNING for s in exp.simulations))
+
+    def test_only_changes_are_reported(self):
+        self.refresher.refresh([self.suite])
+        exp = self.suite.experiments[1]
+        sim_id = str(exp.simulations[4].uid)
+        self.endpoint.set_state(exp, sim_id, SimulationState.Succeeded)
+        changed = self.refresher.refresh([self.suite])
+        self.assertEqual(changed, {sim_id: EntityStatus.SUCCEEDED})
+        self.assertEqual(exp.simulations[4].status, EntityStatus.SUCCEEDED)
+
+    def test_unmodified_simulations_are_not_fetched_again(self):
+        self.refresher.refresh([self.suite])
+        self.assertEqual(self.endpoint.returned, 75)
+        exp = self.suite.experiments[2]
+        sim_id = str(exp.simulations[7].uid)
+        self.endpoint.set_state(exp, sim_id, SimulationState.Succeeded)
+
+        self.endpoint.returned = 0
+        changed = self.refresher.refresh([self.suite])
+        self.assertEqual(changed, {sim_id: EntityStatus.SUCCEEDED})
+        # one query per experiment, returning the modified simulation and the latest simulation of each experiment,
+        # since the modification times are compared to the second
+        self.assertEqual(self.refresher.last_query_count, 3)
+        self.assertEqual(self.endpoint.returned, 1 + 3)
+
+        # a simulation reloaded from COMPS gets the status of the snapshot
+        copy = Simulation(name="sim", parent_id=exp.uid)
+        copy.uid = exp.simulations[7].uid
+        self.assertEqual(self.refresher.refresh([copy]), {sim_id: EntityStatus.SUCCEEDED})
+
+    def test_simulation_refresh_is_bulk(self):
+        exp = self.suite.experiments[0]
+        ops = CompsPlatformSimulationOperations(platform=SimpleNamespace(_status_refresher=self.refresher))
+        sim = exp.simulations[3]
+        ops.refresh_status(sim)
+        self.assertEqual(sim.status, EntityStatus.RUNNING)
+        self.assertEqual(self.refresher.last_query_count, 3)
+
+        # other simulations of the experiment reuse the snapshot
+        self.endpoint.set_state(exp, str(exp.simulations[5].uid), SimulationState.Failed)
+        self.endpoint.returned = 0
+        ops.refresh_status(exp.simulations[5])
+        ops.refresh_status(exp.simulations[6])
+        self.assertEqual((exp.simulations[5].status, exp.simulations[6].status),
+                         (EntityStatus.FAILED, EntityStatus.RUNNING))
+        # the latest modified simulation is fetched by both queries
+        self.assertEqual(self.endpoint.returned, 3)
+
+        # finished simulations are not queried
+        self.refresher.refresh([exp.simulations[5]])
+        self.assertEqual(self.refresher.last_query_count, 0)
+
+    def test_done_experiments_are_not_queried(self):
+        done_exp = self.suite.experiments[0]
+        for sim_id in self.endpoint.states[str(done_exp.uid)]:
+            self.endpoint.set_state(done_exp, sim_id, SimulationState.Failed)
+        self.refresher.refresh([self.suite])
+        self.assertTrue(done_exp.any_failed)
+
+        self.endpoint.calls.clear()
+        self.refresher.refresh([self.suite])
+        queried = {f for qc in self.endpoint.calls for f in qc._filters}
+        self.assertNotIn(f"experiment_id={done_exp.uid}", queried)
+        # the other experiments only query their modified simulations
+        self.assertEqual(self.refresher.last_query_count, 2)
+
+        # force still queries everything
+        self.refresher.refresh([self.suite], force=True)
+        self.assertEqual(self.refresher.last_query_count, 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
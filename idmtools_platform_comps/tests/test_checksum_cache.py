@@ -0,0 +1,196 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+import allure
+from idmtools.assets import Asset, AssetCollection
+from idmtools_platform_comps.comps_operations import asset_collection_operations
+from idmtools_platform_comps.comps_operations.asset_collection_operations import CompsPlatformAssetCollectionOperations
+from idmtools_platform_comps.utils import asset_uploader
+from idmtools_platform_comps.utils.checksum_cache import AssetChecksumCache
+from idmtools_platform_comps.utils.python_requirements_ac.requirements_to_asset_collection import \
+    RequirementsToAssetCollection
+from idmtools_platform_comps.utils.singularity_build import SingularityBuildWorkItem
+
+
+class FakeCOMPSAssetCollection:
+    """Asset collection of a fake server knowing the checksums in *known*."""
+    known = set()
+    collections = dict()
+    saves = 0
+
+    def __init__(self):
+        self.assets = []
+        self.tags = None
+        self.id = None
+
+    @classmethod
+    def get(cls, id=None, query_criteria=None):
+        if str(id) not in cls.collections:
+            raise RuntimeError("404 NotFound")
+        return cls.collections[str(id)]
+
+    def add_asset(self, af, file_path=None, data=None):
+        self.assets.append(af)
+
+    def set_tags(self, tags):
+        self.tags = tags
+
+    def save(self, return_missing_files=False):
+        FakeCOMPSAssetCollection.saves += 1
+        missing = [af.md5_checksum for af in self.assets if af.md5_checksum not in self.known]
+        if return_missing_files and missing:
+            return missing
+        if missing:
+            raise RuntimeError("400 BadRequest: missing files")
+        self.id = uuid.uuid4()
+        self.collections[str(self.id)] = self
+
+
+@allure.story("COMPS")
+@allure.suite("idmtools_platform_comps")
+class TestAssetChecksumCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = AssetChecksumCache(namespace="https://comps.example", directory=os.path.join(self.tmp, "cache"))
+        self.file = os.path.join(self.tmp, "model.bin")
+        with open(self.file, "wb") as f:
+            f.write(os.urandom(4096))
+
+    def tearDown(self):
+        self.cache.cache.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_known_checksums_expire(self):
+        a, b = uuid.uuid4(), uuid.uuid4()
+        cache = AssetChecksumCache(namespace="expiring", ttl=0.2, directory=self.cache.directory)
+        cache.add_known([a])
+        self.assertEqual(cache.unknown([a, str(b)]), {b})
+        # other servers do not share the entries
+        self.assertEqual(self.cache.unknown([a]), {a})
+        time.sleep(0.3)
+        self.assertEqual(cache.unknown([a]), {a})
+        cache.cache.close()
+
+    def test_file_checksum_invalidated_by_changes(self):
+        checksum = uuid.uuid4()
+        self.cache.set_file_checksum(self.file, checksum)
+        self.assertEqual(self.cache.file_checksum(self.file), checksum)
+        with open(self.file, "ab") as f:
+            f.write(b"more")
+        self.assertIsNone(self.cache.file_checksum(self.file))
+
+    def test_asset_collections(self):
+        ac_id, checksums = uuid.uuid4(), [uuid.uuid4(), uuid.uuid4()]
+        self.cache.record_asset_collection(ac_id, checksums, lookup_key="requirements:linux:abc")
+        self.assertEqual(self.cache.find_asset_collection("requirements:linux:abc"), str(ac_id))
+        self.assertEqual(self.cache.unknown(checksums), set())
+        self.cache.invalidate_asset_collection(ac_id)
+        self.assertIsNone(self.cache.find_asset_collection("requirements:linux:abc"))
+        self.assertEqual(self.cache.unknown(checksums), set(checksums))
+
+    def test_disabled(self):
+        cache = AssetChecksumCache(ttl=0, directory=self.cache.directory)
+        cache.record_asset_collection(uuid.uuid4(), [uuid.uuid4()], lookup_key="key")
+        self.assertIsNone(cache.find_asset_collection("key"))
+        self.assertIsNone(cache.file_checksum(self.file))
+
+    def fake_comps(self):
+        FakeCOMPSAssetCollection.known = set()
+        FakeCOMPSAssetCollection.collections = dict()
+        FakeCOMPSAssetCollection.saves = 0
+
+        def upload_stream(checksum, stream, status_callback=None):
+            stream.read()
+            FakeCOMPSAssetCollection.known.add(checksum)
+
+        platform = SimpleNamespace(uid="comps", environment="Calculon", _checksum_cache=self.cache)
+        platform._assets = CompsPlatformAssetCollectionOperations(platform=platform)
+        platform._assets.uploader.upload_stream = upload_stream
+        patches = [mock.patch.object(asset_collection_operations, 'COMPSAssetCollection', FakeCOMPSAssetCollection),
+                   mock.patch('idmtools.IdmConfigParser.is_progress_bar_disabled', return_value=True),
+                   mock.patch('idmtools.IdmConfigParser.is_output_enabled', return_value=False)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        return platform
+
+    def test_platform_create_reuses_unchanged_collections(self):
+        ops = self.fake_comps()._assets
+        first = ops.platform_create(AssetCollection([Asset(absolute_path=self.file)]))
+        self.assertEqual(FakeCOMPSAssetCollection.saves, 2)
+        # unchanged files are neither hashed nor negotiated again
+        with mock.patch.object(asset_uploader, 'calculate_md5', side_effect=AssertionError("hashed again")):
+            ac = AssetCollection([Asset(absolute_path=self.file)])
+            second = ops.platform_create(ac)
+        self.assertIs(second, first)
+        self.assertEqual(ac.uid, first.id)
+        self.assertEqual(FakeCOMPSAssetCollection.saves, 2)
+
+        # a collection deleted on the server is created again
+        del FakeCOMPSAssetCollection.collections[str(first.id)]
+        third = ops.platform_create(AssetCollection([Asset(absolute_path=self.file)]))
+        self.assertNotEqual(third.id, first.id)
+        self.assertEqual(FakeCOMPSAssetCollection.saves, 3)
+        self.assertEqual(self.cache.find_asset_collection(
+            self.cache.asset_collection_key([(a.file_name, a.relative_path, a.md5_checksum) for a in third.assets])),
+            str(third.id))
+
+    def test_known_files_are_not_negotiated(self):
+        ops = self.fake_comps()._assets
+        with open(self.file, "rb") as f:
+            checksum = uuid.UUID(hashlib.md5(f.read()).hexdigest())
+        FakeCOMPSAssetCollection.known.add(checksum)
+        self.cache.add_known([checksum])
+        ops.platform_create(AssetCollection([Asset(absolute_path=self.file)]))
+        self.assertEqual(FakeCOMPSAssetCollection.saves, 1)
+
+        # a file removed from the server since it was cached is negotiated and uploaded again
+        FakeCOMPSAssetCollection.known.clear()
+        ac = ops.platform_create(AssetCollection([Asset(absolute_path=self.file)], tags=dict(copy=2)))
+        self.assertIsNotNone(ac.id)
+        self.assertEqual(FakeCOMPSAssetCollection.saves, 1 + 3)
+        self.assertIn(checksum, FakeCOMPSAssetCollection.known)
+
+    def test_requirements_use_cache(self):
+        platform = self.fake_comps()
+        rta = RequirementsToAssetCollection(platform=platform, pkg_list=["astor==0.8.1"])
+        rta._requirements = ["astor==0.8.1"]
+        ac = FakeCOMPSAssetCollection()
+        ac.add_asset(SimpleNamespace(md5_checksum=uuid.uuid4()))
+        FakeCOMPSAssetCollection.known.update(a.md5_checksum for a in ac.assets)
+        ac.save()
+        with mock.patch.object(RequirementsToAssetCollection, 'retrieve_ac_by_tag', return_value=ac) as retrieve:
+            self.assertEqual(rta.run(), ac.id)
+            self.assertEqual(rta.run(), ac.id)
+            retrieve.assert_called_once()
+            self.assertEqual(self.cache.unknown([ac.assets[0].md5_checksum]), set())
+
+            # the cached collection was deleted on COMPS
+            del FakeCOMPSAssetCollection.collections[str(ac.id)]
+            retrieve.return_value = None
+            self.assertIsNone(rta.retrieve_ac_id_from_cache())
+            self.assertIsNone(self.cache.find_asset_collection(rta.cache_key))
+
+    def test_singularity_context_checksum_cached(self):
+        sbi = SingularityBuildWorkItem(name="build", definition_content="Bootstrap: docker\nFrom: alpine")
+        sbi.add_asset(Asset(absolute_path=self.file))
+        expected = sbi.context_checksum()
+        sbi.platform = SimpleNamespace(uid="comps", _checksum_cache=self.cache)
+        self.assertEqual(sbi.context_checksum(), expected)
+        with mock.patch('idmtools_platform_comps.utils.singularity_build.calculate_md5_stream',
+                        side_effect=AssertionError("hashed again")):
+            self.assertEqual(sbi.context_checksum(), expected)
+        with open(self.file, "ab") as f:
+            f.write(b"more")
+        self.assertNotEqual(sbi.context_checksum(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
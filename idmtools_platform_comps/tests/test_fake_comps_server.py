@@ -0,0 +1,149 @@
+import hashlib
+import io
+import os
+import time
+import unittest
+import uuid
+from unittest import skipUnless
+import allure
+import pytest
+from COMPS import Client
+from COMPS.Data import AssetCollection as COMPSAssetCollection, AssetCollectionFile, AssetManager, \
+    Experiment as COMPSExperiment, QueryCriteria, Simulation as COMPSSimulation
+from idmtools.analysis.analyze_manager import AnalyzeManager
+from idmtools.core import ItemType
+from idmtools.core.platform_factory import Platform
+from idmtools_test.utils.comps_benchmark import BENCHMARK_OPERATIONS, DownloadAnalyzer, build_experiment, \
+    run_benchmark
+from idmtools_test.utils.fake_comps_server import FakeCOMPSConfig, FakeCOMPSServer
+
+
+@allure.story("COMPS")
+@allure.suite("idmtools_platform_comps")
+class TestFakeCOMPSServer(unittest.TestCase):
+
+    def start(self, **kwargs) -> FakeCOMPSServer:
+        server = FakeCOMPSServer(FakeCOMPSConfig(**kwargs)).start()
+        self.addCleanup(server.stop)
+        server.login()
+        return server
+
+    def commissioned_simulation(self) -> COMPSSimulation:
+        experiment = COMPSExperiment("fake")
+        experiment.save()
+        simulation = COMPSSimulation("fake", experiment_id=experiment.id)
+        simulation.save()
+        experiment.commission()
+        return simulation
+
+    def test_platform_operations(self):
+        server = self.start(run_time=0.5)
+        platform = Platform(type="COMPS", endpoint=server.url, environment="Calculon")
+        experiment = build_experiment(20)
+        experiment.run(wait_until_done=False, platform=platform)
+        self.assertEqual(len(server.store.entities["Simulations"]), 20)
+        self.assertEqual(len(server.store.commissioned), 20)
+        self.assertLess(server.stats()["requests"]["POST /api/Simulations"], 20)
+
+        # one paged query per poll
+        server.reset_stats()
+        platform.refresh_status(experiment)
+        self.assertFalse(experiment.done)
+        self.assertEqual(server.stats()["total_requests"], 1)
+        time.sleep(0.5)
+        platform.refresh_status(experiment)
+        self.assertTrue(experiment.succeeded)
+
+        analyzer = DownloadAnalyzer(filenames=["output/result.json", "stdout.txt"])
+        manager = AnalyzeManager(platform=platform, ids=[(experiment.uid, ItemType.EXPERIMENT)], analyzers=[analyzer],
+                                 executor_type="thread", verbose=False)
+        server.reset_stats()
+        self.assertTrue(manager.analyze())
+        self.assertEqual(analyzer.results, 20 * (len(b'{"value": 1}') + len(b"Done\n")))
+        stats = server.stats()
+        self.assertEqual(stats["requests"]["GET /asset/Simulations/{id}/Output"], 20)
+        self.assertEqual(stats["requests"]["GET /asset/Simulations/{id}/Output/{path}"], 40)
+
+        loaded = platform.get_item(experiment.uid, ItemType.EXPERIMENT)
+        self.assertEqual(sorted(s.tags["index"] for s in loaded.simulations), list(range(20)))
+
+    def test_paging(self):
+        self.start()
+        experiment = COMPSExperiment("paging")
+        experiment.save()
+        for i in range(5):
+            COMPSSimulation(f"sim{i}", experiment_id=experiment.id)
+        COMPSSimulation.save_all(None)
+        qc = QueryCriteria().select(["id", "name"]).where([f"experiment_id={experiment.id}"])
+        page = COMPSSimulation.get(query_criteria=qc.orderby("date_created desc").count(2).offset(1))
+        self.assertEqual([s.name for s in page], ["sim3", "sim2"])
+        self.assertIsNone(page[0].state)
+
+    def test_error_injection(self):
+        server = self.start(disconnect_rate=0.5, error_paths="/Output", seed=1)
+        simulation = self.commissioned_simulation()
+        # the COMPS client retries dropped connections of GET requests
+        self.assertEqual(simulation.retrieve_output_files(["stdout.txt"]), [b"Done\n"])
+        self.assertGreater(server.stats()["errors"], 0)
+
+        server.config.disconnect_rate = 0
+        server.config.error_rate = 1
+        with self.assertRaisesRegex(RuntimeError, "503 Service Unavailable - Injected error"):
+            simulation.retrieve_output_files(["stdout.txt"])
+
+    def test_latency_and_bandwidth(self):
+        server = self.start(output_files={"output.bin": b"0" * 20000})
+        simulation = self.commissioned_simulation()
+        server.config.latency = 0.1
+        server.config.bandwidth = 100000
+        start = time.time()
+        simulation.retrieve_output_files(["output.bin"])
+        # two requests and 20 kB at 100 kB/s
+        self.assertGreaterEqual(time.time() - start, 0.4)
+
+    def test_missing_files_and_resumed_upload(self):
+        server = self.start()
+        data = os.urandom(100000)
+        checksum = uuid.UUID(hashlib.md5(data).hexdigest())
+        ac = COMPSAssetCollection()
+        ac.add_asset(AssetCollectionFile("data.bin", md5_checksum=checksum))
+        self.assertEqual(ac.save(return_missing_files=True), [checksum])
+
+        Client.post(f"/upload/{checksum}", data=data[:1000],
+                    headers={"Content-Type": "application/octet-stream", "Content-Range": f"bytes 0-999/{len(data)}"})
+        self.assertEqual(Client.get(f"/upload/check/{checksum}", http_err_handle_exceptions=[404]).json(),
+                         dict(Size=1000))
+        server.reset_stats()
+        AssetManager.upload_large_asset(checksum, io.BytesIO(data))
+        self.assertEqual(server.stats()["bytes_received"], len(data) - 1000)
+        ac.save()
+        ac = COMPSAssetCollection.get(ac.id, QueryCriteria().select_children(["assets"]))
+        self.assertEqual(ac.assets[0].length, len(data))
+        self.assertEqual(ac.assets[0].retrieve(), data)
+
+
+@pytest.mark.long
+@allure.story("COMPS")
+@allure.suite("idmtools_platform_comps")
+@skipUnless(os.getenv("IDMTOOLS_RUN_COMPS_BENCHMARKS"), "Set IDMTOOLS_RUN_COMPS_BENCHMARKS to run the COMPS benchmarks")
+@pytest.mark.usefixtures("unittest_record_property")
+class TestCOMPSPlatformBenchmark(unittest.TestCase):
+
+    def run_benchmark(self, simulations: int):
+        results = run_benchmark(simulations, FakeCOMPSConfig(latency=0.01, run_time=5.0))
+        for result in results:
+            self.record_property(result.operation, str(result))
+        self.assertEqual([result.operation for result in results], list(BENCHMARK_OPERATIONS))
+
+    def test_1k_simulations(self):
+        self.run_benchmark(1000)
+
+    def test_10k_simulations(self):
+        self.run_benchmark(10000)
+
+    def test_100k_simulations(self):
+        self.run_benchmark(100000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import glob
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+from unittest import mock
+import allure
+from idmtools.utils.hashing import calculate_md5
+from idmtools_platform_comps.utils.ssmt_utils import file_filter
+from idmtools_platform_comps.utils.ssmt_utils.file_filter import ChecksumCache, FileMatcher, find_files, gather_files, \
+    hash_files, is_file_excluded
+
+FILES = [
+    "output/result.csv", "output/InsetChart.json", "output/nested/deep/data.csv", "output/.hidden.csv",
+    ".cache/data.csv", "config.json", "campaign.json", "stdout.txt", "StdErr.txt", "comps.log", "logs/idmtools.log",
+    "Assets/model.py", "Assets/lib/helper.py", "Assets.txt", "a[1].txt", "b?.txt", "outputs2/x.csv"
+]
+
+PATTERNS = [
+    ["**"], ["*"], ["output/*.csv"], ["output/**"], ["**/*.csv"], ["**/*.json", "output/*.csv"], ["*.json", "*.txt"],
+    ["output/**/*.csv"], ["out*/*"], [".cache/*"], ["output/.*"], ["[ab]*.txt"], ["a[[]1].txt"], ["config.json"],
+    ["Assets/**"], ["**/missing/*"], ["*/nested/**"]
+]
+
+EXCLUDES = [[], ["*.log"], ["StdErr.txt", "StdOut.txt", "WorkOrder.json", "*.log"], ["output/*.json"], ["nested/*/*"],
+            ["*.CSV"]]
+
+
+def legacy_gather(directory, file_patterns, exclude_patterns, assets, prefix=None):
+    """Files gathered by globbing each pattern, then excluding."""
+    found = set()
+    for pattern in file_patterns:
+        for file in glob.iglob(os.path.join(directory, pattern), recursive=True):
+            if os.path.isfile(file):
+                short_name = file.replace(directory + os.path.sep, "")
+                if short_name.startswith("Assets") and not assets:
+                    continue
+                found.add((file, os.path.join(prefix if prefix else '', short_name)))
+    return {f for f in found if not is_file_excluded(f[0], exclude_patterns)}
+
+
+@allure.story("COMPS")
+@allure.suite("idmtools_platform_comps")
+class TestFileFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name in FILES:
+            path = os.path.join(self.directory, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(name)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_single_walk_matches_glob(self):
+        for patterns in PATTERNS:
+            for excludes in EXCLUDES:
+                for assets in (False, True):
+                    with self.subTest(patterns=patterns, excludes=excludes, assets=assets):
+                        expected = legacy_gather(self.directory, patterns, excludes, assets, prefix="sim")
+                        actual = find_files(self.directory, patterns, excludes, assets=assets, prefix="sim")
+                        self.assertEqual(len(actual), len(set(actual)))
+                        self.assertEqual(set(actual), expected)
+
+    def test_exclude_matcher(self):
+        patterns = ["StdErr.txt", "StdOut.txt", "WorkOrder.json", "*.log", "ABc/*/stderr.*"]
+        matcher = FileMatcher(["**"], patterns)
+        for name in ["a.py", "b.py", "/work/ABc/123/stdout.err", "ABc/123/StdErr.err", "comps.log", "logs/idmtools.log",
+                     "/work/stdout.txt", "/work/WorkOrder.json.bak", "/work/abc/1/STDERR.txt"]:
+            with self.subTest(name=name):
+                self.assertEqual(matcher.is_excluded(name), is_file_excluded(name, patterns))
+
+    def test_roots(self):
+        self.assertEqual(FileMatcher(["output/*.csv", "output/nested/**", "logs/a.log"]).roots, {"output", "logs"})
+        self.assertEqual(FileMatcher(["output/*.csv", "**/*.json"]).roots, {""})
+
+    def test_hashing_after_excluding(self):
+        cache = ChecksumCache()
+        with mock.patch.object(file_filter, 'CHECKSUM_CACHE', cache), \
+                mock.patch('idmtools.utils.hashing.calculate_md5', wraps=calculate_md5) as md5:
+            files = gather_files(self.directory, ["**/*.csv", "output/*.csv"], ["nested/*/*"], prefix="p")
+        self.assertEqual({f[1] for f in files}, {"p/output/result.csv", "p/outputs2/x.csv"})
+        for file in files:
+            with open(file[0], "rb") as f:
+                content = f.read()
+            self.assertEqual(file[2], uuid.UUID(hashlib.md5(content).hexdigest()))
+            self.assertEqual(file[3], len(content))
+        # each file matching several patterns is hashed once, and the excluded file is not hashed
+        self.assertEqual(md5.call_count, 2)
+
+    def test_checksum_cache_shared_through_links(self):
+        shared = os.path.join(self.directory, "output", "result.csv")
+        link = os.path.join(self.directory, "link.csv")
+        os.symlink(shared, link)
+        cache = ChecksumCache()
+        with mock.patch('idmtools.utils.hashing.calculate_md5', return_value=hashlib.md5(b"x").hexdigest()) as md5:
+            files = list(hash_files([(shared, "a/result.csv"), (link, "b/result.csv")], checksum_cache=cache))
+        self.assertEqual(md5.call_count, 1)
+        self.assertEqual({f[1] for f in files}, {"a/result.csv", "b/result.csv"})
+        self.assertEqual(len({f[2] for f in files}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import shutil
+import tempfile
+import unittest
+import uuid
+from dataclasses import fields
+from types import SimpleNamespace
+import allure
+from idmtools.assets import Asset
+from idmtools.entities.simulation import Simulation
+from idmtools_platform_comps.comps_platform import COMPSPlatform
+from idmtools_platform_comps.comps_operations.simulation_operations import CompsPlatformSimulationOperations
+from idmtools_platform_comps.utils.checksum_cache import AssetChecksumCache
+from idmtools_platform_comps.utils.transient_dedup import TransientAssetDeduplicator
+from idmtools_test.utils.test_task import TestTask
+
+
+class FakeCOMPSClient:
+    """Local stand-in for COMPS recording the uploaded payloads and the checksum references."""
+
+    def __init__(self):
+        self.asset_collections = []
+        self.uploaded = []
+
+    def save_asset_collection(self, ac):
+        ac._id = uuid.uuid4()
+        self.asset_collections.append(ac)
+
+
+class FakeCOMPSSimulation:
+    def __init__(self, client):
+        self.client = client
+        self.files = []
+
+    def add_file(self, simulationfile, data=None):
+        if data is not None:
+            self.client.uploaded.append(data)
+        self.files.append((simulationfile, data))
+
+
+@allure.story("COMPS")
+@allure.suite("idmtools_platform_comps")
+class TestTransientAssetDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeCOMPSClient()
+        self.dedup = TransientAssetDeduplicator(save_asset_collection=self.client.save_asset_collection)
+        platform = SimpleNamespace(dedup_transient_assets=True, _transient_dedup=self.dedup)
+        self.ops = CompsPlatformSimulationOperations(platform=platform)
+        self.config = json.dumps(dict(parameters=dict(x="y" * 4000))).encode()
+
+    def make_simulation(self, i):
+        sim = Simulation(task=TestTask())
+        sim.assets.add_asset(Asset(filename="config.json", content=self.config))
+        sim.assets.add_asset(Asset(filename="campaign.json", content=json.dumps(dict(i=i, pad="z" * 2000)).encode()))
+        sim.assets.add_asset(Asset(filename="small.txt", content=b"tiny"))
+        return sim
+
+    def send_batch(self, count, start=0):
+        batch = self.ops.start_transient_batch()
+        comps_sims = []
+        for i in range(start, start + count):
+            comps_sim = FakeCOMPSSimulation(self.client)
+            self.ops.send_assets(self.make_simulation(i), comps_sim, transient_batch=batch)
+            comps_sims.append(comps_sim)
+        report = batch.flush()
+        batch.commit()
+        return comps_sims, report
+
+    def test_repeated_payload_is_uploaded_once(self):
+        comps_sims, report = self.send_batch(10)
+        self.assertEqual(len(self.client.asset_collections), 1)
+        self.assertEqual(report.asset_collection_id, str(self.client.asset_collections[0].id))
+        self.assertEqual(report.simulations, 10)
+        self.assertEqual(report.files, 30)
+        # config.json is shared, campaign.json is unique per simulation, small.txt is too small to be referenced
+        self.assertEqual(report.unique_payloads, 12)
+        self.assertEqual(report.promoted, 1)
+        self.assertEqual(report.references, 10)
+        self.assertNotIn(self.config, self.client.uploaded)
+        self.assertEqual(report.bytes_uploaded, report.bytes_total - 10 * len(self.config) + len(self.config))
+        for comps_sim in comps_sims:
+            files = {f.file_name: (f, data) for f, data in comps_sim.files}
+            self.assertEqual(sorted(files), ["campaign.json", "config.json", "small.txt"])
+            config, data = files["config.json"]
+            self.assertIsNone(data)
+            self.assertEqual(config.md5_checksum, uuid.UUID(hashlib.md5(self.config).hexdigest()))
+            self.assertEqual(config.file_type, "input")
+            self.assertIsNotNone(files["campaign.json"][1])
+
+    def test_later_batches_reference_known_payloads(self):
+        self.send_batch(3)
+        # the campaign of simulation 1 was uploaded with the first batch
+        comps_sims, report = self.send_batch(3, start=1)
+        self.assertEqual(len(self.client.asset_collections), 1)
+        self.assertEqual(report.promoted, 0)
+        self.assertEqual(report.references, 3 + 2)
+        self.assertEqual(len(self.dedup.reports), 2)
+        summary = self.dedup.summary()
+        self.assertEqual(summary.simulations, 6)
+        self.assertEqual(summary.references, 3 + 5)
+        self.assertGreater(summary.bytes_saved, 0)
+        self.assertIn("6 simulations", str(summary))
+
+    def test_known_payloads_are_shared_with_the_checksum_cache(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        cache = AssetChecksumCache(namespace="https://comps.example", directory=tmp)
+        self.addCleanup(cache.cache.close)
+        self.dedup.checksum_cache = cache
+        # the config was uploaded with an asset collection
+        cache.add_known([hashlib.md5(self.config).hexdigest()])
+        comps_sims, report = self.send_batch(3)
+        self.assertEqual(self.client.asset_collections, [])
+        self.assertEqual(report.references, 3)
+        self.assertNotIn(self.config, self.client.uploaded)
+
+        # the payloads uploaded with the simulations are known to the next session
+        self.dedup.known_checksums.clear()
+        campaign = next(data for f, data in comps_sims[0].files if f.file_name == "campaign.json")
+        self.assertEqual(cache.unknown([hashlib.md5(campaign).hexdigest()]), set())
+        comps_sims, report = self.send_batch(1)
+        self.assertEqual(report.references, 2)
+
+    def test_disabled(self):
+        # opt-in
+        self.assertFalse(next(f.default for f in fields(COMPSPlatform) if f.name == "dedup_transient_assets"))
+        self.ops.platform.dedup_transient_assets = False
+        self.assertIsNone(self.ops.start_transient_batch())
+        comps_sim = FakeCOMPSSimulation(self.client)
+        self.ops.send_assets(self.make_simulation(0), comps_sim, add_metadata=True)
+        self.assertEqual([f.file_name for f, _ in comps_sim.files],
+                         ["config.json", "campaign.json", "small.txt", "idmtools_metadata.json"])
+        self.assertTrue(all(data is not None for _, data in comps_sim.files))
+        self.assertEqual(self.client.asset_collections, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,7 +13,7 @@ from rich.console import Console
 from rich.table import Table
 from idmtools.core import ItemType
 from idmtools_platform_container.container_operations.docker_operations import list_running_jobs, find_running_job, \
-    is_docker_installed, is_docker_daemon_running, get_working_containers, get_containers, get_container
+    is_docker_installed, is_docker_daemon_running, get_working_containers, get_containers, get_container, kill_job
 from idmtools_platform_container.utils.status import summarize_status_files, get_simulation_status
 from idmtools_platform_container.utils.general import convert_byte_size, format_timestamp
 from idmtools_platform_file.tools.job_history import JobHistory
@@ -123,12 +123,7 @@ def cancel(item_id: Union[int, str], container_id: str = None):
     console = Console()
     job = find_running_job(item_id, container_id)
     if job:
-        if job.item_type == ItemType.EXPERIMENT:
-            kill_cmd = f"docker exec {job.container_id} pkill -TERM -g {job.job_id}"
-        else:
-            kill_cmd = f"docker exec {job.container_id} kill -9 {job.job_id}"
-
-        result = subprocess.run(kill_cmd, shell=True, stderr=subprocess.PIPE, text=True)  # default: check=False
+        result = kill_job(job)
         if result.returncode == 0:
             console.print(f"Successfully killed {job.item_type.name} {job.job_id}")
         else:
@@ -144,7 +139,9 @@ def cancel(item_id: Union[int, str], container_id: str = None):
 @click.option('-c', '--container_id', help="Container Id")
 @click.option('-l', '--limit', default=10, help="Max number of simulations to show")
 @click.option('--verbose/--no-verbose', default=False, help="Display with working directory or not")
-def status(item_id: Union[int, str], container_id: str = None, limit: int = 10, verbose: bool = False):
+@click.option('-w', '--watch', default=None, type=float, help="Refresh every WATCH seconds until all simulations are done")
+def status(item_id: Union[int, str], container_id: str = None, limit: int = 10, verbose: bool = False,
+           watch: float = None):
     """
     Check Experiment/Simulation status.
     Args:
@@ -152,6 +149,7 @@ def status(item_id: Union[int, str], container_id: str = None, limit: int = 10,
         container_id: Container ID
         limit: number of simulations to display
         verbose: display simulation details or not
+        watch: refresh interval in seconds
     Returns:
         None
     """
@@ -165,7 +163,7 @@ def status(item_id: Union[int, str], container_id: str = None, limit: int = 10,
             console.print(f"{item_type.name} {item_id} is {st}.")
         elif item_type == ItemType.EXPERIMENT:
             exp_dir = item_dir[0]
-            summarize_status_files(exp_dir, max_display=limit, verbose=verbose)
+            summarize_status_files(exp_dir, max_display=limit, verbose=verbose, watch=watch)
         else:
             user_logger.warning(f"{item_type.name} {item_id} status id not defined.")
     else:
@@ -175,7 +173,7 @@ def status(item_id: Union[int, str], container_id: str = None, limit: int = 10,
             if job.item_type == ItemType.EXPERIMENT:
                 job_cache = JobHistory.get_job(job.item_id)
                 exp_dir = job_cache['EXPERIMENT_DIR']
-                summarize_status_files(exp_dir, max_display=limit, verbose=verbose)
+                summarize_status_files(exp_dir, max_display=limit, verbose=verbose, watch=watch)
             elif job.item_type == ItemType.SIMULATION:
                 console.print(f"Simulation {job.item_id} is RUNNING.")
         else:
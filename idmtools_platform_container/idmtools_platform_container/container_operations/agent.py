@@ -0,0 +1,99 @@
+"""
+Here we implement the agent running inside the container.
+
+The agent is a long-lived process started once per container with ``docker exec -i``. It reads one JSON request per
+line on stdin and writes one JSON response per line on stdout, so the platform can submit, list and cancel jobs
+without starting a new exec session for each operation.
+
+This module only uses the standard library: its source is sent to the python interpreter of the container. The
+source is part of the command line of the agent, so it must not contain the job markers that ``ps`` queries look for.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+
+# Processes submitted by the agent, reaped on each request
+_children = {}
+
+
+def ping() -> dict:
+    """Identify the agent."""
+    return dict(pid=os.getpid())
+
+
+def is_dir(path: str) -> bool:
+    """Check a directory exists."""
+    return os.path.isdir(path)
+
+
+def convert(directory: str, files: list) -> list:
+    """Remove the carriage returns of scripts and return the files converted."""
+    converted = []
+    for name in files:
+        path = os.path.join(directory, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, 'rb') as f:
+            content = f.read()
+        if b'\r' in content:
+            with open(path, 'wb') as f:
+                f.write(content.replace(b'\r', b''))
+        converted.append(name)
+    return converted
+
+
+def submit(directory: str, name: str, script: str) -> int:
+    """Run a script in the background of its own process group, named by *name*, and return its pid."""
+    process = subprocess.Popen(['bash', '-c', f'exec -a "{name}" bash {script}'], cwd=directory,
+                               stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+    _children[process.pid] = process
+    return process.pid
+
+
+def run(command: str) -> dict:
+    """Run a shell command and return its return code and outputs."""
+    result = subprocess.run(['bash', '-c', command], capture_output=True, text=True)
+    return dict(returncode=result.returncode, stdout=result.stdout, stderr=result.stderr)
+
+
+OPERATIONS = dict(ping=ping, is_dir=is_dir, convert=convert, submit=submit, run=run)
+
+
+def handle(request: dict) -> dict:
+    """Run the operation of a request and build its response."""
+    for pid, process in list(_children.items()):
+        if process.poll() is not None:
+            del _children[pid]
+    response = dict(id=request.get('id'))
+    try:
+        operation = OPERATIONS[request['op']]
+        response['result'] = operation(**request.get('params', {}))
+    except Exception as ex:
+        response['error'] = f"{type(ex).__name__}: {ex}"
+    return response
+
+
+def main(stdin=None, stdout=None):
+    """Serve requests until stdin is closed."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    # Jobs keep running after the agent exits
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            response = handle(json.loads(line))
+        except ValueError as ex:
+            response = dict(id=None, error=f"Invalid request: {ex}")
+        stdout.write(json.dumps(response) + '\n')
+        stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Here we implement the client of the agent running inside a container.
+
+A ContainerAgent starts the agent once per container with ``docker exec -i`` and keeps it alive, so each operation costs
+a JSON message on a pipe instead of a new ``docker`` CLI process and exec session.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import atexit
+import inspect
+import json
+import queue
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from idmtools_platform_container.container_operations import agent
+from logging import getLogger, DEBUG
+
+logger = getLogger(__name__)
+
+# Agents started by the platform, by container id
+_AGENTS: Dict[str, 'ContainerAgent'] = {}
+_AGENTS_LOCK = threading.Lock()
+
+
+class ContainerAgentError(Exception):
+    """Error of the agent or of an operation run by the agent."""
+    pass
+
+
+class ContainerAgentUnavailable(ContainerAgentError):
+    """The agent could not be reached, so the request was not sent."""
+    pass
+
+
+@dataclass(repr=False)
+class ContainerAgent:
+    """
+    Client of the agent of a container.
+    """
+    container_id: str = field(default=None, metadata=dict(help="Container Id"))
+    command: List[str] = field(default=None, metadata=dict(help="Command starting the agent, docker exec by default"))
+    timeout: float = field(default=30, metadata=dict(help="Seconds to wait for each response"))
+
+    def __post_init__(self):
+        if self.command is None:
+            self.command = ["docker", "exec", "-i", self.container_id, "python3", "-u", "-c",
+                            inspect.getsource(agent)]
+        self._process = None
+        self._responses = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        """True if the agent process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> 'ContainerAgent':
+        """
+        Start the agent and check it answers.
+        Returns:
+            The agent
+        Raises:
+            ContainerAgentError: if the agent does not start
+        """
+        try:
+            self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        except OSError as ex:
+            raise ContainerAgentUnavailable(f"Failed to start the agent of container {self.container_id}: {ex}")
+        threading.Thread(target=self._read, args=(self._process,), daemon=True).start()
+        pid = self.call("ping")["pid"]
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"Agent {pid} started in container {self.container_id}")
+        return self
+
+    def _read(self, process: subprocess.Popen):
+        for line in process.stdout:
+            self._responses.put(line)
+        self._responses.put(None)
+
+    def call(self, op: str, **params) -> Any:
+        """
+        Run an operation in the container.
+        Args:
+            op: operation: ping, is_dir, convert, submit or run
+            params: parameters of the operation
+        Returns:
+            Result of the operation
+        Raises:
+            ContainerAgentUnavailable: if the agent is not running, the operation was not sent
+            ContainerAgentError: if the operation failed, or the agent did not answer after the operation was sent
+        """
+        with self._lock:
+            if not self.alive:
+                raise ContainerAgentUnavailable(f"The agent of container {self.container_id} is not running")
+            self._next_id += 1
+            try:
+                self._process.stdin.write(json.dumps(dict(id=self._next_id, op=op, params=params)) + "\n")
+                self._process.stdin.flush()
+            except OSError as ex:
+                # The pipe is broken: the agent is gone and cannot run the operation
+                self._process.kill()
+                self.close()
+                raise ContainerAgentUnavailable(f"The agent of container {self.container_id} is not running: {ex!r}")
+            try:
+                line = self._responses.get(timeout=self.timeout)
+            except queue.Empty as ex:
+                self._process.kill()
+                self.close()
+                raise ContainerAgentError(f"The agent of container {self.container_id} did not answer: {ex!r}")
+            if line is None:
+                self.close()
+                raise ContainerAgentError(f"The agent of container {self.container_id} exited")
+            response = json.loads(line)
+        if "error" in response:
+            raise ContainerAgentError(response["error"])
+        return response["result"]
+
+    def close(self):
+        """
+        Stop the agent. The jobs it submitted keep running.
+        Returns:
+            None
+        """
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+
+
+def get_agent(container_id: str, start: bool = True, command: List[str] = None) -> Optional[ContainerAgent]:
+    """
+    Get the running agent of a container.
+    Args:
+        container_id: Container ID
+        start: start the agent if it is not running
+        command: command starting the agent, docker exec by default
+    Returns:
+        The agent, None if it is not running and could not be started
+    """
+    with _AGENTS_LOCK:
+        agent_client = _AGENTS.get(container_id)
+        if agent_client is not None and agent_client.alive:
+            return agent_client
+        _AGENTS.pop(container_id, None)
+        if not start:
+            return None
+        try:
+            agent_client = ContainerAgent(container_id=container_id, command=command).start()
+        except ContainerAgentError as ex:
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f"Agent unavailable for container {container_id}, use docker exec: {ex}")
+            return None
+        _AGENTS[container_id] = agent_client
+        return agent_client
+
+
+@atexit.register
+def close_agents():
+    """
+    Stop all agents.
+    Returns:
+        None
+    """
+    with _AGENTS_LOCK:
+        for agent_client in _AGENTS.values():
+            agent_client.close()
+        _AGENTS.clear()
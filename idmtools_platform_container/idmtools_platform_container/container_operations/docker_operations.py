@@ -9,6 +9,7 @@ import subprocess
 from dataclasses import dataclass, field
 from typing import List, Dict, NoReturn, Any, Union
 from idmtools.core import ItemType
+from idmtools_platform_container.container_operations.container_agent import get_agent, ContainerAgentError
 from idmtools_platform_container.utils.general import normalize_path, parse_iso8601
 from idmtools_platform_file.tools.job_history import JobHistory
 from docker.models.containers import Container
@@ -75,10 +76,8 @@ def validate_container_running(platform, **kwargs) -> str:
             container_id = container_running[0].short_id
             container = get_container(container_id)
             if sys_platform.system() not in ["Windows"]:
-                command = f"bash -c '[ \"$(ls -lart {platform.data_mount} | wc -l)\" -ge 3 ] && echo exists || echo not_exists'"
-                result = container.exec_run(command)
-                output = result.output.decode().strip()
-                if output == "not_exists":
+                # Starting the agent checks the directory, then serves the operations of the run
+                if not is_container_directory(container, platform.data_mount, start_agent=platform.use_agent):
                     stop_container(container_id, remove=True)
                     if logger.isEnabledFor(DEBUG):
                         logger.debug(f"Existing container {container_id} is not usable")
@@ -106,6 +105,49 @@ def validate_container_running(platform, **kwargs) -> str:
     return container_id
 
 
+def is_container_directory(container: Container, path: str, start_agent: bool = False) -> bool:
+    """
+    Check a directory exists in a container, through the agent of the container when it is running.
+    Args:
+        container: container object
+        path: directory in the container
+        start_agent: start the agent of the container if it is not running
+    Returns:
+        True/False
+    """
+    agent = get_agent(container.short_id, start=start_agent)
+    if agent is not None:
+        try:
+            return agent.call("is_dir", path=path)
+        except ContainerAgentError as ex:
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f"Agent failed to check {path}, use docker exec: {ex}")
+    command = f"bash -c '[ \"$(ls -lart {path} | wc -l)\" -ge 3 ] && echo exists || echo not_exists'"
+    result = container.exec_run(command)
+    return result.output.decode().strip() != "not_exists"
+
+
+def exec_command(container_id: str, command: str) -> subprocess.CompletedProcess:
+    """
+    Run a bash command in a container, through the agent of the container when it is running.
+    Args:
+        container_id: Container ID
+        command: bash command
+    Returns:
+        completed process with the return code and the outputs of the command
+    """
+    agent = get_agent(container_id, start=False)
+    if agent is not None:
+        try:
+            result = agent.call("run", command=command)
+            return subprocess.CompletedProcess(command, result['returncode'], result['stdout'], result['stderr'])
+        except ContainerAgentError as ex:
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f"Agent failed to run {command}, use docker exec: {ex}")
+    return subprocess.run(f'docker exec {container_id} bash -c "({command})"', shell=True, check=False,
+                          capture_output=True, text=True)
+
+
 #############################
 # Check containers
 #############################
@@ -504,8 +546,7 @@ def list_running_jobs(container_id: str, limit: int = None) -> List[Job]:
     Returns:
         list of running jobs
     """
-    command = f'docker exec {container_id} bash -c "({PS_QUERY})"'
-    result = subprocess.run(command, shell=True, check=False, capture_output=True, text=True)
+    result = exec_command(container_id, PS_QUERY)
 
     running_jobs = []
     if result.returncode == 0:
@@ -547,6 +588,21 @@ def list_running_jobs(container_id: str, limit: int = None) -> List[Job]:
     return running_jobs[:limit]
 
 
+def kill_job(job: Job) -> subprocess.CompletedProcess:
+    """
+    Kill a running job: the process group of an experiment, or the process of a simulation.
+    Args:
+        job: running Job
+    Returns:
+        completed process of the kill command
+    """
+    if job.item_type == ItemType.EXPERIMENT:
+        command = f"pkill -TERM -g {job.job_id}"
+    else:
+        command = f"kill -9 {job.job_id}"
+    return exec_command(job.container_id, command)
+
+
 def find_running_job(item_id: Union[int, str], container_id: str = None) -> Job:
     """
     Check item running on container.
@@ -9,7 +9,7 @@ import platform
 import subprocess
 from uuid import uuid4
 from docker.models.containers import Container
-from typing import Union, NoReturn, List, Dict
+from typing import Union, NoReturn, List, Dict, Optional
 from dataclasses import dataclass, field
 from idmtools.core.interfaces.ientity import IEntity
 from idmtools.entities import Suite
@@ -18,6 +18,8 @@ from idmtools.entities.simulation import Simulation
 from idmtools_platform_container.container_operations.docker_operations import validate_container_running, \
     find_container_by_image, compare_mounts, find_running_job, get_container, CONTAINER_STATUS, restart_container, \
     is_docker_installed, is_docker_daemon_running
+from idmtools_platform_container.container_operations.container_agent import ContainerAgent, ContainerAgentError, \
+    ContainerAgentUnavailable, get_agent
 from idmtools_platform_container.platform_operations.simulation_operations import ContainerPlatformSimulationOperations
 from idmtools_platform_container.utils.general import map_container_path
 from idmtools_platform_file.tools.job_history import JobHistory
@@ -46,6 +48,8 @@ class ContainerPlatform(FilePlatform):
     include_stopped: bool = field(default=False, metadata=dict(help="Include stopped containers"))
     debug: bool = field(default=False, metadata=dict(help="Debug mode"))
     container_id: str = field(default=None, metadata=dict(help="Container Id"))
+    use_agent: bool = field(default=True, metadata=dict(
+        help="Run the container operations through a long-lived agent process in the container"))
 
     def __post_init__(self):
         super().__post_init__()
@@ -78,6 +82,10 @@ class ContainerPlatform(FilePlatform):
         Returns:
             Container short id
         """
+        # A running agent means the container was validated and is still running
+        if self.use_agent and get_agent(container_id, start=False) is not None:
+            return container_id
+
         # Check if the container exists
         container = get_container(container_id)
         if not container:
@@ -170,6 +178,16 @@ class ContainerPlatform(FilePlatform):
             raise NotImplementedError(
                 f"Submit job is not implemented for {item.__class__.__name__} on ContainerPlatform.")
 
+    def container_agent(self) -> Optional[ContainerAgent]:
+        """
+        Get the agent of the container, starting it if needed.
+        Returns:
+            The agent, None if the agent is disabled or unavailable
+        """
+        if not self.use_agent or self.container_id is None:
+            return None
+        return get_agent(self.container_id)
+
     def check_container(self, **kwargs) -> str:
         """
         Check the container status.
@@ -224,6 +242,15 @@ class ContainerPlatform(FilePlatform):
         """
         directory = self.get_container_directory(experiment)
 
+        agent = self.container_agent()
+        if agent is not None:
+            try:
+                agent.call("convert", directory=directory, files=["batch.sh", "run_simulation.sh"])
+                return
+            except ContainerAgentError as ex:
+                if logger.isEnabledFor(DEBUG):
+                    logger.debug(f"Agent failed to convert scripts, use docker exec: {ex}")
+
         try:
             commands = [
                 f"cd {directory}",
@@ -253,6 +280,26 @@ class ContainerPlatform(FilePlatform):
             logger.debug(f"Directory: {directory}")
             logger.debug(f"container_id: {self.container_id}")
 
+        agent = self.container_agent()
+        if agent is not None:
+            try:
+                pid = agent.call("submit", directory=directory, name=f"EXPERIMENT:{experiment.id}", script="batch.sh")
+                if logger.isEnabledFor(DEBUG):
+                    logger.debug(f"Submit experiment {experiment.id} successfully with pid {pid}")
+                return
+            except ContainerAgentUnavailable as ex:
+                if logger.isEnabledFor(DEBUG):
+                    logger.debug(f"Agent unavailable to submit experiment {experiment.id}, use docker exec: {ex}")
+            except ContainerAgentError as ex:
+                # The agent received the request and may have started the experiment: do not launch it twice
+                job = find_running_job(experiment.id, self.container_id)
+                if job is None:
+                    user_logger.error(f"Submit experiment {experiment.id} encounter Error: {ex}")
+                    exit(-1)
+                if logger.isEnabledFor(DEBUG):
+                    logger.debug(f"Submit experiment {experiment.id} successfully with pid {job.job_id}")
+                return
+
         try:
             # Commands to change directory and run the script
             command = f'exec -a "EXPERIMENT:{experiment.id}" bash batch.sh &'
@@ -4,13 +4,12 @@ Here we implement the ContainerPlatform experiment operations.
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import shutil
-import subprocess
 from dataclasses import dataclass
-from typing import NoReturn, Dict, TYPE_CHECKING
+from typing import NoReturn, Dict, TYPE_CHECKING, Any, Iterator, Tuple
 from idmtools.core import ItemType
 from idmtools.entities.experiment import Experiment
 from idmtools_platform_file.platform_operations.experiment_operations import FilePlatformExperimentOperations
-from idmtools_platform_container.container_operations.docker_operations import find_running_job
+from idmtools_platform_container.container_operations.docker_operations import find_running_job, kill_job
 from logging import getLogger
 
 logger = getLogger(__name__)
@@ -69,8 +68,7 @@ class ContainerPlatformExperimentOperations(FilePlatformExperimentOperations):
         if job:
             logger.debug(
                 f"{job.item_type.name} {experiment_id} is running on Container {job.container_id}.")
-            kill_cmd = f"docker exec {job.container_id} pkill -TERM -g {job.job_id}"
-            result = subprocess.run(kill_cmd, shell=True, stderr=subprocess.PIPE, text=True)
+            result = kill_job(job)
             if result.returncode == 0:
                 logger.debug(f"Successfully killed {job.item_type.name} {experiment_id}")
             else:
@@ -110,3 +108,18 @@ class ContainerPlatformExperimentOperations(FilePlatformExperimentOperations):
         exp = self.platform.get_item(experiment_id, ItemType.EXPERIMENT, raw=False)
         sims = exp.simulations
         return {sim.id: str(self.platform.get_container_directory(sim)) for sim in sims}
+
+    def get_sim_directory_records(self, experiment_id: str, include_tags: bool = True) \
+            -> Iterator[Tuple[str, Dict[str, Any], str]]:
+        """
+        Gather the id, tags, and container directory of each simulation in a single pass over the experiment.
+        Args:
+            experiment_id: experiment id
+            include_tags: Include the simulation tags
+
+        Returns:
+            Iterator of (simulation id, tags, simulation directory in the container)
+        """
+        exp = self.platform.get_item(experiment_id, ItemType.EXPERIMENT, raw=False)
+        for sim in exp.simulations:
+            yield sim.id, sim.tags if include_tags else {}, str(self.platform.get_container_directory(sim))
@@ -3,12 +3,11 @@ Here we implement the ContainerPlatform simulation operations.
 
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
-import subprocess
 from dataclasses import dataclass
 from typing import NoReturn, Dict
 from idmtools.core import ItemType
 from idmtools_platform_file.platform_operations.simulation_operations import FilePlatformSimulationOperations
-from idmtools_platform_container.container_operations.docker_operations import find_running_job
+from idmtools_platform_container.container_operations.docker_operations import find_running_job, kill_job
 from logging import getLogger
 
 logger = getLogger(__name__)
@@ -36,8 +35,7 @@ class ContainerPlatformSimulationOperations(FilePlatformSimulationOperations):
                 pass
             user_logger.debug(
                 f"{job.item_type.name} {sim_id} is running on Container {job.container_id}.")
-            kill_cmd = f"docker exec {job.container_id} kill -9 {job.job_id}"
-            result = subprocess.run(kill_cmd, shell=True, stderr=subprocess.PIPE, text=True)
+            result = kill_job(job)
             if result.returncode == 0:
                 print(f"Successfully killed {job.item_type.name} {sim_id}")
             else:
@@ -8,6 +8,7 @@ from rich.console import Console
 from typing import List, NoReturn
 from logging import getLogger
 from idmtools_platform_container.utils.general import normalize_path
+from idmtools_platform_file.tools.status_report.status_snapshot import StatusSnapshot, watch_status
 
 logger = getLogger(__name__)
 user_logger = getLogger('user')
@@ -62,13 +63,34 @@ def append_with_limit(lst: List, item: str, limit: int) -> List:
     return lst
 
 
-def summarize_status_files(exp_dir: str, max_display: int = 10, verbose: bool = False) -> NoReturn:
+def summarize_status_files(exp_dir: str, max_display: int = 10, verbose: bool = False,
+                           watch: float = None) -> NoReturn:
     """
     Summarize the status of simulations.
     Args:
         exp_dir: Experiment Directory Path
         max_display: the maximum number of items to display
         verbose: whether to display the simulation details
+        watch: refresh interval in seconds; keep refreshing until all simulations are done. None to report once
+    Returns:
+        None
+    """
+    if watch:
+        watch_status(exp_dir, lambda snapshot: print_status_summary(exp_dir, snapshot, max_display, verbose),
+                     interval=watch)
+    else:
+        print_status_summary(exp_dir, StatusSnapshot(exp_dir).refresh(), max_display, verbose)
+
+
+def print_status_summary(exp_dir: str, snapshot: StatusSnapshot, max_display: int = 10,
+                         verbose: bool = False) -> NoReturn:
+    """
+    Print the status summary of an experiment status snapshot.
+    Args:
+        exp_dir: Experiment Directory Path
+        snapshot: refreshed status snapshot
+        max_display: the maximum number of items to display
+        verbose: whether to display the simulation details
     Returns:
         None
     """
@@ -86,34 +108,16 @@ def summarize_status_files(exp_dir: str, max_display: int = 10, verbose: bool =
         'PENDING': 0
     }
 
-    total_simulation_count = 0
-
-    # Traverse through all sub-folders in the given folder path
-    for sub_folder in os.listdir(exp_dir):
-        sub_folder_path = os.path.join(exp_dir, sub_folder)
-
-        if os.path.isdir(sub_folder_path):
-            # Check if the sub-folder contains metadata.json
-            if not os.path.exists(os.path.join(sub_folder_path, 'metadata.json')):
-                continue
-            total_simulation_count += 1
-            status_file_path = os.path.join(sub_folder_path, FILE_NAME)
-
-            if os.path.isfile(status_file_path):
-                with open(status_file_path, 'r') as file:
-                    content = file.read().strip()
-
-                    status = status_mapping.get(content, 'PENDING')
-                    summary[status] = append_with_limit(summary[status], sub_folder, max_display)
-                    counter[status] += 1
-            else:
-                summary['PENDING'] = append_with_limit(summary['PENDING'], sub_folder, max_display)
-                counter['PENDING'] += 1
+    directories = snapshot.directories
+    for sim_id, content in snapshot.statuses.items():
+        status = status_mapping.get(content, 'PENDING')
+        summary[status] = append_with_limit(summary[status], directories[sim_id].name, max_display)
+        counter[status] += 1
 
     # Print out the results
     console = Console()
     console.print(f'\n[bold][cyan]Experiment Directory[/][/]: \n{normalize_path(exp_dir)}\n')
-    console.print(f"[bold][cyan]Simulation Count[/][/]: [yellow]{total_simulation_count}[/]\n")
+    console.print(f"[bold][cyan]Simulation Count[/][/]: [yellow]{len(snapshot)}[/]\n")
 
     for status in ['SUCCEEDED', 'FAILED', 'RUNNING', 'PENDING']:
         # console.print(f"{status} ({counter[status]})")
@@ -0,0 +1,162 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+import allure
+import pytest
+from idmtools.core import ItemType
+from idmtools_platform_container.container_operations import agent
+from idmtools_platform_container.container_operations.container_agent import ContainerAgent, ContainerAgentError, \
+    ContainerAgentUnavailable, get_agent, close_agents
+from idmtools_platform_container.container_operations.docker_operations import list_running_jobs, find_running_job, \
+    kill_job, is_container_directory, Job
+from idmtools_platform_container.container_platform import ContainerPlatform
+
+# The agent runs as a local process standing in for the container
+LOCAL_AGENT = [sys.executable, "-u", agent.__file__]
+
+
+@pytest.mark.serial
+@allure.story("Container")
+@allure.suite("idmtools_platform_container")
+@unittest.skipIf(sys.platform == "win32", "The agent runs on Linux")
+class TestContainerAgent(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.agent = get_agent("local", command=LOCAL_AGENT)
+        self.addCleanup(close_agents)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write_batch(self, content: str):
+        with open(os.path.join(self.directory, "batch.sh"), "w", newline="") as f:
+            f.write(content)
+
+    def test_operations(self):
+        self.assertIs(get_agent("local", start=False), self.agent)
+        self.assertNotEqual(self.agent.call("ping")["pid"], os.getpid())
+        self.assertTrue(self.agent.call("is_dir", path=self.directory))
+        self.assertFalse(self.agent.call("is_dir", path=os.path.join(self.directory, "missing")))
+        self.assertTrue(is_container_directory(MagicMock(short_id="local"), self.directory))
+
+        self.write_batch("echo one\r\necho two\r\n")
+        self.assertEqual(self.agent.call("convert", directory=self.directory, files=["batch.sh", "missing.sh"]),
+                         ["batch.sh"])
+        with open(os.path.join(self.directory, "batch.sh"), "rb") as f:
+            self.assertEqual(f.read(), b"echo one\necho two\n")
+
+        with self.assertRaisesRegex(ContainerAgentError, "KeyError"):
+            self.agent.call("unknown")
+        # the agent keeps serving after a failed operation
+        self.assertEqual(self.agent.call("run", command="echo $((1 + 2))")["stdout"], "3\n")
+
+    def test_submit_list_and_cancel(self):
+        self.write_batch("sleep 30 &\nwait\n")
+        pid = self.agent.call("submit", directory=self.directory, name="EXPERIMENT:agent_test", script="batch.sh")
+        self.addCleanup(self.agent.call, "run", command=f"kill -9 -{pid} 2>/dev/null")
+        time.sleep(0.2)
+
+        jobs = list_running_jobs("local")
+        job = find_running_job("agent_test", "local")
+        self.assertIn(job, jobs)
+        self.assertEqual((job.item_type, job.job_id, job.group_pid), (ItemType.EXPERIMENT, pid, pid))
+
+        self.assertEqual(kill_job(job).returncode, 0)
+        for _ in range(50):
+            if find_running_job("agent_test", "local") is None:
+                break
+            time.sleep(0.1)
+        self.assertIsNone(find_running_job("agent_test", "local"))
+
+    def test_jobs_survive_the_agent(self):
+        self.write_batch("sleep 30\n")
+        pid = self.agent.call("submit", directory=self.directory, name="EXPERIMENT:agent_survivor", script="batch.sh")
+        self.addCleanup(os.killpg, pid, 9)
+        self.agent.close()
+        self.assertFalse(self.agent.alive)
+        with self.assertRaises(ContainerAgentUnavailable):
+            self.agent.call("ping")
+        # a new agent finds the job submitted by the previous one
+        get_agent("local", command=LOCAL_AGENT)
+        self.assertEqual(find_running_job("agent_survivor", "local").job_id, pid)
+
+    def test_unavailable_agent(self):
+        self.assertIsNone(get_agent("broken", command=[sys.executable, "-c", "pass"]))
+        with self.assertRaisesRegex(ContainerAgentError, "did not answer"):
+            ContainerAgent(container_id="silent", command=[sys.executable, "-c", "import time; time.sleep(5)"],
+                           timeout=0.5).start()
+        with self.assertRaises(ContainerAgentUnavailable):
+            ContainerAgent(container_id="missing", command=[os.path.join(self.directory, "missing")]).start()
+        # an agent which stops answering after the request was sent is not reported as unavailable
+        agent_client = ContainerAgent(container_id="slow", command=LOCAL_AGENT, timeout=0.5).start()
+        self.addCleanup(agent_client.close)
+        with self.assertRaisesRegex(ContainerAgentError, "did not answer") as context:
+            agent_client.call("run", command="sleep 5")
+        self.assertNotIsInstance(context.exception, ContainerAgentUnavailable)
+
+    @patch.object(ContainerPlatform, '__post_init__', lambda x: None)
+    @patch.object(ContainerPlatform, 'get_container_directory')
+    @patch('subprocess.Popen')
+    def test_platform_uses_agent(self, mock_popen, mock_get_container_directory):
+        mock_get_container_directory.return_value = self.directory
+        self.write_batch("echo done > done.txt\r\n")
+        platform = ContainerPlatform(job_directory=self.directory, container_id="local")
+        experiment = MagicMock(id="platform_agent")
+        platform.convert_scripts_to_linux(experiment)
+        platform.submit_experiment(experiment)
+        # no docker exec
+        mock_popen.assert_not_called()
+        for _ in range(50):
+            if os.path.exists(os.path.join(self.directory, "done.txt")):
+                break
+            time.sleep(0.1)
+        with open(os.path.join(self.directory, "done.txt")) as f:
+            self.assertEqual(f.read(), "done\n")
+
+        # the running agent stands for the validation of the container
+        with patch('idmtools_platform_container.container_platform.get_container', side_effect=AssertionError):
+            self.assertEqual(platform.validate_container("local"), "local")
+
+        platform.use_agent = False
+        self.assertIsNone(platform.container_agent())
+
+    @patch.object(ContainerPlatform, '__post_init__', lambda x: None)
+    @patch.object(ContainerPlatform, 'get_container_directory')
+    @patch.object(ContainerPlatform, 'container_agent')
+    @patch('idmtools_platform_container.container_platform.find_running_job')
+    @patch('subprocess.Popen')
+    def test_submit_is_not_repeated(self, mock_popen, mock_find_running_job, mock_container_agent,
+                                    mock_get_container_directory):
+        mock_get_container_directory.return_value = self.directory
+        platform = ContainerPlatform(job_directory=self.directory, container_id="local")
+        experiment = MagicMock(id="platform_agent")
+
+        # the request was not sent: submit with docker exec
+        mock_container_agent.return_value.call.side_effect = ContainerAgentUnavailable("not running")
+        platform.submit_experiment(experiment)
+        mock_popen.assert_called_once()
+        mock_find_running_job.assert_not_called()
+
+        # the agent timed out after the request was sent, but the experiment started
+        mock_popen.reset_mock()
+        mock_container_agent.return_value.call.side_effect = ContainerAgentError("did not answer")
+        mock_find_running_job.return_value = Job(item_id="platform_agent", item_type=ItemType.EXPERIMENT, job_id=12,
+                                                 group_pid=12, parent_pid=1, container_id="local", elapsed="00:01")
+        platform.submit_experiment(experiment)
+        mock_find_running_job.assert_called_once_with("platform_agent", "local")
+        mock_popen.assert_not_called()
+
+        # the experiment did not start
+        mock_find_running_job.return_value = None
+        with self.assertRaises(SystemExit):
+            platform.submit_experiment(experiment)
+        mock_popen.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,10 +4,10 @@ Utility functions to generate batch scripts.
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 from pathlib import Path
-from jinja2 import Template
 from typing import TYPE_CHECKING, Optional
 from idmtools.entities.experiment import Experiment
 from idmtools.entities.simulation import Simulation
+from idmtools.utils.templates import get_renderer
 
 if TYPE_CHECKING:
     from idmtools_platform_file.file_platform import FilePlatform
@@ -30,19 +30,16 @@ def generate_script(platform: 'FilePlatform', experiment: Experiment, max_job: i
         None
     """
     output_target = platform.get_directory(experiment).joinpath("batch.sh")
-    with open(output_target, "w") as tout:
-        with open(DEFAULT_TEMPLATE_FILE) as tin:
-            t = Template(tin.read())
-            tvars = dict(
-                platform=platform,
-                max_job=max_job if max_job is not None else platform.max_job,
-                run_sequence=run_sequence if run_sequence is not None else platform.run_sequence
-            )
-            if platform.modules:
-                tvars['modules'] = platform.modules
-            if platform.extra_packages:
-                tvars['packages'] = platform.extra_packages
-            tout.write(t.render(tvars))
+    tvars = dict(
+        platform=platform,
+        max_job=max_job if max_job is not None else platform.max_job,
+        run_sequence=run_sequence if run_sequence is not None else platform.run_sequence
+    )
+    if platform.modules:
+        tvars['modules'] = platform.modules
+    if platform.extra_packages:
+        tvars['packages'] = platform.extra_packages
+    get_renderer().render_to_file(DEFAULT_TEMPLATE_FILE, output_target, tvars)
 
     # Make executable
     platform.update_script_mode(output_target)
@@ -62,16 +59,13 @@ def generate_simulation_script(platform: 'FilePlatform', simulation: Simulation,
         None
     """
     sim_script = platform.get_directory(simulation).joinpath("_run.sh")
-    with open(sim_script, "w") as tout:
-        with open(DEFAULT_SIMULATION_TEMPLATE) as tin:
-            t = Template(tin.read())
-            tvars = dict(
-                platform=platform,
-                simulation=simulation,
-                retries=retries if retries else platform.retries,
-                ntasks=platform.ntasks
-            )
-            tout.write(t.render(tvars))
+    tvars = dict(
+        platform=platform,
+        simulation=simulation,
+        retries=retries if retries else platform.retries,
+        ntasks=platform.ntasks
+    )
+    get_renderer().render_to_file(DEFAULT_SIMULATION_TEMPLATE, sim_script, tvars)
 
     # Make executable
     platform.update_script_mode(sim_script)
@@ -34,9 +34,10 @@ def file(ctx: click.Context, job_directory):
 @click.option('--verbose/--no-verbose', default=True, help="Enable verbose output in results")
 @click.option('--display/--no-display', default=True, help="Display with working directory or not")
 @click.option('--display-count', default=20, help="Display Count")
+@click.option('--watch', default=None, type=float, help="Refresh every WATCH seconds until all simulations are done")
 @click.pass_context
 def status_report(ctx: click.Context, suite_id, exp_id, status_filter, sim_filter, verbose, display,
-                  display_count):
+                  display_count, watch):
     """
     Build status report.
     Args:
@@ -48,6 +49,7 @@ def status_report(ctx: click.Context, suite_id, exp_id, status_filter, sim_filte
         verbose: bool True/False
         display: bool True/False
         display_count: how many to display
+        watch: refresh interval in seconds
     Returns:
         None
     """
@@ -64,7 +66,8 @@ def status_report(ctx: click.Context, suite_id, exp_id, status_filter, sim_filte
     generate_status_report(platform=platform, scope=scope,
                            status_filter=status_filter if len(status_filter) > 0 else None,
                            sim_filter=sim_filter if len(sim_filter) > 0 else None,
-                           verbose=verbose, display=display, display_count=display_count)
+                           verbose=verbose, display=display, display_count=display_count,
+                           watch=watch)
 
 
 @file.command(help="Get the latest experiment info")
@@ -146,21 +149,23 @@ def get_status(ctx: click.Context, sim_id, exp_id):
 @file.command(help="Get simulation's status")
 @click.option('--exp-id', default=None, help="Idmtools Experiment id")
 @click.option('--display/--no-display', default=False, help="Display with working directory or not")
+@click.option('--watch', default=None, type=float, help="Refresh every WATCH seconds until all simulations are done")
 @click.pass_context
-def status(ctx: click.Context, exp_id, display):
+def status(ctx: click.Context, exp_id, display, watch):
     """
     Get job status.
     Args:
         ctx: click.Context
         exp_id: experiment id
         display: bool True/False
+        watch: refresh interval in seconds
     Returns:
         None
     """
     job_dir = ctx.obj['job_directory']
     platform = Platform('FILE', job_directory=job_dir)
 
-    check_status(platform=platform, exp_id=exp_id, display=display)
+    check_status(platform=platform, exp_id=exp_id, display=display, watch=watch)
 
 
 @file.command(help="Clear generated files/folders")
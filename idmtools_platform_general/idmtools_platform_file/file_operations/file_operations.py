@@ -254,7 +254,17 @@ class FileOperations(IOperations):
             EntityStatus
         """
         sim_dir = self.get_directory_by_id(sim_id, ItemType.SIMULATION)
+        return self.get_directory_status(sim_dir)
 
+    @staticmethod
+    def get_directory_status(sim_dir: Path) -> EntityStatus:
+        """
+        Retrieve simulation status from its directory.
+        Args:
+            sim_dir: simulation directory
+        Returns:
+            EntityStatus
+        """
         # Check process status
         job_status_path = sim_dir.joinpath('job_status.txt')
         if job_status_path.exists():
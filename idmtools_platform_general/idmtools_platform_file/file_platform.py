@@ -6,15 +6,17 @@ Copyright 2025, Gates Foundation. All rights reserved.
 import os
 from pathlib import Path
 from logging import getLogger
-from typing import Union, List
+from typing import Union, List, Dict
 from dataclasses import dataclass, field
 
 from idmtools import IdmConfigParser
+from idmtools.assets import AssetCollection
 from idmtools.core import ItemType, EntityStatus, TRUTHY_VALUES
 from idmtools.entities import Suite
 from idmtools.entities.experiment import Experiment
 from idmtools.entities.simulation import Simulation
 from idmtools.entities.iplatform import IPlatform
+from idmtools.utils.json import dumps_json
 from idmtools_platform_file.file_operations.file_operations import FileOperations
 from idmtools_platform_file.platform_operations.asset_collection_operations import FilePlatformAssetCollectionOperations
 from idmtools_platform_file.platform_operations.experiment_operations import FilePlatformExperimentOperations
@@ -256,6 +258,31 @@ class FilePlatform(IPlatform):
         """
         self._op_client.link_dir(target, link)
 
+    def plan_simulation_storage(self, simulation: Simulation, common_assets: AssetCollection) -> Dict[str, int]:
+        """
+        Estimate what the platform writes for a simulation, besides its transient assets.
+        Args:
+            simulation: idmtools Simulation prepared for creation
+            common_assets: common assets of the experiment
+        Returns:
+            Number of files, directories and bytes written for the simulation
+        """
+        # metadata, tags and batch files
+        files = 3
+        directories = 1
+        meta = self._metas.get(simulation)
+        size = len(dumps_json(meta, json_ready=True))
+        size += len(dumps_json({key: meta[key] for key in ("id", "item_type", "tags")}, indent=2, json_ready=True))
+        if self.sym_link:
+            # link to the Assets directory of the experiment
+            files += 1
+        else:
+            # copy of the Assets directory of the experiment
+            files += len(common_assets)
+            directories += 1
+            size += sum(asset.length for asset in common_assets)
+        return dict(files=files, directories=directories, bytes=size)
+
     def make_command_executable(self, simulation: Simulation) -> None:
         """
         Make simulation command executable.
@@ -6,11 +6,12 @@ Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 import shutil
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, List, Type, Dict, Optional, Any
+from typing import TYPE_CHECKING, List, Type, Dict, Optional, Any, Iterator, Tuple
 from idmtools.assets import Asset, AssetCollection
-from idmtools.core import ItemType
+from idmtools.core import EntityStatus, ItemType
 from idmtools.entities import Suite
 from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation_table import SimulationTable
 from idmtools.entities.iplatform_ops.iplatform_experiment_operations import IPlatformExperimentOperations
 from idmtools_platform_file.platform_operations.utils import FileExperiment, FileSimulation, FileSuite
 from logging import getLogger
@@ -85,7 +86,7 @@ class FilePlatformExperimentOperations(IPlatformExperimentOperations):
         sim_meta_list = self.platform._metas.get_children(experiment)
         for meta in sim_meta_list:
             file_sim = FileSimulation(meta)
-            file_sim.status = self.platform.get_simulation_status(file_sim.id)
+            file_sim.status = self._get_directory_status(meta['dir'])
             if raw:
                 sim_list.append(file_sim)
             else:
@@ -180,13 +181,14 @@ class FilePlatformExperimentOperations(IPlatformExperimentOperations):
         return assets
 
     def to_entity(self, file_exp: FileExperiment, parent: Optional[Suite] = None, children: bool = True,
-                  **kwargs) -> Experiment:
+                  simulation_table: bool = False, **kwargs) -> Experiment:
         """
         Convert a FileExperiment  to idmtools Experiment.
         Args:
             file_exp: simulation to convert
             parent: optional experiment object
             children: bool
+            simulation_table: load the simulations as a compact SimulationTable instead of Simulation objects
             kwargs:
         Returns:
             Experiment object
@@ -207,11 +209,88 @@ class FilePlatformExperimentOperations(IPlatformExperimentOperations):
         if exp.assets is None:
             exp.assets = AssetCollection()
 
-        if children:
+        if children and simulation_table:
+            exp.simulations = self.get_simulation_table(file_exp)
+        elif children:
             exp.simulations = self.get_children(file_exp, parent=exp, raw=False)
 
         return exp
 
+    def get_simulation_table(self, experiment: FileExperiment) -> SimulationTable:
+        """
+        Load the simulations of an experiment as a SimulationTable, without building Simulation objects.
+        Args:
+            experiment: File experiment
+        Returns:
+            SimulationTable
+        """
+        ids, names, statuses, tags, directories = [], [], [], [], []
+        for meta in self.platform._metas.get_children(experiment):
+            ids.append(meta['id'])
+            names.append(meta.get('name'))
+            tags.append(meta.get('tags') or {})
+            directories.append(meta.get('dir'))
+            statuses.append(self._get_directory_status(meta['dir']))
+        return SimulationTable(ids, statuses=statuses, names=names, tags=tags, directories=directories,
+                               platform=self.platform)
+
+    def refresh_simulation_status(self, experiment: Experiment, **kwargs):
+        """
+        Refresh the status of each simulation of an experiment.
+        Args:
+            experiment: idmtools Experiment
+            kwargs: keyword arguments used to expand functionality
+        Returns:
+            None
+        """
+        simulations = experiment.simulations.items
+        if isinstance(simulations, SimulationTable):
+            directories = [simulations.get_directory(index) for index in range(len(simulations))]
+            if any(directory is None for directory in directories):
+                known = self._get_simulation_directories(experiment)
+                directories = [directory or known.get(sim_id) for sim_id, directory in zip(simulations.ids, directories)]
+            # update the table in place without materializing the simulations
+            for sim_id, directory in zip(simulations.ids, directories):
+                simulations.set_status(sim_id, self._get_simulation_status(sim_id, directory, **kwargs))
+            return
+        directories = self._get_simulation_directories(experiment)
+        for sim in experiment.simulations:
+            sim.status = self._get_simulation_status(sim.id, directories.get(sim.id), **kwargs)
+
+    def _get_simulation_directories(self, experiment: Experiment) -> Dict[str, str]:
+        """
+        Get the directory of each simulation of an experiment, reading the metadata of the experiment once.
+        Args:
+            experiment: idmtools Experiment
+        Returns:
+            Dict of simulation id as key and directory as value
+        """
+        return {meta['id']: meta['dir'] for meta in self.platform._metas.get_children(experiment)}
+
+    def _get_directory_status(self, directory: str) -> EntityStatus:
+        """
+        Get the status of a simulation from its directory.
+        Args:
+            directory: simulation directory
+        Returns:
+            EntityStatus
+        """
+        return self.platform._op_client.get_directory_status(Path(directory))
+
+    def _get_simulation_status(self, sim_id: str, directory: Optional[str], **kwargs) -> EntityStatus:
+        """
+        Get the status of a simulation, looking up its directory only when it is not known.
+        Args:
+            sim_id: simulation id
+            directory: simulation directory, if known
+            kwargs: keyword arguments used to expand functionality
+        Returns:
+            EntityStatus
+        """
+        if directory is None:
+            return self.platform.get_simulation_status(sim_id, **kwargs)
+        return self._get_directory_status(directory)
+
     def refresh_status(self, experiment: Experiment, **kwargs):
         """
         Refresh status of experiment.
@@ -222,8 +301,7 @@ class FilePlatformExperimentOperations(IPlatformExperimentOperations):
             Dict of simulation id as key and working dir as value
         """
         # Refresh status for each simulation
-        for sim in experiment.simulations:
-            sim.status = self.platform.get_simulation_status(sim.id, **kwargs)
+        self.refresh_simulation_status(experiment, **kwargs)
 
     def create_sim_directory_map(self, experiment_id: str) -> Dict:
         """
@@ -238,6 +316,21 @@ class FilePlatformExperimentOperations(IPlatformExperimentOperations):
         sims = exp.simulations
         return {sim.id: str(self.platform.get_directory(sim)) for sim in sims}
 
+    def get_sim_directory_records(self, experiment_id: str, include_tags: bool = True) \
+            -> Iterator[Tuple[str, Dict[str, Any], str]]:
+        """
+        Gather the id, tags, and directory of each simulation in a single pass over the experiment.
+        Args:
+            experiment_id: experiment id
+            include_tags: Include the simulation tags
+
+        Returns:
+            Iterator of (simulation id, tags, simulation directory)
+        """
+        exp = self.platform.get_item(experiment_id, ItemType.EXPERIMENT, raw=False)
+        for sim in exp.simulations:
+            yield sim.id, sim.tags if include_tags else {}, str(self.platform.get_directory(sim))
+
     def platform_delete(self, experiment_id: str) -> None:
         """
         Delete platform experiment.
@@ -13,7 +13,7 @@ from idmtools.core.interfaces import imetadata_operations
 from idmtools.entities import Suite
 from idmtools.entities.experiment import Experiment
 from idmtools.entities.simulation import Simulation
-from idmtools.utils.json import IDMJSONEncoder
+from idmtools.utils.json import dumps_json, to_json_ready
 from idmtools_platform_file.platform_operations.utils import FileSuite, FileExperiment
 
 if TYPE_CHECKING:
@@ -44,20 +44,22 @@ class JSONMetadataOperations(imetadata_operations.IMetadataOperations):
         return metadata
 
     @staticmethod
-    def _write_to_file(filepath: Union[Path, str], data: Dict, indent: int = None) -> None:
+    def _write_to_file(filepath: Union[Path, str], data: Dict, indent: int = None, json_ready: bool = False) -> None:
         """
         Utility: save metadata to a file.
         Args:
             filepath: metadata file path
             data: metadata as dictionary
             indent: indent level for pretty printing the JSON file. None for compact JSON.
+            json_ready: True when data is already made of plain JSON types, as returned by get
         Returns:
             None
         """
         filepath = Path(filepath)
         filepath.parent.mkdir(parents=True, exist_ok=True)
+        content = dumps_json(data, indent=indent, json_ready=json_ready)
         with filepath.open(mode='w') as f:
-            json.dump(data, f, indent=indent, cls=IDMJSONEncoder)
+            f.write(content)
 
     def get_metadata_filepath(self, item: Union[Suite, Experiment, Simulation]) -> Path:
         """
@@ -101,7 +103,8 @@ class JSONMetadataOperations(imetadata_operations.IMetadataOperations):
         data = item.to_dict()
         if isinstance(item, Suite):
             data.pop('experiments', None)
-        meta = json.loads(json.dumps(data, cls=IDMJSONEncoder))
+        # one pass to plain JSON types, without encoding and decoding JSON text
+        meta = to_json_ready(data)
         meta['id'] = meta['_uid']
         meta['uid'] = meta['_uid']
         meta['status'] = 'CREATED'
@@ -128,14 +131,14 @@ class JSONMetadataOperations(imetadata_operations.IMetadataOperations):
             raise RuntimeError("Dump method supports Suite/Experiment/Simulation only.")
         dest = self.get_metadata_filepath(item)
         meta = self.get(item)
-        self._write_to_file(dest, meta)
+        self._write_to_file(dest, meta, json_ready=True)
 
         # Also write tags.json file
         keys_to_extract = ["id", "item_type", "tags"]
         extracted = {key: meta[key] for key in keys_to_extract}
 
         tags_path = dest.parent / "tags.json"
-        self._write_to_file(tags_path, extracted, indent=2)
+        self._write_to_file(tags_path, extracted, indent=2, json_ready=True)
         return meta
 
     def load(self, item: Union[Suite, Experiment, Simulation]) -> Dict:
@@ -4,6 +4,7 @@ Here we implement the FilePlatform simulation operations.
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
 import shutil
+from pathlib import Path
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, List, Dict, Type, Optional, Any
 from idmtools.assets import Asset
@@ -44,7 +45,7 @@ class FilePlatformSimulationOperations(IPlatformSimulationOperations):
         if len(metas) > 0:
             # update status - data analysis may need this
             file_sim = FileSimulation(metas[0])
-            file_sim.status = self.platform.get_simulation_status(file_sim.id)
+            file_sim.status = self.platform._op_client.get_directory_status(Path(metas[0]['dir']))
             return file_sim
         else:
             raise RuntimeError(f"Not found Simulation with id '{simulation_id}'")
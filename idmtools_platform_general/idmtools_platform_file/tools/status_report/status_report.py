@@ -9,9 +9,10 @@ from logging import getLogger
 from collections import Counter
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, TYPE_CHECKING
-from idmtools.core import ItemType, EntityStatus
+from idmtools.core import ItemType
 from idmtools.entities.experiment import Experiment
 from idmtools_platform_file.tools.status_report.utils import get_latest_experiment
+from idmtools_platform_file.tools.status_report.status_snapshot import StatusSnapshot, PENDING, watch_status
 from idmtools_platform_file.platform_operations.utils import FILE_MAPS
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -32,10 +33,22 @@ class StatusReporter:
     _summary: Dict = field(default_factory=dict, init=False, compare=False)
     _report: Dict = field(default_factory=dict, init=False, compare=False)
     _pending: List = field(default_factory=list, init=False, compare=False)
+    _snapshot: StatusSnapshot = field(default=None, init=False, compare=False)
 
     def __post_init__(self):
         self.initialize()
 
+    @property
+    def snapshot(self) -> StatusSnapshot:
+        """
+        Status snapshot of the experiment, refreshed by each report.
+        Returns:
+            StatusSnapshot
+        """
+        if self._snapshot is None:
+            self._snapshot = StatusSnapshot(self.platform.get_directory(self._exp))
+        return self._snapshot
+
     def initialize(self) -> None:
         """
         Determine the experiment and build dictionary with basic info.
@@ -70,33 +83,34 @@ class StatusReporter:
                                  job_directory=self.platform.job_directory)
 
     def apply_filters(self, status_filter: Tuple[str] = None, sim_filter: Tuple[str] = None,
-                      verbose: bool = True) -> None:
+                      verbose: bool = True, refresh: bool = True) -> None:
         """
         Filter simulations.
         Args:
             status_filter: tuple with target status
             sim_filter: tuple with simulation id
             verbose: True/False to include simulation directory
+            refresh: True/False to refresh the snapshot first
         Returns:
             None
         """
-        # Make sure we get the latest status
-        self.platform.refresh_status(self._exp)
+        # Make sure we get the latest status, only re-reading simulations that changed since the last report
+        if refresh:
+            self.snapshot.refresh()
+        _directories = self.snapshot.directories
+        self._pending = []
+        self._report = {}
 
         # Filter simulations and format the results
-        _simulations = self._exp.simulations
-        for sim in _simulations:
+        for sim_id, status in self.snapshot.statuses.items():
             # Apply simulation filter
-            if sim_filter is not None and sim.id not in sim_filter:
+            if sim_filter is not None and sim_id not in sim_filter:
                 continue
 
-            sim_dir = self.platform.get_directory(sim)
-            job_status_path = sim_dir.joinpath("job_status.txt")
-            if not job_status_path.exists():
-                self._pending.append(f"    {sim.id}")
+            if status == PENDING:
+                self._pending.append(f"    {sim_id}")
                 continue
 
-            status = open(job_status_path).read().strip()
             # Apply status filter
             if status_filter is not None and status not in status_filter:
                 continue
@@ -104,8 +118,8 @@ class StatusReporter:
             # Format the results
             d = dict(status=status)
             if verbose:
-                d["WorkDir"] = str(self.platform.get_directory(sim))
-            self._report[sim.id] = d
+                d["WorkDir"] = str(_directories[sim_id])
+            self._report[sim_id] = d
 
     @staticmethod
     def output_definition() -> None:
@@ -149,8 +163,9 @@ class StatusReporter:
             None
         """
         _status_list = [v["status"] for k, v in self._report.items()]
-        _sim_not_run_list = [sim for sim in self._exp.simulations if sim.status == EntityStatus.CREATED]
-        _simulation_count = len(self._exp.simulations)
+        _not_run_count = self.snapshot.counts()[PENDING]
+        _simulation_count = len(self.snapshot)
+        _exp_status = self.snapshot.experiment_status
 
         # print report
         user_logger.info(f"{'status filter: '.ljust(20)} {status_filter}")
@@ -159,15 +174,16 @@ class StatusReporter:
         user_logger.info(f"{'display: '.ljust(20)} {display}")
         user_logger.info(f"{'Simulation Count: '.ljust(20)} {_simulation_count}")
         user_logger.info(f"{'Match Count: '.ljust(20)} {len(self._report)} ({dict(Counter(_status_list))})")
-        user_logger.info(f"{'Not Running Count: '.ljust(20)} {len(_sim_not_run_list)}")
+        user_logger.info(f"{'Not Running Count: '.ljust(20)} {_not_run_count}")
 
-        if self._exp.status is None:
+        if _exp_status is None:
             user_logger.info(f'\nExperiment Status: {None}')
         else:
-            user_logger.info(f'\nExperiment Status: {self._exp.status.name}')
+            user_logger.info(f'\nExperiment Status: {_exp_status.name}')
 
     def output_status_report(self, status_filter: Tuple[str] = None, sim_filter: Tuple[str] = None,
-                             verbose: bool = True, display: bool = True, display_count: int = 20) -> None:
+                             verbose: bool = True, display: bool = True, display_count: int = 20,
+                             refresh: bool = True) -> None:
         """
         Output simulations status with possible override parameters.
         Args:
@@ -176,13 +192,14 @@ class StatusReporter:
             verbose: True/False to include simulation directory
             display: True/False to print the searched results
             display_count: how many to print
+            refresh: True/False to refresh the status first
         Returns:
             None
         """
         if status_filter is None:
             status_filter = ('0', '-1', '100')
 
-        self.apply_filters(status_filter, sim_filter, verbose)
+        self.apply_filters(status_filter, sim_filter, verbose, refresh)
 
         self.output_summary()
 
@@ -203,7 +220,7 @@ class StatusReporter:
 
 def generate_status_report(platform: 'IPlatform', scope: Tuple[str, ItemType] = None, status_filter: Tuple[str] = None,
                            sim_filter: Tuple[str] = None, verbose: bool = True, display: bool = True,
-                           display_count: int = 20) -> None:
+                           display_count: int = 20, watch: float = None) -> None:
     """
     The entry point of status viewer.
     Args:
@@ -214,9 +231,18 @@ def generate_status_report(platform: 'IPlatform', scope: Tuple[str, ItemType] =
         verbose: True/False to include simulation directory
         display: True/False to print the search results
         display_count: how many to print
+        watch: refresh interval in seconds; keep refreshing until all simulations are done. None to report once
     Returns:
         None
     """
     sr = StatusReporter(scope=scope, platform=platform)
-    sr.output_status_report(status_filter=status_filter, sim_filter=sim_filter, verbose=verbose, display=display,
-                            display_count=display_count)
+
+    def report(snapshot: StatusSnapshot = None):
+        # watch_status refreshes the snapshot before each report
+        sr.output_status_report(status_filter=status_filter, sim_filter=sim_filter, verbose=verbose,
+                                display=display, display_count=display_count, refresh=snapshot is None)
+
+    if watch:
+        watch_status(sr.snapshot, report, interval=watch)
+    else:
+        report()
@@ -0,0 +1,316 @@
+"""
+Incremental simulation status snapshot shared by the File, Slurm and Container platform status commands.
+
+The snapshot is stored as a small json file inside the experiment directory. On each refresh only simulations whose
+job_status.txt changed since the previous refresh are re-read, so repeated status calls on large experiments (for
+example a status command running in a watch loop) do not re-open every file on the shared filesystem.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import os
+import json
+import time
+from pathlib import Path
+from logging import getLogger
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Union, Optional, Callable, Set, Tuple
+from idmtools.core import EntityStatus
+from idmtools_platform_file.platform_operations.utils import FILE_MAPS
+
+logger = getLogger(__name__)
+user_logger = getLogger('user')
+
+SNAPSHOT_FILE = '.status_snapshot.json'
+SNAPSHOT_VERSION = 2
+STATUS_FILE = 'job_status.txt'
+METADATA_FILE = 'metadata.json'
+# Status code used for simulations without job_status.txt
+PENDING = 'None'
+
+
+@dataclass(repr=False)
+class StatusSnapshot:
+    """
+    Per experiment status snapshot refreshed incrementally using directory and file modification times.
+
+    The experiment directory is only listed again when its modification time changes (simulations added or removed),
+    and a simulation's job_status.txt is only opened when its modification time or size changed. Directories whose
+    metadata.json cannot be read yet are retried on every refresh, as the metadata may be written after the directory.
+    """
+    exp_dir: Union[Path, str]
+    snapshot_file: str = field(default=SNAPSHOT_FILE)
+    #: Additional small files (like job_id.txt) cached with the status and re-read only when the status changes
+    extra_files: Tuple[str, ...] = field(default=())
+
+    #: Number of simulations whose job_status.txt was re-read during the last refresh
+    rescanned: int = field(default=0, init=False, compare=False)
+    _exp_mtime: Optional[int] = field(default=None, init=False, compare=False)
+    _records: Dict[str, Dict] = field(default_factory=dict, init=False, compare=False)
+    #: Directories without readable metadata.json
+    _unresolved: Set[str] = field(default_factory=set, init=False, compare=False)
+
+    def __post_init__(self):
+        self.exp_dir = Path(self.exp_dir)
+        self.load()
+
+    @property
+    def snapshot_path(self) -> Path:
+        """
+        Snapshot file path.
+        Returns:
+            Path
+        """
+        return self.exp_dir.joinpath(self.snapshot_file)
+
+    def load(self) -> None:
+        """
+        Load a previously saved snapshot. An unreadable or outdated snapshot is ignored and rebuilt on refresh.
+        Returns:
+            None
+        """
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == SNAPSHOT_VERSION:
+                self._exp_mtime = data['exp_mtime']
+                self._records = data['simulations']
+                self._unresolved = set(data['unresolved'])
+                if not set(self.extra_files).issubset(data.get('extra_files', [])):
+                    # Cached records miss some extra files, force them to be re-read on next refresh
+                    for record in self._records.values():
+                        record['status_stat'] = None
+        except (OSError, ValueError, KeyError):
+            self._exp_mtime = None
+            self._records = {}
+            self._unresolved = set()
+
+    def save(self) -> None:
+        """
+        Write the snapshot to disk.
+
+        Returns:
+            None
+
+        Notes:
+            The file is rewritten in place so that saving does not change the modification time of the experiment
+            directory, which is what we use to detect new simulations.
+        """
+        data = dict(version=SNAPSHOT_VERSION, exp_mtime=self._exp_mtime, extra_files=list(self.extra_files),
+                    simulations=self._records, unresolved=sorted(self._unresolved))
+        try:
+            with open(self.snapshot_path, 'w') as f:
+                json.dump(data, f)
+        except OSError as e:
+            logger.debug(f"Could not save status snapshot {self.snapshot_path}: {e}")
+
+    def _scan_experiment(self) -> None:
+        """
+        List the experiment directory and pick up new or removed simulation directories.
+        Returns:
+            None
+        """
+        seen = set()
+        with os.scandir(self.exp_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                seen.add(entry.name)
+                if entry.name not in self._records:
+                    self._resolve(entry.name)
+
+        for name in list(self._records):
+            if name not in seen:
+                self._records.pop(name)
+        self._unresolved &= seen
+
+    def _resolve(self, name: str) -> None:
+        """
+        Add a simulation record for a directory, or remember the directory to retry when its metadata is not readable.
+        Args:
+            name: directory name
+        Returns:
+            None
+        """
+        try:
+            with open(self.exp_dir.joinpath(name, METADATA_FILE), 'r') as f:
+                sim_id = json.load(f).get('id', name)
+        except (OSError, ValueError):
+            # Not a simulation directory (Assets, output folders...), or its metadata is not written yet
+            self._unresolved.add(name)
+            return
+        self._unresolved.discard(name)
+        self._records[name] = dict(id=sim_id, status_stat=None, status=PENDING, extra={})
+
+    def _refresh_simulation(self, name: str, record: Dict) -> bool:
+        """
+        Refresh one simulation record if its job_status.txt changed since the last refresh.
+        Args:
+            name: simulation directory name
+            record: simulation record
+        Returns:
+            True if job_status.txt was re-read
+        """
+        sim_dir = self.exp_dir.joinpath(name)
+        status_path = sim_dir.joinpath(STATUS_FILE)
+        try:
+            st = os.stat(status_path)
+        except OSError:
+            record['status_stat'] = None
+            record['status'] = PENDING
+            return False
+
+        # job_status.txt is overwritten in place, so compare size as well as mtime (mtime may be coarse on NFS)
+        status_stat = [st.st_mtime_ns, st.st_size]
+        if record['status_stat'] == status_stat:
+            return False
+        try:
+            with open(status_path, 'r') as f:
+                content = f.read().strip()
+        except OSError:
+            return False
+        record['status_stat'] = status_stat
+        record['status'] = content if content in FILE_MAPS else '100'
+        # Extra files like job_id.txt are written by the run script right before the status changes
+        self._read_extra_files(sim_dir, record)
+        return True
+
+    def _read_extra_files(self, sim_dir: Path, record: Dict) -> None:
+        """
+        Read the extra files of a simulation into its record.
+        Args:
+            sim_dir: simulation directory
+            record: simulation record
+        Returns:
+            None
+        """
+        for file_name in self.extra_files:
+            try:
+                with open(sim_dir.joinpath(file_name), 'r') as f:
+                    record['extra'][file_name] = f.read().strip()
+            except OSError:
+                record['extra'][file_name] = None
+
+    def refresh(self, save: bool = True) -> 'StatusSnapshot':
+        """
+        Bring the snapshot up to date, re-reading only the simulations that changed.
+        Args:
+            save: True/False to persist the snapshot after refresh
+        Returns:
+            self
+        """
+        exp_mtime = os.stat(self.exp_dir).st_mtime_ns
+        if exp_mtime != self._exp_mtime:
+            self._scan_experiment()
+            self._exp_mtime = exp_mtime
+        else:
+            for name in list(self._unresolved):
+                self._resolve(name)
+
+        self.rescanned = 0
+        for name, record in self._records.items():
+            if self._refresh_simulation(name, record):
+                self.rescanned += 1
+
+        if save:
+            self.save()
+        return self
+
+    @property
+    def statuses(self) -> Dict[str, str]:
+        """
+        Simulation status codes.
+        Returns:
+            Dictionary of simulation id to status code ('0', '-1', '100' or 'None' for pending)
+        """
+        return {r['id']: r['status'] for r in self._records.values()}
+
+    @property
+    def directories(self) -> Dict[str, Path]:
+        """
+        Simulation directories.
+        Returns:
+            Dictionary of simulation id to simulation directory
+        """
+        return {r['id']: self.exp_dir.joinpath(name) for name, r in self._records.items()}
+
+    def get_extra(self, file_name: str) -> Dict[str, Optional[str]]:
+        """
+        Cached content of one of the extra files.
+        Args:
+            file_name: one of extra_files
+        Returns:
+            Dictionary of simulation id to file content (None if the file does not exist)
+        """
+        return {r['id']: r['extra'].get(file_name) for r in self._records.values()}
+
+    def counts(self) -> Counter:
+        """
+        Count simulations by status code.
+        Returns:
+            Counter of status code
+        """
+        return Counter(r['status'] for r in self._records.values())
+
+    def __len__(self):
+        """Number of simulations."""
+        return len(self._records)
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether all simulations are done.
+        Returns:
+            True if every simulation has succeeded or failed
+        """
+        counts = self.counts()
+        return len(self) > 0 and counts['0'] + counts['-1'] == len(self)
+
+    @property
+    def experiment_status(self) -> Optional[EntityStatus]:
+        """
+        Experiment status computed from the snapshot using the same rules as Experiment.status.
+        Returns:
+            EntityStatus
+        """
+        counts = self.counts()
+        if len(self) == 0:
+            return None
+        any_succeeded_failed = counts['0'] > 0 or counts['-1'] > 0
+        if counts['100'] > 0:
+            return EntityStatus.RUNNING
+        elif counts[PENDING] > 0 and any_succeeded_failed:
+            return EntityStatus.RUNNING
+        elif counts['-1'] > 0:
+            return EntityStatus.FAILED
+        elif counts['0'] == len(self):
+            return EntityStatus.SUCCEEDED
+        return EntityStatus.CREATED
+
+
+def watch_status(exp_dir: Union[Path, str, StatusSnapshot], callback: Callable[[StatusSnapshot], None],
+                 interval: float = 10, max_iterations: int = None, extra_files: Tuple[str, ...] = ()) -> StatusSnapshot:
+    """
+    Refresh an experiment status snapshot periodically until all simulations are done.
+    Args:
+        exp_dir: experiment directory, or the snapshot to refresh
+        callback: function called with the refreshed snapshot on each iteration
+        interval: seconds to wait between refreshes
+        max_iterations: stop after this many refreshes (None to run until done)
+        extra_files: extra simulation files to cache with the status, when exp_dir is a directory
+    Returns:
+        StatusSnapshot
+    """
+    snapshot = exp_dir if isinstance(exp_dir, StatusSnapshot) else StatusSnapshot(exp_dir, extra_files=extra_files)
+    iteration = 0
+    try:
+        while True:
+            snapshot.refresh()
+            callback(snapshot)
+            iteration += 1
+            if snapshot.done or (max_iterations is not None and iteration >= max_iterations):
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        user_logger.info("Stopped watching.")
+    return snapshot
@@ -7,8 +7,9 @@ import os
 import shutil
 from pathlib import Path
 from logging import getLogger
-from typing import Dict, Tuple, TYPE_CHECKING
+from typing import Dict, Tuple, Union, TYPE_CHECKING
 from idmtools.core import ItemType
+from idmtools_platform_file.tools.status_report.status_snapshot import StatusSnapshot, PENDING, watch_status
 
 if TYPE_CHECKING:  # pragma: no cover
     from idmtools.entities.iplatform import IPlatform
@@ -43,47 +44,34 @@ def get_latest_experiment(platform: 'IPlatform') -> Dict:
         raise FileNotFoundError("Could not find the last Experiment")
 
 
-def check_status(platform: 'IPlatform', exp_id: str = None, display: bool = False) -> None:
+def output_status_summary(exp_dir: Union[Path, str], snapshot: StatusSnapshot, display: bool = False) -> None:
     """
-    List simulations status.
+    Output simulations status from a status snapshot.
     Args:
-        platform: Platform
-        exp_id: experiment id
+        exp_dir: experiment directory
+        snapshot: refreshed status snapshot
         display: True/False
     Returns:
         None
     """
-    if exp_id is None:
-        exp_dic = get_latest_experiment(platform)
-        exp_id = exp_dic['experiment_id']
-
-    _exp = platform.get_item(exp_id, ItemType.EXPERIMENT)
-
     _pending = []
     _running = []
     _failed = []
     _succeeded = []
-    _simulations = _exp.simulations
-    for sim in _simulations:
-        sim_dir = platform.get_directory(sim)
-        job_status_path = sim_dir.joinpath("job_status.txt")
-        if not job_status_path.exists():
-            _pending.append(f"    {sim.id}")
+    for sim_id, status in snapshot.statuses.items():
+        if status == PENDING:
+            _pending.append(f"    {sim_id}")
+        elif status == '0':
+            _succeeded.append(f"    {sim_id}")
+        elif status == '-1':
+            _failed.append(f"    {sim_id}")
         else:
-            status = open(job_status_path).read().strip()
-            if status == '0':
-                _succeeded.append(f"    {sim.id}")
-            elif status == '100':
-                _running.append(f"    {sim.id}")
-            elif status == '-1':
-                _failed.append(f"    {sim.id}")
-            else:
-                _running.append(f"    {sim.id}")
-
-    user_logger.info(f'\nExperiment Directory: \n{str(platform.get_directory(_exp))}')
+            _running.append(f"    {sim_id}")
+
+    user_logger.info(f'\nExperiment Directory: \n{str(exp_dir)}')
 
     # Output report
-    user_logger.info(f"\n{'Simulation Count: '.ljust(20)} {len(_simulations)}\n")
+    user_logger.info(f"\n{'Simulation Count: '.ljust(20)} {len(snapshot)}\n")
 
     user_logger.info(f'SUCCEEDED ({len(_succeeded)})')
     if display:
@@ -101,10 +89,33 @@ def check_status(platform: 'IPlatform', exp_id: str = None, display: bool = Fals
     if display:
         user_logger.info('\n'.join(_pending))
 
-    if _exp.status is None:
+    exp_status = snapshot.experiment_status
+    if exp_status is None:
         user_logger.info(f'\nExperiment Status: {None}')
     else:
-        user_logger.info(f'\nExperiment Status: {_exp.status.name}\n')
+        user_logger.info(f'\nExperiment Status: {exp_status.name}\n')
+
+
+def check_status(platform: 'IPlatform', exp_id: str = None, display: bool = False, watch: float = None) -> None:
+    """
+    List simulations status.
+    Args:
+        platform: Platform
+        exp_id: experiment id
+        display: True/False
+        watch: refresh interval in seconds; keep refreshing until all simulations are done. None to report once
+    Returns:
+        None
+    """
+    if exp_id is None:
+        exp_dic = get_latest_experiment(platform)
+        exp_id = exp_dic['experiment_id']
+
+    exp_dir = platform.get_directory_by_id(exp_id, ItemType.EXPERIMENT)
+    if watch:
+        watch_status(exp_dir, lambda snapshot: output_status_summary(exp_dir, snapshot, display), interval=watch)
+    else:
+        output_status_summary(exp_dir, StatusSnapshot(exp_dir).refresh(), display)
 
 
 def clear_history(platform: 'IPlatform', exp_id: str = None, sim_id: Tuple = None, remove_list=None) -> None:
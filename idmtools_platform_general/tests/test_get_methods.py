@@ -2,6 +2,7 @@ import copy
 import os
 import sys
 import unittest
+from unittest import mock
 
 import pytest
 from functools import partial
@@ -19,6 +20,7 @@ from idmtools.core.platform_factory import Platform
 from idmtools.entities import Suite
 from idmtools.entities.experiment import Experiment
 from idmtools.entities.simulation import Simulation
+from idmtools.entities.simulation_table import SimulationTable
 from idmtools.entities.templated_simulation import TemplatedSimulations
 from idmtools_models.python.json_python_task import JSONConfiguredPythonTask
 from idmtools_platform_file.platform_operations.utils import FileSimulation, FileExperiment, FileSuite
@@ -441,3 +443,30 @@ class TestFilePlatform(unittest.TestCase):
             count += 1
         self.assertEqual(count, 7)
 
+
+    def test_get_experiment_as_simulation_table(self):
+        experiment = self.platform.get_item(self.experiment.id, ItemType.EXPERIMENT, force=True,
+                                            simulation_table=True)
+        table = experiment.simulations.items
+        self.assertIsInstance(table, SimulationTable)
+        self.assertEqual(len(table), 9)
+        self.assertEqual(set(table.ids), {s.id for s in self.experiment.simulations})
+        self.assertEqual(experiment.status, self.experiment.status)
+        for sim in experiment.simulations:
+            self.assertIn(sim.tags['a'], range(3))
+            self.assertEqual(table.get_directory(table.index_of(sim.id)),
+                             str(self.platform.get_directory(sim).resolve()))
+        experiment.refresh_simulations_status()
+        self.assertTrue(experiment.validate_status_counts())
+
+    def test_refresh_status_does_not_look_up_each_simulation(self):
+        # statuses come from the simulation directories, not from one metadata search per simulation id
+        with mock.patch.object(type(self.platform), "get_simulation_status", side_effect=AssertionError("lookup by id")):
+            experiment = self.platform.get_item(self.experiment.id, ItemType.EXPERIMENT, force=True,
+                                                simulation_table=True)
+            experiment.refresh_simulations_status()
+            self.assertTrue(experiment.validate_status_counts())
+            experiment = self.platform.get_item(self.experiment.id, ItemType.EXPERIMENT, force=True)
+            experiment.refresh_simulations_status()
+            self.assertEqual({s.status for s in experiment.simulations},
+                             {s.status for s in self.experiment.simulations})
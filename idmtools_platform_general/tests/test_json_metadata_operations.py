@@ -1,17 +1,34 @@
+import json
 import os
 from pathlib import Path
 import shutil
 import tempfile
+import time
 import unittest
 
+import pytest
+
 from idmtools.core import ItemType
+from idmtools.entities.command_task import CommandTask
 from idmtools.core.platform_factory import Platform
 from idmtools.entities.experiment import Experiment
 from idmtools.entities.simulation import Simulation
 from idmtools.entities.suite import Suite
+from idmtools.utils.json import IDMJSONEncoder, dumps_json
 from idmtools_platform_file.platform_operations.json_metadata_operations import JSONMetadataOperations
 
 
+def legacy_simulation_dump(op, sim):
+    """The metadata of a simulation and its JSON text, serialized the way JSONMetadataOperations used to."""
+    meta = json.loads(json.dumps(sim.to_dict(), cls=IDMJSONEncoder))
+    meta['id'] = meta['_uid']
+    meta['uid'] = meta['_uid']
+    meta['status'] = 'CREATED'
+    meta['dir'] = os.path.abspath(op.platform.get_directory(sim))
+    meta['experiment_id'] = meta["parent_id"]
+    return meta, json.dumps(meta, cls=IDMJSONEncoder)
+
+
 class JSONMetadataOperationsTest(unittest.TestCase):
 
     @staticmethod
@@ -396,3 +413,41 @@ class JSONMetadataOperationsTest(unittest.TestCase):
         filtered_meta_list = self.op.filter(item_type=ItemType.SIMULATION)
         # make sure match 3 simulations
         self.assertEqual(len(filtered_meta_list), 3)
+
+    def _create_experiment(self, count):
+        experiment = Experiment(name="Exp")
+        experiment.suite = Suite(name="Suite")
+        for i in range(count):
+            simulation = Simulation(name=f"Sim{i}", task=CommandTask(command=f"python model.py --i {i}"),
+                                    tags=dict(i=i, a=0.5))
+            experiment.add_simulation(simulation)
+            simulation.experiment = experiment
+        return experiment
+
+    def test_get_same_as_json_round_trip(self):
+        experiment = self._create_experiment(5)
+        for sim in experiment.simulations:
+            meta = self.op.get(sim)
+            self.assertEqual(meta, legacy_simulation_dump(self.op, sim)[0])
+            self.assertEqual(json.loads(dumps_json(meta)), meta)
+        self.op.dump(experiment.simulations[0])
+        self.assertEqual(self.op.load(experiment.simulations[0]), self.op.get(experiment.simulations[0]))
+
+    @pytest.mark.long
+    @pytest.mark.usefixtures("unittest_record_property")
+    def test_benchmark_simulation_metadata(self):
+        # 100 rounds over 1000 simulations: 100k dumps
+        experiment = self._create_experiment(1000)
+
+        def run(dump):
+            start = time.perf_counter()
+            for _ in range(100):
+                for sim in experiment.simulations:
+                    dump(sim)
+            return time.perf_counter() - start
+
+        legacy = run(lambda sim: legacy_simulation_dump(self.op, sim))
+        current = run(lambda sim: dumps_json(self.op.get(sim), json_ready=True))
+        self.record_property("legacy_seconds", legacy)
+        self.record_property("current_seconds", current)
+        self.assertLess(current, legacy)
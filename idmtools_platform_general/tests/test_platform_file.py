@@ -28,7 +28,7 @@ from idmtools_test.utils.decorators import linux_only
 @linux_only
 class TestFilePlatform(unittest.TestCase):
 
-    def create_experiment(self, a=1, b=1, retries=None, wait_until_done=False):
+    def create_experiment(self, a=1, b=1, retries=None, wait_until_done=False, run=True):
         task = JSONConfiguredPythonTask(script_path=os.path.join(COMMON_INPUT_PATH, "python", "model3.py"),
                                         envelope="parameters", parameters=(dict(c=0)))
         task.python_path = "python3"
@@ -55,6 +55,8 @@ class TestFilePlatform(unittest.TestCase):
         suite.update_tags({'name': 'suite_tag', 'idmtools': '123'})
         # Add experiment to the suite
         suite.add_experiment(experiment)
+        if not run:
+            return experiment
         # Commission
         suite.run(wait_until_done=wait_until_done, retries=retries)
         print("suite_id: " + suite.id)
@@ -218,6 +220,17 @@ class TestFilePlatform(unittest.TestCase):
         # cleanup
         os.remove(f"{experiment.id}.csv")
 
+    def test_create_sim_directory_csv_streaming(self):
+        experiment = self.experiment
+        output = os.path.join(self.job_directory, "sim_directory_csv")
+        self.platform.save_sim_directory_df_to_csv(experiment.id, output=output, save_header=True, chunk_size=4)
+        exp_df = self.platform.create_sim_directory_df(experiment.id)
+        csv_df = pd.read_csv(os.path.join(output, f"{experiment.id}.csv"))
+        self.assertEqual(list(csv_df.columns), list(exp_df.columns))
+        self.assertEqual(csv_df['simid'].tolist(), exp_df['simid'].tolist())
+        self.assertEqual(csv_df['outpath'].tolist(), exp_df['outpath'].tolist())
+        self.assertEqual(os.listdir(output), [f"{experiment.id}.csv"])
+
     def test_platform_delete_experiment(self):
         experiment = self.create_experiment(a=3, b=3)
         suite_dir = self.platform.get_directory(experiment.parent)
@@ -283,4 +296,14 @@ class TestFilePlatform(unittest.TestCase):
         simulation_assets = [asset.filename for asset in experiment.simulations[0].assets]
         self.assertEqual(set(file_simulation_assets), set(simulation_assets))
 
-
+    def test_plan_matches_created_files(self):
+        experiment = self.create_experiment(a=3, b=3, run=False)
+        plan = experiment.plan(platform=self.platform, samples=4)
+        self.assertEqual(plan.simulation_count, 9)
+        self.assertEqual(plan.sampled, 4)
+        self.assertEqual(plan.total_directories, 9)
+        created = [os.listdir(self.platform.get_directory(sim)) for sim in self.experiment.simulations]
+        # config.json, metadata, batch file and the link to the assets of the experiment
+        self.assertEqual(plan.transient_files_per_simulation + plan.platform_files_per_simulation, len(created[0]))
+        self.assertEqual(round(plan.total_files - plan.common_asset_count), sum(len(files) for files in created))
+        self.assertEqual(plan.common_asset_count, len(self.experiment.assets))
@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from idmtools.core import EntityStatus
+from idmtools_platform_file.tools.status_report.status_snapshot import StatusSnapshot, PENDING, SNAPSHOT_FILE, \
+    watch_status
+
+
+class TestStatusSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.exp_dir = Path(tempfile.mkdtemp())
+        self.exp_dir.joinpath("Assets").mkdir()
+        for i in range(5):
+            self._add_simulation(f"sim{i}")
+
+    def tearDown(self):
+        shutil.rmtree(self.exp_dir)
+
+    def _add_simulation(self, sim_id):
+        sim_dir = self.exp_dir.joinpath(sim_id)
+        sim_dir.mkdir()
+        self._add_simulation_metadata(sim_id)
+
+    def _add_simulation_metadata(self, sim_id):
+        with open(self.exp_dir.joinpath(sim_id, "metadata.json"), "w") as f:
+            json.dump(dict(id=sim_id, item_type="Simulation"), f)
+
+    def _set_status(self, sim_id, status):
+        with open(self.exp_dir.joinpath(sim_id, "job_status.txt"), "w") as f:
+            f.write(f"{status}\n")
+
+    def test_initial_scan(self):
+        self._set_status("sim0", "0")
+        self._set_status("sim1", "-1")
+        self._set_status("sim2", "100")
+        snapshot = StatusSnapshot(self.exp_dir).refresh()
+        self.assertEqual(len(snapshot), 5)
+        self.assertEqual(snapshot.statuses, {"sim0": "0", "sim1": "-1", "sim2": "100", "sim3": PENDING,
+                                             "sim4": PENDING})
+        self.assertEqual(snapshot.rescanned, 3)
+        self.assertEqual(snapshot.experiment_status, EntityStatus.RUNNING)
+        self.assertFalse(snapshot.done)
+        self.assertTrue(self.exp_dir.joinpath(SNAPSHOT_FILE).exists())
+        self.assertEqual(snapshot.directories["sim1"], self.exp_dir.joinpath("sim1"))
+
+    def test_only_changed_simulations_are_reread(self):
+        for i in range(5):
+            self._set_status(f"sim{i}", "100")
+        StatusSnapshot(self.exp_dir).refresh()
+
+        # a new process loads the snapshot from disk and nothing changed
+        snapshot = StatusSnapshot(self.exp_dir).refresh()
+        self.assertEqual(snapshot.rescanned, 0)
+
+        # job_status.txt rewritten in place
+        self._set_status("sim3", "0")
+        snapshot = StatusSnapshot(self.exp_dir).refresh()
+        self.assertEqual(snapshot.rescanned, 1)
+        self.assertEqual(snapshot.statuses["sim3"], "0")
+
+    def test_new_and_removed_simulations(self):
+        snapshot = StatusSnapshot(self.exp_dir).refresh()
+        self._add_simulation("sim5")
+        shutil.rmtree(self.exp_dir.joinpath("sim0"))
+        # make sure the experiment directory mtime changes even on coarse filesystems
+        st = os.stat(self.exp_dir)
+        os.utime(self.exp_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        snapshot.refresh()
+        self.assertIn("sim5", snapshot.statuses)
+        self.assertNotIn("sim0", snapshot.statuses)
+        self.assertEqual(len(snapshot), 5)
+
+    def test_experiment_status(self):
+        for i in range(5):
+            self._set_status(f"sim{i}", "0")
+        snapshot = StatusSnapshot(self.exp_dir).refresh()
+        self.assertEqual(snapshot.experiment_status, EntityStatus.SUCCEEDED)
+        self.assertTrue(snapshot.done)
+        self._set_status("sim2", "-1")
+        snapshot = StatusSnapshot(self.exp_dir).refresh()
+        self.assertEqual(snapshot.experiment_status, EntityStatus.FAILED)
+        self.assertEqual(snapshot.counts(), {"0": 4, "-1": 1})
+
+    def test_extra_files(self):
+        self._set_status("sim0", "100")
+        with open(self.exp_dir.joinpath("sim0", "job_id.txt"), "w") as f:
+            f.write("123_0\n")
+        StatusSnapshot(self.exp_dir).refresh()
+        # the saved snapshot did not cache job_id.txt, so it has to be picked up
+        snapshot = StatusSnapshot(self.exp_dir, extra_files=("job_id.txt",)).refresh()
+        job_ids = snapshot.get_extra("job_id.txt")
+        self.assertEqual(job_ids["sim0"], "123_0")
+        self.assertIsNone(job_ids["sim1"])
+
+    def test_metadata_written_after_directory(self):
+        self.exp_dir.joinpath("sim5").mkdir()
+        snapshot = StatusSnapshot(self.exp_dir).refresh()
+        self.assertEqual(len(snapshot), 5)
+
+        # the metadata does not change the experiment directory mtime, the directory is retried anyway
+        with open(self.exp_dir.joinpath("sim5", "metadata.json"), "w") as f:
+            f.write('{"id": "sim5"')
+        snapshot.refresh()
+        self.assertNotIn("sim5", snapshot.statuses)
+        self._add_simulation_metadata("sim5")
+        snapshot.refresh()
+        self.assertEqual(snapshot.statuses["sim5"], PENDING)
+
+        # the unresolved directories are saved with the snapshot
+        self.exp_dir.joinpath("sim6").mkdir()
+        st = os.stat(self.exp_dir)
+        os.utime(self.exp_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        StatusSnapshot(self.exp_dir).refresh()
+        self._add_simulation_metadata("sim6")
+        snapshot = StatusSnapshot(self.exp_dir).refresh()
+        self.assertEqual(len(snapshot), 7)
+
+    def test_corrupted_snapshot_is_rebuilt(self):
+        with open(self.exp_dir.joinpath(SNAPSHOT_FILE), "w") as f:
+            f.write("{not json")
+        snapshot = StatusSnapshot(self.exp_dir).refresh()
+        self.assertEqual(len(snapshot), 5)
+
+    def test_watch_status(self):
+        for i in range(5):
+            self._set_status(f"sim{i}", "0")
+        calls = []
+        snapshot = watch_status(self.exp_dir, calls.append, interval=0)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(snapshot.done)
+
+        self._set_status("sim0", "100")
+        calls = []
+        watch_status(self.exp_dir, calls.append, interval=0, max_iterations=3)
+        self.assertEqual(len(calls), 3)
+
+        # an existing snapshot is refreshed in place
+        snapshot = StatusSnapshot(self.exp_dir)
+        self.assertIs(watch_status(snapshot, calls.append, interval=0, max_iterations=1), snapshot)
+        self.assertIs(calls[-1], snapshot)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,23 +3,88 @@ SlurmPlatform utilities.
 
 Copyright 2021, Bill & Melinda Gates Foundation. All rights reserved.
 """
+import math
+from dataclasses import dataclass
 from pathlib import Path
-from jinja2 import Template
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Optional, Union, Tuple, List
 from idmtools.entities.experiment import Experiment
-from idmtools_platform_slurm.platform_operations.utils import check_home
+from idmtools.utils.templates import get_renderer
+from idmtools_platform_slurm.platform_operations.utils import check_home, get_runtime_estimates, pack_simulations
 
 if TYPE_CHECKING:
     from idmtools_platform_slurm.slurm_platform import SlurmPlatform, CONFIG_PARAMETERS
 
 DEFAULT_TEMPLATE_FILE = Path(__file__).parent.joinpath("sbatch.sh.jinja2")
 BATCH_TEMPLATE_FILE = Path(__file__).parent.joinpath("batch.sh.jinja2")
+SIMULATION_TEMPLATE_FILE = Path(__file__).parent.joinpath("_run.sh.jinja2")
+SIMULATION_INDEX_FILE = "simulation_index.txt"
+
+
+def get_array_batch_size(platform: 'SlurmPlatform', njobs: int) -> int:
+    """
+    Get the number of tasks of each array job.
+    Args:
+        platform: Slurm Platform
+        njobs: number of array tasks of the experiment
+    Returns:
+        array batch size
+    """
+    sizes = [platform._max_array_size, platform.array_batch_size, njobs]
+    return min(size for size in sizes if size is not None)
+
+
+@dataclass
+class SimulationIndex:
+    """
+    Manifest of the simulations run by the array tasks of an experiment.
+    """
+    #: Number of tasks of each array job
+    array_batch_size: int
+    #: Number of simulations run by each task
+    sims_per_task: int
+    #: Number of simulations a task runs at the same time
+    parallel: int
+    #: Simulation id and directory name, task i running the i-th slice of sims_per_task simulations
+    simulations: List[Tuple[str, str]]
+
+    @property
+    def tasks(self) -> int:
+        """Number of array tasks."""
+        return math.ceil(len(self.simulations) / self.sims_per_task)
+
+    def get_task(self, sim_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Get the array task of a simulation.
+        Args:
+            sim_id: simulation id
+        Returns:
+            index of the array job and 1-based task id in the array job, None if the simulation is not in the manifest
+        """
+        position = next((i for i, (s_id, _) in enumerate(self.simulations) if s_id == sim_id), None)
+        if position is None:
+            return None
+        task = position // self.sims_per_task
+        return task // self.array_batch_size, task % self.array_batch_size + 1
+
+    def get_task_simulations(self, sim_id: str) -> List[str]:
+        """
+        Get the simulations run by the array task of a simulation.
+        Args:
+            sim_id: simulation id
+        Returns:
+            ids of the simulations of the task, including the simulation, empty if the simulation is not in the manifest
+        """
+        position = next((i for i, (s_id, _) in enumerate(self.simulations) if s_id == sim_id), None)
+        if position is None:
+            return []
+        start = position - position % self.sims_per_task
+        return [s_id for s_id, _ in self.simulations[start:start + self.sims_per_task]]
 
 
 def generate_batch(platform: 'SlurmPlatform', experiment: Experiment,
                    max_running_jobs: Optional[int] = None, array_batch_size: Optional[int] = None,
-                   dependency: Optional[bool] = None,
-                   template: Union[Path, str] = BATCH_TEMPLATE_FILE, **kwargs) -> None:
+                   dependency: Optional[bool] = None, template: Union[Path, str] = BATCH_TEMPLATE_FILE,
+                   njobs: Optional[int] = None, **kwargs) -> None:
     """
     Generate bash script file batch.sh
     Args:
@@ -29,11 +94,12 @@ def generate_batch(platform: 'SlurmPlatform', experiment: Experiment,
         array_size: INT, array size for slurm job
         dependency: bool, determine if Slurm jobs depend on each other
         template: template to be used to build batch file
+        njobs: number of array tasks, one per simulation by default
         kwargs: keyword arguments used to expand functionality
     Returns:
         None
     """
-    template_vars = dict(njobs=experiment.simulation_count)
+    template_vars = dict(njobs=experiment.simulation_count if njobs is None else njobs)
 
     # Set max_running_jobs
     if max_running_jobs is not None:
@@ -50,17 +116,7 @@ def generate_batch(platform: 'SlurmPlatform', experiment: Experiment,
     # Set array_size
     if array_batch_size is not None:
         platform.array_batch_size = array_batch_size
-
-    if platform._max_array_size is not None:
-        if platform.array_batch_size is not None:
-            template_vars['array_batch_size'] = min(platform._max_array_size, platform.array_batch_size,
-                                                    experiment.simulation_count)
-        else:
-            template_vars['array_batch_size'] = min(platform._max_array_size, experiment.simulation_count)
-    elif platform.array_batch_size is not None:
-        template_vars['array_batch_size'] = min(platform.array_batch_size, experiment.simulation_count)
-    else:
-        template_vars['array_batch_size'] = experiment.simulation_count
+    template_vars['array_batch_size'] = get_array_batch_size(platform, template_vars['njobs'])
 
     # Consider dependency
     if dependency is None:
@@ -70,14 +126,9 @@ def generate_batch(platform: 'SlurmPlatform', experiment: Experiment,
     # Update with possible override values
     template_vars.update(kwargs)
 
-    # Build batch based on the given template
-    with open(template) as file_:
-        t = Template(file_.read())
-
-    # Write out file
+    # Build batch based on the given template and write out file
     output_target = platform.get_directory(experiment).joinpath("batch.sh")
-    with open(output_target, "w") as tout:
-        tout.write(t.render(template_vars))
+    get_renderer().render_to_file(template, output_target, template_vars)
 
     # Make executable
     platform.update_script_mode(output_target)
@@ -116,13 +167,9 @@ def generate_script(platform: 'SlurmPlatform', experiment: Experiment, max_runni
     if platform.modules:
         template_vars['modules'] = platform.modules
 
-    with open(template) as file_:
-        t = Template(file_.read())
-
     # Write out file
     output_target = platform.get_directory(experiment).joinpath("sbatch.sh")
-    with open(output_target, "w") as tout:
-        tout.write(t.render(template_vars))
+    get_renderer().render_to_file(template, output_target, template_vars)
     # Make executable
     platform.update_script_mode(output_target)
 
@@ -141,17 +188,63 @@ def generate_simulation_script(platform: 'SlurmPlatform', simulation, retries: O
     experiment_dir = str(experiment_dir).replace('\\', '/')
     check = check_home(experiment_dir)
     sim_script = platform.get_directory(simulation).joinpath("_run.sh")
-    with open(sim_script, "w") as tout:
-        with open(Path(__file__).parent.parent.joinpath("assets/_run.sh.jinja2")) as tin:
-            tvars = dict(
-                platform=platform,
-                simulation=simulation,
-                retries=retries if retries else platform.retries
-            )
-            if not check:
-                tvars['experiment_dir'] = str(experiment_dir)
-
-            t = Template(tin.read())
-            tout.write(t.render(tvars))
+    tvars = dict(
+        platform=platform,
+        simulation=simulation,
+        retries=retries if retries else platform.retries
+    )
+    if not check:
+        tvars['experiment_dir'] = str(experiment_dir)
+    get_renderer().render_to_file(SIMULATION_TEMPLATE_FILE, sim_script, tvars)
     # Make executable
     platform.update_script_mode(sim_script)
+
+
+def generate_simulation_index(platform: 'SlurmPlatform', experiment: Experiment) -> SimulationIndex:
+    """
+    Generate the manifest simulation_index.txt of the simulations run by the array tasks.
+
+    The first line records how simulations are packed in tasks, then each line holds the id and the directory of a
+    simulation, task i running the i-th slice of sims_per_task lines. Lines are padded to the same width, so
+    run_simulation.sh seeks to its lines instead of listing the experiment directory.
+    Args:
+        platform: Slurm Platform
+        experiment: idmtools Experiment
+    Returns:
+        SimulationIndex
+    """
+    simulations = list(experiment.simulations)
+    parallel = (platform.cpus_per_task or 1) if platform.parallel_sims else 1
+    sims_per_task, simulations = pack_simulations(simulations, platform.sims_per_task,
+                                                  get_runtime_estimates(simulations, platform.runtime_estimate),
+                                                  platform.task_runtime, parallel)
+    index = SimulationIndex(array_batch_size=0, sims_per_task=sims_per_task, parallel=parallel,
+                            simulations=[(sim.id, platform.get_directory(sim).name) for sim in simulations])
+    index.array_batch_size = get_array_batch_size(platform, index.tasks)
+
+    lines = [f"# array_batch_size={index.array_batch_size} sims_per_task={sims_per_task} parallel={parallel}".encode()]
+    lines.extend(f"{sim_id} {sim_dir}".encode() for sim_id, sim_dir in index.simulations)
+    width = max(len(line) for line in lines)
+    output_target = platform.get_directory(experiment).joinpath(SIMULATION_INDEX_FILE)
+    with open(output_target, "wb") as tout:
+        tout.writelines(line.ljust(width) + b"\n" for line in lines)
+    return index
+
+
+def read_simulation_index(experiment_dir: Union[Path, str]) -> Optional[SimulationIndex]:
+    """
+    Read the manifest simulation_index.txt of an experiment.
+    Args:
+        experiment_dir: experiment directory
+    Returns:
+        SimulationIndex, None if the experiment has no manifest
+    """
+    index_file = Path(experiment_dir).joinpath(SIMULATION_INDEX_FILE)
+    if not index_file.exists():
+        return None
+    with open(index_file, encoding="utf-8") as f:
+        header, *lines = f.read().splitlines()
+    values = dict(item.split("=") for item in header.split()[1:])
+    return SimulationIndex(array_batch_size=int(values["array_batch_size"]),
+                           sims_per_task=int(values.get("sims_per_task", 1)), parallel=int(values.get("parallel", 1)),
+                           simulations=[tuple(line.rstrip().split(" ", 1)) for line in lines])
@@ -2,22 +2,54 @@
 # Get the parameters passed from sbatch.sh
 mpi_type="$2"
 
-SIMULATION_INDEX=$((${SLURM_ARRAY_TASK_ID} + $1))
-JOB_DIRECTORY=$(find . -type d -maxdepth 1 -mindepth 1  | grep -v Assets | head -$SIMULATION_INDEX | tail -1)
-cd $JOB_DIRECTORY
-current_dir=$(pwd)
-echo "The script is running from: $current_dir"
+run_simulation() {
+    cd "$1"
+    current_dir=$(pwd)
+    echo "The script is running from: $current_dir"
 
-# Run the simulation based on whether MPI is required
-if [ "$mpi_type" = "no-mpi" ]; then
-    echo "Run without MPI"
-    srun _run.sh 1> stdout.txt 2> stderr.txt
-elif [ "$mpi_type" = "mpirun" ]; then
-    echo "Run mpirun"
-    mpirun "$current_dir"/_run.sh 1> stdout.txt 2> stderr.txt
-elif [ "$mpi_type" = "pmi2" ] || [ "$mpi_type" = "pmix" ]; then # pmi2 or pmix
-    echo "Run MPI with $mpi_type"
-    srun --mpi=$mpi_type _run.sh 1> stdout.txt 2> stderr.txt
+    # Run the simulation based on whether MPI is required
+    if [ "$mpi_type" = "no-mpi" ]; then
+        echo "Run without MPI"
+        srun $srun_options _run.sh 1> stdout.txt 2> stderr.txt
+    elif [ "$mpi_type" = "mpirun" ]; then
+        echo "Run mpirun"
+        mpirun "$current_dir"/_run.sh 1> stdout.txt 2> stderr.txt
+    elif [ "$mpi_type" = "pmi2" ] || [ "$mpi_type" = "pmix" ]; then # pmi2 or pmix
+        echo "Run MPI with $mpi_type"
+        srun --mpi=$mpi_type _run.sh 1> stdout.txt 2> stderr.txt
+    else
+        echo "Invalid MPI type: $mpi_type"
+    fi
+}
+
+TASK_INDEX=$((${SLURM_ARRAY_TASK_ID} + $1))
+if [ -f simulation_index.txt ]; then
+    # The header of the manifest tells how many simulations each task runs, and how many at the same time
+    HEADER=$(head -n 1 simulation_index.txt)
+    SIMS_PER_TASK=$(echo "$HEADER" | sed -n 's/.*sims_per_task=\([0-9]*\).*/\1/p')
+    SIMS_PER_TASK=${SIMS_PER_TASK:-1}
+    PARALLEL=$(echo "$HEADER" | sed -n 's/.*parallel=\([0-9]*\).*/\1/p')
+    PARALLEL=${PARALLEL:-1}
+    if [ "$PARALLEL" -gt 1 ] && [ "$mpi_type" = "no-mpi" ]; then
+        # Each simulation gets one CPU of the task
+        srun_options="--exact --ntasks=1 --cpus-per-task=1"
+    else
+        PARALLEL=1
+    fi
+
+    # All lines of the manifest have the same width: seek to the first line of the task, after the header line
+    LINE_WIDTH=$(echo "$HEADER" | wc -c)
+    FIRST_LINE=$(((TASK_INDEX - 1) * SIMS_PER_TASK + 1))
+    tail -c +$((FIRST_LINE * LINE_WIDTH + 1)) simulation_index.txt | head -n $SIMS_PER_TASK | {
+        while read -r _ JOB_DIRECTORY; do
+            while [ "$(jobs -rp | wc -l)" -ge "$PARALLEL" ]; do
+                wait -n
+            done
+            (run_simulation "$JOB_DIRECTORY") < /dev/null &
+        done
+        wait
+    }
 else
-    echo "Invalid MPI type: $mpi_type"
+    JOB_DIRECTORY=$(find . -type d -maxdepth 1 -mindepth 1  | grep -v Assets | head -$TASK_INDEX | tail -1)
+    run_simulation $JOB_DIRECTORY
 fi
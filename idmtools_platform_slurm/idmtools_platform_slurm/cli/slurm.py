@@ -37,9 +37,10 @@ def slurm(ctx: click.Context, job_directory):
 @click.option('--verbose/--no-verbose', default=True, help="Enable verbose output in results")
 @click.option('--display/--no-display', default=True, help="Display with working directory or not")
 @click.option('--display-count', default=20, help="Display Count")
+@click.option('--watch', default=None, type=float, help="Refresh every WATCH seconds until all simulations are done")
 @click.pass_context
 def status_report(ctx: click.Context, suite_id, exp_id, status_filter, sim_filter, job_filter, root, verbose, display,
-                  display_count):
+                  display_count, watch):
     job_dir = ctx.obj['job_directory']
 
     if suite_id is not None:
@@ -55,7 +56,8 @@ def status_report(ctx: click.Context, suite_id, exp_id, status_filter, sim_filte
                            status_filter=status_filter if len(status_filter) > 0 else None,
                            job_filter=job_filter if len(job_filter) > 0 else None,
                            sim_filter=sim_filter if len(sim_filter) > 0 else None,
-                           root=root, verbose=verbose, display=display, display_count=display_count)
+                           root=root, verbose=verbose, display=display, display_count=display_count,
+                           watch=watch)
 
 
 @slurm.command(help="Get Suite/Experiment/Simulation directory")
@@ -134,18 +136,20 @@ def get_latest(ctx: click.Context):
 @slurm.command(help="Get simulation's status")
 @click.option('--exp-id', default=None, help="Idmtools Experiment id")
 @click.option('--display/--no-display', default=False, help="Display with working directory or not")
+@click.option('--watch', default=None, type=float, help="Refresh every WATCH seconds until all simulations are done")
 @click.pass_context
-def status(ctx: click.Context, exp_id, display):
+def status(ctx: click.Context, exp_id, display, watch):
     """
     Get job status.
     Args:
         ctx: click.Context
         exp_id: experiment id
         display: bool True/False
+        watch: refresh interval in seconds
     Returns:
         None
     """
     job_dir = ctx.obj['job_directory']
     platform = Platform('SLURM_LOCAL', job_directory=job_dir)
 
-    check_status(platform=platform, exp_id=exp_id, display=display)
+    check_status(platform=platform, exp_id=exp_id, display=display, watch=watch)
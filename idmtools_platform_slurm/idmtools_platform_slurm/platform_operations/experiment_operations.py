@@ -10,7 +10,9 @@ from typing import TYPE_CHECKING
 from idmtools.core import EntityStatus
 from idmtools.core import ItemType
 from idmtools.entities.experiment import Experiment
+from idmtools.entities.simulation_table import SimulationTable
 from idmtools_platform_file.platform_operations.experiment_operations import FilePlatformExperimentOperations
+from idmtools_platform_slurm.assets import generate_batch, generate_simulation_index, read_simulation_index
 from logging import getLogger
 
 
@@ -38,6 +40,12 @@ class SlurmPlatformExperimentOperations(FilePlatformExperimentOperations):
         """
         # Ensure parent
         super().platform_run_item(experiment, **kwargs)
+        # Map the array tasks to the simulations
+        index = generate_simulation_index(self.platform, experiment)
+        if index.tasks != experiment.simulation_count:
+            # Simulations are packed: submit one array task per group of simulations
+            generate_batch(self.platform, experiment, kwargs.get('max_running_jobs'), kwargs.get('array_batch_size'),
+                           kwargs.get('dependency'), njobs=index.tasks)
         # Commission
         if not dry_run:
             self.platform.submit_job(experiment, **kwargs)
@@ -58,8 +66,31 @@ class SlurmPlatformExperimentOperations(FilePlatformExperimentOperations):
             return
 
         # Refresh status for each simulation
+        self.refresh_simulation_status(experiment, **kwargs)
+
+    def refresh_simulation_status(self, experiment: Experiment, **kwargs):
+        """
+        Refresh the status of each simulation of an experiment, finding the simulation directories in the manifest.
+        Args:
+            experiment: idmtools Experiment
+            kwargs: keyword arguments used to expand functionality
+        Returns:
+            None
+        """
+        experiment_dir = self.platform.get_directory(experiment)
+        index = read_simulation_index(experiment_dir)
+        if index is None:
+            super().refresh_simulation_status(experiment, **kwargs)
+            return
+
+        directories = {sim_id: experiment_dir.joinpath(sim_dir) for sim_id, sim_dir in index.simulations}
+        simulations = experiment.simulations.items
+        if isinstance(simulations, SimulationTable):
+            for sim_id in simulations.ids:
+                simulations.set_status(sim_id, self._get_simulation_status(sim_id, directories.get(sim_id), **kwargs))
+            return
         for sim in experiment.simulations:
-            sim.status = self.platform.get_simulation_status(sim.id, **kwargs)
+            sim.status = self._get_simulation_status(sim.id, directories.get(sim.id), **kwargs)
 
     def platform_cancel(self, experiment_id: str, force: bool = True) -> None:
         """
@@ -34,7 +34,16 @@ class SlurmPlatformSimulationOperations(FilePlatformSimulationOperations):
         sim = self.platform.get_item(sim_id, ItemType.SIMULATION, raw=False)
         if force or sim.status == EntityStatus.RUNNING:
             logger.debug(f"cancel slurm job for simulation: {sim_id}...")
+            # the job of a simulation packed with others is their array task: cancelling it would stop them too
+            packed = self.platform._op_client.get_task_simulations(sim)
+            if len(packed) > 1:
+                user_logger.warning(f"Simulation {sim_id} shares its Slurm array task with {len(packed) - 1} other "
+                                    f"simulation(s) and cannot be cancelled alone. Cancel its experiment instead.")
+                return
             job_id = self.platform.get_job_id(sim_id, ItemType.SIMULATION)
+            if job_id is None:
+                # The simulation has not started yet: find its array task in the manifest
+                job_id = self.platform._op_client.get_array_task_id(sim)
             if job_id is None:
                 logger.debug(f"Slurm job for simulation: {sim_id} is not available!")
                 return
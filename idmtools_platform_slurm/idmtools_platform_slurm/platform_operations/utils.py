@@ -3,12 +3,17 @@ This is SlurmPlatform operations utils.
 
 Copyright 2025, Gates Foundation. All rights reserved.
 """
+import heapq
+import math
 import os
 import subprocess
 from logging import getLogger
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar, Union
 
 logger = getLogger(__name__)
 
+T = TypeVar('T')
+
 
 def get_max_array_size():
     """
@@ -43,3 +48,64 @@ def check_home(directory: str) -> bool:
         return True
     else:
         return False
+
+
+def get_runtime_estimates(simulations: Sequence, runtime_estimate: Union[str, Callable]) -> Optional[List[float]]:
+    """
+    Get the estimated runtime of each simulation.
+    Args:
+        simulations: simulations
+        runtime_estimate: tag holding the estimated runtime of a simulation, or function of a simulation returning it
+    Returns:
+        estimated runtimes, None without runtime_estimate. Simulations without estimate get the mean of the others
+    """
+    if runtime_estimate is None:
+        return None
+    if callable(runtime_estimate):
+        estimates = [runtime_estimate(sim) for sim in simulations]
+    else:
+        estimates = [(sim.tags or {}).get(runtime_estimate) for sim in simulations]
+    known = [float(e) for e in estimates if e is not None]
+    default = sum(known) / len(known) if known else 1.0
+    return [float(e) if e is not None else default for e in estimates]
+
+
+def pack_simulations(simulations: Sequence[T], sims_per_task: Optional[int] = None,
+                     estimates: Optional[Sequence[float]] = None, task_runtime: Optional[float] = None,
+                     parallel: int = 1) -> Tuple[int, List[T]]:
+    """
+    Group simulations into array tasks.
+
+    Without estimates, task i runs the simulations i * sims_per_task to (i + 1) * sims_per_task - 1 in their
+    order. With estimates, simulations are balanced between tasks, longest first, so tasks have similar runtimes.
+    Args:
+        simulations: simulations to run
+        sims_per_task: simulations per task. Computed from the estimates and task_runtime when not set, else 1
+        estimates: estimated runtime of each simulation
+        task_runtime: target runtime of a task, in the unit of the estimates
+        parallel: number of simulations a task runs at the same time
+    Returns:
+        simulations per task, and the simulations ordered so task i runs the i-th slice of sims_per_task of them
+    """
+    count = len(simulations)
+    if sims_per_task is None:
+        if estimates and task_runtime:
+            sims_per_task = int(task_runtime * parallel * count / sum(estimates)) if sum(estimates) else count
+        else:
+            sims_per_task = 1
+    sims_per_task = max(1, min(sims_per_task, count))
+    if not estimates or sims_per_task == 1:
+        return sims_per_task, list(simulations)
+
+    # Longest processing time first, each task limited to its number of simulations
+    tasks = math.ceil(count / sims_per_task)
+    capacities = [sims_per_task] * (tasks - 1) + [count - (tasks - 1) * sims_per_task]
+    groups = [[] for _ in range(tasks)]
+    loads = [(0.0, i) for i in range(tasks)]
+    for i in sorted(range(count), key=lambda i: estimates[i], reverse=True):
+        load, task = heapq.heappop(loads)
+        groups[task].append(i)
+        if len(groups[task]) < capacities[task]:
+            heapq.heappush(loads, (load + estimates[i], task))
+    # Longest first in each task too, so parallel slots are balanced
+    return sims_per_task, [simulations[i] for group in groups for i in group]
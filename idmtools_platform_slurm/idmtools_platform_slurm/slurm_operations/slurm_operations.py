@@ -6,12 +6,14 @@ Copyright 2025, Gates Foundation. All rights reserved.
 import subprocess
 from dataclasses import dataclass, field
 from logging import getLogger
-from typing import Union, List, Any, Type
+from typing import Union, List, Any, Type, Optional
 
+from idmtools.core import ItemType
 from idmtools.entities.experiment import Experiment
 from idmtools.entities.simulation import Simulation
 from idmtools_platform_file.file_operations.file_operations import FileOperations
-from idmtools_platform_slurm.assets import generate_batch, generate_script, generate_simulation_script
+from idmtools_platform_slurm.assets import generate_batch, generate_script, generate_simulation_script, \
+    read_simulation_index
 
 
 logger = getLogger(__name__)
@@ -41,6 +43,38 @@ class SlurmOperations(FileOperations):
         else:
             raise NotImplementedError(f"{item.__class__.__name__} is not supported for batch creation.")
 
+    def get_array_task_id(self, simulation: Simulation) -> Optional[str]:
+        """
+        Get the Slurm array task id of a simulation from the manifest of its experiment.
+
+        The id is shared by all the simulations packed in the task, see :meth:`get_task_simulations`.
+        Args:
+            simulation: idmtools Simulation
+        Returns:
+            array task id as <array job id>_<task id>, None if the experiment has no manifest or no job
+        """
+        experiment_dir = self.platform.get_directory_by_id(simulation.parent_id, ItemType.EXPERIMENT)
+        index = read_simulation_index(experiment_dir)
+        job_ids = self.platform.get_job_id(simulation.parent_id, ItemType.EXPERIMENT)
+        if index is None or job_ids is None:
+            return None
+        task = index.get_task(simulation.id)
+        if task is None or task[0] >= len(job_ids):
+            return None
+        return f"{job_ids[task[0]]}_{task[1]}"
+
+    def get_task_simulations(self, simulation: Simulation) -> List[str]:
+        """
+        Get the simulations packed in the Slurm array task of a simulation.
+        Args:
+            simulation: idmtools Simulation
+        Returns:
+            ids of the simulations of the task, including the simulation, empty if the experiment has no manifest
+        """
+        experiment_dir = self.platform.get_directory_by_id(simulation.parent_id, ItemType.EXPERIMENT)
+        index = read_simulation_index(experiment_dir)
+        return [] if index is None else index.get_task_simulations(simulation.id)
+
     @staticmethod
     def cancel_job(job_ids: Union[str, List[str]]) -> Any:
         """
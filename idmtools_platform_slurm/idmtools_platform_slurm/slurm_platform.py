@@ -4,7 +4,7 @@ Here we implement the SlurmPlatform object.
 Copyright 2025, Gates Foundation. All rights reserved.
 """
 import subprocess
-from typing import Optional, Any, Dict, List, Union, Literal
+from typing import Optional, Any, Dict, List, Union, Literal, Callable
 from dataclasses import dataclass, field, fields
 from logging import getLogger
 from idmtools.core import ItemType
@@ -95,6 +95,21 @@ class SlurmPlatform(FilePlatform):
     # Set array max size for Slurm job
     array_batch_size: int = field(default=None, metadata=dict(sbatch=False, help="Array batch size"))
 
+    # Pack several simulations in each array task. Packed simulations share their job: they are cancelled with their
+    # experiment, not one by one
+    sims_per_task: int = field(default=None, metadata=dict(sbatch=False, help="Number of simulations per array task"))
+
+    # Run the simulations of an array task in parallel, one per CPU of cpus_per_task
+    parallel_sims: bool = field(default=False, metadata=dict(sbatch=False,
+                                                             help="Run the simulations of a task in parallel"))
+
+    # Tag holding the estimated runtime of each simulation, or function of a simulation returning it
+    runtime_estimate: Union[str, Callable] = field(default=None, metadata=dict(
+        sbatch=False, help="Tag or function giving the estimated runtime of a simulation"))
+
+    # Target runtime of an array task, in the unit of runtime_estimate, to compute sims_per_task
+    task_runtime: float = field(default=None, metadata=dict(sbatch=False, help="Target runtime of an array task"))
+
     # determine if run script as Slurm job
     run_on_slurm: bool = field(default=False, repr=False, compare=False, metadata=dict(help="Run script as Slurm job"))
 
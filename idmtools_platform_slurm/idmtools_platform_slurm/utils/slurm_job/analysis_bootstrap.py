@@ -0,0 +1,128 @@
+"""
+Entry point of the map and reduce jobs of a :class:`~idmtools_platform_slurm.utils.slurm_job.slurm_analysis.SlurmAnalysis`.
+
+The jobs run in the analysis directory::
+
+    python3 -m idmtools_platform_slurm.utils.slurm_job.analysis_bootstrap map --task $SLURM_ARRAY_TASK_ID
+    python3 -m idmtools_platform_slurm.utils.slurm_job.analysis_bootstrap reduce
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import argparse
+import importlib
+import os
+import pickle
+import sys
+from logging import getLogger
+from typing import Any, Dict, List
+from idmtools.analysis.sharding import ShardAnalyzeManager, merge_shard_results, read_shard_ids
+from idmtools.entities import IAnalyzer
+from idmtools_platform_slurm.utils.slurm_job.slurm_analysis import ANALYSIS_FILE, RESULTS_FILE, SHARD_IDS_FILE, \
+    SHARD_OUTPUT_FILE
+
+logger = getLogger(__name__)
+user_logger = getLogger('user')
+
+
+def load_analysis(analysis_dir: str) -> Dict[str, Any]:
+    """
+    Load the pickled analysis.
+
+    Args:
+        analysis_dir: Analysis directory
+
+    Returns:
+        Analysis with the platform and the analyzer instances
+    """
+    sys.path.insert(0, analysis_dir)
+    with open(os.path.join(analysis_dir, ANALYSIS_FILE), 'rb') as f:
+        analysis = pickle.load(f)
+    analyzers: List[IAnalyzer] = []
+    for module, class_name, args in analysis['analyzers']:
+        analyzers.append(getattr(importlib.import_module(module), class_name)(**args))
+    analysis['analyzers'] = analyzers
+    return analysis
+
+
+def run_map(analysis_dir: str, task: int) -> bool:
+    """
+    Map the slice of simulations of an array task and save the partial results.
+
+    Args:
+        analysis_dir: Analysis directory
+        task: Array task id, starting at one
+
+    Returns:
+        True if the analysis of all the simulations succeeded
+    """
+    analysis = load_analysis(analysis_dir)
+    ids = read_shard_ids(os.path.join(analysis_dir, SHARD_IDS_FILE.format(task=task)))
+    am = ShardAnalyzeManager(platform=analysis['platform'], ids=ids, analyzers=analysis['analyzers'],
+                             shard_output=os.path.join(analysis_dir, SHARD_OUTPUT_FILE.format(task=task)),
+                             **analysis['extra_args'])
+    return am.analyze()
+
+
+def run_reduce(analysis_dir: str) -> bool:
+    """
+    Merge the partial results of the array tasks, reduce, and save the results.
+
+    Args:
+        analysis_dir: Analysis directory
+
+    Returns:
+        True if the reduce succeeded
+    """
+    analysis = load_analysis(analysis_dir)
+    shard_results, missing = [], []
+    for task in range(1, analysis['shards'] + 1):
+        path = os.path.join(analysis_dir, SHARD_OUTPUT_FILE.format(task=task))
+        if not os.path.exists(path):
+            missing.append(task)
+            continue
+        with open(path, 'rb') as f:
+            shard_results.append(pickle.load(f))
+    if missing:
+        message = f"{len(missing)} of {analysis['shards']} map tasks have no results: {missing}"
+        if not analysis['allow_partial_results'] or not shard_results:
+            user_logger.error(message)
+            return False
+        user_logger.warning(f"{message}. Reducing the results of the other tasks.")
+
+    results = merge_shard_results(analysis['analyzers'], shard_results, working_dir=analysis_dir)
+    try:
+        with open(os.path.join(analysis_dir, RESULTS_FILE), 'wb') as out:
+            pickle.dump(results, out)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        user_logger.warning(f"The reduce results could not be saved: {e}")
+    return True
+
+
+def main(args: List[str] = None) -> int:
+    """
+    Run the map or the reduce step.
+
+    Args:
+        args: Command line arguments
+
+    Returns:
+        Exit code
+    """
+    parser = argparse.ArgumentParser("Slurm analysis job")
+    parser.add_argument("step", choices=["map", "reduce"], help="Step of the analysis to run")
+    parser.add_argument("--task", type=int, help="Array task id of the map step")
+    parser.add_argument("--analysis-dir", default=os.getcwd(), help="Analysis directory")
+    options = parser.parse_args(args)
+
+    analysis_dir = os.path.abspath(options.analysis_dir)
+    if options.step == "map":
+        if options.task is None:
+            parser.error("--task is required by the map step")
+        succeeded = run_map(analysis_dir, options.task)
+    else:
+        succeeded = run_reduce(analysis_dir)
+    return 0 if succeeded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Run analyzers as Slurm jobs, next to the data.
+
+The simulations to analyze are split into contiguous slices. An array job maps one slice per task and saves the
+partial results of the analyzers, then a reduce job, which depends on the array job, merges them. The analyzers are
+pickled as :class:`~idmtools.analysis.platform_anaylsis.PlatformAnalysis` does: their source files are copied next to
+the jobs and imported by the tasks.
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import inspect
+import os
+import pickle
+import shutil
+import subprocess
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type, TYPE_CHECKING
+from idmtools.analysis.sharding import partition_items, write_shard_ids
+from idmtools.core import ItemType, NoPlatformException
+from idmtools.entities import IAnalyzer
+from idmtools_platform_slurm.utils.slurm_job import slurm_installed
+from idmtools_platform_slurm.utils.slurm_job.slurm_job import generate_script
+
+if TYPE_CHECKING:  # pragma: no cover
+    from idmtools_platform_slurm.slurm_platform import SlurmPlatform
+
+logger = getLogger(__name__)
+user_logger = getLogger('user')
+
+ANALYSIS_FILE = "analysis.pkl"
+MAP_SCRIPT = "map_sbatch.sh"
+REDUCE_SCRIPT = "reduce_sbatch.sh"
+RESULTS_FILE = "results.pkl"
+JOB_ID_FILE = "job_id.txt"
+SHARD_IDS_FILE = "ids_{task}.json"
+SHARD_OUTPUT_FILE = "shard_{task}.pkl"
+BOOTSTRAP_MODULE = "idmtools_platform_slurm.utils.slurm_job.analysis_bootstrap"
+
+#: sacct states of jobs that are finished
+FINAL_STATES = {'COMPLETED', 'FAILED', 'CANCELLED', 'TIMEOUT', 'OUT_OF_MEMORY', 'NODE_FAIL', 'PREEMPTED',
+                'BOOT_FAIL', 'DEADLINE'}
+
+
+@dataclass(repr=False)
+class SlurmAnalysis:
+    """
+    Run analyzers as a Slurm array job (map) followed by a dependent reduce job.
+
+    Examples:
+        .. code-block:: python
+
+            analysis = SlurmAnalysis(platform=platform, analyzers=[MyAnalyzer],
+                                     ids=[(experiment_id, ItemType.EXPERIMENT)], shards=20)
+            analysis.run()
+            analysis.wait()
+            results = analysis.get_results()
+    """
+    #: Slurm platform
+    platform: 'SlurmPlatform' = field(default=None)
+    #: Analyzer classes
+    analyzers: List[Type[IAnalyzer]] = field(default_factory=list)
+    #: Arguments of each analyzer
+    analyzers_args: List[Dict[str, Any]] = field(default=None)
+    #: Items to analyze. Suites and experiments are expanded to their simulations
+    ids: List[Tuple[str, ItemType]] = field(default_factory=list)
+    #: Number of array tasks. Each task maps a contiguous slice of simulations
+    shards: int = field(default=10)
+    #: Name of the analysis, used for the analysis directory
+    analysis_name: str = field(default='analysis')
+    #: Directory of the scripts, partial results, and analyzers output. Defaults to a new directory under
+    #: job_directory/analysis
+    working_directory: str = field(default=None)
+    #: Python used by the jobs
+    executable: str = field(default='python3')
+    #: Maximum number of array tasks running at the same time. Defaults to the platform max_running_jobs
+    max_running_jobs: Optional[int] = field(default=None)
+    #: Reduce the slices that succeeded even if some tasks failed
+    allow_partial_results: bool = field(default=False)
+    #: Extra arguments of the AnalyzeManager of each task, such as max_workers
+    extra_args: Dict[str, Any] = field(default_factory=dict)
+    #: sbatch options of the jobs, overriding the platform ones
+    sbatch_options: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        """
+        Validate the analysis and set the defaults.
+
+        Raises:
+            NoPlatformException: when no platform is given or in the current context
+            ValueError: when the analyzers arguments do not match the analyzers
+        """
+        if self.platform is None:
+            from idmtools.core.context import CURRENT_PLATFORM
+            if CURRENT_PLATFORM is None:
+                raise NoPlatformException("No Platform defined on object, in current context, or passed to run")
+            self.platform = CURRENT_PLATFORM
+        if self.analyzers_args is None:
+            self.analyzers_args = [{}] * len(self.analyzers)
+        if len(self.analyzers_args) != len(self.analyzers):
+            raise ValueError("analyzers_args must have one entry per analyzer")
+        if self.shards < 1:
+            raise ValueError("The number of shards must be greater or equal to one")
+        if self.working_directory is None:
+            name = f"{self.analysis_name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+            self.working_directory = str(Path(self.platform.job_directory).joinpath("analysis", name).absolute())
+        self.map_job_id = None
+        self.reduce_job_id = None
+        self.task_count = 0
+
+    def _get_items(self) -> List[Tuple[str, ItemType]]:
+        """
+        List the simulations to analyze.
+
+        Returns:
+            Unique simulations, in the order of the ids
+        """
+        items = []
+        for item_id, item_type in self.ids:
+            if item_type == ItemType.SIMULATION:
+                items.append((str(item_id), item_type))
+            else:
+                item = self.platform.get_item(item_id, item_type, force=True)
+                items.extend((str(sim.id), ItemType.SIMULATION) for sim in self.platform.flatten_item(item))
+        return list(dict.fromkeys(items))
+
+    def _write_analyzers(self, analysis_dir: Path) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Copy the source files of the analyzers to the analysis directory.
+
+        Args:
+            analysis_dir: Analysis directory
+
+        Returns:
+            Module name, class name, and arguments of each analyzer
+        """
+        specs = []
+        for analyzer, args in zip(self.analyzers, self.analyzers_args):
+            source = inspect.getfile(analyzer)
+            shutil.copy(source, analysis_dir.joinpath(os.path.basename(source)))
+            specs.append((Path(source).stem, analyzer.__name__, args))
+        return specs
+
+    def prepare(self) -> int:
+        """
+        Write the shard ids, the pickled analyzers and platform, and the batch files of the map and reduce jobs.
+
+        Returns:
+            Number of array tasks
+        """
+        analysis_dir = Path(self.working_directory)
+        analysis_dir.mkdir(parents=True, exist_ok=True)
+        max_array_size = getattr(self.platform, '_max_array_size', None)
+        shard_count = min(self.shards, max_array_size) if max_array_size else self.shards
+        shards = partition_items(self._get_items(), shard_count)
+        for task, shard in enumerate(shards, start=1):
+            analysis_dir.joinpath(SHARD_IDS_FILE.format(task=task)).write_bytes(write_shard_ids(shard))
+
+        analysis = dict(platform=self.platform, analyzers=self._write_analyzers(analysis_dir), shards=len(shards),
+                        extra_args=self.extra_args, allow_partial_results=self.allow_partial_results)
+        with open(analysis_dir.joinpath(ANALYSIS_FILE), 'wb') as out:
+            pickle.dump(analysis, out)
+
+        # Analysis jobs run a single task, whatever the simulations need
+        options = dict(ntasks=None, nodes=None)
+        options.update(self.sbatch_options)
+        command = f"{self.executable} -m {BOOTSTRAP_MODULE}"
+        # the analysis jobs have their own logs and do not track a job status like the simulations
+        generate_script(self.platform, f"{command} map --task $SLURM_ARRAY_TASK_ID", batch_dir=analysis_dir,
+                        script_name=MAP_SCRIPT, output="stdout_map_%a.txt", error="stderr_map_%a.txt",
+                        track_status=False, **options)
+        generate_script(self.platform, f"{command} reduce", batch_dir=analysis_dir, script_name=REDUCE_SCRIPT,
+                        output="stdout_reduce.txt", error="stderr_reduce.txt", track_status=False, **options)
+        self.task_count = len(shards)
+        logger.debug(f"Prepared {len(shards)} analysis tasks in {analysis_dir}")
+        return self.task_count
+
+    def _sbatch(self, *args: str) -> str:
+        """
+        Submit a batch file.
+
+        Args:
+            args: sbatch arguments
+
+        Returns:
+            Slurm job id
+
+        Raises:
+            RuntimeError: when the submission fails
+        """
+        result = subprocess.run(['sbatch', '--parsable', *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                cwd=self.working_directory)
+        if result.returncode != 0:
+            raise RuntimeError(f"sbatch {' '.join(args)} failed: {result.stderr.decode('utf-8').strip()}")
+        return result.stdout.decode('utf-8').strip().split(';')[0]
+
+    def run(self, dry_run: bool = False) -> 'SlurmAnalysis':
+        """
+        Submit the map array job and the reduce job.
+
+        Args:
+            dry_run: Only write the files of the jobs
+
+        Returns:
+            The analysis
+        """
+        self.prepare()
+        if dry_run:
+            user_logger.warning('Analysis is running with dry_run = True')
+            return self
+        if not slurm_installed():
+            raise RuntimeError('Slurm is not installed/available!')
+
+        max_running_jobs = self.max_running_jobs or self.platform.max_running_jobs or self.task_count
+        self.map_job_id = self._sbatch(f'--array=1-{self.task_count}%{max_running_jobs}', MAP_SCRIPT)
+        dependency = 'afterany' if self.allow_partial_results else 'afterok'
+        self.reduce_job_id = self._sbatch(f'--dependency={dependency}:{self.map_job_id}', '--kill-on-invalid-dep=yes',
+                                          REDUCE_SCRIPT)
+        Path(self.working_directory).joinpath(JOB_ID_FILE).write_text(f"{self.map_job_id}\n{self.reduce_job_id}\n")
+
+        user_logger.info(f"{'map job_id: '.ljust(20)} {self.map_job_id} ({self.task_count} tasks)")
+        user_logger.info(f"{'reduce job_id: '.ljust(20)} {self.reduce_job_id}")
+        user_logger.info(f"{'analysis directory: '.ljust(20)} {self.working_directory}")
+        return self
+
+    def get_job_states(self) -> Dict[str, str]:
+        """
+        Get the state of the map tasks and of the reduce job from sacct.
+
+        Returns:
+            State by Slurm job id, array tasks being reported as <job id>_<task>
+        """
+        job_ids = [job_id for job_id in (self.map_job_id, self.reduce_job_id) if job_id]
+        if not job_ids:
+            return {}
+        result = subprocess.run(['sacct', '-j', ','.join(job_ids), '-X', '-n', '-P', '--format=JobID,State'],
+                                stdout=subprocess.PIPE)
+        states = {}
+        for line in result.stdout.decode('utf-8').splitlines():
+            if '|' in line:
+                job_id, state = line.strip().split('|', 1)
+                # sacct reports e.g. "CANCELLED by 123"
+                states[job_id] = state.split(' ')[0]
+        return states
+
+    def wait(self, timeout: int = 86400, interval: int = 10) -> str:
+        """
+        Wait for the reduce job to finish.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+            interval: Time between sacct checks in seconds
+
+        Returns:
+            Final state of the reduce job
+
+        Raises:
+            RuntimeError: when the analysis was not submitted
+            TimeoutError: when the reduce job is not finished after timeout
+        """
+        if self.reduce_job_id is None:
+            raise RuntimeError("The analysis was not submitted")
+        start_time = time.time()
+        while True:
+            state = self.get_job_states().get(self.reduce_job_id)
+            if state in FINAL_STATES:
+                if state != 'COMPLETED':
+                    user_logger.error(f"Analysis job {self.reduce_job_id} finished with state {state}. "
+                                      f"Check the stderr files in {self.working_directory}")
+                return state
+            if time.time() - start_time > timeout:
+                raise TimeoutError(f"Analysis job {self.reduce_job_id} did not finish within {timeout} seconds")
+            time.sleep(interval)
+
+    def get_results(self) -> List[Any]:
+        """
+        Load the results of the reduce job.
+
+        Returns:
+            Reduce result of each analyzer, in analyzer order
+
+        Raises:
+            FileNotFoundError: when the reduce job did not save results
+        """
+        with open(Path(self.working_directory).joinpath(RESULTS_FILE), 'rb') as f:
+            return pickle.load(f)
@@ -11,7 +11,7 @@ from pathlib import Path
 from dataclasses import dataclass, field
 from typing import NoReturn, Union, List, TYPE_CHECKING
 from idmtools.core import NoPlatformException
-from jinja2 import Template
+from idmtools.utils.templates import get_renderer
 from logging import getLogger
 from idmtools_platform_slurm.utils.slurm_job import create_slurm_indicator, slurm_installed
 from typing import Tuple
@@ -29,13 +29,16 @@ TEMP_FILES = ['sbatch.sh', 'job_id.txt', 'job_status.txt', 'stdout.txt', 'stderr
 
 
 def generate_script(platform: 'SlurmPlatform', command: str,
-                    template: Union[Path, str] = DEFAULT_TEMPLATE_FILE, batch_dir: str = None, **kwargs) -> None:
+                    template: Union[Path, str] = DEFAULT_TEMPLATE_FILE, batch_dir: str = None,
+                    script_name: str = "sbatch.sh", **kwargs) -> None:
     """
     Generate batch file sbatch.sh
     Args:
         platform: Slurm Platform
         command: execution command
         template: template to be used to build batch file
+        batch_dir: directory of the batch file. Defaults to the current directory
+        script_name: name of the batch file
         kwargs: keyword arguments used to expand functionality
     Returns:
         None
@@ -55,17 +58,13 @@ def generate_script(platform: 'SlurmPlatform', command: str,
     if platform.modules:
         template_vars['modules'] = platform.modules
 
-    with open(Path(__file__).parent.joinpath(template)) as tin:
-        t = Template(tin.read())
-
     # Write our file
     if batch_dir is None:
-        output_target = Path.cwd().joinpath("sbatch.sh")
+        output_target = Path.cwd().joinpath(script_name)
     else:
-        output_target = Path(batch_dir).joinpath("sbatch.sh")
+        output_target = Path(batch_dir).joinpath(script_name)
 
-    with open(output_target, "w") as tout:
-        tout.write(t.render(template_vars))
+    get_renderer().render_to_file(Path(__file__).parent.joinpath(template), output_target, template_vars)
 
     # Make executable
     platform.update_script_mode(output_target)
@@ -7,7 +7,7 @@ import os
 from pathlib import Path
 from logging import getLogger
 from typing import Dict, TYPE_CHECKING
-from idmtools.core import ItemType
+from idmtools_platform_file.tools.status_report.utils import check_status as file_check_status
 
 if TYPE_CHECKING:  # pragma: no cover
     from idmtools.entities.iplatform import IPlatform
@@ -44,13 +44,14 @@ def get_latest_experiment(platform: 'IPlatform') -> Dict:
         raise FileNotFoundError("Could not find the last Experiment")
 
 
-def check_status(platform: 'IPlatform', exp_id: str = None, display: bool = False) -> None:
+def check_status(platform: 'IPlatform', exp_id: str = None, display: bool = False, watch: float = None) -> None:
     """
     List simulations status.
     Args:
         platform: Platform
         exp_id: experiment id
         display: True/False
+        watch: refresh interval in seconds; keep refreshing until all simulations are done. None to report once
     Returns:
         None
     """
@@ -58,51 +59,4 @@ def check_status(platform: 'IPlatform', exp_id: str = None, display: bool = Fals
         exp_dic = get_latest_experiment(platform)
         exp_id = exp_dic['experiment_id']
 
-    _exp = platform.get_item(exp_id, ItemType.EXPERIMENT)
-
-    _pending = []
-    _running = []
-    _failed = []
-    _succeeded = []
-    _simulations = _exp.simulations
-    for sim in _simulations:
-        sim_dir = platform.get_directory(sim)
-        job_status_path = sim_dir.joinpath("job_status.txt")
-        if not job_status_path.exists():
-            _pending.append(f"    {sim.id}")
-        else:
-            status = open(job_status_path).read().strip()
-            if status == '0':
-                _succeeded.append(f"    {sim.id}")
-            elif status == '100':
-                _running.append(f"    {sim.id}")
-            elif status == '-1':
-                _failed.append(f"    {sim.id}")
-            else:
-                _running.append(f"    {sim.id}")
-
-    user_logger.info(f'\nExperiment Directory: \n{str(platform.get_directory(_exp))}')
-
-    # Output report
-    user_logger.info(f"\n{'Simulation Count: '.ljust(20)} {len(_simulations)}\n")
-
-    user_logger.info(f'SUCCEEDED ({len(_succeeded)})')
-    if display:
-        user_logger.info('\n'.join(_succeeded))
-
-    user_logger.info(f'FAILED ({len(_failed)})')
-    if display:
-        user_logger.info('\n'.join(_failed))
-
-    user_logger.info(f'RUNNING ({len(_running)})')
-    if display:
-        user_logger.info('\n'.join(_running))
-
-    user_logger.info(f'PENDING ({len(_pending)})')
-    if display:
-        user_logger.info('\n'.join(_pending))
-
-    if _exp.status is None:
-        user_logger.info(f'\nExperiment Status: {None}')
-    else:
-        user_logger.info(f'\nExperiment Status: {_exp.status.name}\n')
+    file_check_status(platform, exp_id=exp_id, display=display, watch=watch)
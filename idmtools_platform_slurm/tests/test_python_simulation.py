@@ -1,20 +1,26 @@
 import json
 import os
 import pathlib
+import subprocess
 from functools import partial
 from typing import Any, Dict
+from unittest import mock
 import numpy as np
 import pandas as pd
 import pytest
 
 from idmtools.builders import SimulationBuilder
-from idmtools.core import ItemType
+from idmtools.core import ItemType, EntityStatus
 from idmtools.core.platform_factory import Platform
 from idmtools.entities import Suite
 from idmtools.entities.experiment import Experiment
 from idmtools.entities.simulation import Simulation
 from idmtools.entities.templated_simulation import TemplatedSimulations
 from idmtools_models.python.json_python_task import JSONConfiguredPythonTask
+from idmtools_platform_file.file_operations.file_operations import FileOperations
+from idmtools_platform_slurm.assets import SIMULATION_INDEX_FILE, generate_simulation_index, read_simulation_index
+from idmtools_platform_slurm.platform_operations.utils import get_runtime_estimates, pack_simulations
+from idmtools_platform_slurm.slurm_operations.slurm_operations import SlurmOperations
 from idmtools_test import COMMON_INPUT_PATH
 from idmtools_test.utils.decorators import linux_only
 from idmtools_test.utils.itest_with_persistence import ITestWithPersistence
@@ -72,7 +78,8 @@ class TestPythonSimulation(ITestWithPersistence):
         for (dirpath, dirnames, filenames) in os.walk(experiment_dir):
             files.extend(filenames)
             break
-        self.assertSetEqual(set(files), set(["metadata.json", "run_simulation.sh", "sbatch.sh", "batch.sh", "tags.json"]))
+        self.assertSetEqual(set(files), set(["metadata.json", "run_simulation.sh", "sbatch.sh", "batch.sh", "tags.json",
+                                              "simulation_index.txt"]))
 
         # verify all files under simulations
         self.assertEqual(experiment.simulation_count, 9)
@@ -105,11 +112,10 @@ class TestPythonSimulation(ITestWithPersistence):
         # verify run_simulation.sh script content in experiment level
         with open(os.path.join(experiment_dir, 'run_simulation.sh'), 'r') as fpr:
             contents = fpr.read()
-        self.assertIn(
-            "JOB_DIRECTORY=$(find . -type d -maxdepth 1 -mindepth 1  | grep -v Assets | head -$SIMULATION_INDEX | tail -1)",
-            contents)
+        self.assertIn('tail -c +$((FIRST_LINE * LINE_WIDTH + 1)) simulation_index.txt | head -n $SIMS_PER_TASK',
+                      contents)
         self.assertIn("JOB_DIRECTORY", contents)
-        self.assertIn("srun _run.sh 1> stdout.txt 2> stderr.txt", contents)
+        self.assertIn("srun $srun_options _run.sh 1> stdout.txt 2> stderr.txt", contents)
 
         # verify _run.sh script content under simulation level
         simulation_ids = []
@@ -146,6 +152,119 @@ class TestPythonSimulation(ITestWithPersistence):
                     config_contents = json.loads(j.read())
                 self.assertDictEqual(contents['task']['parameters'], config_contents['parameters'])
 
+    def run_array_tasks(self, experiment_dir, tasks):
+        """Run array tasks with a fake srun writing its options and the directory it runs from."""
+        bin_dir = os.path.join(experiment_dir, "bin")
+        os.makedirs(bin_dir, exist_ok=True)
+        with open(os.path.join(bin_dir, "srun"), "w") as f:
+            f.write("#!/bin/bash\necho \"$@\"\npwd\n")
+        os.chmod(os.path.join(bin_dir, "srun"), 0o755)
+        env = dict(os.environ, PATH=bin_dir + os.pathsep + os.environ["PATH"])
+        for offset, task in tasks:
+            subprocess.run(["bash", "run_simulation.sh", str(offset), "no-mpi"], cwd=experiment_dir, check=True,
+                           env=dict(env, SLURM_ARRAY_TASK_ID=str(task)), stdout=subprocess.DEVNULL)
+
+    def read_srun_output(self, platform, simulation):
+        path = platform.get_directory(simulation).joinpath("stdout.txt")
+        if not path.exists():
+            return None
+        with open(path) as f:
+            options, directory = f.read().splitlines()
+        self.assertEqual(directory, str(platform.get_directory(simulation).resolve()))
+        return options
+
+    def test_simulation_index(self):
+        platform = Platform('SLURM_LOCAL', job_directory=self.job_directory, array_batch_size=4)
+        experiment = self.create_experiment(platform=platform, a=3, b=3)
+        experiment_dir = platform.get_directory(experiment)
+        index = read_simulation_index(experiment_dir)
+        self.assertEqual((index.array_batch_size, index.sims_per_task, index.parallel, index.tasks), (4, 1, 1, 9))
+        self.assertEqual(index.simulations,
+                         [(sim.id, platform.get_directory(sim).name) for sim in experiment.simulations])
+        with open(os.path.join(experiment_dir, SIMULATION_INDEX_FILE), 'rb') as f:
+            self.assertEqual(len({len(line) for line in f}), 1)
+
+        # each array task runs the simulation of its line
+        self.run_array_tasks(experiment_dir, [(0, 1), (0, 4), (4, 3), (8, 1)])
+        for i, simulation in enumerate(experiment.simulations):
+            self.assertEqual(self.read_srun_output(platform, simulation), "_run.sh" if i in (0, 3, 6, 8) else None)
+
+    def test_packed_simulations(self):
+        platform = Platform('SLURM_LOCAL', job_directory=self.job_directory, array_batch_size=2, sims_per_task=4,
+                            parallel_sims=True, cpus_per_task=2)
+        experiment = self.create_experiment(platform=platform, a=3, b=3)
+        experiment_dir = platform.get_directory(experiment)
+        index = read_simulation_index(experiment_dir)
+        self.assertEqual((index.array_batch_size, index.sims_per_task, index.parallel, index.tasks), (2, 4, 2, 3))
+        with open(os.path.join(experiment_dir, "batch.sh")) as f:
+            contents = f.read()
+        self.assertIn("total_tasks=3", contents)
+        self.assertIn("batch_size=2", contents)
+
+        # the array tasks run all simulations, each on one CPU
+        self.run_array_tasks(experiment_dir, [(0, 1), (0, 2), (2, 1)])
+        for simulation in experiment.simulations:
+            self.assertEqual(self.read_srun_output(platform, simulation),
+                             "--exact --ntasks=1 --cpus-per-task=1 _run.sh")
+
+        with open(os.path.join(experiment_dir, "job_id.txt"), "w") as f:
+            f.write("101\n102\n")
+        simulations = experiment.simulations
+        self.assertEqual(platform._op_client.get_task_simulations(simulations[5]),
+                         [sim.id for sim in simulations[4:8]])
+        self.assertEqual(platform._op_client.get_task_simulations(simulations[8]), [simulations[8].id])
+
+        # the job of a packed simulation is shared with the other simulations of its task: it is not cancelled,
+        # whether the simulation started or not
+        with open(platform.get_directory(simulations[4]).joinpath("job_id.txt"), "w") as f:
+            f.write("101_2")
+        with mock.patch.object(SlurmOperations, 'cancel_job', return_value="Success") as cancel_job:
+            for simulation in simulations[3:6]:
+                platform._simulations.platform_cancel(simulation.id, force=True)
+            cancel_job.assert_not_called()
+            # a simulation alone in its task is cancelled
+            platform._simulations.platform_cancel(simulations[8].id, force=True)
+        cancel_job.assert_called_once_with("102_1")
+
+    def test_pack_simulations_from_runtime_estimates(self):
+        estimates = [60, 20, 20, 60, 30, 30, 40, 20, 20, 60, 40, 20]
+        sims_per_task, packed = pack_simulations(list(range(12)), estimates=estimates, task_runtime=140)
+        self.assertEqual(sims_per_task, 4)
+        self.assertEqual(sorted(packed), list(range(12)))
+        loads = [sum(estimates[i] for i in packed[t:t + sims_per_task]) for t in range(0, 12, sims_per_task)]
+        self.assertEqual(loads, [140, 140, 140])
+        # in parallel, a task runs more simulations in the same time
+        self.assertEqual(pack_simulations(list(range(12)), estimates=estimates, task_runtime=140, parallel=2)[0], 8)
+        # without estimates, consecutive simulations share a task
+        self.assertEqual(pack_simulations(list(range(5)), sims_per_task=2), (2, [0, 1, 2, 3, 4]))
+
+        simulations = [Simulation(tags=dict(runtime=estimate)) for estimate in (10, 30)] + [Simulation()]
+        self.assertEqual(get_runtime_estimates(simulations, "runtime"), [10.0, 30.0, 20.0])
+        self.assertEqual(get_runtime_estimates(simulations, lambda sim: 5), [5.0, 5.0, 5.0])
+
+    def test_simulation_index_status_and_cancel(self):
+        experiment = self.create_experiment(self.platform, a=3, b=3)
+        experiment_dir = self.platform.get_directory(experiment)
+        with open(os.path.join(experiment_dir, "job_id.txt"), "w") as f:
+            f.write("101\n102\n")
+        simulations = experiment.simulations
+        with open(self.platform.get_directory(simulations[2]).joinpath("job_status.txt"), "w") as f:
+            f.write("0")
+        with mock.patch.object(FileOperations, 'get_directory_by_id', side_effect=AssertionError("metadata lookup")):
+            self.platform.refresh_status(experiment)
+        self.assertEqual([sim.status for sim in simulations].count(EntityStatus.SUCCEEDED), 1)
+        self.assertTrue(simulations[2].succeeded)
+
+        # simulations not started yet are cancelled through their array task
+        with mock.patch.object(SlurmOperations, 'cancel_job', return_value="Success") as cancel_job:
+            self.platform._simulations.platform_cancel(simulations[0].id, force=True)
+        cancel_job.assert_called_once_with("101_1")
+        self.assertEqual(self.platform._op_client.get_array_task_id(simulations[8]), "101_9")
+        platform = Platform('SLURM_LOCAL', job_directory=self.job_directory, array_batch_size=5)
+        generate_simulation_index(platform, experiment)
+        self.assertEqual(platform._op_client.get_array_task_id(simulations[4]), "101_5")
+        self.assertEqual(platform._op_client.get_array_task_id(simulations[5]), "102_1")
+
     @pytest.mark.skip("unskip this line when doing real run in local")
     def test_std_status_jobid_files(self):
         experiment = self.create_experiment(self.platform, a=3, b=3, wait_until_done=True, dry_run=False)
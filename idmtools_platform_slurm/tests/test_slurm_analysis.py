@@ -0,0 +1,172 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import allure
+import pytest
+from idmtools.builders import SimulationBuilder
+from idmtools.core import ItemType
+from idmtools.core.platform_factory import Platform
+from idmtools.entities import IAnalyzer
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.templated_simulation import TemplatedSimulations
+from idmtools_models.python.json_python_task import JSONConfiguredPythonTask
+from idmtools_platform_slurm.utils.slurm_job.slurm_analysis import SlurmAnalysis
+from idmtools_test import COMMON_INPUT_PATH
+from idmtools_test.utils.decorators import linux_only
+
+# Runs the batch file synchronously, one array task at a time, and records the job states in $FAKE_SLURM_STATE
+FAKE_SBATCH = """#!{python}
+import json, os, subprocess, sys
+state_file = os.environ["FAKE_SLURM_STATE"]
+state = json.load(open(state_file)) if os.path.exists(state_file) else dict(next_id=1000, jobs={{}})
+array, dependency, script = None, None, None
+for arg in sys.argv[1:]:
+    if arg.startswith("--array="):
+        array = arg.split("=", 1)[1].split("%")[0]
+    elif arg.startswith("--dependency="):
+        dependency = arg.split("=", 1)[1]
+    elif not arg.startswith("-"):
+        script = arg
+job_id = str(state["next_id"])
+state["next_id"] += 1
+jobs = state["jobs"]
+if dependency:
+    kind, parent = dependency.split(":", 1)
+    tasks = [s for j, s in jobs.items() if j.startswith(parent + "_")]
+    if kind == "afterok" and any(s != "COMPLETED" for s in tasks):
+        jobs[job_id] = "CANCELLED"
+        json.dump(state, open(state_file, "w"))
+        print(job_id)
+        sys.exit(0)
+if array:
+    first, last = (int(v) for v in array.split("-"))
+    for task in range(first, last + 1):
+        env = dict(os.environ, SLURM_JOB_ID=job_id, SLURM_ARRAY_TASK_ID=str(task))
+        rc = subprocess.call(["bash", script], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        jobs[f"{{job_id}}_{{task}}"] = "COMPLETED" if rc == 0 else "FAILED"
+else:
+    rc = subprocess.call(["bash", script], env=dict(os.environ, SLURM_JOB_ID=job_id), stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL)
+    jobs[job_id] = "COMPLETED" if rc == 0 else "FAILED"
+json.dump(state, open(state_file, "w"))
+print(job_id)
+"""
+
+FAKE_SACCT = """#!{python}
+import json, os, sys
+jobs = json.load(open(os.environ["FAKE_SLURM_STATE"]))["jobs"]
+ids = sys.argv[sys.argv.index("-j") + 1].split(",")
+for job_id, state in jobs.items():
+    if job_id.split("_")[0] in ids:
+        print(f"{{job_id}}|{{state}}")
+"""
+
+
+class ParameterAnalyzer(IAnalyzer):
+    def __init__(self, fail_on=None):
+        super().__init__(filenames=["config.json"])
+        self.fail_on = fail_on
+
+    def map(self, data, item):
+        a = data["config.json"]["parameters"]["a"]
+        if a == self.fail_on:
+            raise ValueError(f"Cannot analyze a={a}")
+        return a
+
+    def reduce(self, all_data):
+        return sorted(all_data.values())
+
+
+@pytest.mark.serial
+@linux_only
+@allure.story("Slurm")
+@allure.suite("idmtools_platform_slurm")
+class TestSlurmAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.job_directory = tempfile.mkdtemp()
+        self.platform = Platform('SLURM_LOCAL', job_directory=self.job_directory)
+        task = JSONConfiguredPythonTask(script_path=os.path.join(COMMON_INPUT_PATH, "python", "model1.py"),
+                                        envelope="parameters", parameters=dict(c=0))
+        builder = SimulationBuilder()
+        builder.add_sweep_definition(JSONConfiguredPythonTask.set_parameter_partial("a"), range(7))
+        ts = TemplatedSimulations(base_task=task)
+        ts.add_builder(builder)
+        self.experiment = Experiment.from_template(ts, name="slurm_analysis")
+        self.experiment.run(platform=self.platform, wait_until_done=False, dry_run=True)
+        for sim in self.experiment.simulations:
+            with open(self.platform.get_directory(sim).joinpath("job_status.txt"), "w") as f:
+                f.write("0")
+
+        bin_dir = os.path.join(self.job_directory, "bin")
+        os.makedirs(bin_dir)
+        for name, content in (("sbatch", FAKE_SBATCH), ("sacct", FAKE_SACCT), ("sinfo", "#!/bin/bash\necho slurm 23\n")):
+            path = os.path.join(bin_dir, name)
+            with open(path, "w") as f:
+                f.write(content.format(python=sys.executable))
+            os.chmod(path, 0o755)
+        self.env = mock.patch.dict(os.environ, PATH=bin_dir + os.pathsep + os.environ["PATH"],
+                                   FAKE_SLURM_STATE=os.path.join(self.job_directory, "slurm.json"))
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.job_directory, ignore_errors=True)
+
+    def get_analysis(self, **kwargs):
+        return SlurmAnalysis(platform=self.platform, analyzers=[ParameterAnalyzer],
+                             ids=[(self.experiment.id, ItemType.EXPERIMENT)], shards=3, executable=sys.executable,
+                             extra_args=dict(executor_type='thread', max_workers=1, verbose=False), **kwargs)
+
+    def test_dry_run(self):
+        analysis = self.get_analysis(sbatch_options=dict(partition="analysis"))
+        analysis.run(dry_run=True)
+        files = os.listdir(analysis.working_directory)
+        for name in ["map_sbatch.sh", "reduce_sbatch.sh", "analysis.pkl", "test_slurm_analysis.py", "ids_1.json",
+                     "ids_3.json"]:
+            self.assertIn(name, files)
+        self.assertNotIn("ids_4.json", files)
+        with open(os.path.join(analysis.working_directory, "map_sbatch.sh")) as f:
+            contents = f.read()
+        self.assertIn("-m idmtools_platform_slurm.utils.slurm_job.analysis_bootstrap map --task $SLURM_ARRAY_TASK_ID",
+                      contents)
+        self.assertIn("#SBATCH --partition=analysis", contents)
+        self.assertIn("#SBATCH --output=stdout_map_%a.txt", contents)
+        self.assertNotIn("--ntasks", contents)
+        self.assertNotIn("job_status.txt", contents)
+        shards = [json.load(open(os.path.join(analysis.working_directory, f"ids_{i}.json"))) for i in (1, 2, 3)]
+        self.assertEqual([len(s) for s in shards], [3, 2, 2])
+        self.assertEqual(sorted(s[0] for s in sum(shards, [])), sorted(s.id for s in self.experiment.simulations))
+        self.assertIsNone(analysis.map_job_id)
+
+    def test_map_and_reduce_jobs(self):
+        analysis = self.get_analysis().run()
+        self.assertEqual(analysis.wait(interval=0), "COMPLETED")
+        self.assertEqual(analysis.get_results(), [list(range(7))])
+        states = analysis.get_job_states()
+        self.assertEqual(sorted(states), [f"{analysis.map_job_id}_{i}" for i in (1, 2, 3)] + [analysis.reduce_job_id])
+        with open(os.path.join(analysis.working_directory, "job_id.txt")) as f:
+            self.assertEqual(f.read().split(), [analysis.map_job_id, analysis.reduce_job_id])
+
+    def test_failed_task(self):
+        analysis = self.get_analysis(analyzers_args=[dict(fail_on=4)]).run()
+        self.assertEqual(analysis.wait(interval=0), "CANCELLED")
+        self.assertEqual(sorted(analysis.get_job_states().values()), ["CANCELLED", "COMPLETED", "COMPLETED", "FAILED"])
+        with self.assertRaises(FileNotFoundError):
+            analysis.get_results()
+
+        analysis = self.get_analysis(analyzers_args=[dict(fail_on=4)], allow_partial_results=True).run()
+        self.assertEqual(analysis.wait(interval=0), "COMPLETED")
+        values = analysis.get_results()[0]
+        # the values of the slice with a=4 are missing
+        self.assertNotIn(4, values)
+        self.assertIn(len(values), (4, 5))
+        self.assertTrue(set(values) < set(range(7)))
+
+
+if __name__ == '__main__':
+    unittest.main()
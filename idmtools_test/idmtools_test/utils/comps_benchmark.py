@@ -0,0 +1,236 @@
+"""idmtools COMPS platform benchmark.
+
+Measures the creation throughput, the cost of status polls, and the download throughput of analysis for the COMPS
+platform against a local fake COMPS server, so changes to the COMPS plugin can be compared offline.
+
+Run it with::
+
+    python -m idmtools_test.utils.comps_benchmark --simulations 1000 10000 100000 --latency 0.02
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import argparse
+import time
+from dataclasses import dataclass, field, asdict
+from logging import getLogger
+from typing import Any, Dict, List, Sequence
+import humanfriendly
+from idmtools.analysis.analyze_manager import AnalyzeManager
+from idmtools.assets import Asset
+from idmtools.builders import SimulationBuilder
+from idmtools.core import ItemType
+from idmtools.core.platform_factory import Platform
+from idmtools.entities.command_task import CommandTask
+from idmtools.entities.experiment import Experiment
+from idmtools.entities.ianalyzer import IAnalyzer
+from idmtools.entities.templated_simulation import TemplatedSimulations
+from idmtools_test.utils.fake_comps_server import FakeCOMPSConfig, FakeCOMPSServer
+
+logger = getLogger(__name__)
+
+BENCHMARK_OPERATIONS = ("create", "poll", "download")
+
+
+@dataclass
+class BenchmarkResult:
+    """Measure of one operation."""
+    #: Number of simulations of the experiment
+    simulations: int
+    #: Operation measured: create, poll, or download
+    operation: str
+    #: Seconds spent in the operation
+    elapsed: float
+    #: Number of units processed: simulations created or downloaded, or polls
+    count: int
+    #: Requests received by the server
+    requests: int
+    #: Bytes sent by the client
+    bytes_uploaded: int
+    #: Bytes sent by the server
+    bytes_downloaded: int
+    #: Errors injected by the server
+    errors: int = field(default=0)
+
+    @property
+    def rate(self) -> float:
+        """Units processed per second."""
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        """Summary of the measure."""
+        unit = "polls" if self.operation == "poll" else "simulations"
+        return f"{self.operation:<8} {self.simulations:>8} sims: {self.elapsed:8.2f}s {self.rate:10.1f} {unit}/s " \
+               f"{self.requests:>8} requests ({self.requests / max(self.count, 1):.2f}/{unit[:-1]}) " \
+               f"up {humanfriendly.format_size(self.bytes_uploaded)} " \
+               f"down {humanfriendly.format_size(self.bytes_downloaded)} " \
+               f"({humanfriendly.format_size(self.bytes_downloaded / self.elapsed if self.elapsed else 0)}/s) " \
+               f"{self.errors} errors"
+
+
+class DownloadAnalyzer(IAnalyzer):
+    """Analyzer counting the bytes of the files it downloads."""
+
+    def __init__(self, filenames: List[str]):
+        """
+        Constructor.
+
+        Args:
+            filenames: Files to download from each simulation
+        """
+        super().__init__(filenames=filenames, parse=False)
+
+    def map(self, data: Dict[str, Any], item: Any) -> int:
+        """Size of the files of a simulation."""
+        return sum(len(content) for content in data.values())
+
+    def reduce(self, all_data: Dict[Any, int]) -> int:
+        """Total size of the files."""
+        return sum(all_data.values())
+
+
+def _set_index(simulation, index: int) -> Dict[str, int]:
+    return dict(index=index)
+
+
+def build_experiment(simulations: int) -> Experiment:
+    """
+    Build an experiment of command simulations sharing one common asset.
+
+    Args:
+        simulations: Number of simulations
+
+    Returns:
+        Experiment
+    """
+    task = CommandTask(command="python Assets/model.py")
+    task.common_assets.add_asset(Asset(filename="model.py", content=b"print('benchmark')\n"))
+    builder = SimulationBuilder()
+    builder.add_sweep_definition(_set_index, range(simulations))
+    templates = TemplatedSimulations(base_task=task)
+    templates.add_builder(builder)
+    return Experiment.from_template(templates, name=f"benchmark_{simulations}")
+
+
+class _Measure:
+    """Context measuring the time and the server statistics of an operation."""
+
+    def __init__(self, server: FakeCOMPSServer, results: List[BenchmarkResult], simulations: int, operation: str):
+        self.server = server
+        self.results = results
+        self.result = BenchmarkResult(simulations=simulations, operation=operation, elapsed=0.0, count=0, requests=0,
+                                      bytes_uploaded=0, bytes_downloaded=0)
+
+    def __enter__(self) -> BenchmarkResult:
+        self.server.reset_stats()
+        return self.result
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        stats = self.server.stats()
+        self.result.requests = stats["total_requests"]
+        self.result.bytes_uploaded = stats["bytes_received"]
+        self.result.bytes_downloaded = stats["bytes_sent"]
+        self.result.errors = stats["errors"]
+        self.results.append(self.result)
+        logger.info(str(self.result))
+
+
+def run_benchmark(simulations: int, config: FakeCOMPSConfig = None, operations: Sequence[str] = BENCHMARK_OPERATIONS,
+                  poll_interval: float = 1.0, max_polls: int = 1000, analysis_workers: int = None,
+                  executor_type: str = "thread", **platform_kwargs) -> List[BenchmarkResult]:
+    """
+    Benchmark the COMPS platform with an experiment against a fake COMPS server.
+
+    The server runs in a child process, so it does not compete with the platform for the interpreter.
+
+    Args:
+        simulations: Number of simulations of the experiment
+        config: Behavior of the fake server
+        operations: Operations to measure, in the order create, poll, download. The experiment is always created
+        poll_interval: Seconds between status polls
+        max_polls: Largest number of polls before giving up on the experiment finishing
+        analysis_workers: Workers of the analysis. Defaults to the AnalyzeManager default
+        executor_type: Executor of the analysis, "thread" or "process"
+        **platform_kwargs: Options of the COMPS platform, such as batch_size or max_workers
+
+    Returns:
+        Measure of each operation
+    """
+    config = config or FakeCOMPSConfig()
+    results = []
+    with FakeCOMPSServer(config).start(process=True) as server:
+        server.login()
+        platform = Platform(type="COMPS", endpoint=server.url, environment=config.environments[0], **platform_kwargs)
+        experiment = build_experiment(simulations)
+        with _Measure(server, results if "create" in operations else [], simulations, "create") as result:
+            start = time.time()
+            experiment.run(wait_until_done=False, platform=platform)
+            result.elapsed = time.time() - start
+            result.count = simulations
+
+        if "poll" in operations or "download" in operations:
+            with _Measure(server, results if "poll" in operations else [], simulations, "poll") as result:
+                while result.count < max_polls:
+                    start = time.time()
+                    platform.refresh_status(experiment)
+                    result.elapsed += time.time() - start
+                    result.count += 1
+                    if experiment.done:
+                        break
+                    time.sleep(poll_interval)
+
+        if "download" in operations:
+            analyzer = DownloadAnalyzer(filenames=list(config.output_files))
+            manager = AnalyzeManager(platform=platform, ids=[(experiment.uid, ItemType.EXPERIMENT)],
+                                     analyzers=[analyzer], max_workers=analysis_workers, executor_type=executor_type,
+                                     verbose=False, analyze_failed_items=True)
+            with _Measure(server, results, simulations, "download") as result:
+                start = time.time()
+                manager.analyze()
+                result.elapsed = time.time() - start
+                result.count = simulations
+    return results
+
+
+def main(args: List[str] = None):
+    """
+    Run the benchmark from the command line and print the measures.
+
+    Args:
+        args: Command line arguments
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the COMPS platform against a local fake COMPS server")
+    parser.add_argument("--simulations", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--operations", nargs="+", choices=BENCHMARK_OPERATIONS, default=list(BENCHMARK_OPERATIONS))
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each request")
+    parser.add_argument("--bandwidth", type=float, default=None, help="Bytes per second of each request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="Fraction of connections dropped")
+    parser.add_argument("--run-time", type=float, default=5.0, help="Seconds each simulation runs")
+    parser.add_argument("--output-size", type=int, default=10240, help="Bytes of the output file of each simulation")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--analysis-workers", type=int, default=None)
+    parser.add_argument("--executor-type", choices=["thread", "process"], default="thread")
+    parser.add_argument("--batch-size", type=int, default=None, help="Simulations per creation batch")
+    parser.add_argument("--max-workers", type=int, default=None, help="Workers creating simulations")
+    options = parser.parse_args(args)
+
+    config = FakeCOMPSConfig(latency=options.latency, bandwidth=options.bandwidth, error_rate=options.error_rate,
+                             disconnect_rate=options.disconnect_rate, run_time=options.run_time,
+                             output_files={"output/result.json": b"0" * options.output_size})
+    platform_kwargs = {k: getattr(options, k) for k in ("batch_size", "max_workers") if getattr(options, k)}
+    print(f"Fake COMPS server: {asdict(config) | dict(output_files=f'{options.output_size} bytes')}")
+    results = []
+    for simulations in options.simulations:
+        results.extend(run_benchmark(simulations, config, options.operations, options.poll_interval,
+                                     analysis_workers=options.analysis_workers, executor_type=options.executor_type,
+                                     **platform_kwargs))
+    print()
+    for result in results:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
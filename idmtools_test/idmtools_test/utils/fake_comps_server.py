@@ -0,0 +1,908 @@
+"""idmtools fake COMPS server.
+
+Local stand-in for the subset of the COMPS REST API used by idmtools: suites, experiments, simulations, asset
+collections, tags, commissioning, simulation outputs, and large asset uploads. Latency, bandwidth, and errors can be
+injected, so the COMPS platform can be benchmarked and regression-tested offline.
+
+Run it standalone with::
+
+    python -m idmtools_test.utils.fake_comps_server --port 8080 --latency 0.05
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import getLogger, DEBUG
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qsl
+import requests
+from COMPS import Client
+from COMPS.CredentialPrompt import CredentialPrompt
+
+logger = getLogger(__name__)
+
+#: Child objects of each entity type, only returned when requested
+CHILDREN = {
+    "Suites": {"Tags", "Configuration"},
+    "Experiments": {"Tags", "Configuration"},
+    "Simulations": {"Tags", "Configuration", "Files", "HPCJobs"},
+    "AssetCollections": {"Tags", "Assets"}
+}
+ACTIVE_STATES = {"CommissionRequested", "Provisioning", "Commissioned", "Running", "Retry"}
+# Path of the statistics of the server. Requests to it are neither counted nor delayed
+STATS_PATH = "/api/FakeCOMPS/Stats"
+
+_ID = r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}"
+_ID_PATTERN = re.compile(_ID)
+_FILTER_PATTERN = re.compile(r"^(\w+)(!=|<=|>=|=|~|<|>)(.*)$")
+# Dates are compared to the second, like the COMPS filters
+DATE_KEYS = {"DateCreated", "LastModified"}
+
+
+def comps_date(timestamp: float = None) -> str:
+    """
+    Format a date the way COMPS does.
+
+    Args:
+        timestamp: Seconds since the epoch. Defaults to now
+
+    Returns:
+        ISO 8601 date with seven fractional digits
+    """
+    date = datetime.fromtimestamp(time.time() if timestamp is None else timestamp, timezone.utc)
+    return date.strftime('%Y-%m-%dT%H:%M:%S.%f') + '0Z'
+
+
+def parse_filter_date(value: str) -> str:
+    """
+    Normalize a date of a filter or an entity for comparisons.
+
+    Args:
+        value: Date, as formatted by COMPS or by a filter
+
+    Returns:
+        Date to the second, comparable as a string
+    """
+    return value[:19].replace('T', ' ')
+
+
+class FakeCOMPSError(Exception):
+    """Error returned to the client as a COMPS error response."""
+
+    def __init__(self, status: int, message: str, **extra):
+        """
+        Constructor.
+
+        Args:
+            status: HTTP status
+            message: Response message
+            **extra: Additional fields of the response, such as UntrackedIds
+        """
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+@dataclass
+class FakeCOMPSConfig:
+    """Behavior of the fake COMPS server."""
+    #: Seconds added to each request
+    latency: float = field(default=0.0)
+    #: Bytes per second of request and response bodies. None is unlimited
+    bandwidth: Optional[float] = field(default=None)
+    #: Fraction of requests answered with *error_status*
+    error_rate: float = field(default=0.0)
+    #: Status of the injected errors
+    error_status: int = field(default=503)
+    #: Fraction of requests whose connection is closed without a response
+    disconnect_rate: float = field(default=0.0)
+    #: Only inject errors on paths matching this regular expression. None is all paths
+    error_paths: Optional[str] = field(default=None)
+    #: Seconds between the commissioning of a simulation and its completion
+    run_time: float = field(default=0.0)
+    #: Fraction of the simulations that fail
+    failure_rate: float = field(default=0.0)
+    #: Output files of each simulation, by path relative to the working directory
+    output_files: Dict[str, bytes] = field(default_factory=lambda: {
+        "output/result.json": b'{"value": 1}',
+        "stdout.txt": b"Done\n",
+        "stderr.txt": b""
+    })
+    #: Name of the user logged in
+    username: str = field(default="fakeuser")
+    #: Environments the user can access
+    environments: List[str] = field(default_factory=lambda: ["Calculon", "SlurmStage"])
+    #: Seed of the error injection
+    seed: Optional[int] = field(default=None)
+
+
+class FakeCOMPSStats:
+    """Requests and bytes handled by the server."""
+
+    def __init__(self):
+        """Constructor."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the statistics.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.requests = Counter()
+            self.bytes_received = 0
+            self.bytes_sent = 0
+            self.errors = 0
+
+    @staticmethod
+    def route(method: str, path: str) -> str:
+        """
+        Route of a request, with ids and file paths replaced by placeholders.
+
+        Args:
+            method: HTTP method
+            path: Path of the url
+
+        Returns:
+            Route such as "GET /api/Simulations/{id}"
+        """
+        path = re.sub(r"(/Output)/.+$", r"\1/{path}", _ID_PATTERN.sub("{id}", path))
+        return f"{method} {path}"
+
+    def record(self, method: str, path: str, received: int = 0, sent: int = 0, error: bool = False):
+        """
+        Record a request.
+
+        Args:
+            method: HTTP method
+            path: Path of the url
+            received: Bytes of the request body
+            sent: Bytes of the response body
+            error: Whether an error was injected
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if method:
+                self.requests[self.route(method, path)] += 1
+            self.bytes_received += received
+            self.bytes_sent += sent
+            self.errors += int(error)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Statistics as a dictionary.
+
+        Returns:
+            Total and per route request counts, bytes received and sent, and injected errors
+        """
+        with self._lock:
+            return dict(total_requests=sum(self.requests.values()), requests=dict(self.requests),
+                        bytes_received=self.bytes_received, bytes_sent=self.bytes_sent, errors=self.errors)
+
+
+def parse_multipart(content_type: str, body: bytes) -> List[Tuple[str, Optional[str], bytes]]:
+    """
+    Parse a multipart/form-data body.
+
+    Args:
+        content_type: Content-Type header with the boundary
+        body: Request body
+
+    Returns:
+        Name, filename, and data of each part
+    """
+    match = re.search(r'boundary="?([^";]+)"?', content_type or "")
+    if match is None:
+        raise FakeCOMPSError(400, "Missing multipart boundary")
+    parts = []
+    for chunk in body.split(b"--" + match.group(1).encode())[1:-1]:
+        headers, _, data = chunk[2:].partition(b"\r\n\r\n")
+        disposition = headers.decode("utf-8", "replace")
+        name = re.search(r'\bname="([^"]*)"', disposition)
+        filename = re.search(r'\bfilename="([^"]*)"', disposition)
+        parts.append((name.group(1) if name else None, filename.group(1) if filename else None, data[:-2]))
+    return parts
+
+
+class FakeCOMPSStore:
+    """In-memory entities of the fake server and the handling of each route."""
+
+    def __init__(self, config: FakeCOMPSConfig):
+        """
+        Constructor.
+
+        Args:
+            config: Behavior of the server
+        """
+        self.config = config
+        self.stats = FakeCOMPSStats()
+        self.lock = threading.RLock()
+        self.entities: Dict[str, Dict[str, dict]] = {entity_type: dict() for entity_type in CHILDREN}
+        self.children: Dict[str, List[str]] = defaultdict(list)
+        self.commissioned: Dict[str, float] = dict()
+        self.canceled = set()
+        self.blobs: Dict[str, bytes] = dict()
+        self.partial_uploads: Dict[str, bytearray] = dict()
+        self.random = random.Random(config.seed)
+        self.routes = [
+            ("GET", re.compile(r"^/api/FakeCOMPS/Stats$"), self.get_stats),
+            ("DELETE", re.compile(r"^/api/FakeCOMPS/Stats$"), self.reset_stats),
+            ("POST", re.compile(r"^/api/tokens$"), self.token),
+            ("PUT", re.compile(r"^/api/tokens$"), self.token),
+            ("POST", re.compile(r"^/api/(Suites|Experiments)$"), self.save_json),
+            ("POST", re.compile(r"^/api/(Simulations|AssetCollections)$"), self.save_multipart),
+            ("GET", re.compile(rf"^/api/(Suites|Experiments|Simulations|AssetCollections)(?:/({_ID}))?$"), self.get),
+            ("DELETE", re.compile(rf"^/api/(Suites|Experiments|Simulations)/({_ID})$"), self.delete),
+            ("PUT", re.compile(rf"^/api/(Suites|Experiments|Simulations)/({_ID})/State/(\w+)$"), self.set_state),
+            ("POST", re.compile(rf"^/api/(Suites|Experiments|Simulations|AssetCollections)/({_ID})/tags$"),
+             self.set_tags),
+            ("GET", re.compile(rf"^/asset/Simulations/({_ID})/Output$"), self.output_info),
+            ("GET", re.compile(rf"^/asset/Simulations/({_ID})/Output/(.+)$"), self.output_file),
+            ("GET", re.compile(rf"^/asset/Blobs/({_ID})$"), self.blob),
+            ("GET", re.compile(rf"^/api/upload/check/({_ID})$"), self.upload_check),
+            ("POST", re.compile(rf"^/api/upload/({_ID})$"), self.upload)
+        ]
+
+    def get_stats(self, match, request) -> Tuple[int, Dict[str, Any], None]:
+        """Statistics of the server."""
+        return 200, self.stats.to_dict(), None
+
+    def reset_stats(self, match, request) -> Tuple[int, None, None]:
+        """Clear the statistics of the server."""
+        self.stats.reset()
+        return 200, None, None
+
+    def token(self, match, request) -> Tuple[int, Any, Dict[str, str]]:
+        """Issue a system token, which never needs renewal during a benchmark."""
+        expiration = (datetime.now(timezone.utc) + timedelta(days=30)).strftime('%Y-%m-%d-%H-%M-%S')
+        parts = ["FakeCOMPS", "System", self.config.username, "", "", "", expiration, "", "", "", "", "", "FakeGroup",
+                 "-".join(self.config.environments)]
+        return 200, None, {"X-COMPS-Token": ",".join(parts)}
+
+    def handle(self, request: 'FakeCOMPSRequest') -> Tuple[int, Any, Optional[Dict[str, str]]]:
+        """
+        Route a request.
+
+        Args:
+            request: Request
+
+        Returns:
+            Status, json payload or bytes, and extra headers
+        """
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if match and method == request.method:
+                return handler(match, request)
+        raise FakeCOMPSError(404, f"No route for {request.method} {request.path}")
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Entities
+    # ------------------------------------------------------------------------------------------------------------------
+    def _entity(self, entity_type: str, entity_id: str) -> dict:
+        entity = self.entities[entity_type].get(entity_id.lower())
+        if entity is None:
+            raise FakeCOMPSError(404, f"{entity_type[:-1]} {entity_id} not found")
+        return entity
+
+    def simulation_state(self, simulation: dict) -> str:
+        """
+        Current state of a simulation, advancing with the time since it was commissioned.
+
+        Args:
+            simulation: Simulation
+
+        Returns:
+            Name of the SimulationState
+        """
+        simulation_id = simulation["Id"]
+        if simulation_id in self.canceled:
+            return "Canceled"
+        started = self.commissioned.get(simulation_id)
+        if started is None:
+            return simulation["SimulationState"]
+        elapsed = time.time() - started
+        if elapsed >= self.config.run_time:
+            # the same simulations fail at each query
+            failed = int(simulation_id[:8], 16) / 0xffffffff < self.config.failure_rate
+            return "Failed" if failed else "Succeeded"
+        return "Running" if elapsed >= self.config.run_time / 2 else "Commissioned"
+
+    def simulation_modified(self, simulation: dict) -> str:
+        """
+        Last modification of a simulation, including the state changes from the time since it was commissioned.
+
+        Args:
+            simulation: Simulation
+
+        Returns:
+            Date of the last modification
+        """
+        started = self.commissioned.get(simulation["Id"])
+        if started is None or simulation["Id"] in self.canceled:
+            return simulation["LastModified"]
+        elapsed = time.time() - started
+        changes = [started] + [started + delay for delay in (self.config.run_time / 2, self.config.run_time)
+                               if elapsed >= delay]
+        return max(simulation["LastModified"], comps_date(max(changes)))
+
+    def _render(self, entity_type: str, entity: dict, fields: List[str], children: List[str], base_url: str) -> dict:
+        result = {key: value for key, value in entity.items()
+                  if key not in CHILDREN[entity_type] and (not fields or key in fields)}
+        if entity_type == "Simulations" and (not fields or "SimulationState" in fields):
+            result["SimulationState"] = self.simulation_state(entity)
+        if entity_type == "Simulations" and (not fields or "LastModified" in fields):
+            result["LastModified"] = self.simulation_modified(entity)
+        for child in CHILDREN[entity_type].intersection(children):
+            if child == "HPCJobs":
+                result[child] = self._hpc_jobs(entity)
+            elif child == "Assets":
+                result[child] = [dict(asset, Uri=f"{base_url}/asset/Blobs/{asset['MD5Checksum']}")
+                                 for asset in entity.get("Assets") or []]
+            else:
+                result[child] = entity.get(child)
+        return result
+
+    def _hpc_jobs(self, simulation: dict) -> Optional[List[dict]]:
+        started = self.commissioned.get(simulation["Id"])
+        if started is None:
+            return None
+        state = self.simulation_state(simulation)
+        job_state = dict(Succeeded="Finished", Failed="Failed", Canceled="Canceled").get(state, "Running")
+        return [dict(Id=simulation["Id"], JobId=abs(hash(simulation["Id"])) % 10 ** 7, JobState=job_state,
+                     WorkingDirectory=f"/fake_comps/{simulation['Id']}", SubmitTime=comps_date(started),
+                     StartTime=comps_date(started))]
+
+    def _matches(self, entity_type: str, entity: dict, filters: List[Tuple[str, str, str]],
+                 tag_filters: List[str]) -> bool:
+        for key, operator, value in filters:
+            if key == "SimulationState":
+                actual = self.simulation_state(entity)
+            elif key == "LastModified" and entity_type == "Simulations":
+                actual = self.simulation_modified(entity)
+            else:
+                actual = entity.get(key)
+            actual = "" if actual is None else str(actual).lower()
+            value = value.lower()
+            if key in DATE_KEYS:
+                actual, value = parse_filter_date(actual), parse_filter_date(value)
+            if (operator == "=" and actual != value) or (operator == "!=" and actual == value) or \
+                    (operator == "~" and value not in actual) or (operator == "<" and not actual < value) or \
+                    (operator == ">" and not actual > value) or (operator == "<=" and not actual <= value) or \
+                    (operator == ">=" and not actual >= value):
+                return False
+        tags = entity.get("Tags") or dict()
+        for tag_filter in tag_filters:
+            key, _, value = tag_filter.partition("=")
+            if key not in tags or (value and str(tags[key]) != value):
+                return False
+        return True
+
+    def get(self, match, request) -> Tuple[int, Any, Optional[Dict[str, str]]]:
+        """Query entities, with the fields, children, filters, ordering, and paging of COMPS."""
+        entity_type, entity_id = match.group(1), match.group(2)
+        params = request.params
+        fields = [f for f in params.get("fields", "").split(",") if f]
+        children = [c for c in params.get("children", "").split(",") if c]
+        with self.lock:
+            if entity_id:
+                candidates = [self._entity(entity_type, entity_id)]
+                filters, tag_filters = [], []
+            else:
+                filters = []
+                for condition in (c for c in params.get("filters", "").split(",") if c):
+                    parsed = _FILTER_PATTERN.match(condition)
+                    if parsed is None:
+                        raise FakeCOMPSError(400, f"Invalid filter {condition}")
+                    filters.append(parsed.groups())
+                tag_filters = [t for t in params.get("tagfilters", "").split(",") if t]
+                candidates = self._candidates(entity_type, filters)
+            items = [e for e in candidates if self._matches(entity_type, e, filters, tag_filters)]
+            orderby = params.get("orderby", "DateCreated").split(" ")
+            if orderby[0] != "DateCreated":
+                items.sort(key=lambda e: str(e.get(orderby[0], "")))
+            if len(orderby) > 1 and orderby[1].lower() == "desc":
+                items.reverse()
+            total = len(items)
+            offset = int(params.get("offset", 0))
+            items = items[offset:offset + int(params["count"])] if "count" in params else items[offset:]
+            payload = {entity_type: [self._render(entity_type, e, fields, children, request.base_url) for e in items]}
+        headers = None
+        if len(items) < total:
+            headers = {"Content-Range": f"{offset}-{offset + len(items) - 1}/{total}"}
+        return 200, payload, headers
+
+    def _candidates(self, entity_type: str, filters: List[Tuple[str, str, str]]) -> List[dict]:
+        # use the parent indexes, the usual queries of idmtools
+        for key, operator, value in filters:
+            if operator == "=" and (entity_type, key) in (("Simulations", "ExperimentId"), ("Experiments", "SuiteId")):
+                entities = self.entities[entity_type]
+                return [entities[i] for i in self.children.get(value.lower(), []) if i in entities]
+            if operator == "=" and key == "Id":
+                entity = self.entities[entity_type].get(value.lower())
+                return [entity] if entity else []
+        return list(self.entities[entity_type].values())
+
+    def _save(self, entity_type: str, data: dict) -> str:
+        data = {key: value for key, value in data.items() if value is not None}
+        entity_id = str(data.pop("Id", "") or "").lower()
+        now = comps_date()
+        if entity_id:
+            entity = self._entity(entity_type, entity_id)
+            configuration = data.pop("Configuration", None)
+            if configuration:
+                entity["Configuration"] = dict(entity.get("Configuration") or dict(),
+                                               **{k: v for k, v in configuration.items() if v is not None})
+            for key in ("DateCreated", "Owner", "SimulationState"):
+                data.pop(key, None)
+            entity.update(data, LastModified=now)
+            return entity_id
+        entity_id = str(uuid.uuid4())
+        entity = dict(data, Id=entity_id, Owner=self.config.username, DateCreated=now, LastModified=now)
+        parent = dict(Simulations="ExperimentId", Experiments="SuiteId").get(entity_type)
+        if parent and entity.get(parent):
+            entity[parent] = str(entity[parent]).lower()
+            self._entity(f"{parent[:-2]}s", entity[parent])
+            self.children[entity[parent]].append(entity_id)
+        if entity_type == "Simulations":
+            entity["SimulationState"] = "Created"
+        if entity_type == "AssetCollections":
+            entity["Assets"] = [dict(asset, MD5Checksum=str(asset["MD5Checksum"]).lower(),
+                                     Length=len(self.blobs[str(asset["MD5Checksum"]).lower()]))
+                                for asset in entity.get("Assets") or []]
+        self.entities[entity_type][entity_id] = entity
+        return entity_id
+
+    def save_json(self, match, request) -> Tuple[int, Any, None]:
+        """Create or update suites and experiments."""
+        entity_type = match.group(1)
+        entities = json.loads(request.body)[entity_type]
+        with self.lock:
+            ids = [self._save(entity_type, entity) for entity in entities]
+        return 200, dict(Ids=ids), None
+
+    def save_multipart(self, match, request) -> Tuple[int, Any, None]:
+        """Create simulations and asset collections with their files, which are given inline or by checksum."""
+        entity_type = match.group(1)
+        entities = []
+        uploaded = dict()
+        for name, filename, data in parse_multipart(request.headers.get("Content-Type"), request.body):
+            if name == "not_a_file":
+                entities = json.loads(data)
+            else:
+                uploaded[name.lower()] = data
+        files_key = "Files" if entity_type == "Simulations" else "Assets"
+        with self.lock:
+            self.blobs.update(uploaded)
+            missing = sorted({str(f["MD5Checksum"]).lower() for entity in entities for f in entity.get(files_key) or []
+                              if str(f.get("MD5Checksum")).lower() not in self.blobs})
+            if missing:
+                raise FakeCOMPSError(400, f"{len(missing)} files are not in COMPS", UntrackedIds=missing)
+            ids = [self._save(entity_type, entity) for entity in entities]
+        return 200, dict(Ids=ids), None
+
+    def delete(self, match, request) -> Tuple[int, None, None]:
+        """Delete an entity and its children."""
+        entity_type, entity_id = match.group(1), match.group(2).lower()
+        with self.lock:
+            self._entity(entity_type, entity_id)
+            self._delete(entity_type, entity_id)
+        return 200, None, None
+
+    def _delete(self, entity_type: str, entity_id: str):
+        self.entities[entity_type].pop(entity_id, None)
+        child_type = dict(Suites="Experiments", Experiments="Simulations").get(entity_type)
+        for child in self.children.pop(entity_id, []):
+            self._delete(child_type, child)
+
+    def _simulations(self, entity_type: str, entity_id: str) -> List[dict]:
+        if entity_type == "Simulations":
+            return [self._entity(entity_type, entity_id)]
+        self._entity(entity_type, entity_id)
+        child_type = "Experiments" if entity_type == "Suites" else "Simulations"
+        return [s for child in self.children.get(entity_id, []) for s in self._simulations(child_type, child)]
+
+    def set_state(self, match, request) -> Tuple[int, None, None]:
+        """Commission or cancel the simulations of an entity."""
+        entity_type, entity_id, state = match.group(1), match.group(2).lower(), match.group(3)
+        now = time.time()
+        with self.lock:
+            for simulation in self._simulations(entity_type, entity_id):
+                current = self.simulation_state(simulation)
+                if state == "CommissionRequested" and current == "Created":
+                    self.commissioned[simulation["Id"]] = now
+                elif state == "CancelRequested" and current in ACTIVE_STATES:
+                    simulation["LastModified"] = comps_date(now)
+                    self.canceled.add(simulation["Id"])
+                elif state not in ("CommissionRequested", "CancelRequested"):
+                    raise FakeCOMPSError(400, f"Unsupported state {state}")
+        return 200, None, None
+
+    def set_tags(self, match, request) -> Tuple[int, None, None]:
+        """Replace, merge, or delete the tags of an entity."""
+        entity_type, entity_id = match.group(1), match.group(2)
+        data = json.loads(request.body)
+        with self.lock:
+            entity = self._entity(entity_type, entity_id)
+            tags = dict(entity.get("Tags") or dict())
+            if data["OperationMode"] == "Replace":
+                tags = dict(data["Tags"])
+            elif data["OperationMode"] == "Merge":
+                tags.update(data["Tags"])
+            else:
+                for key in data["Tags"]:
+                    tags.pop(key, None)
+            entity["Tags"] = tags
+        return 200, None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------------------------------------------------------
+    def output_info(self, match, request) -> Tuple[int, Any, None]:
+        """List the output files of a simulation, available once it is commissioned."""
+        simulation_id = match.group(1).lower()
+        with self.lock:
+            self._entity("Simulations", simulation_id)
+            started = simulation_id in self.commissioned
+        resources = []
+        for path, data in (self.config.output_files.items() if started else []):
+            directory, _, name = path.rpartition("/")
+            resources.append(dict(Id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{simulation_id}/{path}")), Length=len(data),
+                                  FriendlyName=name, PathFromRoot=directory or ".", MimeType="application/octet-stream",
+                                  Url=f"{request.base_url}/asset/Simulations/{simulation_id}/Output/{path}"))
+        return 200, dict(Resources=resources), None
+
+    def output_file(self, match, request) -> Tuple[int, bytes, None]:
+        """Download an output file of a simulation."""
+        simulation_id, path = match.group(1).lower(), match.group(2)
+        with self.lock:
+            self._entity("Simulations", simulation_id)
+        if simulation_id not in self.commissioned or path not in self.config.output_files:
+            raise FakeCOMPSError(404, f"File {path} not found")
+        return 200, self.config.output_files[path], None
+
+    def blob(self, match, request) -> Tuple[int, bytes, None]:
+        """Download a file known by its checksum."""
+        data = self.blobs.get(match.group(1).lower())
+        if data is None:
+            raise FakeCOMPSError(404, f"Asset {match.group(1)} not found")
+        return 200, data, None
+
+    def upload_check(self, match, request) -> Tuple[int, Any, None]:
+        """Report whether a large file is on the server, or how much of it was uploaded."""
+        checksum = match.group(1).lower()
+        with self.lock:
+            if checksum in self.blobs:
+                return 200, None, None
+            if checksum in self.partial_uploads:
+                return 206, dict(Size=len(self.partial_uploads[checksum])), None
+        raise FakeCOMPSError(404, f"Asset {checksum} not found")
+
+    def upload(self, match, request) -> Tuple[int, None, None]:
+        """Receive a chunk of a large file."""
+        checksum = match.group(1).lower()
+        content_range = re.match(r"bytes (\d+)-(\d+)/(\d+)", request.headers.get("Content-Range", ""))
+        if content_range is None:
+            raise FakeCOMPSError(400, "Missing Content-Range")
+        start, total = int(content_range.group(1)), int(content_range.group(3))
+        with self.lock:
+            data = self.partial_uploads.setdefault(checksum, bytearray())
+            if start != len(data):
+                raise FakeCOMPSError(400, f"Expected a chunk starting at {len(data)}")
+            data.extend(request.body)
+            if len(data) >= total:
+                del self.partial_uploads[checksum]
+                if hashlib.md5(data).hexdigest() != checksum.replace("-", ""):
+                    raise FakeCOMPSError(400, f"Checksum mismatch for {checksum}")
+                self.blobs[checksum] = bytes(data)
+        return 200, None, None
+
+
+@dataclass
+class FakeCOMPSRequest:
+    """Request given to the routes of the store."""
+    method: str
+    path: str
+    params: Dict[str, str]
+    headers: Any
+    body: bytes
+    #: Url of the server as seen by the client
+    base_url: str
+
+
+class FakeCOMPSRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler applying the injected latency, bandwidth, and errors before routing to the store."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        """Log requests at debug level instead of stderr."""
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(format % args)
+
+    def do_GET(self):  # noqa: N802
+        """Handle GET."""
+        self._dispatch("GET")
+
+    def do_POST(self):  # noqa: N802
+        """Handle POST."""
+        self._dispatch("POST")
+
+    def do_PUT(self):  # noqa: N802
+        """Handle PUT."""
+        self._dispatch("PUT")
+
+    def do_DELETE(self):  # noqa: N802
+        """Handle DELETE."""
+        self._dispatch("DELETE")
+
+    def _throttle(self, size: int):
+        bandwidth = self.server.store.config.bandwidth
+        if bandwidth and size:
+            time.sleep(size / bandwidth)
+
+    def _dispatch(self, method: str):
+        store: FakeCOMPSStore = self.server.store
+        config = store.config
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        request = FakeCOMPSRequest(method=method, path=url.path, params=dict(parse_qsl(url.query)), headers=self.headers,
+                                   body=body, base_url=f"http://{self.headers.get('Host')}")
+        control = url.path == STATS_PATH
+        if not control:
+            time.sleep(config.latency)
+            self._throttle(len(body))
+            injectable = config.error_paths is None or re.search(config.error_paths, url.path)
+            with store.lock:
+                draw = store.random.random() if injectable and url.path != "/api/tokens" else 1.0
+            if draw < config.disconnect_rate:
+                store.stats.record(method, url.path, len(body), error=True)
+                self.close_connection = True
+                return
+            if draw < config.disconnect_rate + config.error_rate:
+                store.stats.record(method, url.path, len(body), error=True)
+                self._respond(config.error_status, dict(ResponseMessage="Injected error"))
+                return
+        try:
+            status, payload, headers = store.handle(request)
+        except FakeCOMPSError as e:
+            status, payload, headers = e.status, dict(ResponseMessage=str(e), **e.extra), None
+        except Exception as e:
+            logger.exception(e)
+            status, payload, headers = 500, dict(ResponseMessage=str(e)), None
+        sent = self._respond(status, payload, headers, throttle=not control)
+        if not control:
+            store.stats.record(method, url.path, len(body), sent)
+
+    def _respond(self, status: int, payload: Any, headers: Dict[str, str] = None, throttle: bool = False) -> int:
+        if isinstance(payload, bytes):
+            data, content_type = payload, "application/octet-stream"
+        else:
+            data, content_type = (b"" if payload is None else json.dumps(payload).encode("utf-8")), "application/json"
+        if throttle:
+            self._throttle(len(data))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or dict()).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+        return len(data)
+
+
+class FakeCOMPSHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the store."""
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address: Tuple[str, int], config: FakeCOMPSConfig):
+        """
+        Constructor.
+
+        Args:
+            address: Host and port. Port 0 picks a free port
+            config: Behavior of the server
+        """
+        super().__init__(address, FakeCOMPSRequestHandler)
+        self.store = FakeCOMPSStore(config)
+
+
+def _serve(config: FakeCOMPSConfig, host: str, port: int, connection):
+    """Run a server in a child process, sending its port back to the parent."""
+    server = FakeCOMPSHTTPServer((host, port), config)
+    connection.send(server.server_address[1])
+    connection.close()
+    server.serve_forever()
+
+
+class _FakeCredentialPrompt(CredentialPrompt):
+    """Credentials of the fake server, which accepts any password."""
+
+    def __init__(self, username: str):
+        self.username = username
+
+    def prompt(self):
+        return dict(Username=self.username, Password="fake")
+
+
+class FakeCOMPSServer:
+    """
+    Local fake COMPS server.
+
+    The server runs in a thread of the current process, or in a child process when started with process=True so
+    benchmarks do not share the interpreter with it.
+
+    Examples:
+        >>> with FakeCOMPSServer(FakeCOMPSConfig(latency=0.01)) as server:  # doctest: +SKIP
+        ...     platform = Platform("COMPS", endpoint=server.url, environment="Calculon")
+    """
+
+    def __init__(self, config: FakeCOMPSConfig = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Constructor.
+
+        Args:
+            config: Behavior of the server
+            host: Interface to listen on
+            port: Port to listen on. 0 picks a free port
+        """
+        self.config = config or FakeCOMPSConfig()
+        self.host = host
+        self.port = port
+        self._server: Optional[FakeCOMPSHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._process: Optional[multiprocessing.Process] = None
+        self._previous_auth_manager = None
+
+    @property
+    def url(self) -> str:
+        """Url of the server, used as the endpoint of the platform."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def store(self) -> FakeCOMPSStore:
+        """Entities of a server running in this process."""
+        if self._server is None:
+            raise RuntimeError("The store is only available for servers running in this process")
+        return self._server.store
+
+    def start(self, process: bool = False) -> 'FakeCOMPSServer':
+        """
+        Start the server.
+
+        Args:
+            process: Run the server in a child process
+
+        Returns:
+            The server
+        """
+        if process:
+            parent, child = multiprocessing.Pipe()
+            self._process = multiprocessing.Process(target=_serve, args=(self.config, self.host, self.port, child),
+                                                    daemon=True)
+            self._process.start()
+            self.port = parent.recv()
+        else:
+            self._server = FakeCOMPSHTTPServer((self.host, self.port), self.config)
+            self.port = self._server.server_address[1]
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        logger.debug(f"Fake COMPS server listening on {self.url}")
+        return self
+
+    def stop(self):
+        """
+        Stop the server and log out of it.
+
+        Returns:
+            None
+        """
+        self.logout()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self):
+        """Start the server."""
+        return self if self._server or self._process else self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop the server."""
+        self.stop()
+
+    def login(self):
+        """
+        Log the COMPS client into the server. A session with another COMPS server is restored by :meth:`logout`.
+
+        Returns:
+            None
+        """
+        # the client only allows one host at a time
+        self._previous_auth_manager = Client._Client__auth_manager
+        Client._Client__auth_manager = None
+        Client.login(self.url, credential_prompt=_FakeCredentialPrompt(self.config.username))
+
+    def logout(self):
+        """
+        Log out of the server, removing its cached token.
+
+        Returns:
+            None
+        """
+        manager = Client._Client__auth_manager
+        if manager is not None and manager.hoststring == self.url:
+            Client.logout()
+            Client._Client__auth_manager = self._previous_auth_manager
+            self._previous_auth_manager = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the statistics of the server.
+
+        Returns:
+            Requests per route, bytes received and sent, and the number of injected errors
+        """
+        return requests.get(self.url + STATS_PATH).json()
+
+    def reset_stats(self):
+        """
+        Clear the statistics of the server.
+
+        Returns:
+            None
+        """
+        requests.delete(self.url + STATS_PATH)
+
+
+def main(args: List[str] = None):
+    """
+    Run a fake COMPS server until interrupted.
+
+    Args:
+        args: Command line arguments
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Local fake COMPS server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    defaults = FakeCOMPSConfig()
+    for name in ("latency", "bandwidth", "error_rate", "disconnect_rate", "run_time", "failure_rate"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=getattr(defaults, name))
+    parser.add_argument("--error-paths", default=None)
+    options = vars(parser.parse_args(args))
+    host, port = options.pop("host"), options.pop("port")
+    config = FakeCOMPSConfig(**options)
+    server = FakeCOMPSHTTPServer((host, port), config)
+    print(f"Fake COMPS server listening on http://{host}:{server.server_address[1]} with {asdict(config)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
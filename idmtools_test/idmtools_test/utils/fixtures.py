@@ -0,0 +1,19 @@
+"""Pytest fixtures shared by the test suites of the idmtools packages.
+
+Load them from the conftest.py of a test suite with::
+
+    pytest_plugins = ["idmtools_test.utils.fixtures"]
+
+Copyright 2025, Gates Foundation. All rights reserved.
+"""
+import pytest
+
+
+@pytest.fixture
+def unittest_record_property(request, record_property):
+    """Expose pytest's record_property to unittest.TestCase tests as self.record_property.
+
+    Benchmarks use it to report their timings in the junit xml report. Use it on a TestCase class with
+    ``@pytest.mark.usefixtures("unittest_record_property")``.
+    """
+    request.instance.record_property = record_property